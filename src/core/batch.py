@@ -0,0 +1,168 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo implementa a execução em lote (batch) do tracking sobre vários vídeos.
+Cada vídeo vira um "job" independente, executado em modo headless dentro de um pool de processos
+dimensionado pelo número de núcleos da máquina. Como o CSRT é limitado pela CPU, processos separados
+evitam o GIL e usam todos os núcleos. Falhas de um vídeo não interrompem os demais, e ao final
+é gerada uma tabela-resumo com o resultado de cada job.
+'''
+#################
+
+import os  # Importa o módulo os para listar arquivos e contar núcleos
+import time  # Importa time para medir a duração de cada job
+import multiprocessing  # Importa multiprocessing para escolher o contexto de criação dos processos
+from collections import Counter  # Importa Counter para detectar vídeos com o mesmo nome base
+from concurrent.futures import ProcessPoolExecutor, as_completed  # Importa o pool de processos
+from typing import Dict, List, Optional  # Importa tipos para anotação de tipagem
+import cv2  # Importa a biblioteca OpenCV (para limitar as threads internas em cada processo)
+from src.core.cache import cached_track_single_object, get_cache_dir  # Importa o tracking com cache de resultados
+from src.io.logger import get_app_logger, get_log_level, init_worker_logging, log_event, process_log_queue  # Importa o logger da aplicação
+from src.io.paths import get_timestamped_results_dir  # Importa a função que cria pastas de resultado com data/hora
+from src.io.roi import Box, find_initial_box, match_roi_key  # Importa o tipo de caixa e a busca de ROI por vídeo
+
+logger = get_app_logger("batch")  # Inicializa o logger específico para o módulo de lote
+
+SUPPORTED_VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov")  # Extensões de vídeo aceitas (as mesmas da interface)
+
+# Campos do dicionário de estatísticas que voltam do processo filho (a trajetória completa fica nos arquivos)
+_SUMMARY_KEYS = (
+    "num_frames", "fps", "success_frames", "success_rate", "mean_speed_px", "max_speed_px",
+    "total_distance_px", "path_efficiency", "report_path", "csv_output", "binary_output", "video_output", "cache_hit",
+)
+
+def find_videos(input_dir: str) -> List[str]:  # Lista os vídeos suportados de uma pasta, em ordem alfabética
+    names = sorted(os.listdir(input_dir))  # Lista os arquivos da pasta em ordem
+    return [
+        os.path.join(input_dir, n) for n in names  # Monta o caminho completo
+        if os.path.splitext(n)[1].lower() in SUPPORTED_VIDEO_EXTENSIONS  # Mantém apenas extensões de vídeo
+    ]
+
+def _init_worker(log_queue=None, log_level: int = 20):  # Inicializa cada processo do pool
+    cv2.setNumThreads(1)  # Uma thread do OpenCV por processo: o paralelismo vem do pool, evitando disputa de núcleos
+    if log_queue is not None:  # Os logs do processo são gravados pelo processo principal (um único arquivo)
+        init_worker_logging(log_queue, log_level)
+
+def _run_job(job: Dict) -> Dict:  # Executa um job de tracking (função de nível de módulo para poder ser enviada ao processo)
+    start = time.perf_counter()  # Marca o início do job
+    result = {"video": job["video_path"], "output_dir": job["output_dir"], "ok": False}  # Resultado padrão (falha)
+    try:
+        stats = cached_track_single_object(headless=True, **job)  # Executa o tracking sem interface (ou reaproveita o cache)
+        result["stats"] = {k: stats.get(k) for k in _SUMMARY_KEYS}  # Devolve apenas o resumo (leve para serializar)
+        result["ok"] = True  # Marca o job como bem-sucedido
+    except Exception as e:  # Isola a falha: o erro vira parte do resultado, sem derrubar o lote
+        result["error"] = f"{type(e).__name__}: {e}"  # Guarda a descrição do erro
+    result["elapsed_s"] = time.perf_counter() - start  # Registra a duração do job
+    return result  # Retorna o resultado ao processo principal
+
+def run_batch(  # Executa o tracking em lote sobre uma lista de vídeos
+    video_paths: List[str],  # Lista de vídeos a processar
+    rois: Optional[Dict[str, Box]] = None,  # ROIs iniciais por vídeo (nome do arquivo -> caixa)
+    tracker_type: str = "CSRT",  # Algoritmo de tracking
+    workers: Optional[int] = None,  # Número de processos (padrão: número de núcleos)
+    save_video: bool = True,  # Salva o vídeo anotado de cada job
+    save_csv: bool = True,  # Salva o CSV de cada job
+    pixels_per_meter: Optional[float] = None,  # Calibração física comum a todos os vídeos
+    save_debug_images: bool = False,  # Salva as imagens de debug de cada job
+    results_root: Optional[str] = None,  # Pasta onde as pastas de cada job são criadas (padrão: data/results)
+    streaming: bool = False,  # Grava o CSV durante o tracking com memória constante
+    save_binary: bool = False,  # Salva a trajetória binária '.traj' de cada job
+    use_cache: bool = False,  # Reaproveita resultados guardados no cache (pasta 'cache' dentro de results_root)
+) -> List[Dict]:  # Retorna a lista de resultados, na mesma ordem dos vídeos
+
+    results: List[Optional[Dict]] = [None] * len(video_paths)  # Resultados na ordem original dos vídeos
+    jobs = {}  # Jobs válidos a enviar ao pool (índice -> parâmetros)
+
+    stems = Counter(os.path.splitext(os.path.basename(v))[0] for v in video_paths)  # Quantos vídeos compartilham cada nome base
+    used_prefixes = set()  # Prefixos de pasta já usados neste lote (evita duas execuções na mesma pasta)
+
+    for i, video_path in enumerate(video_paths):  # Prepara um job por vídeo
+        file_name = os.path.basename(video_path)  # Nome do arquivo com extensão (ex.: gato.mp4)
+        stem = os.path.splitext(file_name)[0]  # Nome do arquivo sem extensão (ex.: gato)
+        box = find_initial_box(video_path, rois)  # Procura a ROI inicial do vídeo
+        error = None  # Motivo para não executar o job (se houver)
+        if box is None:  # Sem ROI o job não pode rodar em modo headless
+            error = "ROI inicial não encontrada"
+        elif stems[stem] > 1 and match_roi_key(video_path, rois) not in (video_path, os.path.abspath(video_path), file_name):
+            error = f"ROI ambígua: '{stem}' corresponde a mais de um vídeo (use o nome com extensão)"  # ROI pelo nome base ou sidecar compartilhado
+        if error is not None:  # Registra a falha sem ocupar o pool
+            results[i] = {"video": video_path, "output_dir": None, "ok": False, "error": error, "elapsed_s": 0.0}
+            continue
+
+        prefix = file_name.replace(".", "_")  # Prefixo da pasta com a extensão (gato.mp4 e gato.avi não colidem)
+        n = 2  # Sufixo numérico para vídeos com o mesmo nome em pastas diferentes
+        while prefix in used_prefixes:  # Garante um prefixo único dentro do lote
+            prefix = f"{file_name.replace('.', '_')}_{n}"
+            n += 1
+        used_prefixes.add(prefix)  # Reserva o prefixo
+
+        jobs[i] = {
+            "video_path": video_path,  # Vídeo de entrada
+            "output_dir": str(get_timestamped_results_dir(prefix=prefix, base_dir=results_root)),  # Pasta de saída própria do job
+            "tracker_type": tracker_type,  # Algoritmo de tracking
+            "save_video": save_video,  # Salva o vídeo anotado?
+            "save_csv": save_csv,  # Salva o CSV?
+            "pixels_per_meter": pixels_per_meter,  # Calibração física
+            "save_debug_images": save_debug_images,  # Salva as imagens de debug?
+            "initial_box": box,  # ROI inicial
+            "streaming": streaming,  # Modo streaming
+            "save_binary": save_binary,  # Salva a trajetória binária?
+            "use_cache": use_cache,  # Usa o cache de resultados?
+            "cache_dir": None,  # Pasta do cache (preenchida abaixo, depois de montar os jobs)
+        }
+
+    cache_dir = str(get_cache_dir(results_root)) if use_cache else None  # Pasta do cache compartilhada pelos processos
+    for job in jobs.values():
+        job["cache_dir"] = cache_dir
+
+    if jobs:  # Só cria o pool se houver trabalho
+        workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))  # Não cria mais processos do que jobs
+        logger.info(f"Iniciando lote: {len(jobs)} vídeo(s), {workers} processo(s), tracker={tracker_type}")
+
+        ctx = multiprocessing.get_context("spawn")  # 'spawn' evita herdar o estado interno do OpenCV via fork
+        with process_log_queue(ctx) as log_queue, ProcessPoolExecutor(  # Cria o pool (os logs dos processos voltam pela fila)
+                max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(log_queue, get_log_level())) as pool:
+            futures = {pool.submit(_run_job, job): i for i, job in jobs.items()}  # Envia todos os jobs
+            for fut in as_completed(futures):  # Coleta cada resultado assim que fica pronto
+                i = futures[fut]  # Índice do vídeo correspondente
+                try:
+                    results[i] = fut.result()  # Resultado retornado pelo processo
+                except Exception as e:  # O processo filho morreu (ex.: falha nativa do OpenCV)
+                    results[i] = {"video": jobs[i]["video_path"], "output_dir": jobs[i]["output_dir"], "ok": False,
+                                  "error": f"{type(e).__name__}: {e}", "elapsed_s": 0.0}
+                status = "ok" if results[i]["ok"] else f"falhou ({results[i]['error']})"  # Texto de status do job
+                log_event(logger, "batch_job", f"Job concluído: {jobs[i]['video_path']} -> {status}",  # Registra o término do job
+                          video=jobs[i]["video_path"], ok=results[i]["ok"], error=results[i].get("error"),
+                          elapsed_s=round(results[i]["elapsed_s"], 3))
+
+    ok = sum(1 for r in results if r["ok"])  # Conta os jobs bem-sucedidos
+    logger.info(f"Lote concluído: {ok}/{len(results)} vídeo(s) com sucesso")  # Registra o resumo do lote
+    return results  # Retorna todos os resultados
+
+def format_batch_summary(results: List[Dict]) -> str:  # Monta a tabela-resumo do lote em texto
+    header = f"{'Vídeo':<28} {'Status':<7} {'Frames':>7} {'Sucesso':>8} {'Vel.méd(px/f)':>14} {'Tempo(s)':>9}  Saída / Erro"
+    lines = [header, "-" * len(header)]  # Cabeçalho e linha separadora
+
+    for r in results:  # Uma linha por vídeo
+        name = os.path.basename(r["video"])[:28]  # Nome do vídeo (truncado para caber na coluna)
+        if r["ok"]:  # Job bem-sucedido
+            s = r["stats"]  # Resumo das estatísticas
+            lines.append(
+                f"{name:<28} {'ok':<7} {s['num_frames']:>7} {s['success_rate']*100:>7.1f}% "
+                f"{s['mean_speed_px']:>14.3f} {r['elapsed_s']:>9.2f}  {r['output_dir']}"
+            )
+        else:  # Job com falha
+            lines.append(f"{name:<28} {'ERRO':<7} {'-':>7} {'-':>8} {'-':>14} {r['elapsed_s']:>9.2f}  {r['error']}")
+
+    ok = sum(1 for r in results if r["ok"])  # Conta os sucessos
+    lines.append("-" * len(header))  # Linha separadora final
+    lines.append(f"Total: {len(results)} | Sucesso: {ok} | Falhas: {len(results) - ok}")  # Totais do lote
+    return "\n".join(lines)  # Junta as linhas da tabela
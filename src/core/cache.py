@@ -0,0 +1,205 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo implementa o cache de resultados do tracking (pasta data/results/cache).
+Cada execução é identificada por uma chave calculada a partir de:
+  - uma impressão digital rápida do vídeo (tamanho, data de modificação e hash de trechos amostrados);
+  - os parâmetros que mudam o resultado (ROI, tracker, escala, janela de busca, calibração e saídas pedidas);
+  - a versão do código (hash dos módulos de tracking).
+Se a mesma análise for pedida de novo, as estatísticas e os arquivos guardados são devolvidos na hora,
+sem decodificar o vídeo. O cache tem limite de tamanho: as entradas usadas há mais tempo são apagadas primeiro.
+'''
+#################
+
+import os  # Importa o módulo os para manipular arquivos e pastas
+import json  # Importa json para guardar as estatísticas de cada entrada
+import shutil  # Importa shutil para copiar e apagar artefatos
+import hashlib  # Importa hashlib para calcular as chaves do cache
+import inspect  # Importa inspect para obter os valores padrão dos parâmetros do tracking
+from functools import lru_cache  # Importa lru_cache para calcular a versão do código uma única vez
+from pathlib import Path  # Importa Path para os caminhos do cache
+from typing import Dict, Optional  # Importa tipos para anotação de tipagem
+from src.core.tracking import track_single_object  # Importa a função principal de tracking
+from src.core.trajectory import TrajectoryStore, load_binary_trajectory  # Importa a trajetória em colunas e a leitura do '.traj'
+from src.io.logger import get_app_logger  # Importa o logger da aplicação
+from src.io.paths import get_data_dir  # Importa a pasta padrão de resultados
+
+logger = get_app_logger("cache")  # Inicializa o logger específico do cache
+
+CACHE_FORMAT_VERSION = 1  # Versão do formato das entradas (mudar invalida todo o cache)
+DEFAULT_MAX_CACHE_BYTES = 2 * 1024 ** 3  # Tamanho máximo padrão do cache (2 GB)
+FINGERPRINT_SAMPLES = 8  # Quantidade de trechos do vídeo lidos na impressão digital
+FINGERPRINT_SAMPLE_SIZE = 64 * 1024  # Tamanho de cada trecho (64 KB)
+
+_STATS_FILE = "stats.json"  # Estatísticas da entrada (a data de modificação marca o último uso)
+_TRAJECTORY_FILE = "trajectory.traj"  # Trajetória da entrada (recarregada com memória mapeada)
+_ARTIFACT_KEYS = ("video_output", "csv_output", "binary_output", "overlay_output", "report_path", "debug_dir")  # Arquivos gerados pelo tracking
+
+# Parâmetros do tracking que mudam o resultado (os demais, como headless e queue_size, não entram na chave).
+# O modo streaming muda as métricas filtradas (filtro só para frente em vez de RTS) e pula a cinemática.
+_KEY_PARAMS = ("tracker_type", "initial_box", "track_scale", "search_window", "pixels_per_meter",
+               "save_video", "save_csv", "save_binary", "save_debug_images", "streaming",
+               "debug_every", "debug_frames", "debug_format", "debug_quality",
+               "start_frame", "end_frame", "start_time", "end_time", "max_stride", "motion_gate",
+               "reacquire", "kalman", "kinematics", "overlay")
+
+# Módulos cujo código muda o resultado do tracking (caminhos relativos a src/)
+_CODE_MODULES = ("core/tracking.py", "core/trajectory.py", "core/metrics.py", "core/resolution.py", "core/pipeline.py",
+                 "core/cascade.py", "core/reacquire.py", "core/kalman.py", "core/kinematics.py",
+                 "core/profiling.py", "core/overlay.py", "core/debug_panels.py",
+                 "io/seek_index.py", "io/trajectory_file.py")
+
+def get_cache_dir(results_root: Optional[str] = None) -> Path:  # Pasta do cache (padrão: data/results/cache)
+    root = Path(results_root) if results_root else get_data_dir("results")
+    path = root / "cache"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+@lru_cache(maxsize=1)
+def code_version() -> str:  # Hash do código dos módulos de tracking (qualquer alteração invalida o cache)
+    h = hashlib.blake2b(digest_size=8)
+    src_dir = Path(__file__).resolve().parent.parent  # Pasta src
+    for name in _CODE_MODULES:
+        h.update((src_dir / name).read_bytes())
+    return h.hexdigest()
+
+def video_fingerprint(video_path: str) -> str:  # Impressão digital rápida do vídeo (sem ler o arquivo inteiro)
+    st = os.stat(video_path)  # Tamanho e data de modificação
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    with open(video_path, "rb") as f:  # Trechos espaçados igualmente ao longo do arquivo
+        step = max(1, (st.st_size - FINGERPRINT_SAMPLE_SIZE) // max(1, FINGERPRINT_SAMPLES - 1))
+        for i in range(FINGERPRINT_SAMPLES):
+            f.seek(min(i * step, max(0, st.st_size - FINGERPRINT_SAMPLE_SIZE)))
+            h.update(f.read(FINGERPRINT_SAMPLE_SIZE))
+    return h.hexdigest()
+
+def _key_params(kwargs: Dict) -> Dict:  # Parâmetros da chave, completados com os valores padrão do tracking
+    defaults = {n: p.default for n, p in inspect.signature(track_single_object).parameters.items()}
+    params = {n: kwargs.get(n, defaults.get(n)) for n in _KEY_PARAMS}
+    params["tracker_type"] = str(params["tracker_type"]).upper()  # 'csrt' e 'CSRT' são o mesmo tracker
+    if params["initial_box"] is not None:
+        params["initial_box"] = [int(v) for v in params["initial_box"]]
+    return params
+
+def cache_key(video_path: str, kwargs: Dict) -> str:  # Chave do cache para um vídeo e um conjunto de parâmetros
+    payload = {
+        "format": CACHE_FORMAT_VERSION,  # Versão do formato das entradas
+        "code": code_version(),  # Versão do código
+        "video": video_fingerprint(video_path),  # Conteúdo do vídeo
+        "params": _key_params(kwargs),  # Parâmetros do tracking
+    }
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+def _link_or_copy(src: str, dst: str):  # Cria um hard link (instantâneo) ou copia o arquivo se não for possível
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def _entry_size(entry: Path) -> int:  # Tamanho total de uma entrada em bytes
+    return sum(p.stat().st_size for p in entry.rglob("*") if p.is_file())
+
+def lookup(key: str, cache_dir: Path) -> Optional[Dict]:  # Procura uma entrada; devolve as estatísticas ou None
+    entry = cache_dir / key
+    stats_file = entry / _STATS_FILE
+    if not stats_file.is_file():  # Entrada inexistente (ou incompleta)
+        return None
+    with open(stats_file, encoding="utf-8") as f:
+        stats = json.load(f)
+    for k in _ARTIFACT_KEYS:  # Os artefatos são guardados pelo nome, relativo à entrada
+        if stats.get(k):
+            stats[k] = str(entry / stats[k])
+    if stats.get("initial_box") is not None:  # O JSON transforma tuplas em listas
+        stats["initial_box"] = tuple(stats["initial_box"])
+    traj_file = entry / _TRAJECTORY_FILE
+    if not traj_file.is_file() and stats.get("binary_output"):  # Execução em modo streaming: usa o '.traj' gerado por ela
+        traj_file = Path(stats["binary_output"])
+    stats["trajectory"] = load_binary_trajectory(str(traj_file)) if traj_file.is_file() else None
+    os.utime(stats_file)  # Marca o uso da entrada (para a remoção das menos usadas)
+    stats["cache_hit"] = True
+    return stats
+
+def store(key: str, stats: Dict, cache_dir: Path):  # Guarda as estatísticas e os artefatos de uma execução
+    entry = cache_dir / key
+    tmp = cache_dir / f".{key}.tmp"  # A entrada é montada em uma pasta temporária e renomeada no fim
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    saved = {k: v for k, v in stats.items() if k not in ("trajectory", "cache_hit")}  # Estatísticas serializáveis
+    for k in _ARTIFACT_KEYS:  # Traz os artefatos para dentro da entrada
+        src = stats.get(k)
+        if not src or not os.path.exists(src):
+            continue
+        name = os.path.basename(src)
+        if os.path.isdir(src):
+            shutil.copytree(src, tmp / name, copy_function=_link_or_copy)
+        else:
+            _link_or_copy(src, str(tmp / name))
+        saved[k] = name
+    trajectory = stats.get("trajectory")
+    if isinstance(trajectory, TrajectoryStore):  # Guarda a trajetória para ser recarregada nos acertos
+        trajectory.write_binary(str(tmp / _TRAJECTORY_FILE), stats["fps"], stats["frame_width"], stats["frame_height"])
+    with open(tmp / _STATS_FILE, "w", encoding="utf-8") as f:
+        json.dump(saved, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(entry, ignore_errors=True)  # Substitui uma entrada anterior (ex.: incompleta)
+    os.replace(tmp, entry)
+
+def evict(cache_dir: Path, max_bytes: int = DEFAULT_MAX_CACHE_BYTES) -> int:  # Apaga as entradas menos usadas até caber no limite
+    entries = []  # (último uso, tamanho, pasta)
+    for entry in cache_dir.iterdir():
+        stats_file = entry / _STATS_FILE
+        if entry.is_dir() and stats_file.is_file():
+            entries.append((stats_file.stat().st_mtime, _entry_size(entry), entry))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, entry in sorted(entries, key=lambda e: e[0]):  # Das menos usadas para as mais usadas
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+        removed += 1
+    if removed:
+        logger.info(f"Cache: {removed} entrada(s) removida(s) para respeitar o limite de {max_bytes} bytes")
+    return removed
+
+def cached_track_single_object(  # Executa o tracking usando o cache de resultados
+    video_path: str,  # Caminho do vídeo de entrada
+    output_dir: str,  # Pasta de saída (usada apenas quando o tracking precisa rodar)
+    use_cache: bool = True,  # False ignora o cache (sempre roda o tracking e não guarda o resultado)
+    cache_dir: Optional[str] = None,  # Pasta do cache (padrão: data/results/cache)
+    max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,  # Tamanho máximo do cache
+    **kwargs,  # Demais parâmetros de track_single_object
+) -> Dict:
+    if (not use_cache or kwargs.get("initial_box") is None or not kwargs.get("headless", False)
+            or kwargs.get("profile_dump")):  # O perfil detalhado mede uma execução de verdade
+        return track_single_object(video_path, output_dir, **kwargs)  # Sem ROI conhecida (seleção manual) não há chave
+
+    cache_path = Path(cache_dir) if cache_dir else get_cache_dir()
+    cache_path.mkdir(parents=True, exist_ok=True)
+    key = cache_key(video_path, kwargs)
+    stats = lookup(key, cache_path)
+    if stats is not None:  # Acerto: devolve o resultado guardado
+        logger.info(f"Cache: resultado reaproveitado para {video_path} ({key})")
+        return stats
+
+    stats = track_single_object(video_path, output_dir, **kwargs)  # Falha: roda o tracking normalmente
+    if stats.get("cancelled"):  # Resultado parcial não é guardado
+        stats["cache_hit"] = False
+        return stats
+    try:
+        store(key, stats, cache_path)
+        evict(cache_path, max_cache_bytes)
+    except OSError as e:  # Um problema no cache não invalida o resultado do tracking
+        logger.warning(f"Cache: não foi possível guardar o resultado de {video_path}: {e}")
+    stats["cache_hit"] = False
+    return stats
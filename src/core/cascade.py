@@ -0,0 +1,132 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo implementa o tracker em cascata KCF -> CSRT.
+O KCF (rápido) é usado por padrão. Quando ele falha, dá um salto grande demais ou a aparência dentro da caixa
+deixa de se parecer com o objeto, o CSRT (preciso e mais lento) é iniciado a partir da última caixa confiável
+e assume o tracking. Depois de uma sequência estável de frames, o KCF é reiniciado na caixa do CSRT e volta
+a ser o tracker principal (com o tamanho de caixa da inicialização: o KCF não estima escala, e o custo da
+sua FFT depende muito das dimensões da caixa, ficando até 10x maior em tamanhos desfavoráveis). Assim o custo fica próximo ao do KCF, com a robustez do CSRT nos trechos difíceis.
+A cascata expõe a mesma interface dos trackers do OpenCV (init/update) e pode ser combinada com a escala
+reduzida e a janela de busca (ver src/core/resolution.py).
+'''
+#################
+
+from collections import Counter  # Importa Counter para contar os frames de cada tracker
+from typing import Callable, Optional, Tuple  # Importa tipos para anotação de tipagem
+import cv2  # Importa a biblioteca OpenCV para a comparação de aparência
+import numpy as np  # Importa NumPy para os recortes dos frames
+from src.core.reacquire import FLAT_TEMPLATE_STD  # Importa o limiar de textura dos modelos de aparência
+
+Box = Tuple[float, float, float, float]  # Caixa (x, y, w, h)
+
+CASCADE_NAMES = ("CASCADE", "KCF+CSRT")  # Nomes aceitos para o tracker em cascata
+STABLE_FRAMES = 30  # Frames seguidos do CSRT com sucesso antes de voltar ao KCF
+MAX_JUMP = 0.5  # Deslocamento máximo do centro entre duas consultas (fração da caixa) aceito do KCF
+MIN_APPEARANCE = 0.4  # Correlação mínima entre a caixa do KCF e o modelo de aparência do objeto
+
+def _patch(frame: np.ndarray, box: Box) -> Optional[np.ndarray]:  # Recorte da caixa em cinza (limitado ao frame); None se vazio
+    x, y, w, h = [int(v) for v in box]
+    fh, fw = frame.shape[:2]
+    x0, y0, x1, y1 = max(0, x), max(0, y), min(fw, x + w), min(fh, y + h)
+    if x1 - x0 < 2 or y1 - y0 < 2:
+        return None
+    patch = frame[y0:y1, x0:x1]  # Recorta antes de converter (só a caixa passa pelo cvtColor)
+    return cv2.cvtColor(patch, cv2.COLOR_BGR2GRAY) if patch.ndim == 3 else patch
+
+class CascadeTracker:  # KCF por padrão, CSRT nos trechos em que o KCF não é confiável
+
+    def __init__(
+        self,
+        fast_factory: Callable[[], object],  # Cria o tracker rápido (KCF)
+        robust_factory: Callable[[], object],  # Cria o tracker robusto (CSRT)
+        usage: Optional[Counter] = None,  # Contador compartilhado de frames por tracker e de escalonamentos
+        stable_frames: int = STABLE_FRAMES,  # Sequência estável que devolve o tracking ao KCF
+        names: Tuple[str, str] = ("KCF", "CSRT"),  # Nomes usados no contador
+    ):
+        self.fast_factory = fast_factory
+        self.robust_factory = robust_factory
+        self.usage = usage if usage is not None else Counter()  # Frames respondidos por cada tracker e escalonamentos
+        self.stable_frames = stable_frames
+        self.names = names
+        self.fast = None  # Tracker rápido atual
+        self.robust = None  # Tracker robusto (None = modo KCF)
+        self.stable = 0  # Frames seguidos do CSRT com sucesso
+        self.fast_size = None  # Tamanho (w, h) da caixa do KCF, fixado na inicialização
+        self.template = None  # Modelo de aparência do objeto (cinza)
+        self.last_box = None  # Última caixa confiável
+        self.last_frame = None  # Frame da última caixa confiável (cópia: o loop desenha sobre os frames)
+
+    def _remember(self, frame: np.ndarray, box: Box):  # Guarda a última caixa confiável e o seu frame
+        if self.last_frame is None or self.last_frame.shape != frame.shape:
+            self.last_frame = frame.copy()
+        else:
+            np.copyto(self.last_frame, frame)  # Reaproveita o buffer (sem alocar a cada frame)
+        self.last_box = tuple(int(v) for v in box)
+
+    def _start_fast(self, frame: np.ndarray, box: Box):  # (Re)inicia o KCF e o modelo de aparência
+        box = tuple(int(v) for v in box)
+        if self.fast_size is None:  # Primeira inicialização: guarda o tamanho escolhido
+            self.fast_size = box[2:]
+        else:  # Volta do CSRT: mesmo tamanho de antes, centralizado na caixa do CSRT
+            w, h = self.fast_size
+            box = (int(box[0] + (box[2] - w) / 2.0), int(box[1] + (box[3] - h) / 2.0), w, h)
+        self.fast = self.fast_factory()
+        self.fast.init(frame, box)
+        self.template = _patch(frame, box)
+        self.template = None if self.template is None else self.template.copy()
+        self.robust = None
+        self._remember(frame, box)
+
+    def _consistent(self, frame: np.ndarray, box: Box) -> bool:  # A resposta do KCF é plausível?
+        lx, ly, lw, lh = self.last_box
+        x, y, w, h = box
+        jump = np.hypot(x + w / 2.0 - lx - lw / 2.0, y + h / 2.0 - ly - lh / 2.0)
+        if jump > MAX_JUMP * max(lw, lh):  # Salto grande demais para uma única consulta
+            return False
+        if self.template is None or self.template.std() < FLAT_TEMPLATE_STD:  # Objeto sem textura: só o salto é verificado
+            return True
+        patch = _patch(frame, box)
+        if patch is None:  # A caixa saiu do frame
+            return False
+        if patch.shape != self.template.shape:  # Caixa cortada pela borda do frame: compara no tamanho do modelo
+            patch = cv2.resize(patch, (self.template.shape[1], self.template.shape[0]), interpolation=cv2.INTER_AREA)
+        score = float(cv2.matchTemplate(patch, self.template, cv2.TM_CCOEFF_NORMED)[0, 0])  # Correlação normalizada
+        return not np.isfinite(score) or score >= MIN_APPEARANCE  # Regiões lisas não têm correlação definida
+
+    def init(self, frame: np.ndarray, box: Box):  # Inicializa a cascata no modo KCF
+        self.fast_size = None
+        self._start_fast(frame, box)
+        return True
+
+    def update(self, frame: np.ndarray):  # Atualiza a cascata e devolve (sucesso, caixa)
+        fast_name, robust_name = self.names
+        if self.robust is None:  # Modo KCF
+            ok, box = self.fast.update(frame)
+            if ok and self._consistent(frame, box):
+                self.usage[fast_name] += 1
+                self._remember(frame, box)
+                return ok, box
+            self.usage["escalations"] += 1  # KCF falhou ou não é confiável: o CSRT assume a partir da última caixa boa
+            self.robust = self.robust_factory()
+            self.robust.init(self.last_frame, self.last_box)
+            self.stable = 0
+
+        ok, box = self.robust.update(frame)  # Modo CSRT
+        self.usage[robust_name] += 1
+        if not ok:
+            self.stable = 0
+            return ok, box
+        self.stable += 1
+        self._remember(frame, box)
+        if self.stable >= self.stable_frames:  # Trecho estável: volta ao KCF na caixa do CSRT
+            self._start_fast(frame, box)
+        return ok, box
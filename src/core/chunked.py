@@ -0,0 +1,193 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo implementa o tracking paralelo no tempo (por blocos) de um único vídeo longo.
+O vídeo é dividido em N blocos, e cada bloco é rastreado em um processo separado (o tracker é sequencial,
+então um vídeo sozinho usaria apenas um núcleo). Cada bloco começa alguns frames antes do fim do anterior
+(janela de sobreposição) e reencontra o objeto por correlação de template no seu primeiro frame.
+Na costura, as caixas dos dois blocos na sobreposição são comparadas: se concordam, o bloco é aceito;
+se não, ele é rastreado de novo a partir da última caixa do bloco anterior, o que garante a continuidade
+do objeto mesmo quando a reaquisição paralela se engana.
+'''
+#################
+
+import os  # Importa o módulo os para montar os caminhos de saída
+import tempfile  # Importa tempfile para a pasta descartável de cada bloco
+import multiprocessing  # Importa multiprocessing para escolher o contexto de criação dos processos
+from concurrent.futures import ProcessPoolExecutor  # Importa o pool de processos
+from datetime import datetime  # Importa datetime para o nome dos arquivos
+from typing import Dict, List, Optional, Tuple  # Importa tipos para anotação de tipagem
+import cv2  # Importa a biblioteca OpenCV para ler os frames de reaquisição
+import numpy as np  # Importa NumPy para juntar as trajetórias dos blocos
+from src.core.tracking import track_single_object  # Importa o tracking de um trecho
+from src.core.trajectory import TrajectoryStore  # Importa a trajetória em colunas
+from src.core.metrics import build_stats, write_report  # Importa o motor de métricas
+from src.core.reacquire import MIN_MATCH_SCORE, cut_template, match_template  # Importa a reaquisição por template
+from src.io.seek_index import get_seek_index, seek_to_frame  # Importa o índice de busca (início de cada bloco)
+from src.io.logger import get_app_logger, get_log_level, init_worker_logging, process_log_queue  # Importa o logger da aplicação
+
+logger = get_app_logger("chunked")  # Inicializa o logger específico do tracking por blocos
+
+DEFAULT_OVERLAP = 15  # Frames de sobreposição entre blocos vizinhos
+MIN_CHUNK_FRAMES = 60  # Tamanho mínimo de um bloco (blocos menores não compensam o custo de um processo)
+
+def split_chunks(num_frames: int, num_chunks: int, overlap: int = DEFAULT_OVERLAP) -> List[Tuple[int, int]]:  # Divide o vídeo em blocos [início, fim)
+    num_chunks = max(1, min(num_chunks, num_frames // max(MIN_CHUNK_FRAMES, 2 * overlap)))  # Não cria blocos curtos demais
+    bounds = [round(k * num_frames / num_chunks) for k in range(num_chunks + 1)]  # Fronteiras nominais
+    return [(max(0, bounds[k] - overlap) if k > 0 else 0, bounds[k + 1]) for k in range(num_chunks)]  # Cada bloco começa na sobreposição
+
+def _read_frame(video_path: str, frame: int) -> np.ndarray:  # Lê um único frame usando o índice de busca
+    cap = cv2.VideoCapture(video_path)
+    try:
+        seek_to_frame(cap, get_seek_index(video_path, frame), frame)
+        ret, image = cap.read()
+    finally:
+        cap.release()
+    if not ret:
+        raise RuntimeError(f"Não foi possível ler o frame {frame} de {video_path}")
+    return image
+
+def _init_worker(log_queue, log_level: int):  # Inicializa cada processo do pool
+    cv2.setNumThreads(1)  # Uma thread do OpenCV por processo
+    init_worker_logging(log_queue, log_level)  # Os logs do processo são gravados pelo processo principal
+
+def _track_chunk(job: Dict) -> Dict:  # Rastreia um bloco (função de nível de módulo para poder ser enviada ao processo)
+    box, score = job["box"], 1.0  # Caixa inicial conhecida (primeiro bloco ou continuação da costura)
+    if box is None:  # Reaquisição: procura o template no primeiro frame do bloco
+        box, score = match_template(_read_frame(job["video_path"], job["start"]), job["template"], job.get("around"))
+    with tempfile.TemporaryDirectory() as tmp:  # O relatório parcial do bloco é descartado
+        stats = track_single_object(
+            job["video_path"], tmp, tracker_type=job["tracker_type"], save_video=False, save_csv=False,
+            save_debug_images=False, initial_box=box, headless=True, track_scale=job["track_scale"],
+            search_window=job["search_window"], start_frame=job["start"], end_frame=job["end"],
+        )
+    t = stats["trajectory"]
+    return {
+        "start": job["start"],  # Primeiro frame do bloco
+        "end": job["end"],  # Frame final do bloco (exclusivo)
+        "box": tuple(int(v) for v in box),  # Caixa usada na inicialização
+        "score": score,  # Pontuação da reaquisição (1.0 quando a caixa era conhecida)
+        # Colunas com a numeração da execução do vídeo inteiro (o frame 0 é o primeiro após a ROI inicial)
+        "columns": (t.frames + job["start"], t.xs, t.ys, t.ws, t.hs, t.success),
+    }
+
+def _centers_agree(prev: Dict, cur: Dict, boundary: int) -> bool:  # As caixas dos dois blocos concordam na sobreposição?
+    if cur["score"] < MIN_MATCH_SCORE:  # A reaquisição não encontrou o objeto com confiança
+        return False
+    pf, px, py, pw, ph, ps = prev["columns"]
+    cf, cx, cy, _, _, cs = cur["columns"]
+    window_p = (pf >= cur["start"]) & (pf < boundary) & ps  # Frames da sobreposição rastreados no bloco anterior
+    window_c = (cf >= cur["start"]) & (cf < boundary) & cs  # Os mesmos frames no bloco atual
+    common, ip, ic = np.intersect1d(pf[window_p], cf[window_c], return_indices=True)
+    if len(common) == 0:  # Nenhum frame em comum para comparar
+        return False
+    dist = np.hypot(px[window_p][ip] - cx[window_c][ic], py[window_p][ip] - cy[window_c][ic])  # Distância entre os centros
+    size = np.maximum(pw[window_p][ip], ph[window_p][ip])  # Tamanho da caixa no bloco anterior
+    return bool(np.median(dist) <= 0.5 * np.median(size))  # Tolerância: meia caixa
+
+def _handoff(prev: Dict, start: int) -> Tuple[Optional[Tuple[int, int, int, int]], Optional[Tuple[int, int, int, int]]]:  # Caixa inicial do bloco a partir do anterior
+    f, x, y, w, h, s = prev["columns"]
+    at = np.flatnonzero((f == start - 1) & s)  # Registro do frame 'start' do vídeo (o frame N do vídeo é o registro N-1)
+    if len(at):  # O bloco anterior seguia o objeto exatamente nesse frame: a caixa é usada diretamente
+        i = at[0]
+        return (int(x[i] - w[i] / 2.0), int(y[i] - h[i] / 2.0), int(w[i]), int(h[i])), None
+    before = np.flatnonzero((f < start) & s)  # Última caixa válida antes do frame: busca local ao redor dela
+    if len(before):
+        i = before[-1]
+        return None, (int(x[i] - w[i] / 2.0), int(y[i] - h[i] / 2.0), int(w[i]), int(h[i]))
+    return None, None  # O bloco anterior perdeu o objeto: busca no frame inteiro
+
+def track_chunked(  # Rastreia um vídeo longo em blocos paralelos e costura as trajetórias
+    video_path: str,  # Caminho do vídeo de entrada
+    output_dir: str,  # Pasta de saída
+    initial_box: Tuple[int, int, int, int],  # ROI inicial (x, y, w, h) no primeiro frame
+    num_chunks: Optional[int] = None,  # Número de blocos (padrão: núcleos da máquina)
+    overlap: int = DEFAULT_OVERLAP,  # Frames de sobreposição entre blocos
+    tracker_type: str = "CSRT",  # Algoritmo de tracking
+    save_csv: bool = False,  # Salva a trajetória em CSV
+    save_binary: bool = False,  # Salva a trajetória binária '.traj'
+    pixels_per_meter: Optional[float] = None,  # Calibração física
+    track_scale: float = 1.0,  # Escala do frame entregue ao tracker
+    search_window: Optional[float] = None,  # Janela de busca em múltiplos da caixa
+    max_workers: Optional[int] = None,  # Número de processos (padrão: um por bloco)
+) -> Dict:
+    os.makedirs(output_dir, exist_ok=True)  # Garante que a pasta de saída exista
+    index = get_seek_index(video_path)  # Cria o índice uma vez; os processos reaproveitam o arquivo salvo
+    num_frames = index["num_frames"]
+    chunks = split_chunks(num_frames, num_chunks or os.cpu_count() or 1, overlap)
+    first = _read_frame(video_path, 0)  # Primeiro frame: valida a ROI e fornece o template do objeto
+    height, width = first.shape[:2]
+    x, y, w, h = [int(v) for v in initial_box]
+    if w <= 0 or h <= 0 or x < 0 or y < 0 or x + w > width or y + h > height:
+        raise ValueError(f"ROI inicial fora do frame ({width}x{height}): {initial_box}")
+
+    base_job = {
+        "video_path": video_path, "tracker_type": tracker_type, "track_scale": track_scale,
+        "search_window": search_window, "template": cut_template(first, (x, y, w, h)),
+    }
+    jobs = [{**base_job, "start": s, "end": e, "box": (x, y, w, h) if k == 0 else None} for k, (s, e) in enumerate(chunks)]
+    logger.info(f"Tracking em blocos: vídeo={video_path}, blocos={len(jobs)}, sobreposição={overlap}, tracker={tracker_type}")
+
+    if len(jobs) > 1:
+        workers = max(1, min(max_workers or len(jobs), len(jobs)))
+        ctx = multiprocessing.get_context("spawn")  # 'spawn' evita herdar o estado interno do OpenCV via fork
+        with process_log_queue(ctx) as log_queue, ProcessPoolExecutor(  # Os logs dos processos voltam pela fila
+                max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(log_queue, get_log_level())) as pool:
+            results = list(pool.map(_track_chunk, jobs))
+    else:
+        results = [_track_chunk(jobs[0])]
+
+    reacquisitions = 0  # Blocos rastreados de novo na costura
+    for k in range(1, len(results)):  # Costura: cada bloco é validado contra o anterior (já aceito)
+        boundary = chunks[k][0] + overlap - 1  # Primeiro registro que pertence ao bloco k (fim da sobreposição)
+        if not _centers_agree(results[k - 1], results[k], boundary):
+            box, around = _handoff(results[k - 1], chunks[k][0])
+            logger.info(f"Bloco {k} ({chunks[k][0]}-{chunks[k][1]}): reaquisição divergente, rastreando a partir do bloco anterior")
+            results[k] = _track_chunk({**jobs[k], "box": box, "around": around})
+            reacquisitions += 1
+
+    parts = []  # Registros de cada bloco que entram na trajetória final
+    for k, r in enumerate(results):
+        keep = r["columns"][0] >= (chunks[k][0] + overlap - 1 if k > 0 else 0)  # A sobreposição fica com o bloco anterior
+        parts.append([c[keep] for c in r["columns"]])
+    trajectory = TrajectoryStore.from_columns(*[np.concatenate(cols) for cols in zip(*parts)])
+
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0  # FPS do arquivo (o mesmo lido pelo tracking)
+    cap.release()
+    stats = build_stats(
+        trajectory, max(0, num_frames - 1), fps, pixels_per_meter,
+        video_input=video_path,  # Caminho do vídeo original analisado
+        tracker_type=tracker_type,  # Tipo de algoritmo de rastreamento utilizado
+        frame_width=width,  # Largura do frame do vídeo
+        frame_height=height,  # Altura do frame do vídeo
+        initial_box=(x, y, w, h),  # ROI inicial
+        track_scale=track_scale,  # Escala do frame usada pelo tracker
+        search_window=search_window,  # Janela de busca
+        chunks=len(results),  # Número de blocos paralelos
+        chunk_reacquisitions=reacquisitions,  # Blocos rastreados de novo na costura
+    )
+    stats["trajectory"] = trajectory
+    stats["video_output"] = None  # O modo em blocos não grava vídeo anotado
+    stats["debug_dir"] = None  # Nem imagens de debug
+
+    base_name = os.path.splitext(os.path.basename(video_path))[0]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if save_csv:
+        stats["csv_output"] = os.path.join(output_dir, f"{base_name}_trajectory_{timestamp}.csv")
+        trajectory.write_csv(stats["csv_output"])
+    if save_binary:
+        stats["binary_output"] = os.path.join(output_dir, f"{base_name}_trajectory_{timestamp}.traj")
+        trajectory.write_binary(stats["binary_output"], fps, width, height)
+    stats["report_path"] = os.path.join(output_dir, f"{base_name}_relatorio_{timestamp}.txt")
+    write_report(stats["report_path"], stats)
+    logger.info(f"Tracking em blocos concluído: frames={stats['num_frames']}, reaquisições={reacquisitions}")
+    return stats
@@ -0,0 +1,253 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo gera os painéis de debug do tracking (Original | Bordas | Movimento) fora do loop principal.
+Os painéis são montados e gravados por um pool de threads próprio (DebugPanelWriter): o loop só entrega o frame e
+segue rastreando, e a gravação do vídeo anotado não fica parada atrás de um Canny ou de uma compressão PNG.
+O formato é configurável (PNG com nível de compressão, JPEG ou WebP com qualidade), assim como a amostragem
+(os quartis do vídeo, um frame a cada N ou uma lista de frames). Os painéis também podem ser gerados depois do
+tracking (build_debug_panels): o vídeo original é posicionado em cada frame pedido e, a partir de um arquivo lateral
+de overlay, as anotações são redesenhadas com a trajetória salva.
+'''
+#################
+
+import os  # Importa o módulo os para montar os caminhos
+import queue  # Importa queue para a fila limitada de painéis
+import threading  # Importa threading para o pool de gravação
+from datetime import datetime  # Importa datetime para nomear a pasta dos painéis gerados depois do tracking
+from typing import Callable, Dict, Iterable, List, Optional  # Importa tipos para anotação de tipagem
+from time import perf_counter  # Importa o relógio de alta resolução (tempo de cada painel)
+import cv2  # Importa a biblioteca OpenCV para os filtros e a codificação das imagens
+import numpy as np  # Importa NumPy para montar os painéis
+from src.core.overlay import OverlayRenderer, OVERLAY_SUFFIX, load_overlay  # Importa o redesenho das anotações
+from src.core.pipeline import DEFAULT_QUEUE_SIZE  # Importa o tamanho padrão das filas
+from src.io.seek_index import get_seek_index  # Importa o índice de busca (posicionamento nos frames pedidos)
+from src.io.logger import get_app_logger  # Importa o logger da aplicação
+
+logger = get_app_logger("debug_panels")  # Inicializa o logger específico dos painéis de debug
+
+DEBUG_WORKERS = 2  # Threads que montam e gravam os painéis (o OpenCV libera o GIL no Canny e na codificação)
+SEEK_MIN_GAP = 30  # Distância mínima (frames) para usar a busca em vez de avançar com grab()
+
+# Formatos aceitos: extensão, parâmetro do imwrite e faixa do nível (compressão no PNG, qualidade nos demais)
+DEBUG_FORMATS = {
+    "png": (".png", cv2.IMWRITE_PNG_COMPRESSION, 0, 9),  # Sem perdas; 0 = mais rápido, 9 = menor arquivo
+    "jpg": (".jpg", cv2.IMWRITE_JPEG_QUALITY, 0, 100),  # Com perdas; bem mais rápido que o PNG em frames grandes
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY, 1, 100),  # Com perdas; arquivos menores que o JPEG
+}
+
+def debug_encode_params(fmt: str = "png", quality: Optional[int] = None):  # Extensão e parâmetros do imwrite (valida o formato)
+    if fmt not in DEBUG_FORMATS:
+        raise ValueError(f"Formato de debug desconhecido: {fmt} (use {', '.join(DEBUG_FORMATS)})")
+    ext, flag, low, high = DEBUG_FORMATS[fmt]
+    if quality is None:  # Padrão do OpenCV
+        return ext, []
+    if not low <= int(quality) <= high:
+        raise ValueError(f"Nível inválido para {fmt}: {quality} (use de {low} a {high})")
+    return ext, [flag, int(quality)]
+
+def debug_frame_selector(  # Função que indica se um frame recebe painel de debug (consulta O(1) no loop)
+    total_frames: int,  # Frames do vídeo (ou do trecho)
+    every: Optional[int] = None,  # Um painel a cada N frames
+    frames: Optional[Iterable[int]] = None,  # Frames pedidos explicitamente
+) -> Callable[[int], bool]:
+    if every is None and frames is None:  # Padrão: início, quartos, meio e fim
+        if total_frames <= 0:
+            return lambda idx: False
+        chosen = frozenset({0, max(0, total_frames // 4), max(0, total_frames // 2),
+                            max(0, 3 * total_frames // 4), max(0, total_frames - 1)})
+        return chosen.__contains__
+    if every is not None and int(every) < 1:
+        raise ValueError(f"Intervalo de debug inválido: {every} (use 1 ou mais)")
+    chosen = frozenset(int(i) for i in frames) if frames is not None else frozenset()
+    if every is None:
+        return chosen.__contains__
+    every = int(every)
+    return lambda idx: idx % every == 0 or idx in chosen
+
+def build_debug_panel(  # Monta o painel (Original | Bordas | Movimento) de um frame
+    frame: np.ndarray,  # Frame já anotado (BGR)
+    gray: np.ndarray,  # Frame atual em escala de cinza
+    prev_gray: Optional[np.ndarray],  # Frame anterior em escala de cinza (None no primeiro frame)
+    frame_idx: int,  # Índice do frame
+    speed_px: Optional[float],  # Velocidade instantânea em px/frame (None = desconhecida)
+) -> np.ndarray:
+    edges = cv2.Canny(gray, 100, 200)  # Aplica filtro de Canny para detectar bordas
+
+    if prev_gray is not None:  # Se houver frame anterior
+        diff = cv2.absdiff(gray, prev_gray)  # Calcula a diferença absoluta entre frames (movimento)
+        diff_norm = cv2.normalize(diff, None, 0, 255, cv2.NORM_MINMAX)  # Normaliza para visualizar melhor
+    else:
+        diff_norm = np.zeros_like(gray)  # Se não, cria imagem preta
+
+    h, w = gray.shape[:2]
+    panel = np.empty((h, 3 * w, 3), dtype=np.uint8)  # As 3 imagens lado a lado, escritas direto no painel
+    panel[:, :w] = frame  # Original
+    cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR, dst=panel[:, w:2 * w])  # Bordas (convertidas para BGR no lugar)
+    cv2.cvtColor(diff_norm, cv2.COLOR_GRAY2BGR, dst=panel[:, 2 * w:])  # Movimento
+
+    txt = f"frame={frame_idx}" + (f" | vel={speed_px:.2f}" if speed_px is not None else "")  # Texto informativo
+    cv2.putText(panel, txt, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)  # Escreve no painel
+    return panel
+
+def save_debug_panel(path: str, frame, gray, prev_gray, frame_idx: int, speed_px, params: List[int]):  # Monta e grava um painel
+    if not cv2.imwrite(path, build_debug_panel(frame, gray, prev_gray, frame_idx, speed_px), params):
+        raise IOError(f"Não foi possível gravar o painel de debug: {path}")
+
+_END = object()  # Marcador de fim das tarefas
+
+class DebugPanelWriter:  # Pool de threads que monta e grava os painéis de debug, fora do loop de tracking
+
+    def __init__(self, out_dir: str, fmt: str = "png", quality: Optional[int] = None,
+                 workers: int = DEBUG_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE, timer=None,
+                 release: Optional[Callable[[np.ndarray], None]] = None):
+        self.out_dir = out_dir  # Pasta dos painéis
+        self.ext, self.params = debug_encode_params(fmt, quality)  # Extensão e parâmetros do imwrite
+        self.written = 0  # Painéis gravados
+        self._timer = timer  # Cronômetro do profiler (opcional; cada painel é medido na thread que o grava)
+        self._release = release  # Devolve o frame e os cinzas ao pool de buffers depois do painel (opcional)
+        self._lock = threading.Lock()  # Protege o contador e o cronômetro (várias threads)
+        self._error: Optional[BaseException] = None  # Primeiro erro ocorrido em uma das threads
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))  # Fila limitada (backpressure)
+        self._threads = [threading.Thread(target=self._run, name=f"DebugPanel-{i}", daemon=True)
+                         for i in range(max(1, workers))]
+
+    def start(self) -> "DebugPanelWriter":  # Inicia as threads de gravação
+        for t in self._threads:
+            t.start()
+        return self
+
+    def path_for(self, frame_idx: int) -> str:  # Caminho do painel de um frame
+        return os.path.join(self.out_dir, f"debug_frame_{frame_idx:05d}{self.ext}")
+
+    def _run(self):  # Corpo de cada thread de gravação
+        while True:
+            item = self._queue.get()
+            if item is _END:  # Fim das tarefas
+                return
+            if self._error is not None:  # Depois de um erro as tarefas restantes são descartadas
+                continue
+            start = perf_counter()
+            try:
+                save_debug_panel(*item, self.params)  # Consultada a cada painel (os testes a substituem)
+            except BaseException as e:  # Guarda o erro para relançar na thread principal
+                self._error = self._error or e
+                continue
+            finally:
+                if self._release is not None:  # Frame, cinza e cinza anterior não são mais usados pelo painel
+                    for buf in item[1:4]:
+                        self._release(buf)
+            with self._lock:
+                self.written += 1
+                if self._timer is not None:
+                    self._timer.add(perf_counter() - start, start)
+
+    def submit(self, frame_idx: int, frame: np.ndarray, gray: np.ndarray, prev_gray: Optional[np.ndarray],
+               speed_px: Optional[float]):  # Agenda um painel (os arrays não podem ser alterados até o painel ser gravado)
+        if self._error is not None:  # Relança imediatamente um erro anterior das threads
+            raise self._error
+        self._queue.put((self.path_for(frame_idx), frame, gray, prev_gray, frame_idx, speed_px))
+
+    def close(self, raise_errors: bool = True):  # Espera os painéis pendentes e encerra as threads
+        for _ in self._threads:
+            self._queue.put(_END)
+        for t in self._threads:
+            t.join()
+        if raise_errors and self._error is not None:
+            raise self._error
+
+def _advance(cap, index: Dict, pos: int, target: int) -> int:  # Posiciona o vídeo para que o próximo read() devolva 'target'
+    if target == pos:
+        return pos
+    if index.get("seekable") and (target < pos or target - pos >= SEEK_MIN_GAP):  # Salto longo: busca direta
+        cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+        return target
+    if target < pos:  # Sem busca exata não há como voltar (os frames pedidos são percorridos em ordem)
+        raise RuntimeError(f"Não é possível voltar ao frame {target} neste vídeo")
+    for _ in range(target - pos):  # Salto curto (ou backend sem busca exata): avança sem converter as imagens
+        if not cap.grab():
+            break
+    return target
+
+def build_debug_panels(  # Gera os painéis de frames escolhidos depois do tracking, a partir do vídeo original
+    source: str,  # Arquivo lateral '_overlay_<data>.json' (frames da trajetória, com anotações) ou um vídeo (frames absolutos)
+    frames: Optional[Iterable[int]] = None,  # Frames pedidos
+    every: Optional[int] = None,  # Ou um painel a cada N frames
+    out_dir: Optional[str] = None,  # Pasta dos painéis (padrão: ao lado do arquivo lateral ou do vídeo)
+    fmt: str = "png",  # Formato das imagens
+    quality: Optional[int] = None,  # Nível de compressão (PNG) ou qualidade (JPEG/WebP)
+    workers: int = DEBUG_WORKERS,  # Threads de gravação
+) -> List[str]:  # Caminhos dos painéis gravados
+    renderer, first = None, 0  # Anotações e frame do vídeo correspondente ao índice 0
+    if source.endswith(OVERLAY_SUFFIX):  # Arquivo lateral: índices da trajetória, como no debug do tracking
+        overlay = load_overlay(source)
+        video_path, total = overlay["video"], overlay["num_frames"]
+        renderer = OverlayRenderer(overlay["trajectory"], overlay["fps"])
+        first = overlay["start_frame"] + 1  # O frame da ROI inicial não faz parte da trajetória
+        default_dir = os.path.abspath(source)[: -len(OVERLAY_SUFFIX)].replace("_overlay_", "_debug_")
+        index = get_seek_index(video_path, first)  # Só importa se a busca direta é exata (o total vem do arquivo lateral)
+    else:
+        if not os.path.isfile(source):
+            raise FileNotFoundError(f"Vídeo não encontrado: {source}")
+        video_path = source
+        default_dir = os.path.join(os.path.dirname(os.path.abspath(source)),
+                                   f"{os.path.splitext(os.path.basename(source))[0]}_debug_{datetime.now():%Y%m%d_%H%M%S}")
+        index = get_seek_index(video_path)  # Número real de frames e se a busca direta é exata
+        total = index["num_frames"]
+    if frames is None and every is None:
+        raise ValueError("Informe os frames (frames) ou o intervalo (every) dos painéis")
+    selected = debug_frame_selector(total, every, frames)
+    wanted = [i for i in range(total) if selected(i)] if every is not None else sorted({int(i) for i in frames})
+    invalid = [i for i in wanted if not 0 <= i < total]
+    if invalid:
+        raise ValueError(f"Frames fora do intervalo [0, {total}): {invalid[:5]}")
+
+    out_dir = out_dir or default_dir
+    os.makedirs(out_dir, exist_ok=True)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Não foi possível abrir o vídeo: {video_path}")
+    writer = DebugPanelWriter(out_dir, fmt, quality, workers).start()
+    paths, failed = [], False
+    pos = 0  # Próximo frame devolvido por read()
+    last_idx, last_gray = None, None  # Último frame lido (reaproveitado como anterior de um frame vizinho)
+    try:
+        for idx in wanted:
+            prev_gray = last_gray if last_idx == idx - 1 else None
+            if prev_gray is None and idx > 0:  # Frame anterior: base do painel de movimento
+                pos = _advance(cap, index, pos, first + idx - 1)
+                ret, prev = cap.read()
+                pos += 1
+                prev_gray = cv2.cvtColor(prev, cv2.COLOR_BGR2GRAY) if ret else None
+            pos = _advance(cap, index, pos, first + idx)
+            ret, frame = cap.read()
+            pos += 1
+            if not ret or frame is None:
+                raise RuntimeError(f"Não foi possível ler o frame {first + idx} de {video_path}")
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            speed = None
+            if renderer is not None:  # Caixa, centro e HUD redesenhados a partir da trajetória
+                renderer.render(frame, idx)
+                row = renderer.row(idx)
+                speed = float(renderer.speeds[row]) if row >= 0 else None
+            writer.submit(idx, frame, gray, prev_gray, speed)
+            paths.append(writer.path_for(idx))
+            last_idx, last_gray = idx, gray
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        try:
+            writer.close(raise_errors=not failed)
+        finally:
+            cap.release()
+    logger.info(f"Painéis de debug gerados: {len(paths)} em {out_dir}")
+    return paths
@@ -0,0 +1,160 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo implementa o modelo de movimento do objeto com filtro de Kalman.
+O centro da caixa é modelado com velocidade constante ('cv': posição e velocidade) ou aceleração constante
+('ca': posição, velocidade e aceleração), com os eixos x e y independentes e o mesmo modelo nos dois.
+Durante o tracking, o filtro prevê a posição dos próximos frames (usada para adiantar a janela de busca e
+para procurar o objeto perdido perto de onde ele deveria estar) e acumula as métricas da trajetória filtrada.
+Para execuções completas (offline), o suavizador RTS (Rauch-Tung-Striebel) usa os frames seguintes para
+corrigir cada posição, o que remove o tremor das caixas sem atrasar a trajetória.
+'''
+#################
+
+from functools import lru_cache  # Importa lru_cache para reaproveitar as matrizes de cada intervalo entre frames
+from typing import Optional, Tuple  # Importa tipos para anotação de tipagem
+import math  # Importa math para as distâncias acumuladas
+import numpy as np  # Importa NumPy para as matrizes do filtro
+from src.core.trajectory import TrajectoryStore  # Importa a trajetória em colunas (resultado da suavização)
+
+KALMAN_MODELS = ("cv", "ca")  # Velocidade constante e aceleração constante
+DEFAULT_PROCESS_NOISE = {"cv": 0.5, "ca": 0.1}  # Desvio da aceleração (cv) ou do tranco (ca) por frame, em pixels
+DEFAULT_MEASUREMENT_NOISE = 2.0  # Desvio do centro medido pelo tracker, em pixels
+
+def _check_model(model: str) -> str:  # Valida o nome do modelo
+    model = str(model).lower()
+    if model not in KALMAN_MODELS:
+        raise ValueError(f"Modelo de Kalman inválido: {model} (esperado {' ou '.join(KALMAN_MODELS)})")
+    return model
+
+@lru_cache(maxsize=64)
+def _matrices(model: str, dt: int, q: float) -> Tuple[np.ndarray, np.ndarray]:  # Transição F e ruído de processo Q para 'dt' frames
+    if model == "cv":
+        F = np.array([[1.0, dt], [0.0, 1.0]])
+        G = np.array([[dt * dt / 2.0], [dt]])  # Aceleração aleatória constante durante o intervalo
+    else:
+        F = np.array([[1.0, dt, dt * dt / 2.0], [0.0, 1.0, dt], [0.0, 0.0, 1.0]])
+        G = np.array([[dt ** 3 / 6.0], [dt * dt / 2.0], [dt]])  # Tranco aleatório constante durante o intervalo
+    return F, (G @ G.T) * q * q
+
+class KalmanFilter:  # Filtro de Kalman do centro da caixa (uma coluna de estado por eixo)
+
+    def __init__(
+        self,
+        model: str = "cv",  # 'cv' (velocidade constante) ou 'ca' (aceleração constante)
+        process_noise: Optional[float] = None,  # Desvio da aceleração/tranco (padrão por modelo)
+        measurement_noise: float = DEFAULT_MEASUREMENT_NOISE,  # Desvio da medição em pixels
+    ):
+        self.model = _check_model(model)
+        self.q = DEFAULT_PROCESS_NOISE[self.model] if process_noise is None else float(process_noise)
+        self.r = float(measurement_noise) ** 2  # Variância da medição
+        self.n = 2 if self.model == "cv" else 3  # Tamanho do estado por eixo
+        self.x = np.zeros((self.n, 2))  # Estado: linhas (posição, velocidade[, aceleração]), colunas (eixo x, eixo y)
+        self.P = np.eye(self.n)  # Covariância do estado (igual nos dois eixos: mesmo modelo e mesmo ruído)
+        self.initialized = False
+
+    def reset(self, x: float, y: float):  # Reinicia o filtro em uma posição, com velocidade desconhecida
+        self.x[:] = 0.0
+        self.x[0] = (x, y)
+        self.P = np.diag([self.r] + [100.0] * (self.n - 1))  # Posição confiável; velocidade (e aceleração) incertas
+        self.initialized = True
+
+    def predict(self, dt: int = 1) -> Tuple[float, float]:  # Avança o estado 'dt' frames sem medição
+        F, Q = _matrices(self.model, int(dt), self.q)
+        self.x = F @ self.x
+        self.P = F @ self.P @ F.T + Q
+        return float(self.x[0, 0]), float(self.x[0, 1])
+
+    def update(self, x: float, y: float) -> Tuple[float, float]:  # Corrige o estado com a posição medida
+        S = self.P[0, 0] + self.r  # Variância da inovação (a medição é só a posição)
+        K = self.P[:, 0] / S  # Ganho de Kalman
+        innovation = np.array([x, y]) - self.x[0]
+        self.x += np.outer(K, innovation)
+        self.P -= np.outer(K, self.P[0])
+        return float(self.x[0, 0]), float(self.x[0, 1])
+
+    def peek(self, dt: int = 1) -> Tuple[float, float]:  # Posição prevista daqui a 'dt' frames (sem alterar o estado)
+        F, _ = _matrices(self.model, int(dt), self.q)
+        px = F[0] @ self.x
+        return float(px[0]), float(px[1])
+
+    @property
+    def velocity(self) -> Tuple[float, float]:  # Velocidade estimada em px/frame
+        return float(self.x[1, 0]), float(self.x[1, 1])
+
+def rts_smooth(  # Filtra e suaviza (RTS) os centros de uma trajetória; devolve X e Y suavizados
+    frames: np.ndarray,  # Índice do frame de cada medição (crescente; lacunas são atravessadas só com a previsão)
+    xs: np.ndarray, ys: np.ndarray,  # Centros medidos
+    model: str = "cv",
+    process_noise: Optional[float] = None,
+    measurement_noise: float = DEFAULT_MEASUREMENT_NOISE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    n_points = len(frames)
+    if n_points < 2:
+        return np.asarray(xs, dtype=np.float64).copy(), np.asarray(ys, dtype=np.float64).copy()
+    kf = KalmanFilter(model, process_noise, measurement_noise)
+    n = kf.n
+    x_pred = np.empty((n_points, n, 2))  # Estados e covariâncias previstos e filtrados de cada medição
+    P_pred = np.empty((n_points, n, n))
+    x_filt = np.empty((n_points, n, 2))
+    P_filt = np.empty((n_points, n, n))
+    steps = np.diff(np.asarray(frames, dtype=np.int64))  # Frames entre medições consecutivas
+
+    kf.reset(xs[0], ys[0])  # Passo direto (filtro)
+    x_pred[0], P_pred[0] = kf.x, kf.P
+    x_filt[0], P_filt[0] = kf.x, kf.P
+    for i in range(1, n_points):
+        kf.predict(max(1, steps[i - 1]))
+        x_pred[i], P_pred[i] = kf.x, kf.P
+        kf.update(xs[i], ys[i])
+        x_filt[i], P_filt[i] = kf.x, kf.P
+
+    x_smooth = x_filt.copy()  # Passo reverso (suavizador RTS)
+    for i in range(n_points - 2, -1, -1):
+        F, _ = _matrices(kf.model, int(max(1, steps[i])), kf.q)
+        C = P_filt[i] @ F.T @ np.linalg.inv(P_pred[i + 1])  # Ganho do suavizador
+        x_smooth[i] = x_filt[i] + C @ (x_smooth[i + 1] - x_pred[i + 1])
+        P_filt[i] = P_filt[i] + C @ (P_filt[i + 1] - P_pred[i + 1]) @ C.T  # Covariância suavizada (usada no passo anterior)
+    return x_smooth[:, 0, 0], x_smooth[:, 0, 1]
+
+class FilteredPath:  # Agregados da trajetória filtrada acumulados durante o tracking (sem suavização RTS)
+
+    def __init__(self):
+        self._points = 0  # Pontos filtrados
+        self._steps = 0  # Deslocamentos entre pontos consecutivos
+        self._total = 0.0  # Distância total
+        self._max = 0.0  # Maior deslocamento entre pontos consecutivos
+        self._first: Optional[Tuple[float, float]] = None  # Primeiro ponto
+        self._last: Optional[Tuple[float, float]] = None  # Último ponto
+
+    def add(self, x: float, y: float):  # Acrescenta um ponto filtrado
+        if self._last is not None:
+            step = math.hypot(x - self._last[0], y - self._last[1])
+            self._steps += 1
+            self._total += step
+            self._max = max(self._max, step)
+        else:
+            self._first = (x, y)
+        self._last = (x, y)
+        self._points += 1
+
+    def summary(self) -> Tuple[int, int, float, float, float]:  # (pontos, passos, distância total, vel. máxima, dist. reta)
+        straight = 0.0
+        if self._points >= 2:
+            straight = math.hypot(self._last[0] - self._first[0], self._last[1] - self._first[1])
+        return self._points, self._steps, self._total, self._max, straight
+
+def smooth_trajectory(store, model: str = "cv", process_noise: Optional[float] = None,
+                      measurement_noise: float = DEFAULT_MEASUREMENT_NOISE):  # Trajetória suavizada (RTS) dos frames rastreados
+    ok = store.success  # Apenas os frames com posição
+    frames, xs, ys = store.frames[ok], store.xs[ok], store.ys[ok]
+    sx, sy = rts_smooth(frames, xs, ys, model, process_noise, measurement_noise)
+    return TrajectoryStore.from_columns(frames, sx, sy, store.ws[ok], store.hs[ok], np.ones(len(frames), dtype=bool))
@@ -0,0 +1,140 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo calcula a cinemática detalhada de uma trajetória, toda vetorizada com NumPy sobre as colunas:
+componentes da velocidade, aceleração, tranco (jerk), percentis de velocidade em janela móvel, mudança de
+direção e a divisão da trajetória em trechos parados e em movimento.
+As grandezas são por frame (px/frame, px/frame², px/frame³) e usam o intervalo real entre os pontos, então
+frames perdidos no meio da trajetória não distorcem as derivadas. Os percentis móveis ordenam as janelas em
+blocos (memória limitada), o que permite processar trajetórias de milhões de pontos em frações de segundo.
+'''
+#################
+
+from typing import Dict, Sequence  # Importa tipos para anotação de tipagem
+import numpy as np  # Importa NumPy para os cálculos vetorizados
+from numpy.lib.stride_tricks import sliding_window_view  # Importa as janelas móveis sem cópia
+
+DEFAULT_WINDOW = 15  # Tamanho da janela móvel em pontos (cerca de meio segundo a 30 FPS)
+DEFAULT_PERCENTILES = (50, 90)  # Percentis móveis da velocidade
+STOP_SPEED = 0.5  # Mediana móvel da velocidade (px/frame) abaixo da qual o objeto é considerado parado
+MIN_STOP_FRAMES = 5  # Paradas mais curtas do que isso são incorporadas ao movimento
+_CHUNK = 1 << 16  # Janelas ordenadas por bloco (limita a memória temporária)
+
+# Colunas acrescentadas ao CSV, na ordem
+KINEMATICS_COLUMNS = ("vx", "vy", "accel", "jerk", "heading_deg", "speed_p50", "speed_p90", "moving")
+
+def rolling_percentiles(  # Percentis de 'values' em uma janela móvel centrada; devolve uma coluna por percentil
+    values: np.ndarray,
+    window: int = DEFAULT_WINDOW,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    out = np.empty((n, len(percentiles)))
+    if n == 0:
+        return out
+    window = max(1, min(int(window), n))
+    left = window // 2
+    padded = np.concatenate([np.repeat(values[:1], left), values, np.repeat(values[-1:], window - 1 - left)])  # Bordas repetidas
+    ranks = (window - 1) * np.asarray(percentiles, dtype=np.float64) / 100.0  # Posição de cada percentil na janela ordenada
+    lo = np.floor(ranks).astype(np.intp)
+    hi = np.minimum(lo + 1, window - 1)
+    frac = ranks - lo  # Interpolação linear entre as posições vizinhas (igual a np.percentile)
+    for start in range(0, n, _CHUNK):
+        stop = min(n, start + _CHUNK)
+        block = np.sort(sliding_window_view(padded[start:stop + window - 1], window), axis=1)  # Janelas ordenadas
+        out[start:stop] = block[:, lo] * (1.0 - frac) + block[:, hi] * frac
+    return out
+
+def _runs(mask: np.ndarray):  # Trechos consecutivos de mesmo valor: (inícios, fins exclusivos, valores)
+    change = np.flatnonzero(mask[1:] != mask[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [len(mask)]))
+    return starts, ends, mask[starts]
+
+def _derivative(values: np.ndarray, dt: np.ndarray) -> np.ndarray:  # Diferença por frame; o primeiro ponto repete o segundo
+    out = np.empty_like(values)
+    out[1:] = np.diff(values) / dt
+    out[0] = out[1]
+    return out
+
+def compute_kinematics(  # Séries cinemáticas de uma trajetória (um valor por ponto rastreado)
+    frames: np.ndarray, xs: np.ndarray, ys: np.ndarray,  # Frames e centros dos pontos rastreados, em ordem
+    window: int = DEFAULT_WINDOW,  # Janela móvel dos percentis e da detecção de paradas
+    stop_speed: float = STOP_SPEED,  # Limiar de parada (px/frame)
+    min_stop_frames: int = MIN_STOP_FRAMES,  # Duração mínima de uma parada (frames)
+) -> Dict[str, np.ndarray]:
+    frames = np.asarray(frames, dtype=np.int64)
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    n = len(frames)
+    if n < 2:  # Sem deslocamento: tudo zero e o objeto parado
+        zeros = np.zeros(n)
+        return {"vx": zeros, "vy": zeros, "speed": zeros, "accel": zeros, "jerk": zeros, "heading_deg": zeros,
+                "heading_change_deg": zeros, "speed_p50": zeros, "speed_p90": zeros, "moving": np.zeros(n, dtype=bool)}
+
+    dt = np.maximum(np.diff(frames), 1).astype(np.float64)  # Frames entre pontos consecutivos (lacunas de frames perdidos)
+    vx, vy = _derivative(xs, dt), _derivative(ys, dt)  # Componentes da velocidade (px/frame)
+    speed = np.hypot(vx, vy)
+    ax, ay = _derivative(vx, dt), _derivative(vy, dt)  # Aceleração (px/frame²)
+    accel = np.hypot(ax, ay)
+    jerk = np.hypot(_derivative(ax, dt), _derivative(ay, dt))  # Tranco (px/frame³)
+
+    heading = np.degrees(np.arctan2(vy, vx))  # Direção do movimento (graus, 0 = para a direita, 90 = para baixo)
+    turn = np.zeros(n)
+    turn[1:] = (np.diff(heading) + 180.0) % 360.0 - 180.0  # Mudança de direção entre pontos, em [-180, 180)
+    steady = (speed >= stop_speed) & np.concatenate(([False], speed[:-1] >= stop_speed))  # Parado, a direção é só ruído
+    turn[~steady] = 0.0
+
+    p50, p90 = rolling_percentiles(speed, window, (50, 90)).T  # Percentis móveis da velocidade
+    moving = p50 >= stop_speed  # Mediana móvel: um tremor isolado não interrompe uma parada
+    starts, ends, values = _runs(moving)
+    short = ~values & (ends - starts < min_stop_frames)  # Paradas curtas demais viram movimento
+    if short.any():
+        moving[np.repeat(short, ends - starts)] = True
+
+    return {"vx": vx, "vy": vy, "speed": speed, "accel": accel, "jerk": jerk, "heading_deg": heading,
+            "heading_change_deg": turn, "speed_p50": p50, "speed_p90": p90, "moving": moving}
+
+def summarize_kinematics(k: Dict[str, np.ndarray], frames: np.ndarray) -> Dict:  # Resumo da cinemática para o relatório
+    n = len(k["speed"])
+    if n < 2:
+        return {"points": n}
+    frames = np.asarray(frames, dtype=np.int64)
+    starts, ends, values = _runs(k["moving"])
+    stops = ~values
+    stop_lengths = frames[ends[stops] - 1] - frames[starts[stops]] + 1  # Duração de cada parada em frames
+    span = int(frames[-1] - frames[0] + 1)  # Frames cobertos pela trajetória
+    speed_p50, speed_p90, speed_p99 = np.percentile(k["speed"], (50, 90, 99))
+    return {
+        "points": n,  # Pontos analisados
+        "mean_abs_vx": float(np.abs(k["vx"]).mean()),  # Velocidade horizontal média (módulo, px/frame)
+        "mean_abs_vy": float(np.abs(k["vy"]).mean()),  # Velocidade vertical média (módulo, px/frame)
+        "speed_p50": float(speed_p50), "speed_p90": float(speed_p90), "speed_p99": float(speed_p99),  # Percentis da velocidade
+        "max_rolling_p90": float(k["speed_p90"].max()),  # Maior p90 móvel (velocidade alta sustentada)
+        "mean_accel": float(k["accel"].mean()), "max_accel": float(k["accel"].max()),  # Aceleração (px/frame²)
+        "mean_jerk": float(k["jerk"].mean()), "max_jerk": float(k["jerk"].max()),  # Tranco (px/frame³)
+        "mean_turn_deg": float(np.abs(k["heading_change_deg"][k["moving"]]).mean()) if k["moving"].any() else 0.0,  # Graus/ponto
+        "stops": int(stops.sum()),  # Quantidade de paradas
+        "stop_frames": int(stop_lengths.sum()),  # Frames parados
+        "longest_stop_frames": int(stop_lengths.max()) if len(stop_lengths) else 0,  # Parada mais longa
+        "moving_fraction": 1.0 - float(stop_lengths.sum()) / span if span > 0 else 0.0,  # Fração do tempo em movimento
+    }
+
+def kinematics_columns(k: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:  # Colunas extras do CSV, na ordem de KINEMATICS_COLUMNS
+    return {name: k[name].astype(np.int8) if name == "moving" else k[name] for name in KINEMATICS_COLUMNS}
+
+def trajectory_kinematics(store, window: int = DEFAULT_WINDOW):  # Séries e resumo da cinemática dos frames rastreados de uma trajetória
+    frames, xs, ys = store.tracked()
+    series = compute_kinematics(frames, xs, ys, window)
+    summary = summarize_kinematics(series, frames)
+    summary["window"] = window
+    return series, summary
@@ -0,0 +1,259 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo é o motor de métricas: monta o dicionário de estatísticas e o relatório (.txt) a partir de uma trajetória.
+Ele é usado no fim do tracking e também de forma independente, sobre uma trajetória já salva (CSV ou '.traj').
+Assim, corrigir o FPS ou mudar a calibração (pixels por metro) não exige rodar o tracker de novo:
+as estatísticas e o relatório são recalculados em milissegundos a partir do arquivo.
+'''
+#################
+
+import os  # Importa o módulo os para montar os caminhos de saída
+from datetime import datetime  # Importa datetime para a data do relatório e o nome do arquivo
+from typing import Dict, Optional  # Importa tipos para anotação de tipagem
+from src.core.trajectory import compute_motion_stats, load_trajectory  # Importa as métricas vetorizadas e a leitura de trajetórias
+from src.core.kalman import smooth_trajectory  # Importa a suavização RTS (métricas filtradas)
+from src.core.kinematics import trajectory_kinematics  # Importa a cinemática vetorizada
+from src.io.trajectory_file import is_trajectory_file, open_trajectory  # Importa a leitura do cabeçalho binário (FPS e resolução)
+from src.io.logger import get_app_logger  # Importa o logger da aplicação
+
+logger = get_app_logger("metrics")  # Inicializa o logger específico para o motor de métricas
+
+# Métricas de movimento repetidas para a trajetória filtrada (a qualidade do tracking é a mesma da trajetória bruta)
+_FILTERED_KEYS = ("mean_speed_px", "max_speed_px", "mean_speed_px_per_s", "max_speed_px_per_s", "total_distance_px",
+                  "straight_distance_px", "path_efficiency", "mean_speed_m_s", "max_speed_m_s", "mean_speed_km_h", "max_speed_km_h")
+
+def build_stats(  # Monta o dicionário de estatísticas de uma trajetória
+    trajectory,  # Trajetória (TrajectoryStore ou StreamingTrajectory)
+    num_frames: int,  # Frames processados
+    fps: float,  # Taxa de quadros do vídeo
+    pixels_per_meter: Optional[float] = None,  # Calibração física (opcional)
+    filtered=None,  # Trajetória filtrada pelo modelo de movimento (opcional; gera as métricas 'filtered_*')
+    **meta,  # Metadados da execução (vídeo, tracker, resolução, ROI inicial...)
+) -> Dict:
+    motion = compute_motion_stats(trajectory, num_frames, fps, pixels_per_meter)  # Velocidades, distâncias e conversões
+    stats = {
+        **meta,  # Metadados da execução
+        "num_frames": num_frames,  # Número total de frames processados
+        "fps": fps,  # Taxa de quadros por segundo do vídeo
+        "duracao_segundos": num_frames / fps if fps > 0 else 0.0,  # Duração total do vídeo em segundos
+        "pixels_per_meter": pixels_per_meter,  # Calibração usada nas métricas físicas
+        "mean_speed_px": motion["mean_speed_px"],  # Velocidade média em pixels por frame
+        "max_speed_px": motion["max_speed_px"],  # Velocidade máxima em pixels por frame
+        "mean_speed_px_per_s": motion["mean_speed_px_per_s"],  # Velocidade média em pixels por segundo
+        "max_speed_px_per_s": motion["max_speed_px_per_s"],  # Velocidade máxima em pixels por segundo
+        "total_distance_px": motion["total_distance_px"],  # Distância total percorrida em pixels
+        "straight_distance_px": motion["straight_distance_px"],  # Distância em linha reta (início ao fim) em pixels
+        "path_efficiency": motion["path_efficiency"],  # Eficiência da trajetória (reta / total)
+        "success_frames": motion["success_frames"],  # Número de frames onde o objeto foi rastreado com sucesso
+        "success_rate": motion["success_rate"],  # Taxa de sucesso do rastreamento (0.0 a 1.0)
+        "interpolated_frames": motion["interpolated_frames"],  # Frames com posição interpolada (passo adaptativo)
+        "skipped_frames": motion["skipped_frames"],  # Frames pulados e não avaliados (a medição seguinte falhou)
+        "mean_speed_m_s": motion["mean_speed_m_s"],  # Velocidade média em metros por segundo (se calibrado)
+        "max_speed_m_s": motion["max_speed_m_s"],  # Velocidade máxima em metros por segundo (se calibrado)
+        "mean_speed_km_h": motion["mean_speed_km_h"],  # Velocidade média em km/h (se calibrado)
+        "max_speed_km_h": motion["max_speed_km_h"],  # Velocidade máxima em km/h (se calibrado)
+    }
+    if filtered is not None:  # Mesmas métricas de movimento calculadas sobre a trajetória filtrada
+        motion = compute_motion_stats(filtered, num_frames, fps, pixels_per_meter)
+        stats.update({f"filtered_{k}": motion[k] for k in _FILTERED_KEYS})
+    return stats
+
+def write_motion_sections(f, m: Dict, fps: float, pixels_per_meter: Optional[float]):  # Escreve as seções de métricas de um objeto no relatório
+    f.write("--- Qualidade do tracking ---\n")  # Seção sobre desempenho do rastreamento
+    f.write(f"Frames com sucesso   : {m['success_frames']}\n")  # Registra quantos frames obtiveram tracking válido
+    f.write(f"Taxa de sucesso      : {m['success_rate']*100:.2f} %\n")  # Registra a taxa de sucesso em porcentagem
+    if m.get("max_stride", 1) > 1:  # Passo adaptativo: quantas consultas ao tracker e quantos frames interpolados
+        f.write(f"Passo adaptativo     : até {m['max_stride']} frames ({m['tracker_updates']} consultas ao tracker)\n")
+        f.write(f"Frames interpolados  : {m['interpolated_frames']} (fora da taxa de sucesso)\n")
+        if m.get("skipped_frames"):  # Frames pulados antes de uma medição que falhou
+            f.write(f"Frames não avaliados : {m['skipped_frames']} (pulados antes de uma falha, fora da taxa de sucesso)\n")
+    if m.get("cascade_escalations") or len(m.get("tracker_frames") or {}) > 1:  # Cascata KCF -> CSRT: quem respondeu cada frame
+        counts = ", ".join(f"{name}={n}" for name, n in m["tracker_frames"].items())
+        f.write(f"Frames por tracker   : {counts} ({m['cascade_escalations']} escalonamentos)\n")
+    if m.get("motion_gate") is not None:  # Portão de movimento: frames em que a cena parada dispensou o tracker
+        evaluated = max(1, m["gated_frames"] + m["tracker_updates"])
+        f.write(f"Portão de movimento  : limiar {m['motion_gate']:.2f} níveis de cinza\n")
+        f.write(f"Frames sem consulta  : {m['gated_frames']} de {evaluated} ({m['gated_frames'] / evaluated * 100:.2f} %)\n")
+    if m.get("reacquire"):  # Reaquisição por template: quando o objeto foi reencontrado
+        events = m.get("reacquisition_events") or []
+        frames = ", ".join(str(e["frame"]) for e in events[:10]) + (", ..." if len(events) > 10 else "")
+        f.write(f"Reaquisições         : {len(events)}" + (f" (frames {frames})" if events else "") + "\n")
+    f.write("\n")
+
+    f.write("--- Métricas de movimento (em pixels) ---\n")  # Seção com métricas em unidades de pixels
+    f.write(f"Vel. média (px/frame): {m['mean_speed_px']:.4f}\n")  # Registra velocidade média em px/frame
+    f.write(f"Vel. máx.  (px/frame): {m['max_speed_px']:.4f}\n")  # Registra velocidade máxima em px/frame
+    f.write(f"Vel. média (px/s)    : {m['mean_speed_px_per_s']:.4f}\n")  # Registra velocidade média convertida para px/s
+    f.write(f"Vel. máx.  (px/s)    : {m['max_speed_px_per_s']:.4f}\n")  # Registra velocidade máxima convertida para px/s
+    f.write(f"Dist. total (px)     : {m['total_distance_px']:.4f}\n")  # Registra distância total percorrida em pixels
+    f.write(f"Dist. reta (px)      : {m['straight_distance_px']:.4f}\n")  # Registra distância em linha reta em pixels
+    f.write(f"Eficiência trajetória: {m['path_efficiency']*100:.2f} %\n\n")  # Registra eficiência do caminho em porcentagem
+
+    if m.get("filtered_total_distance_px") is not None:  # Modelo de movimento: as mesmas métricas sem o tremor das caixas
+        smoother = "suavização RTS" if m.get("kalman_smoother") == "RTS" else "filtro durante o tracking"
+        f.write(f"--- Métricas filtradas (Kalman {str(m.get('kalman') or '').upper()}, {smoother}) ---\n")
+        f.write(f"Vel. média (px/frame): {m['filtered_mean_speed_px']:.4f}\n")
+        f.write(f"Vel. máx.  (px/frame): {m['filtered_max_speed_px']:.4f}\n")
+        f.write(f"Vel. média (px/s)    : {m['filtered_mean_speed_px_per_s']:.4f}\n")
+        f.write(f"Vel. máx.  (px/s)    : {m['filtered_max_speed_px_per_s']:.4f}\n")
+        f.write(f"Dist. total (px)     : {m['filtered_total_distance_px']:.4f}\n")
+        f.write(f"Eficiência trajetória: {m['filtered_path_efficiency']*100:.2f} %\n")
+        if m.get("filtered_mean_speed_m_s") is not None:  # Com calibração física
+            f.write(f"Vel. média (km/h)    : {m['filtered_mean_speed_km_h']:.4f}\n")
+            f.write(f"Vel. máx.  (km/h)    : {m['filtered_max_speed_km_h']:.4f}\n")
+        f.write("\n")
+
+    if m.get("kinematics") and m["kinematics"].get("points", 0) >= 2:  # Cinemática detalhada
+        write_kinematics_section(f, m["kinematics"], fps)
+
+    f.write("--- Métricas físicas (se escala for fornecida) ---\n")  # Seção com métricas físicas (depende de calibração)
+    if pixels_per_meter and pixels_per_meter > 0 and fps > 0:  # Verifica se há escala válida para converter pixels em metros
+        f.write(f"Escala utilizada     : {pixels_per_meter} px ≈ 1 m\n")  # Registra a escala fornecida
+        f.write(f"Vel. média (m/s)     : {m['mean_speed_m_s']:.4f}\n")  # Registra velocidade média em metros por segundo
+        f.write(f"Vel. máx.  (m/s)     : {m['max_speed_m_s']:.4f}\n")  # Registra velocidade máxima em metros por segundo
+        f.write(f"Vel. média (km/h)    : {m['mean_speed_km_h']:.4f}\n")  # Registra velocidade média convertida para km/h
+        f.write(f"Vel. máx.  (km/h)    : {m['max_speed_km_h']:.4f}\n")  # Registra velocidade máxima convertida para km/h
+    else:  # Caso não haja escala disponível
+        f.write("Escala física        : não fornecida (velocidades em px/s)\n")  # Registra ausência de calibração física
+        f.write("km/h                 : N/A (é preciso saber quantos px = 1 m)\n")  # Explica a limitação para km/h
+    f.write("\n")  # Adiciona linha em branco para separar seções
+
+def write_kinematics_section(f, k: Dict, fps: float):  # Escreve a seção de cinemática (grandezas por frame)
+    seconds = lambda frames: f" ({frames / fps:.2f} s)" if fps > 0 else ""  # Duração em segundos, se o FPS for conhecido
+    f.write("--- Cinemática (por frame) ---\n")
+    f.write(f"Vel. média |vx|, |vy|: {k['mean_abs_vx']:.4f}, {k['mean_abs_vy']:.4f} px/frame\n")
+    f.write(f"Vel. p50 / p90 / p99 : {k['speed_p50']:.4f} / {k['speed_p90']:.4f} / {k['speed_p99']:.4f} px/frame\n")
+    f.write(f"Maior p90 móvel      : {k['max_rolling_p90']:.4f} px/frame (janela de {k['window']} pontos)\n")
+    f.write(f"Aceleração méd./máx. : {k['mean_accel']:.4f} / {k['max_accel']:.4f} px/frame²\n")
+    f.write(f"Tranco méd./máx.     : {k['mean_jerk']:.4f} / {k['max_jerk']:.4f} px/frame³\n")
+    f.write(f"Mudança de direção   : {k['mean_turn_deg']:.2f} graus/frame em movimento\n")
+    f.write(f"Paradas              : {k['stops']} (total {k['stop_frames']} frames{seconds(k['stop_frames'])}, "
+            f"mais longa {k['longest_stop_frames']} frames{seconds(k['longest_stop_frames'])})\n")
+    f.write(f"Tempo em movimento   : {k['moving_fraction']*100:.2f} %\n\n")
+
+def write_profile_section(f, p: Dict):  # Escreve a seção de desempenho (tempo por estágio do loop de tracking)
+    rss = p.get("peak_rss_mb")  # Pico de memória (None se a plataforma não informar)
+    f.write("--- Desempenho (por estágio) ---\n")
+    f.write(f"Tempo do tracking    : {p['wall_seconds']:.2f} s\n")
+    f.write(f"FPS efetivo          : {p['effective_fps']:.2f} frames/s\n")
+    f.write(f"Pico de memória (RSS): {f'{rss:.1f} MB' if rss is not None else '(indisponível)'}\n")
+    counters = p.get("counters") or {}
+    if "buffer_allocations" in counters:  # Frames e cinzas alocados x reaproveitados do pool de buffers
+        f.write(f"Buffers de imagem    : {counters['buffer_allocations']} alocados "
+                f"({counters['buffer_bytes'] / (1024.0 * 1024.0):.1f} MB), {counters['buffer_reuses']} reaproveitados\n")
+    f.write(f"{'Estágio':<14}{'Medições':>10}{'Total (s)':>11}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'Máx. (ms)':>11}\n")
+    for name, s in p["stages"].items():  # Estágios na ordem em que foram medidos pela primeira vez
+        f.write(f"{name:<14}{s['count']:>10}{s['total_s']:>11.3f}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}"
+                f"{s['p99_ms']:>10.3f}{s['max_ms']:>11.3f}\n")
+    f.write("\n")
+
+def write_report(report_path: str, stats: Dict):  # Escreve o relatório de tracking de um objeto a partir do dicionário de estatísticas
+    unknown = "(desconhecido)"  # Texto para metadados que não estão disponíveis (ex.: recálculo a partir de um CSV)
+
+    with open(report_path, "w", encoding="utf-8") as f:  # Abre o relatório TXT em modo escrita com codificação UTF-8
+        f.write("=== Relatório de Tracking de Objeto ===\n\n")  # Registra o título principal do relatório
+        f.write(f"Data/Hora da análise : {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")  # Registra data e hora da geração
+        if stats.get("trajectory_source"):  # Relatório recalculado a partir de uma trajetória salva
+            f.write(f"Recalculado a partir : {stats['trajectory_source']}\n")  # Registra o arquivo de origem
+        f.write(f"Vídeo de entrada     : {stats.get('video_input') or unknown}\n")  # Registra o caminho do vídeo analisado
+        f.write(f"Tracker utilizado    : {stats.get('tracker_type') or unknown}\n")  # Registra o tipo de tracker usado
+        if "track_scale" in stats:  # Parâmetros de desempenho do tracker (só existem quando o tracking acabou de rodar)
+            f.write(f"Escala do tracking   : {stats['track_scale']:.2f}\n")  # Registra a escala entregue ao tracker
+            search_window = stats.get("search_window")  # Janela de busca
+            f.write(f"Janela de busca      : {f'{search_window}x a caixa' if search_window else 'frame inteiro'}\n")  # Registra a janela de busca
+        if stats.get("chunks"):  # Tracking paralelo em blocos
+            f.write(f"Blocos paralelos     : {stats['chunks']} (rastreados de novo na costura: {stats['chunk_reacquisitions']})\n")
+        f.write("\n")
+
+        f.write("--- Informações do vídeo ---\n")  # Seção com metadados do vídeo
+        if stats.get("frame_width"):  # Registra largura e altura do vídeo
+            f.write(f"Resolução            : {stats['frame_width']} x {stats['frame_height']}\n")
+        else:
+            f.write(f"Resolução            : {unknown}\n")
+        if stats.get("start_frame") is not None:  # Trecho do vídeo (frames absolutos; a trajetória começa no frame seguinte)
+            fps = stats["fps"]
+            t0 = stats["start_frame"] / fps if fps > 0 else 0.0
+            t1 = stats["end_frame"] / fps if fps > 0 else 0.0
+            f.write(f"Trecho analisado     : frames {stats['start_frame']} a {stats['end_frame'] - 1} ({t0:.2f}s a {t1:.2f}s)\n")
+        f.write(f"FPS (arquivo)        : {stats['fps']:.2f}\n")  # Registra FPS reportado pelo arquivo
+        f.write(f"Frames processados   : {stats['num_frames']}\n")  # Registra total de frames processados
+        f.write(f"Duração aprox. (s)   : {stats['duracao_segundos']:.2f}\n")  # Registra duração estimada em segundos
+        if stats.get("cancelled"):  # Tracking interrompido antes do fim do vídeo
+            f.write("Execução cancelada   : sim (resultados parciais, até o último frame processado)\n")
+        f.write("\n")
+
+        if stats.get("initial_box"):  # Seção com informações da ROI inicial
+            f.write("--- Bounding box inicial ---\n")
+            bx, by, bw, bh = stats["initial_box"]  # Descompacta os valores da caixa inicial (posição e tamanho)
+            f.write(f"Posição (x, y)       : ({bx}, {by})\n")  # Registra a posição inicial da ROI
+            f.write(f"Tamanho (w, h)       : {bw} x {bh} px\n\n")  # Registra o tamanho da ROI em pixels
+
+        write_motion_sections(f, stats, stats["fps"], stats.get("pixels_per_meter"))  # Registra qualidade, métricas em pixels e métricas físicas
+        if stats.get("profile"):  # Tempos por estágio (só existem quando o tracking acabou de rodar)
+            write_profile_section(f, stats["profile"])
+        f.write("--- Arquivos gerados ---\n")  # Seção listando os arquivos produzidos
+        if "video_output" in stats:  # Arquivos do tracking (não existem no recálculo)
+            f.write(f"Vídeo com tracking   : {stats['video_output'] or '(não gerado)'}\n")  # Registra o caminho do vídeo de saída
+            f.write(f"Trajetória (CSV)     : {stats.get('csv_output') or '(não gerado)'}\n")  # Registra o caminho do CSV
+            if stats.get("binary_output"):  # Verifica se a trajetória binária foi gerada
+                f.write(f"Trajetória (binária) : {stats['binary_output']}\n")  # Registra o caminho do arquivo '.traj'
+            if stats.get("overlay_output"):  # Anotações sob demanda (player / export)
+                f.write(f"Overlay (sob demanda): {stats['overlay_output']}\n")
+            f.write(f"Imagens de debug     : {stats.get('debug_dir') or '(não geradas)'}\n")  # Registra a pasta com imagens de debug
+            if stats.get("profile_output"):  # Perfil detalhado (cProfile ou trace de eventos)
+                f.write(f"Perfil da execução   : {stats['profile_output']}\n")
+        f.write(f"Relatório (TXT)      : {report_path}\n")  # Registra o caminho do próprio relatório
+
+def recompute_metrics(  # Recalcula estatísticas e relatório a partir de uma trajetória salva, sem rodar o tracker
+    trajectory_path: str,  # Arquivo de trajetória (CSV ';' ou binário '.traj')
+    fps: Optional[float] = None,  # FPS correto (padrão: o do cabeçalho '.traj'; obrigatório para CSV)
+    pixels_per_meter: Optional[float] = None,  # Nova calibração física
+    num_frames: Optional[int] = None,  # Frames processados (padrão: registros do '.traj' ou último frame do CSV + 1)
+    output_dir: Optional[str] = None,  # Pasta do novo relatório (padrão: a pasta da trajetória)
+    save_report: bool = True,  # Escreve o relatório recalculado
+    kalman: Optional[str] = None,  # Modelo de movimento ('cv' ou 'ca') para as métricas filtradas (suavização RTS)
+    kinematics: bool = False,  # Acrescenta a seção de cinemática ao relatório
+) -> Dict:
+
+    meta = {}  # Metadados disponíveis no arquivo
+    if is_trajectory_file(trajectory_path):  # O cabeçalho binário guarda FPS e resolução
+        header = open_trajectory(trajectory_path)
+        meta = {"frame_width": header.width, "frame_height": header.height}
+        if fps is None:
+            fps = header.fps
+    if fps is None:  # O CSV não guarda o FPS do vídeo
+        raise ValueError("Informe o FPS do vídeo para recalcular as métricas a partir de um CSV.")
+
+    trajectory = load_trajectory(trajectory_path)  # Carrega a trajetória em colunas
+    if num_frames is None:  # Sem a informação, usa o que o arquivo permite inferir
+        num_frames = len(trajectory) if is_trajectory_file(trajectory_path) else (
+            int(trajectory.frames[-1]) + 1 if len(trajectory) else 0
+        )
+
+    if kalman:  # Métricas filtradas: a trajetória inteira está disponível, então usa a suavização RTS
+        meta.update(filtered=smooth_trajectory(trajectory, kalman), kalman=kalman.lower(), kalman_smoother="RTS")
+    if kinematics:  # Cinemática detalhada (aceleração, tranco, percentis móveis, paradas)
+        meta["kinematics"] = trajectory_kinematics(trajectory)[1]
+    stats = build_stats(trajectory, num_frames, fps, pixels_per_meter, trajectory_source=trajectory_path, **meta)
+    stats["trajectory"] = trajectory  # Trajetória carregada
+
+    if save_report:  # Escreve o relatório ao lado da trajetória (ou na pasta pedida)
+        output_dir = output_dir or os.path.dirname(os.path.abspath(trajectory_path))
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = os.path.splitext(os.path.basename(trajectory_path))[0]  # Nome da trajetória sem extensão
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")  # Timestamp para nome único
+        report_path = os.path.join(output_dir, f"{base_name}_relatorio_recalculado_{timestamp}.txt")
+        stats["report_path"] = report_path
+        write_report(report_path, stats)
+        logger.info(f"Métricas recalculadas de {trajectory_path}: fps={fps:.2f}, ppm={pixels_per_meter}")
+
+    return stats
@@ -0,0 +1,249 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo desenha as anotações do tracking (caixa, ponto central e HUD) sob demanda.
+Em vez de gravar o vídeo anotado (codificar todos os frames em mp4v na resolução original), o tracking pode salvar
+apenas um arquivo lateral ('_overlay_<data>.json') que aponta para o vídeo original e para a trajetória binária
+('.traj', com as caixas de cada frame). O player decodifica o vídeo original e desenha as anotações na hora, com as
+mesmas funções usadas pelo tracking; a gravação do vídeo anotado ("burn-in") passa a ser um passo explícito
+(subcomando 'export'), que pode processar vários arquivos em paralelo.
+'''
+#################
+
+import os  # Importa o módulo os para montar os caminhos
+import json  # Importa json para o arquivo lateral
+import multiprocessing  # Importa multiprocessing para escolher o contexto de criação dos processos
+from concurrent.futures import ProcessPoolExecutor  # Importa o pool de processos da exportação em paralelo
+from typing import Dict, List, Optional, Tuple  # Importa tipos para anotação de tipagem
+import cv2  # Importa a biblioteca OpenCV para desenhar, decodificar e codificar
+import numpy as np  # Importa NumPy para as colunas da trajetória
+from src.core.pipeline import FrameReader, OutputStage  # Importa os estágios do pipeline (decodificação e gravação)
+from src.io.trajectory_file import open_trajectory  # Importa a leitura da trajetória binária
+from src.io.seek_index import get_seek_index, seek_to_frame  # Importa o índice de busca (vídeos com trecho)
+from src.io.logger import get_app_logger, get_log_level, init_worker_logging, process_log_queue  # Importa o logger da aplicação
+
+logger = get_app_logger("overlay")  # Inicializa o logger específico das anotações sob demanda
+
+OVERLAY_VERSION = 1  # Versão do formato do arquivo lateral
+OVERLAY_SUFFIX = ".json"  # Extensão do arquivo lateral
+
+def draw_tracking_overlay(frame: np.ndarray, idx: int, box, interpolated: bool, speed_px: float, fps: float):  # Caixa, centro e HUD de um frame com posição
+    cx = box[0] + box[2] / 2.0  # Calcula a coordenada X do centro
+    cy = box[1] + box[3] / 2.0  # Calcula a coordenada Y do centro
+    x, y, w, h = [int(round(v)) for v in box]  # Coordenadas inteiras para o desenho
+    color = (0, 255, 255) if interpolated else (0, 255, 0)  # Amarelo: posição interpolada; verde: medida
+    cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)  # Desenha o retângulo ao redor do objeto
+    cv2.circle(frame, (int(cx), int(cy)), 4, (0, 0, 255), -1)  # Desenha um ponto vermelho no centro do objeto
+
+    speed_px_s = speed_px * fps if fps > 0 else 0.0  # Calcula velocidade em pixels por segundo
+    hud_lines = [  # Prepara as linhas de texto para o HUD (Heads-Up Display)
+        f"Frame: {idx}" + (" (interpolado)" if interpolated else ""),
+        f"Vel: {speed_px:.2f} px/frame  ({speed_px_s:.2f} px/s)",
+    ]
+    y0 = 25  # Posição Y inicial do texto
+    for i, text in enumerate(hud_lines):  # Itera sobre as linhas de texto
+        cv2.putText(  # Escreve o texto no frame
+            frame,
+            text,
+            (10, y0 + i * 22),  # Posição
+            cv2.FONT_HERSHEY_SIMPLEX,  # Fonte
+            0.6,  # Tamanho
+            (255, 255, 255),  # Cor (Branco)
+            2,  # Espessura
+        )
+
+def draw_lost_overlay(frame: np.ndarray):  # Aviso de falha do tracking
+    cv2.putText(  # Escreve aviso de falha
+        frame,
+        "Tracking perdido",
+        (10, 25),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.7,
+        (0, 0, 255),  # Cor (Vermelho)
+        2,
+    )
+
+def overlay_path_for(output_dir: str, base_name: str, timestamp: str) -> str:  # Caminho do arquivo lateral de uma execução
+    return os.path.join(output_dir, f"{base_name}_overlay_{timestamp}{OVERLAY_SUFFIX}")
+
+def write_overlay_sidecar(  # Grava o arquivo lateral com o necessário para redesenhar as anotações
+    path: str,  # Caminho do arquivo lateral
+    video_path: str,  # Vídeo original
+    trajectory_path: str,  # Trajetória binária ('.traj'), guardada pelo nome (relativa ao arquivo lateral)
+    start_frame: int,  # Frame da ROI inicial (o registro 0 da trajetória é o frame seguinte)
+    num_frames: int,  # Frames processados pelo tracking
+    fps: float, width: int, height: int,  # Metadados do vídeo
+    tracker_type: str,  # Tracker usado
+):
+    data = {
+        "version": OVERLAY_VERSION,  # Versão do formato
+        "video": os.path.abspath(video_path),  # Vídeo original (caminho absoluto)
+        "trajectory": os.path.relpath(trajectory_path, os.path.dirname(os.path.abspath(path))),  # Trajetória ao lado
+        "start_frame": int(start_frame),
+        "num_frames": int(num_frames),
+        "fps": fps, "width": width, "height": height,
+        "tracker": tracker_type,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def load_overlay(path: str) -> Dict:  # Lê e valida o arquivo lateral
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != OVERLAY_VERSION:
+        raise ValueError(f"Versão de overlay não suportada: {data.get('version')} ({path})")
+    data["trajectory"] = os.path.join(os.path.dirname(os.path.abspath(path)), data["trajectory"])
+    if not os.path.isfile(data["video"]):
+        raise FileNotFoundError(f"Vídeo do overlay não encontrado: {data['video']}")
+    return data
+
+class OverlayRenderer:  # Desenha as anotações de um frame a partir da trajetória salva
+
+    def __init__(self, trajectory_path: str, fps: float):
+        traj = open_trajectory(trajectory_path)  # Registros com memória mapeada
+        self.fps = fps  # FPS do vídeo (velocidade em px/s no HUD)
+        frames = np.asarray(traj.frames, dtype=np.int64)
+        self.xs = np.asarray(traj.xs, dtype=np.float64)  # Centros e tamanhos das caixas
+        self.ys = np.asarray(traj.ys, dtype=np.float64)
+        self.ws = np.asarray(traj.ws, dtype=np.float64)
+        self.hs = np.asarray(traj.hs, dtype=np.float64)
+        self.success = np.asarray(traj.success)  # Frames com posição
+        self.interpolated = np.asarray(traj.interpolated)  # Posições interpoladas (passo adaptativo)
+        self._row = np.full(int(frames.max()) + 1 if len(frames) else 0, -1, dtype=np.int64)  # Frame -> registro
+        self._row[frames] = np.arange(len(frames))
+        # Velocidade do HUD: distância até o frame anterior com posição (0 no primeiro), como no loop de tracking
+        self.speeds = np.zeros(len(frames))
+        pos = np.flatnonzero(self.success)
+        if len(pos) > 1:
+            self.speeds[pos[1:]] = np.hypot(np.diff(self.xs[pos]), np.diff(self.ys[pos]))
+
+    def row(self, idx: int) -> int:  # Registro do frame 'idx' da trajetória (-1 se não houver)
+        return int(self._row[idx]) if 0 <= idx < len(self._row) else -1
+
+    def render(self, frame: np.ndarray, idx: int) -> bool:  # Desenha o frame 'idx' da trajetória; False se não houver registro
+        row = self.row(idx)
+        if row < 0:
+            return False
+        if self.success[row]:
+            w, h = self.ws[row], self.hs[row]
+            box = (self.xs[row] - w / 2.0, self.ys[row] - h / 2.0, w, h)
+            draw_tracking_overlay(frame, idx, box, bool(self.interpolated[row]), float(self.speeds[row]), self.fps)
+        else:
+            draw_lost_overlay(frame)
+        return True
+
+def _open_at_start(overlay: Dict):  # Abre o vídeo original posicionado no primeiro frame da trajetória
+    cap = cv2.VideoCapture(overlay["video"])
+    if not cap.isOpened():
+        raise RuntimeError(f"Não foi possível abrir o vídeo: {overlay['video']}")
+    first = overlay["start_frame"] + 1  # O frame da ROI inicial não faz parte da trajetória
+    if overlay["start_frame"] > 0:  # Trecho: usa o índice de busca
+        seek_to_frame(cap, get_seek_index(overlay["video"], first), first)
+    else:
+        cap.grab()  # Descarta o frame da ROI inicial
+    return cap
+
+def play_overlay(sidecar_path: str, speed: float = 1.0):  # Reproduz o vídeo original com as anotações desenhadas na hora
+    overlay = load_overlay(sidecar_path)
+    renderer = OverlayRenderer(overlay["trajectory"], overlay["fps"])
+    cap = _open_at_start(overlay)
+    width, height = overlay["width"], overlay["height"]
+    scale = min(960 / width, 540 / height, 1.0)  # Mesmo tamanho de janela do tracking interativo
+    delay = max(1, int(1000.0 / ((overlay["fps"] or 30.0) * speed)))  # Espera entre frames (ms)
+    cv2.namedWindow("Overlay", cv2.WINDOW_NORMAL)
+    cv2.resizeWindow("Overlay", int(width * scale), int(height * scale))
+    paused = False  # Espaço pausa/continua; ESC ou fechar a janela encerra
+    idx = 0
+    frame = None
+    try:
+        while idx < overlay["num_frames"]:
+            if not paused or frame is None:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                renderer.render(frame, idx)
+                idx += 1
+            cv2.imshow("Overlay", cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else frame)
+            key = cv2.waitKey(delay) & 0xFF
+            if key == 27 or cv2.getWindowProperty("Overlay", cv2.WND_PROP_VISIBLE) < 1:
+                break
+            if key == ord(" "):
+                paused = not paused
+    finally:
+        cap.release()
+        cv2.destroyAllWindows()
+
+def default_export_path(sidecar_path: str, out_dir: Optional[str] = None) -> str:  # '<vídeo>_overlay_<data>.json' -> '<vídeo>_tracking_<data>.mp4'
+    name = os.path.basename(sidecar_path)[: -len(OVERLAY_SUFFIX)].replace("_overlay_", "_tracking_")
+    return os.path.join(out_dir or os.path.dirname(os.path.abspath(sidecar_path)), name + ".mp4")
+
+def export_overlay(sidecar_path: str, output_path: Optional[str] = None) -> str:  # Grava o vídeo anotado (burn-in) a partir do arquivo lateral
+    overlay = load_overlay(sidecar_path)
+    output_path = output_path or default_export_path(sidecar_path)
+    renderer = OverlayRenderer(overlay["trajectory"], overlay["fps"])
+    cap = _open_at_start(overlay)
+    fps = overlay["fps"]
+    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*"mp4v"), fps if fps > 0 else 30.0,
+                             (overlay["width"], overlay["height"]))  # Mesmo codec do vídeo gravado pelo tracking
+    reader = FrameReader(cap, max_frames=overlay["num_frames"]).start()  # Decodificação em outra thread
+    output = OutputStage().start()  # Codificação em outra thread
+    failed = False
+    try:
+        idx = 0
+        while True:  # O desenho fica na thread atual, entre as duas
+            frame = reader.read()
+            if frame is None:
+                break
+            renderer.render(frame, idx)
+            output.submit(writer.write, frame)
+            idx += 1
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        reader.stop()
+        try:
+            output.close(raise_errors=not failed)
+        finally:
+            cap.release()
+            writer.release()
+    logger.info(f"Vídeo anotado exportado: {output_path} ({idx} frames)")
+    return output_path
+
+def _init_worker(log_queue, log_level: int):  # Inicializa cada processo do pool
+    cv2.setNumThreads(1)  # Uma thread do OpenCV por processo: o paralelismo vem do pool
+    init_worker_logging(log_queue, log_level)
+
+def _export_job(job: Tuple[str, str]) -> Dict:  # Exporta um arquivo lateral (função de nível de módulo para o pool)
+    sidecar, output_path = job
+    try:
+        return {"overlay": sidecar, "ok": True, "output": export_overlay(sidecar, output_path)}
+    except Exception as e:  # Isola a falha: as demais exportações continuam
+        return {"overlay": sidecar, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+def export_overlays(sidecars: List[str], out_dir: Optional[str] = None, workers: int = 1) -> List[Dict]:  # Exporta vários arquivos laterais (em paralelo se workers > 1)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    jobs, used = [], set()  # Nomes de saída únicos (execuções do mesmo vídeo no mesmo segundo geram o mesmo nome)
+    for sidecar in sidecars:
+        path = default_export_path(sidecar, out_dir)
+        root, n = path[:-len(".mp4")], 1
+        while path in used:
+            path, n = f"{root}_{n}.mp4", n + 1
+        used.add(path)
+        jobs.append((sidecar, path))
+    workers = max(1, min(workers, len(jobs)))
+    if workers == 1:
+        return [_export_job(job) for job in jobs]
+    ctx = multiprocessing.get_context("spawn")  # 'spawn' evita herdar o estado interno do OpenCV via fork
+    with process_log_queue(ctx) as log_queue, ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(log_queue, get_log_level())) as pool:
+        return list(pool.map(_export_job, jobs))
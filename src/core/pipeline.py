@@ -0,0 +1,205 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo implementa os estágios do pipeline de processamento de vídeo usado pelo tracking.
+O loop de tracking é dividido em três estágios que rodam ao mesmo tempo:
+  1. FrameReader  : thread que decodifica os frames antecipadamente (prefetch);
+  2. tracker      : o próprio loop de tracking, na thread principal (tracker, HUD e exibição);
+  3. OutputStage  : thread que grava o vídeo anotado.
+Os estágios são ligados por filas limitadas (backpressure): se um estágio ficar para trás, o anterior
+espera em vez de acumular frames na memória. Como o OpenCV libera o GIL na decodificação e na
+codificação, esses estágios realmente se sobrepõem.
+Os frames e as imagens em cinza podem vir de um BufferPool: a decodificação escreve em buffers já alocados e cada
+estágio devolve o buffer ao terminar de usá-lo, o que elimina as alocações por frame (em 4K, 25 MB por frame).
+'''
+#################
+
+import queue  # Importa queue para as filas limitadas entre os estágios
+import threading  # Importa threading para executar os estágios em paralelo
+from typing import Callable, Dict, List, Optional, Tuple  # Importa tipos para anotação de tipagem
+import numpy as np  # Importa NumPy para a tipagem dos frames
+
+DEFAULT_QUEUE_SIZE = 8  # Tamanho padrão das filas entre estágios (frames em trânsito)
+
+_END = object()  # Marcador de fim de fluxo enviado pelas threads
+
+class _StageError:  # Embrulha uma exceção ocorrida dentro de uma thread para ser relançada na thread principal
+    def __init__(self, exc: BaseException):
+        self.exc = exc  # Exceção original
+
+class BufferPool:  # Buffers reaproveitados entre frames, com contagem de referências (seguro entre threads)
+
+    def __init__(self):
+        self._free: Dict[Tuple, List[np.ndarray]] = {}  # Buffers livres por (formato, tipo)
+        self._refs: Dict[int, List] = {}  # id do buffer -> [buffer, referências] (só os buffers em uso)
+        self._lock = threading.Lock()  # Várias threads pegam e devolvem buffers
+        self.allocations = 0  # Buffers criados (o ideal é ficar perto do número de frames em trânsito)
+        self.reuses = 0  # Pedidos atendidos por um buffer devolvido
+        self.allocated_bytes = 0  # Memória total dos buffers criados
+
+    def acquire(self, shape, dtype=np.uint8) -> np.ndarray:  # Buffer livre do formato pedido (ou um novo), com uma referência
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                buf = free.pop()
+                self.reuses += 1
+            else:
+                buf = np.empty(shape, dtype=dtype)
+                self.allocations += 1
+                self.allocated_bytes += buf.nbytes
+            self._refs[id(buf)] = [buf, 1]
+        return buf
+
+    def adopt(self, buf: np.ndarray) -> np.ndarray:  # Passa a controlar um array criado fora do pool (conta como alocação)
+        with self._lock:
+            self._refs[id(buf)] = [buf, 1]
+            self.allocations += 1
+            self.allocated_bytes += buf.nbytes
+        return buf
+
+    def retain(self, buf: Optional[np.ndarray]):  # Mais um dono para o buffer (ex.: o painel de debug na fila)
+        if buf is None:
+            return
+        with self._lock:
+            entry = self._refs.get(id(buf))
+            if entry is not None and entry[0] is buf:
+                entry[1] += 1
+
+    def release(self, buf: Optional[np.ndarray]):  # Um dono a menos; sem donos o buffer volta a ficar livre
+        if buf is None:  # Arrays que não vieram do pool são ignorados
+            return
+        with self._lock:
+            entry = self._refs.get(id(buf))
+            if entry is None or entry[0] is not buf:
+                return
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._refs[id(buf)]
+                self._free.setdefault((buf.shape, buf.dtype.str), []).append(buf)
+
+    def stats(self) -> Dict[str, int]:  # Contadores para o perfil da execução
+        return {"buffer_allocations": self.allocations, "buffer_reuses": self.reuses,
+                "buffer_bytes": self.allocated_bytes}
+
+class FrameReader:  # Estágio de decodificação: lê frames do vídeo em uma thread separada
+
+    def __init__(self, cap, queue_size: int = DEFAULT_QUEUE_SIZE, max_frames: Optional[int] = None, profiler=None,
+                 pool: Optional[BufferPool] = None):
+        self._pool = pool  # Buffers reaproveitados (None = um array novo por frame); quem lê devolve cada frame ao pool
+        self._shape = None  # Formato dos frames (conhecido depois do primeiro)
+        self._cap = cap  # Objeto cv2.VideoCapture já aberto (a thread passa a ser a única a chamar read())
+        self._max_frames = max_frames  # Limite de frames a decodificar (fim de um trecho); None = até o fim do vídeo
+        self._decode_timer = profiler.stage("decode") if profiler is not None else None  # Cronômetro da decodificação (opcional)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))  # Fila limitada de frames decodificados
+        self._stop = threading.Event()  # Sinal para interromper a leitura antes do fim do vídeo
+        self._finished = False  # Indica que o fim do fluxo já foi entregue à thread principal
+        self._thread = threading.Thread(target=self._run, name="FrameReader", daemon=True)  # Thread de decodificação
+
+    def start(self) -> "FrameReader":  # Inicia a thread de decodificação
+        self._thread.start()
+        return self
+
+    def _put(self, item) -> bool:  # Coloca um item na fila, respeitando o sinal de parada
+        while not self._stop.is_set():  # Enquanto ninguém pediu para parar
+            try:
+                self._queue.put(item, timeout=0.1)  # Bloqueia se a fila estiver cheia (backpressure)
+                return True
+            except queue.Full:  # Fila ainda cheia: confere o sinal de parada e tenta de novo
+                continue
+        return False  # Parada solicitada: o item é descartado
+
+    def _run(self):  # Corpo da thread de decodificação
+        try:
+            count = 0  # Frames decodificados
+            while not self._stop.is_set():  # Lê até o fim do vídeo (ou do trecho) ou até a parada
+                if self._max_frames is not None and count >= self._max_frames:  # Fim do trecho pedido
+                    break
+                count += 1
+                buf = self._pool.acquire(self._shape) if self._pool is not None and self._shape else None
+                if self._decode_timer is None:
+                    ret, frame = self._read(buf)  # Decodifica o próximo frame (o OpenCV libera o GIL aqui)
+                else:
+                    with self._decode_timer:  # Mede a decodificação
+                        ret, frame = self._read(buf)
+                if not ret or frame is None:  # Fim do vídeo ou erro de leitura
+                    if self._pool is not None:
+                        self._pool.release(buf)  # O buffer pedido não foi usado
+                    break
+                if self._pool is not None and frame is not buf:  # Primeiro frame (ou mudança de formato): o OpenCV alocou
+                    self._pool.release(buf)
+                    self._pool.adopt(frame)
+                    self._shape = frame.shape
+                if not self._put(frame):  # Entrega o frame ao estágio seguinte
+                    return
+        except BaseException as e:  # Qualquer erro na decodificação é repassado à thread principal
+            self._put(_StageError(e))
+            return
+        self._put(_END)  # Sinaliza o fim do fluxo
+
+    def _read(self, buf: Optional[np.ndarray]):  # Decodifica no buffer (se houver) ou em um array novo
+        return self._cap.read(buf) if buf is not None else self._cap.read()
+
+    def read(self) -> Optional[np.ndarray]:  # Obtém o próximo frame decodificado (None no fim do vídeo)
+        if self._finished:  # O fim do vídeo já foi entregue (ou a leitura foi interrompida)
+            return None
+        item = self._queue.get()  # Espera o próximo item da fila
+        if item is _END:  # Fim do vídeo
+            self._finished = True  # Chamadas seguintes devolvem None sem esperar a fila
+            return None
+        if isinstance(item, _StageError):  # Erro ocorrido na thread de decodificação
+            raise item.exc
+        return item  # Frame decodificado
+
+    def stop(self):  # Interrompe a decodificação e espera a thread terminar
+        self._stop.set()  # Sinaliza a parada
+        self._finished = True  # Leituras após a parada devolvem None
+        while True:  # Esvazia a fila para liberar a thread caso esteja bloqueada
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join()  # Espera a thread terminar (depois disso o VideoCapture pode ser liberado)
+
+class OutputStage:  # Estágio de saída: executa as gravações (vídeo e debug) em uma thread separada, em ordem
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))  # Fila limitada de tarefas de gravação
+        self._error: Optional[BaseException] = None  # Primeiro erro ocorrido na thread de saída
+        self._thread = threading.Thread(target=self._run, name="OutputStage", daemon=True)  # Thread de gravação
+
+    def start(self) -> "OutputStage":  # Inicia a thread de gravação
+        self._thread.start()
+        return self
+
+    def _run(self):  # Corpo da thread de gravação
+        while True:
+            item = self._queue.get()  # Espera a próxima tarefa
+            if item is _END:  # Fim das tarefas
+                return
+            if self._error is not None:  # Depois de um erro as tarefas restantes são descartadas
+                continue
+            fn, args = item  # Desempacota a função e seus argumentos
+            try:
+                fn(*args)  # Executa a gravação (o OpenCV libera o GIL na codificação)
+            except BaseException as e:  # Guarda o erro para relançar na thread principal
+                self._error = e
+
+    def submit(self, fn: Callable, *args):  # Agenda uma gravação (bloqueia se a fila estiver cheia)
+        if self._error is not None:  # Relança imediatamente um erro anterior da thread de saída
+            raise self._error
+        self._queue.put((fn, args))  # Enfileira a tarefa
+
+    def close(self, raise_errors: bool = True):  # Espera todas as gravações pendentes terminarem
+        self._queue.put(_END)  # Sinaliza o fim das tarefas
+        self._thread.join()  # Espera a thread terminar
+        if raise_errors and self._error is not None:  # Relança o erro da thread de saída, se houver
+            raise self._error
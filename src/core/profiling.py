@@ -0,0 +1,147 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo mede onde o tempo do tracking é gasto.
+Cada estágio do loop (decodificação, conversão para cinza, tracker, desenho, exibição, gravação do vídeo,
+imagens de debug e as esperas nas filas do pipeline) tem um cronômetro de baixo custo: cada medição entra em
+um histograma com intervalos logarítmicos (20 por década, de 1 µs a 100 s), sem guardar as amostras, e os
+percentis p50/p95/p99 são lidos do histograma no fim. O resumo inclui o FPS efetivo e o pico de memória (RSS).
+Opcionalmente, a execução gera um perfil do cProfile ('.prof', para o pstats/snakeviz) ou um trace de eventos
+('.trace.json', para chrome://tracing ou Perfetto) com os intervalos de cada estágio em cada thread.
+'''
+#################
+
+import sys  # Importa sys para identificar a plataforma (unidade do RSS)
+import json  # Importa json para gravar o trace de eventos
+import math  # Importa math para o índice do histograma
+import threading  # Importa threading para identificar a thread de cada evento do trace
+from time import perf_counter  # Importa o relógio de alta resolução
+from typing import Dict, List, Optional  # Importa tipos para anotação de tipagem
+import numpy as np  # Importa NumPy para os histogramas
+
+try:  # Pico de memória: 'resource' existe em Linux e macOS
+    import resource
+except ImportError:  # Windows
+    resource = None
+try:  # No Windows, o psutil (opcional) informa o pico de memória
+    import psutil
+except ImportError:
+    psutil = None
+
+PROFILE_DUMPS = ("cprofile", "trace")  # Tipos de perfil detalhado gravados sob demanda
+_BINS_PER_DECADE = 20  # Resolução do histograma (cada intervalo é ~12% mais largo que o anterior)
+_MIN_EXP = -6  # Menor duração do histograma: 1 µs
+_NUM_BINS = _BINS_PER_DECADE * 8 + 1  # De 1 µs a 100 s (o último intervalo acumula o que passar disso)
+
+class StageTimer:  # Cronômetro de um estágio (usado sempre pela mesma thread)
+
+    __slots__ = ("name", "counts", "count", "total", "max", "_start", "_trace")
+
+    def __init__(self, name: str, trace: Optional[List] = None):
+        self.name = name
+        self.counts = np.zeros(_NUM_BINS, dtype=np.int64)  # Histograma logarítmico das durações
+        self.count = 0  # Medições
+        self.total = 0.0  # Soma das durações (s)
+        self.max = 0.0  # Maior duração (s)
+        self._start = 0.0  # Início da medição em andamento
+        self._trace = trace  # Lista de eventos do trace (None = sem trace)
+
+    def add(self, seconds: float, start: Optional[float] = None):  # Registra uma duração
+        idx = int((math.log10(seconds) - _MIN_EXP) * _BINS_PER_DECADE) if seconds > 1e-6 else 0
+        self.counts[min(max(idx, 0), _NUM_BINS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if self._trace is not None:  # Evento completo ('X') do formato de trace do Chrome, em µs
+            begin = (perf_counter() - seconds) if start is None else start
+            self._trace.append((self.name, threading.get_ident(), begin, seconds))
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = perf_counter()
+        self.add(end - self._start, self._start)
+        return False
+
+    def percentile(self, q: float) -> float:  # Percentil aproximado (limite superior do intervalo do histograma), em s
+        if self.count == 0:
+            return 0.0
+        idx = int(np.searchsorted(np.cumsum(self.counts), q / 100.0 * self.count))
+        return min(10.0 ** (_MIN_EXP + (idx + 1) / _BINS_PER_DECADE), self.max)
+
+    def summary(self) -> Dict:  # Resumo do estágio (tempos em ms)
+        return {
+            "count": self.count,  # Medições
+            "total_s": self.total,  # Tempo total
+            "mean_ms": self.total / self.count * 1000.0 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000.0,
+            "p95_ms": self.percentile(95) * 1000.0,
+            "p99_ms": self.percentile(99) * 1000.0,
+            "max_ms": self.max * 1000.0,
+        }
+
+class RunProfiler:  # Cronômetros de todos os estágios de uma execução
+
+    def __init__(self, trace: bool = False):
+        self._stages: Dict[str, StageTimer] = {}  # Estágios na ordem em que aparecem
+        self._events: Optional[List] = [] if trace else None  # Eventos do trace (opcional)
+        self._start = perf_counter()  # Início da execução
+        self._end: Optional[float] = None  # Fim da execução
+        self.frames = 0  # Frames processados (para o FPS efetivo)
+        self.counters: Dict[str, int] = {}  # Contadores da execução (ex.: buffers alocados e reaproveitados)
+
+    def stage(self, name: str) -> StageTimer:  # Cronômetro do estágio (criado no primeiro uso)
+        timer = self._stages.get(name)
+        if timer is None:
+            timer = self._stages.setdefault(name, StageTimer(name, self._events))
+        return timer
+
+    def timed(self, name: str, fn):  # Embrulha uma função para medir cada chamada no estágio 'name'
+        timer = self.stage(name)
+        def wrapper(*args):
+            with timer:
+                return fn(*args)
+        return wrapper
+
+    def finish(self, frames: int):  # Encerra a medição da execução
+        self._end = perf_counter()
+        self.frames = frames
+
+    def summary(self) -> Dict:  # Resumo para as estatísticas e o relatório
+        wall = (self._end or perf_counter()) - self._start
+        return {
+            "wall_seconds": wall,  # Duração do tracking (do início do loop ao fim das gravações)
+            "effective_fps": self.frames / wall if wall > 0 else 0.0,  # Frames processados por segundo de relógio
+            "peak_rss_mb": peak_rss_mb(),  # Pico de memória do processo
+            "stages": {name: t.summary() for name, t in self._stages.items() if t.count},  # Estágios medidos
+            "counters": dict(self.counters),  # Contadores da execução
+        }
+
+    def write_trace(self, path: str):  # Grava o trace de eventos (formato JSON do Chrome / Perfetto)
+        names = {t.ident: t.name for t in threading.enumerate()}  # Nome das threads ainda vivas
+        events = [{"name": name, "ph": "X", "pid": 0, "tid": tid, "ts": (begin - self._start) * 1e6, "dur": dur * 1e6}
+                  for name, tid, begin, dur in self._events or []]
+        events += [{"name": "thread_name", "ph": "M", "pid": 0, "tid": tid, "args": {"name": names.get(tid, str(tid))}}
+                   for tid in {e["tid"] for e in events}]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+def peak_rss_mb() -> Optional[float]:  # Pico de memória residente do processo em MB (None se indisponível)
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0  # macOS: bytes; Linux: KB
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024.0 * 1024.0)
+    return None
@@ -0,0 +1,66 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo informa o andamento do tracking para quem o chamou (interface gráfica, CLI ou outro programa).
+O loop chama o ProgressReporter a cada frame, mas o callback só é chamado em intervalos mínimos (padrão 0,25 s)
+e no fim, com um dicionário: frames processados, total, FPS atual (medido desde o último aviso), tempo decorrido e
+tempo restante estimado. O callback roda na thread do tracking: interfaces gráficas devem apenas repassar o
+dicionário para a thread da janela (ex.: 'after' do Tkinter).
+O cancelamento usa um threading.Event: quem quiser interromper chama set() e o loop termina no frame seguinte,
+gravando o relatório parcial (como o ESC no modo interativo).
+'''
+#################
+
+from time import perf_counter  # Importa o relógio de alta resolução
+from typing import Callable, Dict, Optional  # Importa tipos para anotação de tipagem
+
+PROGRESS_INTERVAL = 0.25  # Intervalo mínimo entre dois avisos de andamento (s)
+FPS_SMOOTHING = 0.5  # Peso do FPS medido no último intervalo na média móvel exponencial
+
+class ProgressReporter:  # Converte as chamadas do loop em avisos espaçados de andamento
+
+    def __init__(self, callback: Optional[Callable[[Dict], None]], total: int, interval: Optional[float] = None):
+        self.callback = callback  # Função que recebe o dicionário de andamento (None = desligado)
+        self.total = max(0, int(total))  # Frames previstos (0 = desconhecido)
+        self.interval = PROGRESS_INTERVAL if interval is None else interval  # Intervalo mínimo entre avisos (s)
+        self.fps = 0.0  # FPS atual (média móvel)
+        self._start = perf_counter()  # Início do tracking
+        self._last_t = self._start  # Momento do último aviso
+        self._last_done = 0  # Frames processados no último aviso
+
+    def update(self, done: int):  # Chamado a cada frame: avisa se o intervalo já passou
+        if self.callback is None:
+            return
+        now = perf_counter()
+        if now - self._last_t >= self.interval:
+            self._emit(done, now)
+
+    def finish(self, done: int, cancelled: bool = False):  # Aviso final (sempre emitido)
+        if self.callback is not None:
+            self._emit(done, perf_counter(), finished=True, cancelled=cancelled)
+
+    def _emit(self, done: int, now: float, finished: bool = False, cancelled: bool = False):
+        dt = now - self._last_t
+        if dt > 0 and done > self._last_done:  # FPS do último intervalo, suavizado
+            current = (done - self._last_done) / dt
+            self.fps = current if self.fps == 0.0 else FPS_SMOOTHING * current + (1 - FPS_SMOOTHING) * self.fps
+        self._last_t, self._last_done = now, done
+        remaining = max(0, self.total - done)
+        self.callback({
+            "done": done,  # Frames processados
+            "total": self.total,  # Frames previstos (0 = desconhecido)
+            "fraction": min(1.0, done / self.total) if self.total else 0.0,  # Fração concluída (0 a 1)
+            "fps": self.fps,  # Frames por segundo atuais
+            "elapsed_s": now - self._start,  # Tempo decorrido
+            "eta_s": remaining / self.fps if self.fps > 0 and self.total and not finished else None,  # Tempo restante estimado
+            "finished": finished,  # Último aviso?
+            "cancelled": cancelled,  # Tracking interrompido pelo cancelamento?
+        })
@@ -0,0 +1,149 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo reencontra o objeto em um frame a partir de um modelo de aparência (template) da caixa.
+Ele usa correlação normalizada (cv2.matchTemplate), no frame inteiro ou em uma janela de busca ao redor
+de uma caixa conhecida, e devolve a caixa encontrada com a pontuação da correspondência (0 a 1).
+A correspondência em várias escalas tolera objetos que se aproximaram ou se afastaram da câmera, e a busca
+em pirâmide procura no frame inteiro em resolução reduzida e refina o resultado na resolução original.
+O Reacquirer guarda o template da última caixa confiável e, quando o tracker perde o objeto, procura-o
+primeiro em uma janela que cresce a cada tentativa e depois no frame inteiro (pirâmide).
+'''
+#################
+
+from typing import Dict, List, Optional, Sequence, Tuple  # Importa tipos para anotação de tipagem
+import cv2  # Importa a biblioteca OpenCV para a correlação de templates
+import numpy as np  # Importa NumPy para a tipagem dos frames
+
+Box = Tuple[int, int, int, int]  # Caixa (x, y, w, h) em pixels do vídeo original
+
+DEFAULT_SEARCH_FACTOR = 3.0  # Tamanho padrão da janela de busca em múltiplos da caixa
+MIN_MATCH_SCORE = 0.5  # Pontuação mínima para considerar o objeto reencontrado
+FLAT_TEMPLATE_STD = 8.0  # Desvio padrão (níveis de cinza) abaixo do qual o template é considerado sem textura
+DEFAULT_SCALES = (0.8, 0.9, 1.0, 1.1, 1.25)  # Escalas do template testadas na busca em várias escalas
+REACQUIRE_MIN_SCORE = 0.7  # Pontuação mínima para reiniciar o tracker (mais exigente: um engano troca de objeto)
+PYRAMID_TEMPLATE_SIDE = 12  # Menor lado do template no nível reduzido da pirâmide (em pixels)
+REFINE_FACTOR = 2.0  # Janela de refinamento ao redor do resultado da pirâmide (múltiplos da caixa)
+
+def cut_template(frame: np.ndarray, box: Box) -> np.ndarray:  # Recorta o modelo de aparência da caixa (em tons de cinza)
+    x, y, w, h = [int(v) for v in box]
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    return gray[y:y + h, x:x + w].copy()  # Cópia: o frame original pode ser descartado
+
+def match_template(  # Procura o template no frame; devolve a caixa encontrada e a pontuação
+    frame: np.ndarray,  # Frame onde procurar (BGR ou cinza)
+    template: np.ndarray,  # Modelo de aparência (cinza)
+    around: Optional[Box] = None,  # Caixa de referência (None = frame inteiro)
+    search_factor: float = DEFAULT_SEARCH_FACTOR,  # Janela de busca em múltiplos da caixa de referência
+) -> Tuple[Box, float]:
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    th, tw = template.shape[:2]  # Tamanho do template
+    fh, fw = gray.shape[:2]  # Tamanho do frame
+    x0, y0, x1, y1 = 0, 0, fw, fh  # Região de busca (padrão: frame inteiro)
+    if around is not None:  # Janela centrada na caixa de referência
+        cx, cy = around[0] + around[2] / 2.0, around[1] + around[3] / 2.0
+        half_w = max(tw, around[2]) * search_factor / 2.0
+        half_h = max(th, around[3]) * search_factor / 2.0
+        x0, y0 = max(0, int(cx - half_w)), max(0, int(cy - half_h))
+        x1, y1 = min(fw, int(cx + half_w)), min(fh, int(cy + half_h))
+    if x1 - x0 < tw or y1 - y0 < th:  # A janela não comporta o template
+        return (x0, y0, tw, th), 0.0
+    region = gray[y0:y1, x0:x1]  # Região de busca
+    if template.std() < FLAT_TEMPLATE_STD:  # Template sem textura: a correlação normalizada vira ruído, usa a diferença quadrática
+        diff = cv2.matchTemplate(region, template, cv2.TM_SQDIFF_NORMED)
+        best, _, (mx, my), _ = cv2.minMaxLoc(diff)
+        score = 1.0 - best
+    else:
+        scores = cv2.matchTemplate(region, template, cv2.TM_CCOEFF_NORMED)  # Correlação em todas as posições
+        _, score, _, (mx, my) = cv2.minMaxLoc(scores)  # Melhor posição
+    if not np.isfinite(score):  # Região sem variação (correlação indefinida)
+        score = 0.0
+    return (x0 + mx, y0 + my, tw, th), float(score)
+
+def match_multiscale(  # Procura o template em várias escalas; devolve a melhor caixa e a pontuação
+    frame: np.ndarray,  # Frame onde procurar (BGR ou cinza)
+    template: np.ndarray,  # Modelo de aparência (cinza)
+    around: Optional[Box] = None,  # Caixa de referência (None = frame inteiro)
+    search_factor: float = DEFAULT_SEARCH_FACTOR,  # Janela de busca em múltiplos da caixa de referência
+    scales: Sequence[float] = DEFAULT_SCALES,  # Escalas do template
+) -> Tuple[Box, float]:
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame  # Converte uma vez para todas as escalas
+    th, tw = template.shape[:2]
+    best_box, best_score = (0, 0, tw, th), -1.0
+    for s in scales:
+        size = (max(4, int(round(tw * s))), max(4, int(round(th * s))))  # Tamanho do template nesta escala
+        scaled = template if size == (tw, th) else cv2.resize(
+            template, size, interpolation=cv2.INTER_AREA if s < 1.0 else cv2.INTER_LINEAR)
+        box, score = match_template(gray, scaled, around, search_factor)
+        if score > best_score:
+            best_box, best_score = box, score
+    return best_box, max(0.0, best_score)
+
+def match_pyramid(  # Procura o template no frame inteiro em resolução reduzida e refina na resolução original
+    frame: np.ndarray,  # Frame onde procurar (BGR ou cinza)
+    template: np.ndarray,  # Modelo de aparência (cinza)
+    scales: Sequence[float] = DEFAULT_SCALES,  # Escalas do template
+) -> Tuple[Box, float]:
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    th, tw = template.shape[:2]
+    f = min(tw, th) / float(PYRAMID_TEMPLATE_SIDE)  # Fator de redução que mantém o template com detalhes suficientes
+    if f < 1.5:  # Template pequeno: reduzir não compensa, busca direto no frame inteiro
+        return match_multiscale(gray, template, scales=scales)
+    small = cv2.resize(gray, None, fx=1.0 / f, fy=1.0 / f, interpolation=cv2.INTER_AREA)  # Nível reduzido do frame
+    small_template = cv2.resize(template, (max(4, int(round(tw / f))), max(4, int(round(th / f)))), interpolation=cv2.INTER_AREA)
+    (sx, sy, sw, sh), _ = match_multiscale(small, small_template, scales=scales)  # Posição aproximada
+    coarse = (int(sx * f), int(sy * f), int(sw * f), int(sh * f))  # De volta para pixels do vídeo original
+    return match_multiscale(gray, template, around=coarse, search_factor=REFINE_FACTOR, scales=scales)  # Refinamento
+
+class Reacquirer:  # Reencontra o objeto depois que o tracker o perde
+
+    def __init__(
+        self,
+        min_score: float = REACQUIRE_MIN_SCORE,  # Pontuação mínima para aceitar o objeto reencontrado
+        search_factor: float = DEFAULT_SEARCH_FACTOR,  # Janela da primeira tentativa (dobra a cada tentativa)
+        scales: Sequence[float] = DEFAULT_SCALES,  # Escalas do template
+    ):
+        self.min_score = min_score
+        self.search_factor = search_factor
+        self.scales = scales
+        self.template: Optional[np.ndarray] = None  # Template da última caixa confiável (cinza)
+        self.last_box: Optional[Box] = None  # Última caixa confiável
+        self.attempts = 0  # Tentativas desde a perda do objeto
+        self.events: List[Dict] = []  # Reaquisições realizadas
+
+    def remember(self, gray: np.ndarray, box: Box):  # Atualiza o template com uma caixa confiável
+        x, y, w, h = [int(v) for v in box]
+        fh, fw = gray.shape[:2]
+        if w >= 4 and h >= 4 and x >= 0 and y >= 0 and x + w <= fw and y + h <= fh:  # Só caixas inteiras dentro do frame
+            self.template = cut_template(gray, (x, y, w, h))
+        self.last_box = (x, y, w, h)
+        self.attempts = 0
+
+    def search(  # Procura o objeto; (caixa, pontuação, etapa) ou None
+        self,
+        gray: np.ndarray,  # Frame atual em cinza
+        around: Optional[Box] = None,  # Centro da janela (ex.: caixa prevista pelo modelo de movimento; padrão: a última caixa)
+    ) -> Optional[Tuple[Box, float, str]]:
+        if self.template is None or self.last_box is None:
+            return None
+        around = self.last_box if around is None else tuple(int(v) for v in around)
+        th, tw = self.template.shape[:2]
+        fh, fw = gray.shape[:2]
+        factor = self.search_factor * 2 ** self.attempts  # A janela cresce a cada frame sem o objeto
+        self.attempts += 1
+        if max(tw, around[2]) * factor < fw or max(th, around[3]) * factor < fh:  # Janela menor que o frame
+            box, score = match_multiscale(gray, self.template, around, factor, self.scales)
+            if score >= self.min_score:
+                return box, score, "janela"
+        box, score = match_pyramid(gray, self.template, self.scales)  # Frame inteiro
+        if score >= self.min_score:
+            return box, score, "pirâmide"
+        return None
@@ -0,0 +1,200 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo implementa os modos de tracking com resolução reduzida.
+O custo do CSRT cresce com o tamanho do frame, então o tracker pode trabalhar:
+  - em um frame reduzido (ScaledTracker), com as caixas convertidas de volta para a escala original;
+  - em uma janela de busca recortada ao redor da última caixa (SearchWindowTracker).
+Os dois "embrulham" um tracker do OpenCV e expõem a mesma interface (init/update), então o resto
+do pipeline (trajetória, HUD e CSV) continua recebendo caixas em pixels do vídeo original.
+Também gera um relatório de precisão x velocidade para escolher a escala de cada câmera.
+'''
+#################
+
+import os  # Importa o módulo os para montar os caminhos dos arquivos
+import time  # Importa time para medir a duração de cada execução
+import tempfile  # Importa tempfile para as pastas descartáveis de cada execução do comparativo
+from datetime import datetime  # Importa datetime para registrar a data do relatório
+from typing import Callable, Dict, List, Optional, Sequence, Tuple  # Importa tipos para anotação de tipagem
+import cv2  # Importa a biblioteca OpenCV para redimensionar os frames
+import numpy as np  # Importa NumPy para comparar as trajetórias
+
+Box = Tuple[float, float, float, float]  # Alias de tipo para uma caixa delimitadora (x, y, w, h)
+
+LEAD_FRAMES = 10  # Frames de movimento previsto à frente usados para adiantar a janela de busca
+
+class ScaledTracker:  # Tracker que trabalha em uma versão reduzida do frame
+
+    def __init__(self, inner, scale: float):
+        if not 0.0 < scale <= 1.0:  # A escala precisa reduzir (ou manter) o frame
+            raise ValueError(f"Escala de tracking inválida: {scale} (esperado 0 < escala <= 1)")
+        self.inner = inner  # Tracker do OpenCV que recebe os frames reduzidos
+        self.scale = scale  # Fator de redução (ex.: 0.5 = metade da largura e da altura)
+        self._buf: Optional[np.ndarray] = None  # Frame reduzido (o mesmo buffer a cada frame)
+
+    def _resize(self, frame: np.ndarray) -> np.ndarray:  # Reduz o frame para a escala de tracking
+        if self.scale == 1.0:  # Sem redução: usa o frame original
+            return frame
+        # INTER_AREA preserva detalhes ao reduzir; com o mesmo formato, o OpenCV escreve no buffer anterior
+        self._buf = cv2.resize(frame, None, dst=self._buf, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        return self._buf
+
+    def init(self, frame: np.ndarray, box: Box):  # Inicializa o tracker com a caixa convertida para a escala reduzida
+        x, y, w, h = box  # Caixa em pixels do vídeo original
+        s = self.scale  # Atalho para a escala
+        scaled = (int(round(x * s)), int(round(y * s)), max(1, int(round(w * s))), max(1, int(round(h * s))))  # Caixa reduzida
+        return self.inner.init(self._resize(frame), scaled)  # Inicializa o tracker interno
+
+    def update(self, frame: np.ndarray):  # Atualiza o tracker e devolve a caixa na escala original
+        ok, box = self.inner.update(self._resize(frame))  # Atualiza com o frame reduzido
+        if not ok:  # Tracking perdido
+            return ok, box
+        return ok, tuple(v / self.scale for v in box)  # Converte a caixa de volta para pixels do vídeo original
+
+class SearchWindowTracker:  # Tracker que trabalha apenas em uma janela recortada ao redor do objeto
+
+    def __init__(self, factory: Callable[[], object], window_factor: float = 3.0, margin: float = 0.15):
+        if window_factor <= 1.0:  # A janela precisa ser maior que a caixa
+            raise ValueError(f"Janela de busca inválida: {window_factor} (esperado > 1)")
+        self.factory = factory  # Função que cria um tracker novo (usada a cada reposicionamento da janela)
+        self.window_factor = window_factor  # Tamanho da janela em múltiplos da caixa
+        self.margin = margin  # Fração da janela que dispara o reposicionamento quando a caixa chega perto da borda
+        self.inner = None  # Tracker atual (trabalha em coordenadas da janela)
+        self.window = (0, 0, 0, 0)  # Janela atual (x, y, w, h) em pixels do vídeo original
+        self.recenters = 0  # Quantas vezes a janela foi reposicionada
+        self.velocity = (0.0, 0.0)  # Velocidade prevista do objeto em px/frame (modelo de movimento; zero = janela centrada)
+
+    def _make_window(self, box: Box, frame_w: int, frame_h: int) -> Tuple[int, int, int, int]:  # Calcula a janela centrada na caixa
+        x, y, w, h = box  # Caixa atual
+        ww = min(frame_w, int(w * self.window_factor))  # Largura da janela (limitada ao frame)
+        wh = min(frame_h, int(h * self.window_factor))  # Altura da janela (limitada ao frame)
+        cx, cy = x + w / 2.0, y + h / 2.0  # Centro da caixa
+        vx, vy = self.velocity  # Adianta a janela na direção do movimento previsto, mantendo a caixa fora da margem de trás
+        lim_x = max(0.0, (ww - w) / 2.0 - ww * self.margin - 1)
+        lim_y = max(0.0, (wh - h) / 2.0 - wh * self.margin - 1)
+        cx += max(-lim_x, min(lim_x, vx * LEAD_FRAMES))
+        cy += max(-lim_y, min(lim_y, vy * LEAD_FRAMES))
+        wx = int(min(max(0, cx - ww / 2.0), frame_w - ww))  # Posição x da janela (dentro do frame)
+        wy = int(min(max(0, cy - wh / 2.0), frame_h - wh))  # Posição y da janela (dentro do frame)
+        return (wx, wy, ww, wh)  # Janela recortada
+
+    def _crop(self, frame: np.ndarray) -> np.ndarray:  # Recorta a janela atual do frame
+        wx, wy, ww, wh = self.window  # Janela atual
+        return np.ascontiguousarray(frame[wy:wy + wh, wx:wx + ww])  # Recorte contíguo (o CSRT não aceita views com passo)
+
+    def init(self, frame: np.ndarray, box: Box):  # Inicializa a janela e o tracker interno
+        self.window = self._make_window(box, frame.shape[1], frame.shape[0])  # Centraliza a janela na caixa
+        wx, wy = self.window[0], self.window[1]  # Origem da janela
+        x, y, w, h = box  # Caixa em pixels do vídeo original
+        self.inner = self.factory()  # Cria um tracker novo para a janela
+        return self.inner.init(self._crop(frame), (int(x - wx), int(y - wy), int(w), int(h)))  # Caixa em coordenadas da janela
+
+    def update(self, frame: np.ndarray):  # Atualiza o tracker na janela e devolve a caixa em pixels do vídeo original
+        ok, box = self.inner.update(self._crop(frame))  # Atualiza apenas com o recorte
+        if not ok:  # Tracking perdido: mantém a janela onde está
+            return ok, box
+
+        wx, wy, ww, wh = self.window  # Janela atual
+        x, y, w, h = box  # Caixa em coordenadas da janela
+        full = (x + wx, y + wy, w, h)  # Caixa em pixels do vídeo original
+
+        fh, fw = frame.shape[:2]  # Dimensões do frame original
+        mx, my = ww * self.margin, wh * self.margin  # Margem de segurança em pixels
+        near_edge = (  # A caixa chegou perto de uma borda da janela que ainda pode se mover (bordas do frame não contam)
+            (x < mx and wx > 0) or (y < my and wy > 0)
+            or (x + w > ww - mx and wx + ww < fw) or (y + h > wh - my and wy + wh < fh)
+        )
+        if near_edge:  # Reposiciona a janela
+            self.init(frame, full)  # Recentraliza a janela e reinicializa o tracker no frame atual
+            self.recenters += 1  # Conta o reposicionamento
+        return ok, full  # Caixa em pixels do vídeo original
+
+def build_tracker(  # Monta o tracker final combinando escala reduzida e janela de busca
+    factory: Callable[[], object],  # Função que cria o tracker base do OpenCV
+    track_scale: float = 1.0,  # Escala de tracking (1.0 = resolução original)
+    search_window: Optional[float] = None,  # Tamanho da janela de busca em múltiplos da caixa (None = frame inteiro)
+):
+    base = factory  # Fábrica do tracker base
+    if track_scale != 1.0:  # Com redução de escala, cada tracker criado trabalha no frame reduzido
+        base = lambda: ScaledTracker(factory(), track_scale)
+    if search_window:  # Com janela de busca, o tracker trabalha só no recorte
+        return SearchWindowTracker(base, search_window)
+    return base()  # Tracker simples (ou apenas reduzido)
+
+def _centers_by_frame(stats: Dict) -> Dict[int, Tuple[float, float]]:  # Mapeia índice do frame -> centro rastreado
+    frames, xs, ys = stats["trajectory"].tracked()  # Colunas dos frames rastreados
+    return {int(f): (x, y) for f, x, y in zip(frames, xs, ys)}
+
+def benchmark_track_scales(  # Compara precisão e velocidade do tracking em várias escalas
+    video_path: str,  # Vídeo de entrada
+    initial_box: Tuple[int, int, int, int],  # ROI inicial em pixels do vídeo original
+    output_dir: str,  # Pasta onde o relatório é salvo
+    scales: Sequence[float] = (1.0, 0.75, 0.5, 0.25),  # Escalas a comparar
+    tracker_type: str = "CSRT",  # Algoritmo de tracking
+    search_window: Optional[float] = None,  # Janela de busca (aplicada a todas as escalas)
+) -> List[Dict]:  # Retorna uma linha de resultado por escala
+
+    from src.core.tracking import track_single_object  # Import local para evitar import circular
+
+    os.makedirs(output_dir, exist_ok=True)  # Garante a pasta de saída
+    runs = []  # Resultados de cada escala
+    for scale in sorted(set([1.0, *scales]), reverse=True):  # A escala 1.0 sempre roda primeiro (referência)
+        with tempfile.TemporaryDirectory() as run_dir:  # Os relatórios individuais são descartados (o comparativo os substitui)
+            start = time.perf_counter()  # Marca o início
+            stats = track_single_object(  # Executa o tracking sem saídas pesadas
+                video_path, run_dir, tracker_type=tracker_type, save_video=False, save_csv=False,
+                save_debug_images=False, initial_box=initial_box, headless=True,
+                track_scale=scale, search_window=search_window,
+            )
+            elapsed = time.perf_counter() - start  # Duração da execução
+        runs.append({"scale": scale, "stats": stats, "elapsed_s": elapsed})  # Guarda o resultado
+
+    reference = _centers_by_frame(runs[0]["stats"])  # Trajetória de referência (escala 1.0)
+    rows = []  # Linhas do relatório
+    for run in runs:  # Compara cada escala com a referência
+        centers = _centers_by_frame(run["stats"])  # Trajetória da escala atual
+        common = sorted(set(reference) & set(centers))  # Frames rastreados nas duas execuções
+        if common:  # Erro entre os centros (distância euclidiana em pixels)
+            ref = np.array([reference[f] for f in common])
+            cur = np.array([centers[f] for f in common])
+            err = np.hypot(*(cur - ref).T)
+            mean_err, max_err = float(err.mean()), float(err.max())
+        else:
+            mean_err = max_err = float("nan")  # Nenhum frame em comum para comparar
+        frames = run["stats"]["num_frames"]  # Frames processados
+        rows.append({
+            "scale": run["scale"],  # Escala de tracking
+            "elapsed_s": run["elapsed_s"],  # Tempo total
+            "fps_processing": frames / run["elapsed_s"] if run["elapsed_s"] > 0 else 0.0,  # Velocidade de processamento
+            "success_rate": run["stats"]["success_rate"],  # Taxa de sucesso
+            "mean_center_error_px": mean_err,  # Erro médio do centro em relação à escala 1.0
+            "max_center_error_px": max_err,  # Erro máximo do centro em relação à escala 1.0
+        })
+
+    base_name = os.path.splitext(os.path.basename(video_path))[0]  # Nome do vídeo sem extensão
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")  # Timestamp para nome único
+    report_path = os.path.join(output_dir, f"{base_name}_escalas_{timestamp}.txt")  # Caminho do relatório
+    with open(report_path, "w", encoding="utf-8") as f:  # Escreve o relatório comparativo
+        f.write("=== Relatório de Precisão x Velocidade por Escala ===\n\n")
+        f.write(f"Vídeo de entrada     : {video_path}\n")
+        f.write(f"Tracker utilizado    : {tracker_type}\n")
+        f.write(f"Janela de busca      : {search_window if search_window else 'frame inteiro'}\n\n")
+        f.write(f"{'Escala':>7} {'Tempo(s)':>9} {'FPS proc.':>10} {'Sucesso':>8} {'Erro méd.(px)':>14} {'Erro máx.(px)':>14}\n")
+        for r in rows:  # Uma linha por escala
+            f.write(
+                f"{r['scale']:>7.2f} {r['elapsed_s']:>9.2f} {r['fps_processing']:>10.1f} {r['success_rate']*100:>7.1f}% "
+                f"{r['mean_center_error_px']:>14.2f} {r['max_center_error_px']:>14.2f}\n"
+            )
+        f.write("\nO erro é a distância entre o centro rastreado e o centro obtido na escala 1.0 (mesmo frame).\n")
+
+    for r in rows:  # Registra o caminho do relatório em cada linha
+        r["report_path"] = report_path
+    return rows  # Retorna o comparativo
@@ -18,19 +18,55 @@ gerar o vídeo processado com as anotações visuais e exportar os relatórios e
 
 import os  # Importa o módulo os para interagir com o sistema operacional (criar pastas, verificar arquivos)
 import csv  # Importa o módulo csv para ler e escrever arquivos CSV (planilhas)
+import logging  # Importa logging para o nível dos eventos de erro
+import threading  # Importa threading para o sinal de cancelamento
+import uuid  # Importa uuid para identificar cada execução nos eventos do log
 import math  # Importa o módulo math para funções matemáticas (cálculo de distância, hipotenusa)
+import cProfile  # Importa o cProfile para o perfil detalhado opcional
 import cv2  # Importa a biblioteca OpenCV para processamento de imagem e vídeo
 import numpy as np  # Importa a biblioteca NumPy para manipulação eficiente de arrays e matrizes numéricas
-from src.io.logger import get_app_logger  # Importa a função personalizada para obter o logger da aplicação
+from src.core.cascade import CASCADE_NAMES, CascadeTracker  # Importa o tracker em cascata KCF -> CSRT
+from src.core.reacquire import Reacquirer  # Importa a reaquisição por template depois da perda do objeto
+from src.core.kalman import FilteredPath, KalmanFilter, smooth_trajectory  # Importa o modelo de movimento (Kalman)
+from src.core.kinematics import kinematics_columns, trajectory_kinematics  # Importa a cinemática vetorizada
+from src.core.resolution import build_tracker  # Importa a montagem do tracker com escala reduzida / janela de busca
+from src.core.overlay import draw_lost_overlay, draw_tracking_overlay, overlay_path_for, write_overlay_sidecar  # Importa o desenho das anotações e o arquivo lateral
+from src.core.debug_panels import DebugPanelWriter, debug_encode_params, debug_frame_selector  # Importa o pool de gravação e a amostragem dos painéis de debug
+from src.core.progress import ProgressReporter  # Importa os avisos espaçados de andamento
+from src.core.profiling import PROFILE_DUMPS, RunProfiler  # Importa os cronômetros por estágio do loop
+from src.core.pipeline import BufferPool, FrameReader, OutputStage, DEFAULT_QUEUE_SIZE  # Importa os estágios do pipeline e o pool de buffers
+from src.core.trajectory import TrajectoryStore, StreamingTrajectory, compute_motion_stats  # Importa as trajetórias (colunas ou streaming) e as métricas
+from src.core.metrics import build_stats, write_report, write_motion_sections  # Importa o motor de estatísticas e relatórios
+from src.io.seek_index import resolve_frame_range, seek_index_for_range, seek_to_frame  # Importa o índice de busca (trechos do vídeo)
+from src.io.trajectory_file import TrajectoryFileWriter  # Importa o gravador do formato binário de trajetória
+from src.io.logger import FrameDebugLog, get_app_logger, log_event  # Importa o logger da aplicação, os eventos estruturados e o debug por frame
+from time import perf_counter  # Importa o relógio de alta resolução (estágios medidos manualmente)
 from datetime import datetime  # Importa a classe datetime para manipular datas e horas
-from typing import List, Tuple, Dict, Optional  # Importa tipos para anotação de tipagem (Type Hinting)
+from collections import Counter  # Importa Counter para contar os frames respondidos por cada tracker
+from concurrent.futures import ThreadPoolExecutor  # Importa o pool de threads para atualizar vários trackers em paralelo
+from typing import Callable, List, Tuple, Dict, Optional  # Importa tipos para anotação de tipagem (Type Hinting)
 
 logger = get_app_logger("tracking")  # Inicializa o logger específico para este módulo com o nome "tracking"
 
-def _create_tracker(tracker_type: str = "CSRT"):  # Define uma função auxiliar privada para criar o objeto Tracker do OpenCV
+STRIDE_TARGET_MOTION = 0.1  # Passo adaptativo: deslocamento desejado entre duas consultas ao tracker (fração da caixa)
+GATE_MARGIN = 0.5  # Portão de movimento: margem ao redor da caixa incluída na medida (fração da caixa, de cada lado)
+
+def _motion_energy(gray: np.ndarray, reference: np.ndarray, box) -> float:  # Diferença média (níveis de cinza) dentro e ao redor da caixa
+    x, y, w, h = box
+    mx, my = w * GATE_MARGIN, h * GATE_MARGIN  # Margem de cada lado
+    fh, fw = gray.shape[:2]
+    x0, y0 = max(0, int(x - mx)), max(0, int(y - my))
+    x1, y1 = min(fw, int(x + w + mx)), min(fh, int(y + h + my))
+    if x1 <= x0 or y1 <= y0:  # Caixa fora do frame: força a consulta ao tracker
+        return float("inf")
+    return float(cv2.absdiff(gray[y0:y1, x0:x1], reference[y0:y1, x0:x1]).mean())  # Uma única passada vetorizada
+
+def _create_tracker(tracker_type: str = "CSRT", usage: Optional[Counter] = None):  # Define uma função auxiliar privada para criar o objeto Tracker do OpenCV
     
     t = tracker_type.upper()  # Converte o tipo de tracker solicitado para maiúsculas para padronização
 
+    if t in CASCADE_NAMES:  # Cascata: KCF por padrão e CSRT nos trechos difíceis
+        return CascadeTracker(lambda: _create_tracker("KCF"), lambda: _create_tracker("CSRT"), usage)
     if t == "CSRT":  # Verifica se o tipo solicitado é CSRT (mais preciso, porém mais lento)
         if hasattr(cv2, "TrackerCSRT_create"):  # Verifica se a função de criação existe na raiz do cv2 (versões antigas)
             return cv2.TrackerCSRT_create()  # Cria e retorna o tracker CSRT
@@ -56,11 +92,46 @@ def track_single_object(  # Define a função principal de tracking que será ch
     save_csv: bool = False,  # Flag para decidir se salva o arquivo CSV com a trajetória
     pixels_per_meter: Optional[float] = None,  # Valor de calibração para converter pixels em metros (opcional)
     save_debug_images: bool = True,  # Flag para decidir se salva imagens de debug (bordas, movimento)
+    debug_every: Optional[int] = None,  # Painel de debug a cada N frames (em vez dos quartis)
+    debug_frames: Optional[List[int]] = None,  # Frames com painel de debug (em vez dos quartis; soma-se a debug_every)
+    debug_format: str = "png",  # Formato dos painéis: 'png', 'jpg' ou 'webp'
+    debug_quality: Optional[int] = None,  # Compressão do PNG (0-9) ou qualidade do JPEG/WebP (padrão do OpenCV)
+    initial_box: Optional[Tuple[int, int, int, int]] = None,  # ROI inicial (x, y, w, h) em pixels do vídeo original (dispensa a seleção manual)
+    headless: bool = False,  # Modo sem interface: não abre janelas do OpenCV (para servidores e execuções em lote)
+    queue_size: int = DEFAULT_QUEUE_SIZE,  # Tamanho das filas entre os estágios do pipeline (decodificação -> tracking -> gravação)
+    track_scale: float = 1.0,  # Escala do frame entregue ao tracker (ex.: 0.5 rastreia em metade da resolução)
+    search_window: Optional[float] = None,  # Rastreia só em uma janela de N vezes o tamanho da caixa (None = frame inteiro)
+    streaming: bool = False,  # Grava o CSV em blocos durante o tracking e mantém só estatísticas acumuladas (memória constante)
+    save_binary: bool = False,  # Salva a trajetória no formato binário compacto '.traj' (leitura com memória mapeada)
+    start_frame: Optional[int] = None,  # Primeiro frame do trecho a rastrear (a ROI inicial se refere a ele)
+    end_frame: Optional[int] = None,  # Frame final do trecho (exclusivo)
+    start_time: Optional[float] = None,  # Início do trecho em segundos (alternativa a start_frame)
+    end_time: Optional[float] = None,  # Fim do trecho em segundos (alternativa a end_frame)
+    max_stride: int = 1,  # Passo adaptativo: consulta o tracker a cada até N frames e interpola os demais (1 = desligado)
+    motion_gate: Optional[float] = None,  # Portão de movimento: abaixo dessa diferença média (níveis de cinza) o tracker não é consultado
+    reacquire: bool = False,  # Procura o objeto por template depois que o tracker o perde e reinicia o tracker
+    kalman: Optional[str] = None,  # Modelo de movimento ('cv' ou 'ca'): prevê a busca e gera as métricas filtradas (None = desligado)
+    kinematics: bool = False,  # Calcula a cinemática (aceleração, tranco, percentis, paradas) para o relatório e o CSV
+    profile_dump: Optional[str] = None,  # Perfil detalhado da execução: 'cprofile' (arquivo '.prof') ou 'trace' ('.trace.json')
+    progress: Optional[Callable[[Dict], None]] = None,  # Recebe o andamento (frames, total, FPS, tempo restante) a cada 0,25 s
+    cancel_event: Optional[threading.Event] = None,  # set() interrompe o tracking no frame seguinte (resultado parcial)
+    overlay: bool = False,  # Em vez de codificar o vídeo anotado, salva o '.traj' e um arquivo lateral para o player/export
 ) -> Dict:  # A função retorna um dicionário com as estatísticas
 
     if not os.path.isfile(video_path):  # Verifica se o arquivo de vídeo existe no caminho especificado
         raise FileNotFoundError(f"Vídeo não encontrado: {video_path}")  # Lança erro se o vídeo não existir
 
+    if headless and initial_box is None:  # Sem interface não há como selecionar a ROI com o mouse
+        raise ValueError("O modo headless exige uma ROI inicial (initial_box).")  # Lança erro explicativo
+
+    motion_filter = KalmanFilter(kalman) if kalman else None  # Modelo de movimento (valida o nome antes de abrir o vídeo)
+    if overlay:  # As anotações são desenhadas sob demanda a partir da trajetória binária
+        save_video = False
+        save_binary = True
+    debug_encode_params(debug_format, debug_quality)  # Valida o formato dos painéis antes de abrir o vídeo
+    if profile_dump is not None and profile_dump not in PROFILE_DUMPS:
+        raise ValueError(f"Perfil desconhecido: {profile_dump} (use {', '.join(PROFILE_DUMPS)})")
+
     os.makedirs(output_dir, exist_ok=True)  # Cria o diretório de saída se ele não existir (exist_ok=True evita erro se já existir)
 
     cap = cv2.VideoCapture(video_path)  # Abre o arquivo de vídeo para leitura usando OpenCV
@@ -78,40 +149,72 @@ def track_single_object(  # Define a função principal de tracking que será ch
     disp_w = int(width * scale)  # Calcula a largura de exibição baseada na escala
     disp_h = int(height * scale)  # Calcula a altura de exibição baseada na escala
 
-    ret, frame = cap.read()  # Lê o primeiro quadro do vídeo para permitir a seleção do objeto
+    segment = None  # Trecho [início, fim) em frames (None = vídeo inteiro)
+    if any(v is not None for v in (start_frame, end_frame, start_time, end_time)):  # Trecho pedido
+        try:
+            index = seek_index_for_range(video_path, start_frame, end_frame, start_time, end_time)  # Índice de busca até o trecho (salvo ao lado do vídeo)
+            segment = resolve_frame_range(index, start_frame, end_frame, start_time, end_time)  # Converte tempos em frames
+        except ValueError:
+            cap.release()  # Libera o vídeo
+            raise
+        seek_to_frame(cap, index, segment[0])  # Pula direto para o início do trecho
+
+    ret, frame = cap.read()  # Lê o primeiro quadro do vídeo (ou do trecho) para permitir a seleção do objeto
     if not ret or frame is None:  # Verifica se a leitura falhou
         cap.release()  # Libera o recurso de vídeo
         raise RuntimeError("Não foi possível ler o primeiro frame do vídeo.")  # Lança erro
 
-    if scale < 1.0:  # Se a escala for menor que 1 (precisa reduzir)
-        frame_disp = cv2.resize(frame, (disp_w, disp_h), interpolation=cv2.INTER_AREA)  # Redimensiona o frame para exibição
+    if initial_box is not None:  # Se a ROI inicial foi fornecida programaticamente (API, CLI ou sidecar JSON)
+        x, y, w, h = [int(v) for v in initial_box]  # Usa a caixa informada diretamente, já na escala original
+        if w <= 0 or h <= 0 or x < 0 or y < 0 or x + w > width or y + h > height:  # Valida se a caixa cabe no frame
+            cap.release()  # Libera o vídeo
+            raise ValueError(f"ROI inicial fora do frame ({width}x{height}): {initial_box}")  # Lança erro
     else:
-        frame_disp = frame.copy()  # Caso contrário, usa o frame original
-
-    # Abre uma janela para o usuário selecionar a Região de Interesse (ROI) - o objeto a rastrear
-    roi_scaled = cv2.selectROI(
-        "Selecione o objeto (ENTER/ESP para confirmar)",  # Título da janela
-        frame_disp,  # Imagem onde será feita a seleção
-        fromCenter=False,  # A seleção não começa do centro
-        showCrosshair=True,  # Mostra uma cruz para ajudar na mira
-    )
-    cv2.destroyWindow("Selecione o objeto (ENTER/ESP para confirmar)")  # Fecha a janela de seleção após confirmar
-
-    if roi_scaled == (0, 0, 0, 0):  # Verifica se a seleção foi vazia (usuário cancelou ou não selecionou nada)
-        cap.release()  # Libera o vídeo
-        raise RuntimeError("ROI inválida (talvez o usuário cancelou).")  # Lança erro
-
-    # Converte as coordenadas da ROI da escala de exibição de volta para a escala original do vídeo
-    x_s, y_s, w_s, h_s = roi_scaled  # Desempacota as coordenadas da ROI selecionada
-    x = int(x_s / scale)  # Calcula x original
-    y = int(y_s / scale)  # Calcula y original
-    w = int(w_s / scale)  # Calcula largura original
-    h = int(h_s / scale)  # Calcula altura original
+        if scale < 1.0:  # Se a escala for menor que 1 (precisa reduzir)
+            frame_disp = cv2.resize(frame, (disp_w, disp_h), interpolation=cv2.INTER_AREA)  # Redimensiona o frame para exibição
+        else:
+            frame_disp = frame.copy()  # Caso contrário, usa o frame original
+
+        # Abre uma janela para o usuário selecionar a Região de Interesse (ROI) - o objeto a rastrear
+        roi_scaled = cv2.selectROI(
+            "Selecione o objeto (ENTER/ESP para confirmar)",  # Título da janela
+            frame_disp,  # Imagem onde será feita a seleção
+            fromCenter=False,  # A seleção não começa do centro
+            showCrosshair=True,  # Mostra uma cruz para ajudar na mira
+        )
+        cv2.destroyWindow("Selecione o objeto (ENTER/ESP para confirmar)")  # Fecha a janela de seleção após confirmar
+
+        if roi_scaled == (0, 0, 0, 0):  # Verifica se a seleção foi vazia (usuário cancelou ou não selecionou nada)
+            cap.release()  # Libera o vídeo
+            raise RuntimeError("ROI inválida (talvez o usuário cancelou).")  # Lança erro
+
+        # Converte as coordenadas da ROI da escala de exibição de volta para a escala original do vídeo
+        x_s, y_s, w_s, h_s = roi_scaled  # Desempacota as coordenadas da ROI selecionada
+        x = int(x_s / scale)  # Calcula x original
+        y = int(y_s / scale)  # Calcula y original
+        w = int(w_s / scale)  # Calcula largura original
+        h = int(h_s / scale)  # Calcula altura original
     roi = (x, y, w, h)  # Cria a tupla da ROI original
     initial_box = roi  # Armazena a caixa inicial para referência futura
 
-    tracker = _create_tracker(tracker_type)  # Cria a instância do tracker escolhido
+    usage = Counter()  # Frames respondidos por cada tracker da cascata (compartilhado entre recriações pela janela de busca)
+    cascade = tracker_type.upper() in CASCADE_NAMES  # Só a cascata recebe o contador
+    make_tracker = lambda: build_tracker(  # Cria a instância do tracker escolhido (com escala reduzida / janela de busca, se pedidos)
+        lambda: _create_tracker(tracker_type, usage) if cascade else _create_tracker(tracker_type),
+        track_scale=track_scale, search_window=search_window,
+    )
+    tracker = make_tracker()
     tracker.init(frame, roi)  # Inicializa o tracker com o primeiro frame e a caixa delimitadora
+    recenters = 0  # Reposicionamentos da janela de busca dos trackers descartados na reaquisição
+    reacquirer = None  # Reaquisição por template (None = desligada)
+    if reacquire:
+        reacquirer = Reacquirer()
+        reacquirer.remember(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), roi)  # Template inicial: a própria ROI
+    lost_at = None  # Primeiro frame da perda atual do objeto
+    filtered_path = FilteredPath() if motion_filter is not None and streaming else None  # Métricas filtradas sem guardar a trajetória
+    filter_idx = -1  # Frame da última medição entregue ao filtro (o frame da ROI inicial é o -1)
+    if motion_filter is not None:
+        motion_filter.reset(roi[0] + roi[2] / 2.0, roi[1] + roi[3] / 2.0)
 
     base_name = os.path.splitext(os.path.basename(video_path))[0]  # Extrai o nome do arquivo de vídeo sem extensão
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")  # Gera um timestamp atual para nomear arquivos únicos
@@ -121,7 +224,12 @@ def track_single_object(  # Define a função principal de tracking que será ch
         debug_dir = os.path.join(output_dir, f"{base_name}_debug_{timestamp}")  # Define o caminho da pasta de debug
         os.makedirs(debug_dir, exist_ok=True)  # Cria a pasta de debug
     
-    logger.info(f"Iniciando tracking: vídeo={video_path}, tracker={tracker_type}")  # Registra no log o início do processo
+    run_id = uuid.uuid4().hex[:12]  # Identifica a execução nos eventos (várias execuções podem dividir o mesmo processo)
+    log_event(logger, "run_start", f"Iniciando tracking: vídeo={video_path}, tracker={tracker_type}",  # Registra no log o início do processo
+              run_id=run_id, video=video_path, tracker=tracker_type, initial_box=roi, segment=segment,
+              track_scale=track_scale, search_window=search_window, max_stride=max_stride, motion_gate=motion_gate,
+              reacquire=reacquire, kalman=kalman, streaming=streaming)
+    frame_log = FrameDebugLog(logger)  # Debug por frame (só com o nível DEBUG, no máximo uma mensagem por segundo)
 
     video_out_path: Optional[str] = None  # Inicializa o caminho do vídeo de saída
     writer = None  # Inicializa o objeto de escrita de vídeo
@@ -136,290 +244,779 @@ def track_single_object(  # Define a função principal de tracking que será ch
             (width, height),  # Resolução
         )
 
-    trajectory: List[Dict] = []  # Lista para armazenar os dados da trajetória frame a frame
     prev_center: Optional[Tuple[float, float]] = None  # Variável para guardar o centro do objeto no frame anterior
-    speeds_px: List[float] = []  # Lista para armazenar as velocidades instantâneas
-    total_distance_px = 0.0  # Acumulador da distância total percorrida
     frame_idx = 0  # Contador de frames processados
-    success_frames = 0  # Contador de frames onde o tracking foi bem-sucedido
 
     prev_gray: Optional[np.ndarray] = None  # Variável para guardar o frame anterior em escala de cinza (para debug)
-    debug_indices = set()  # Conjunto para armazenar os índices dos frames que serão salvos como debug
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)  # Obtém o total de frames do vídeo
-    if save_debug_images and total_frames > 0:  # Se debug ativo e vídeo tem frames
-        debug_indices.update(  # Adiciona frames específicos (início, meio, fim, quartos) para salvar
-            {
-                0,
-                max(0, total_frames // 4),
-                max(0, total_frames // 2),
-                max(0, 3 * total_frames // 4),
-                max(0, total_frames - 1),
-            }
-        )
-
-    cv2.namedWindow("Tracking", cv2.WINDOW_NORMAL)  # Cria a janela de exibição do tracking
-    cv2.resizeWindow("Tracking", disp_w, disp_h)  # Redimensiona a janela para o tamanho calculado
-
-    while True:  # Loop principal de processamento frame a frame
-        ret, frame = cap.read()  # Lê o próximo frame do vídeo
-        if not ret or frame is None:  # Se não houver mais frames ou erro de leitura
-            break  # Sai do loop
-        
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)  # Converte o frame atual para escala de cinza (usado no debug)
-        success, box = tracker.update(frame)  # Atualiza o tracker com o novo frame para encontrar o objeto
-
-        if success:  # Se o objeto foi encontrado com sucesso
-            success_frames += 1  # Incrementa contador de sucesso
-            x, y, w, h = [int(v) for v in box]  # Extrai as coordenadas da caixa delimitadora
-            cx = x + w / 2.0  # Calcula a coordenada X do centro
-            cy = y + h / 2.0  # Calcula a coordenada Y do centro
-
-            speed_px = 0.0  # Inicializa velocidade instantânea
-            if prev_center is not None:  # Se houver um centro anterior (não é o primeiro frame detectado)
-                dx = cx - prev_center[0]  # Calcula deslocamento em X
-                dy = cy - prev_center[1]  # Calcula deslocamento em Y
-                speed_px = float(math.hypot(dx, dy))  # Calcula a distância euclidiana (velocidade em px/frame)
-                speeds_px.append(speed_px)  # Adiciona à lista de velocidades
-                total_distance_px += speed_px  # Soma à distância total
-
-            prev_center = (cx, cy)  # Atualiza o centro anterior para o atual
-
-            trajectory.append(  # Adiciona os dados do frame atual à lista de trajetória
-                {
-                    "frame": frame_idx,
-                    "x": cx,
-                    "y": cy,
-                    "speed_px_per_frame": speed_px,
-                }
+    if segment is not None:  # Trecho: as estatísticas e o debug são relativos a ele
+        total_frames = segment[1] - segment[0]  # Frames do trecho
+    else:
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)  # Obtém o total de frames do vídeo
+    csv_path = None  # Caminho do CSV (será preenchido se salvarmos a trajetória)
+    if save_csv:  # Se opção de salvar CSV ativa
+        csv_filename = f"{base_name}_trajectory_{timestamp}.csv"  # Nome do arquivo de trajetória com timestamp
+        csv_path = os.path.join(output_dir, csv_filename)  # Monta o caminho completo para o CSV no diretório de saída
+    binary_path = None  # Caminho da trajetória binária (será preenchido se for pedida)
+    if save_binary:
+        binary_path = os.path.join(output_dir, f"{base_name}_trajectory_{timestamp}.traj")  # Mesmo nome do CSV, extensão '.traj'
+    if streaming:  # Modo streaming: o CSV e o binário são gravados em blocos durante o loop e a trajetória não fica na memória
+        binary_writer = TrajectoryFileWriter(binary_path, fps, width, height) if binary_path else None
+        trajectory = StreamingTrajectory(csv_path, binary=binary_writer, interpolated_column=max_stride > 1)
+    else:
+        trajectory = TrajectoryStore(total_frames or 1024)  # Trajetória em colunas, pré-alocada com o total de frames do vídeo
+    is_debug_frame = lambda idx: False  # Indica os frames que recebem painel de debug
+    if save_debug_images:  # Quartis do vídeo (início, quartos, meio e fim), um a cada N frames ou frames pedidos
+        is_debug_frame = debug_frame_selector(total_frames, debug_every, debug_frames)
+
+    if not headless:  # A janela de exibição só existe no modo interativo
+        cv2.namedWindow("Tracking", cv2.WINDOW_NORMAL)  # Cria a janela de exibição do tracking
+        cv2.resizeWindow("Tracking", disp_w, disp_h)  # Redimensiona a janela para o tamanho calculado
+
+    speed_px = 0.0  # Velocidade instantânea do último frame rastreado (usada no HUD e no debug)
+    max_frames = total_frames - 1 if segment is not None else None  # Frames após o de inicialização até o fim do trecho
+    profiler = RunProfiler(trace=profile_dump == "trace")  # Cronômetros por estágio (sempre ligados: custo de ~1 µs por medição)
+    read_timer, gray_timer, gate_timer, update_timer = (profiler.stage(n) for n in ("read_wait", "gray", "gate", "tracker"))
+    reacquire_timer, kalman_timer, draw_timer = (profiler.stage(n) for n in ("reacquire", "kalman", "draw"))
+    submit_timer, display_timer = profiler.stage("output_wait"), profiler.stage("display")
+    buffers = BufferPool()  # Frames e cinzas reaproveitados: cada dono devolve o buffer ao terminar de usá-lo
+    timed_write = profiler.timed("write", writer.write) if writer is not None else None  # Gravação medida na thread de saída
+    def write_frame(f):  # Grava o frame e o devolve ao pool (na thread de saída)
+        timed_write(f)
+        buffers.release(f)
+    disp_buf = np.empty((disp_h, disp_w, 3), dtype=np.uint8) if not headless and scale < 1.0 else None  # Frame da janela
+    reader = FrameReader(cap, queue_size, max_frames, profiler, buffers).start()  # Estágio 1: decodificação antecipada em outra thread
+    output = OutputStage(queue_size).start()  # Estágio 3: gravação do vídeo em outra thread
+    debug_writer = None  # Pool que monta e grava os painéis de debug (fora do loop e da gravação do vídeo)
+    if debug_dir is not None:
+        debug_writer = DebugPanelWriter(debug_dir, debug_format, debug_quality, queue_size=queue_size,
+                                        timer=profiler.stage("debug_panel"), release=buffers.release).start()
+    loop_failed = False  # Indica se o loop de tracking terminou com uma exceção
+
+    max_stride = max(1, int(max_stride))  # Passo máximo do modo adaptativo (1 = tracker em todos os frames)
+    stride = 1  # Passo atual: o tracker é consultado a cada 'stride' frames
+    last_idx, last_box = -1, roi  # Último frame medido pelo tracker e sua caixa (o frame da ROI inicial é o -1)
+    pending = []  # Frames pulados aguardando a próxima medição: (índice, frame, cinza)
+    tracker_updates = 0  # Quantas vezes o tracker foi consultado
+    gate_reference = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if motion_gate is not None else None  # Frame da última consulta (cinza)
+    last_ok = True  # A última consulta encontrou o objeto (o portão só repete caixas válidas)
+    gated_frames = 0  # Frames em que o portão manteve a caixa sem consultar o tracker
+    stop = False  # ESC ou janela fechada no modo interativo
+    cancelled = False  # Tracking interrompido pelo cancel_event
+    reporter = ProgressReporter(progress, max(0, total_frames - 1))  # Andamento (o frame da ROI inicial não conta)
+    run_profile = cProfile.Profile() if profile_dump == "cprofile" else None  # Perfil detalhado (apenas a thread principal)
+    if run_profile is not None:
+        run_profile.enable()
+
+    try:
+        while not stop:  # Loop principal de processamento frame a frame (estágio 2: tracking)
+            reporter.update(frame_idx)  # Avisa o andamento (no máximo a cada 0,25 s)
+            if cancel_event is not None and cancel_event.is_set():  # Cancelamento pedido por quem chamou
+                cancelled = True
+                logger.info(f"Tracking cancelado no frame {frame_idx}")
+                break
+            with read_timer:  # Espera pelo estágio de decodificação
+                frame = reader.read()  # Obtém o próximo frame já decodificado
+            if frame is None:  # Se não houver mais frames ou erro de leitura
+                if not pending:
+                    break  # Sai do loop
+                current, frame, gray = pending.pop()  # Fim do vídeo com frames pulados: mede o último deles
+            else:
+                with gray_timer:
+                    gray = buffers.acquire(frame.shape[:2])  # Converte o frame atual para escala de cinza, em um buffer reaproveitado
+                    cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+                current = frame_idx  # Índice do frame
+                frame_idx += 1  # Incrementa o contador de frames
+                if current - last_idx < stride:  # Passo adaptativo: o frame é pulado e terá a posição interpolada
+                    pending.append((current, frame, gray))
+                    continue
+
+            gated = False  # O portão dispensou o tracker neste frame?
+            if gate_reference is not None and last_ok:
+                with gate_timer:
+                    gated = _motion_energy(gray, gate_reference, last_box) < motion_gate  # Cena parada ao redor da caixa
+            if gated:
+                box = last_box  # Mantém a caixa anterior sem consultar o tracker
+                gated_frames += 1
+            else:
+                with update_timer:
+                    success, box = tracker.update(frame)  # Atualiza o tracker com o novo frame para encontrar o objeto
+                tracker_updates += 1
+                box = tuple(int(v) for v in box) if success else None  # Caixa delimitadora (None = objeto perdido)
+                frame_log.debug(current, "caixa=%s, passo=%d", box, stride)
+                if reacquirer is not None:
+                    if box is not None:  # Caixa confiável: atualiza o template
+                        reacquirer.remember(gray, box)
+                        lost_at = None
+                    else:
+                        lost_at = current if lost_at is None else lost_at
+                        around = None  # Centro da busca: a posição prevista pelo modelo de movimento (ou a última caixa)
+                        if motion_filter is not None:
+                            px, py = motion_filter.peek(current - filter_idx)
+                            around = (px - last_box[2] / 2.0, py - last_box[3] / 2.0, last_box[2], last_box[3])
+                        with reacquire_timer:
+                            found = reacquirer.search(gray, around)  # Janela crescente e, sem sucesso, o frame inteiro
+                        if found is not None:  # Objeto reencontrado: reinicia o tracker na caixa encontrada
+                            box, score, stage = found
+                            recenters += getattr(tracker, "recenters", 0)
+                            tracker = make_tracker()
+                            tracker.init(frame, box)
+                            reacquirer.remember(gray, box)
+                            reacquirer.events.append({"frame": current, "lost_since": lost_at, "score": round(score, 3),
+                                                      "stage": stage, "box": box})
+                            log_event(logger, "reacquired", f"Objeto reencontrado no frame {current} (perdido desde o frame "
+                                      f"{lost_at}, pontuação {score:.2f}, busca: {stage})", run_id=run_id,
+                                      **reacquirer.events[-1])
+                            lost_at = None
+                            if motion_filter is not None:  # Depois de um salto, a velocidade anterior não vale mais
+                                motion_filter.reset(box[0] + box[2] / 2.0, box[1] + box[3] / 2.0)
+                                filter_idx = current
+                                if filtered_path is not None:
+                                    filtered_path.add(box[0] + box[2] / 2.0, box[1] + box[3] / 2.0)
+                last_ok = box is not None
+                if gate_reference is not None:  # A energia é medida em relação ao frame da última consulta
+                    buffers.retain(gray)  # O portão passa a ser dono do cinza (e devolve o anterior)
+                    buffers.release(gate_reference)
+                    gate_reference = gray
+
+            if motion_filter is not None and box is not None and filter_idx != current:  # Medição para o modelo de movimento
+                with kalman_timer:
+                    motion_filter.predict(current - filter_idx)
+                    fx, fy = motion_filter.update(box[0] + box[2] / 2.0, box[1] + box[3] / 2.0)
+                filter_idx = current
+                if filtered_path is not None:
+                    filtered_path.add(fx, fy)
+                if hasattr(tracker, "velocity"):  # Janela de busca: adianta o recorte na direção do movimento previsto
+                    tracker.velocity = motion_filter.velocity
+
+            ready = []  # Frames a registrar, em ordem: (índice, frame, cinza, caixa, pulado pelo passo adaptativo)
+            for idx, pframe, pgray in pending:  # Frames pulados desde a última medição
+                if box is not None:  # Interpola linearmente entre a última caixa medida e a atual
+                    t = (idx - last_idx) / (current - last_idx)
+                    ready.append((idx, pframe, pgray, tuple(a + (b - a) * t for a, b in zip(last_box, box)), True))
+                else:  # Sem a caixa final não há como interpolar: os frames ficam sem posição e não avaliados
+                    ready.append((idx, pframe, pgray, None, True))
+            pending = []
+            ready.append((current, frame, gray, box, False))
+
+            if max_stride > 1:  # Ajusta o passo pelo deslocamento medido (em tamanhos de caixa por frame)
+                if box is None:  # Falha: volta a consultar o tracker em todos os frames
+                    stride = 1
+                else:
+                    motion = math.hypot(box[0] + box[2] / 2.0 - last_box[0] - last_box[2] / 2.0,
+                                        box[1] + box[3] / 2.0 - last_box[1] - last_box[3] / 2.0)
+                    motion /= (current - last_idx) * max(box[2], box[3], 1)
+                    target = int(STRIDE_TARGET_MOTION / motion) if motion > 0 else max_stride  # Passo que mantém o deslocamento por medição
+                    stride = max(1, min(max_stride, 2 * stride, target))  # Cresce no máximo dobrando
+            if box is not None:
+                last_box = box
+            last_idx = current
+
+            for idx, frame, gray, box, interpolated in ready:  # Registro, desenho e gravação de cada frame, em ordem
+                draw_start = perf_counter()  # Registro da trajetória, caixa e HUD
+                annotate = writer is not None or not headless or (debug_writer is not None and is_debug_frame(idx))  # Frame será visto?
+                if box is not None:  # Se o objeto tem posição (medida ou interpolada)
+                    cx = box[0] + box[2] / 2.0  # Calcula a coordenada X do centro
+                    cy = box[1] + box[3] / 2.0  # Calcula a coordenada Y do centro
+                    trajectory.append(idx, cx, cy, box[2], box[3], True, interpolated)  # Grava a linha do frame nas colunas da trajetória
+
+                    speed_px = 0.0  # Velocidade instantânea (apenas para o HUD e o debug; as métricas são calculadas no fim)
+                    if prev_center is not None:  # Se houver um centro anterior (não é o primeiro frame detectado)
+                        speed_px = math.hypot(cx - prev_center[0], cy - prev_center[1])  # Distância até o centro anterior
+                    prev_center = (cx, cy)  # Atualiza o centro anterior para o atual
+                    if annotate:  # Alguém vai ver o frame (vídeo, janela ou debug)
+                        draw_tracking_overlay(frame, idx, box, interpolated, speed_px, fps)  # Caixa, centro e HUD
+                else:  # Se o tracking falhou neste frame
+                    trajectory.append_lost(idx, interpolated)  # Registra o frame sem posição (pulado = não avaliado)
+                    if annotate:  # Alguém vai ver o frame (vídeo, janela ou debug)
+                        draw_lost_overlay(frame)  # Escreve aviso de falha
+
+                draw_timer.add(perf_counter() - draw_start, draw_start)
+
+                # Bloco para salvar imagens de debug (se ativado e for um frame selecionado)
+                if debug_writer is not None and is_debug_frame(idx):
+                    for buf in (frame, gray, prev_gray):  # O pool de debug devolve os buffers depois do painel
+                        buffers.retain(buf)
+                    with submit_timer:
+                        debug_writer.submit(idx, frame, gray, prev_gray, speed_px)  # Montado e gravado no pool de debug
+
+                buffers.release(prev_gray)  # Buffer duplo: o cinza anterior volta ao pool e o atual passa a ser o anterior
+                prev_gray = gray  # Atualiza o frame anterior para a próxima iteração
+
+                if writer is not None:  # Se estiver gravando vídeo
+                    buffers.retain(frame)  # A thread de saída devolve o frame depois de gravá-lo
+                    with submit_timer:  # Espera por espaço na fila do estágio de saída (backpressure)
+                        output.submit(write_frame, frame)  # Escreve o frame processado no arquivo de vídeo (no estágio de saída)
+
+                if not headless:  # No modo headless não há redimensionamento de exibição nem espera por teclas
+                    display_start = perf_counter()  # Redimensionamento, exibição e espera por teclas
+                    if scale < 1.0:  # Se precisar redimensionar para exibir na tela (no mesmo buffer a cada frame)
+                        frame_disp = cv2.resize(frame, (disp_w, disp_h), dst=disp_buf, interpolation=cv2.INTER_AREA)
+                    else:
+                        frame_disp = frame
+
+                    cv2.imshow("Tracking", frame_disp)  # Mostra o frame na janela
+
+                    key = cv2.waitKey(1) & 0xFF  # Aguarda 1ms por uma tecla
+                    display_timer.add(perf_counter() - display_start, display_start)
+                    if key == 27:  # Se a tecla for ESC (código 27)
+                        stop = True  # Interrompe o loop
+                        break
+
+                    if cv2.getWindowProperty("Tracking", cv2.WND_PROP_VISIBLE) < 1:  # Se a janela for fechada pelo 'X'
+                        stop = True  # Interrompe o loop
+                        break
+
+                buffers.release(frame)  # O loop terminou de usar o frame: o decodificador pode reaproveitá-lo
+
+    except BaseException as e:  # Erro no loop de tracking: ele tem prioridade sobre erros da gravação
+        loop_failed = True  # Marca a falha para não mascarar a exceção original no fechamento
+        log_event(logger, "run_failed", f"Tracking interrompido no frame {frame_idx}: {type(e).__name__}: {e}",
+                  level=logging.ERROR, run_id=run_id, frame=frame_idx, error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        reader.stop()  # Interrompe a decodificação (ex.: ESC antes do fim do vídeo)
+        try:
+            with profiler.stage("output_drain"):  # Gravações que ainda estavam na fila no fim do loop
+                try:
+                    output.close(raise_errors=not loop_failed)  # Espera as gravações pendentes terminarem
+                finally:
+                    if debug_writer is not None:  # Painéis de debug ainda na fila
+                        debug_writer.close(raise_errors=not loop_failed)
+        finally:
+            cap.release()  # Libera o arquivo de vídeo de entrada
+            if writer is not None:  # Se houver gravador de vídeo
+                writer.release()  # Finaliza e salva o arquivo de vídeo
+            if streaming:  # Grava o último bloco do CSV
+                trajectory.close()
+            if run_profile is not None:
+                run_profile.disable()
+    profiler.finish(frame_idx)  # Fim da medição do loop (FPS efetivo)
+    profiler.counters.update(buffers.stats())  # Buffers de imagem alocados x reaproveitados
+
+    if not headless:  # Só há janelas para fechar no modo interativo
+        cv2.destroyAllWindows()  # Fecha todas as janelas do OpenCV
+
+    filtered = filtered_path  # Trajetória filtrada: suavização RTS (offline) ou o filtro acumulado no modo streaming
+    if motion_filter is not None and not streaming:
+        filtered = smooth_trajectory(trajectory, kalman)
+
+    kinematics_series = kinematics_summary = None  # Cinemática detalhada (precisa da trajetória inteira na memória)
+    if kinematics and streaming:
+        logger.warning("Cinemática indisponível no modo streaming: use 'metrics --kinematics' sobre o '.traj' gravado")
+    elif kinematics:
+        kinematics_series, kinematics_summary = trajectory_kinematics(trajectory)
+
+    # Cálculos finais de estatísticas (velocidades, distâncias e conversões em uma passada vetorizada)
+    stats = build_stats(
+        trajectory, frame_idx, fps, pixels_per_meter, filtered=filtered,
+        video_input=video_path,  # Caminho do vídeo original analisado
+        tracker_type=tracker_type,  # Tipo de algoritmo de rastreamento utilizado (CSRT/KCF)
+        frame_width=width,  # Largura do frame do vídeo
+        frame_height=height,  # Altura do frame do vídeo
+        initial_box=initial_box,  # Coordenadas iniciais da caixa delimitadora (ROI)
+        track_scale=track_scale,  # Escala do frame usada pelo tracker (1.0 = resolução original)
+        search_window=search_window,  # Tamanho da janela de busca em múltiplos da caixa (None = frame inteiro)
+        search_window_recenters=recenters + getattr(tracker, "recenters", 0),  # Quantas vezes a janela de busca foi reposicionada
+        start_frame=segment[0] if segment else None,  # Primeiro frame do trecho (frame da ROI inicial)
+        end_frame=segment[1] if segment else None,  # Frame final do trecho (exclusivo)
+        max_stride=max_stride,  # Passo máximo do modo adaptativo (1 = tracker em todos os frames)
+        tracker_updates=tracker_updates,  # Quantas vezes o tracker foi consultado
+        motion_gate=motion_gate,  # Limiar do portão de movimento (None = desligado)
+        gated_frames=gated_frames,  # Frames em que o portão manteve a caixa sem consultar o tracker
+        # Consultas respondidas por cada tracker (na cascata, KCF e CSRT separados) e escalonamentos KCF -> CSRT
+        tracker_frames={k: v for k, v in usage.items() if k != "escalations"} or {tracker_type.upper(): tracker_updates},
+        cascade_escalations=usage["escalations"],
+        reacquire=reacquire,  # Reaquisição por template ligada?
+        reacquisition_events=reacquirer.events if reacquirer else [],  # Frame, início da perda, pontuação e etapa de cada reaquisição
+        kalman=motion_filter.model if motion_filter else None,  # Modelo de movimento (None = desligado)
+        kalman_smoother="RTS" if motion_filter is not None and not streaming else None,  # Suavização offline das métricas filtradas
+        kinematics=kinematics_summary,  # Resumo da cinemática (None = não calculada)
+    )
+    stats["trajectory"] = None if streaming else trajectory  # Trajetória em colunas (TrajectoryStore); None no modo streaming
+    stats["video_output"] = video_out_path  # Caminho do vídeo gerado com as anotações
+    stats["debug_dir"] = debug_dir  # Diretório onde as imagens de debug foram salvas
+    stats["cancelled"] = cancelled  # Interrompido pelo cancel_event (resultado parcial)
+    stats["run_id"] = run_id  # Identificador da execução nos eventos do log
+    stats["profile"] = profiler.summary()  # Tempos por estágio, FPS efetivo e pico de memória
+    stats["profile_output"] = None  # Arquivo do perfil detalhado (None = não pedido)
+    if run_profile is not None:  # Perfil do cProfile: abrir com 'python -m pstats' ou snakeviz
+        stats["profile_output"] = os.path.join(output_dir, f"{base_name}_profile_{timestamp}.prof")
+        run_profile.dump_stats(stats["profile_output"])
+    elif profile_dump == "trace":  # Trace de eventos: abrir em chrome://tracing ou ui.perfetto.dev
+        stats["profile_output"] = os.path.join(output_dir, f"{base_name}_profile_{timestamp}.trace.json")
+        profiler.write_trace(stats["profile_output"])
+
+    if csv_path:  # Se opção de salvar CSV ativa
+        if not streaming:  # No modo streaming o CSV já foi gravado durante o loop
+            trajectory.write_csv(  # Formata e grava todas as linhas de uma vez (com as colunas de cinemática, se pedidas)
+                csv_path, interpolated_column=max_stride > 1,
+                extra_columns=kinematics_columns(kinematics_series) if kinematics_series else None,
             )
+        stats["csv_output"] = csv_path  # Registra o caminho do CSV gerado dentro do dicionário de estatísticas
+    if binary_path:  # Se a trajetória binária foi pedida
+        if not streaming:  # No modo streaming o binário já foi gravado durante o loop
+            trajectory.write_binary(binary_path, fps, width, height)  # Grava os registros de uma vez
+        stats["binary_output"] = binary_path  # Registra o caminho do arquivo binário
+    stats["overlay_output"] = None  # Arquivo lateral das anotações (None = não pedido)
+    if overlay:  # Vídeo original + trajetória: o player e o 'export' redesenham caixa, centro e HUD
+        stats["overlay_output"] = overlay_path_for(output_dir, base_name, timestamp)
+        write_overlay_sidecar(stats["overlay_output"], video_path, binary_path, segment[0] if segment else 0,
+                              frame_idx, fps, width, height, tracker_type)
+    
+    report_filename = f"{base_name}_relatorio_{timestamp}.txt"  # Nome do arquivo de relatório textual com timestamp
+    report_path = os.path.join(output_dir, report_filename)  # Constroi o caminho completo do relatório no diretório de saída
 
-            cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)  # Desenha o retângulo verde ao redor do objeto
-            cv2.circle(frame, (int(cx), int(cy)), 4, (0, 0, 255), -1)  # Desenha um ponto vermelho no centro do objeto
-
-            speed_px_s = speed_px * fps if fps > 0 else 0.0  # Calcula velocidade em pixels por segundo
-            hud_lines = [  # Prepara as linhas de texto para o HUD (Heads-Up Display)
-                f"Frame: {frame_idx}",
-                f"Vel: {speed_px:.2f} px/frame  ({speed_px_s:.2f} px/s)",
-            ]
-            y0 = 25  # Posição Y inicial do texto
-            for i, text in enumerate(hud_lines):  # Itera sobre as linhas de texto
-                cv2.putText(  # Escreve o texto no frame
-                    frame,
-                    text,
-                    (10, y0 + i * 22),  # Posição
-                    cv2.FONT_HERSHEY_SIMPLEX,  # Fonte
-                    0.6,  # Tamanho
-                    (255, 255, 255),  # Cor (Branco)
-                    2,  # Espessura
-                )
-        else:  # Se o tracking falhou neste frame
-            cv2.putText(  # Escreve aviso de falha
-                frame,
-                "Tracking perdido",
-                (10, 25),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.7,
-                (0, 0, 255),  # Cor (Vermelho)
-                2,
-            )
-        
-        # Bloco para salvar imagens de debug (se ativado e for um frame selecionado)
-        if save_debug_images and debug_dir is not None and (frame_idx in debug_indices):
-            edges = cv2.Canny(gray, 100, 200)  # Aplica filtro de Canny para detectar bordas
-            edges_bgr = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)  # Converte bordas para BGR para poder juntar com imagem colorida
-
-            if prev_gray is not None:  # Se houver frame anterior
-                diff = cv2.absdiff(gray, prev_gray)  # Calcula a diferença absoluta entre frames (movimento)
-                diff_norm = cv2.normalize(diff, None, 0, 255, cv2.NORM_MINMAX)  # Normaliza para visualizar melhor
-            else:
-                diff_norm = np.zeros_like(gray)  # Se não, cria imagem preta
-            diff_bgr = cv2.cvtColor(diff_norm, cv2.COLOR_GRAY2BGR)  # Converte diferença para BGR
+    stats["report_path"] = report_path  # Adiciona caminho do relatório às estatísticas retornadas
+    write_report(report_path, stats)  # Escreve o relatório a partir das estatísticas
 
-            panel = np.hstack([frame, edges_bgr, diff_bgr])  # Junta as 3 imagens horizontalmente (Original, Bordas, Movimento)
-            
-            txt = f"frame={frame_idx} | vel={speed_px:.2f}"  # Texto informativo
-            cv2.putText(panel, txt, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)  # Escreve no painel
+    # Registra no log o sucesso da operação
+    log_event(  # Escreve no log uma mensagem resumindo o tracking feito
+        logger, "run_end",
+        f"Tracking concluído: frames={frame_idx}, "
+        f"FPS={fps:.2f}, dist_total_px={stats['total_distance_px']:.2f}",
+        run_id=run_id, frames=frame_idx, cancelled=cancelled, success_rate=round(stats["success_rate"], 4),
+        effective_fps=round(stats["profile"]["effective_fps"], 2), wall_seconds=round(stats["profile"]["wall_seconds"], 3),
+        peak_rss_mb=stats["profile"]["peak_rss_mb"], report=report_path,
+    )
+    logger.info(f"Relatório salvo em: {report_path}")  # Informa no log onde o relatório foi armazenado
+    reporter.finish(frame_idx, cancelled)  # Último aviso de andamento (relatório já gravado)
 
-            debug_name = os.path.join(debug_dir, f"debug_frame_{frame_idx:05d}.png")  # Define nome do arquivo
-            cv2.imwrite(debug_name, panel)  # Salva a imagem no disco
-        
-        prev_gray = gray  # Atualiza o frame anterior para a próxima iteração
+    return stats  # Retorna o dicionário com todas as estatísticas coletadas
 
-        if writer is not None:  # Se estiver gravando vídeo
-            writer.write(frame)  # Escreve o frame processado no arquivo de vídeo
+# Cores (BGR) usadas para diferenciar os objetos no HUD do tracking de vários objetos
+OBJECT_COLORS = [
+    (0, 255, 0),  # Verde
+    (255, 128, 0),  # Azul
+    (0, 165, 255),  # Laranja
+    (255, 0, 255),  # Magenta
+    (0, 255, 255),  # Amarelo
+    (255, 255, 0),  # Ciano
+    (128, 0, 255),  # Rosa
+    (0, 0, 255),  # Vermelho
+]
+
+def track_multiple_objects(  # Rastreia vários objetos no mesmo vídeo, decodificando cada frame uma única vez
+    video_path: str,  # Caminho do arquivo de vídeo de entrada
+    output_dir: str,  # Diretório onde os resultados serão salvos
+    tracker_type: str = "CSRT",  # Algoritmo de tracking a ser usado (o mesmo para todos os objetos)
+    save_video: bool = True,  # Flag para decidir se salva o vídeo processado
+    save_csv: bool = False,  # Flag para decidir se salva o arquivo CSV com as trajetórias
+    pixels_per_meter: Optional[float] = None,  # Valor de calibração para converter pixels em metros (opcional)
+    initial_boxes: Optional[List[Tuple[int, int, int, int]]] = None,  # ROIs iniciais (x, y, w, h) de cada objeto (dispensa a seleção manual)
+    headless: bool = False,  # Modo sem interface: não abre janelas do OpenCV
+    queue_size: int = DEFAULT_QUEUE_SIZE,  # Tamanho das filas entre os estágios do pipeline
+    max_workers: Optional[int] = None,  # Threads que atualizam os trackers em paralelo (padrão: um por objeto)
+) -> Dict:  # A função retorna um dicionário com as estatísticas gerais e a lista "objects" com as de cada objeto
 
-        if scale < 1.0:  # Se precisar redimensionar para exibir na tela
-            frame_disp = cv2.resize(frame, (disp_w, disp_h), interpolation=cv2.INTER_AREA)
-        else:
-            frame_disp = frame
+    if not os.path.isfile(video_path):  # Verifica se o arquivo de vídeo existe no caminho especificado
+        raise FileNotFoundError(f"Vídeo não encontrado: {video_path}")  # Lança erro se o vídeo não existir
 
-        cv2.imshow("Tracking", frame_disp)  # Mostra o frame na janela
+    if headless and not initial_boxes:  # Sem interface não há como selecionar as ROIs com o mouse
+        raise ValueError("O modo headless exige as ROIs iniciais (initial_boxes).")  # Lança erro explicativo
 
-        key = cv2.waitKey(1) & 0xFF  # Aguarda 1ms por uma tecla
-        if key == 27:  # Se a tecla for ESC (código 27)
-            break  # Interrompe o loop
+    os.makedirs(output_dir, exist_ok=True)  # Cria o diretório de saída se ele não existir
 
-        if cv2.getWindowProperty("Tracking", cv2.WND_PROP_VISIBLE) < 1:  # Se a janela for fechada pelo 'X'
-            break  # Interrompe o loop
+    cap = cv2.VideoCapture(video_path)  # Abre o arquivo de vídeo para leitura usando OpenCV
+    if not cap.isOpened():  # Verifica se o vídeo foi aberto com sucesso
+        raise RuntimeError(f"Não foi possível abrir o vídeo: {video_path}")  # Lança erro se falhar ao abrir
 
-        frame_idx += 1  # Incrementa o contador de frames
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0  # Obtém a taxa de quadros por segundo (FPS) do vídeo
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))  # Obtém a largura dos quadros do vídeo
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))  # Obtém a altura dos quadros do vídeo
 
-    cap.release()  # Libera o arquivo de vídeo de entrada
-    if writer is not None:  # Se houver gravador de vídeo
-        writer.release()  # Finaliza e salva o arquivo de vídeo
-    cv2.destroyAllWindows()  # Fecha todas as janelas do OpenCV
+    scale = min(960 / width, 540 / height, 1.0)  # Fator de escala da janela de exibição (mesmos limites do tracking de um objeto)
+    disp_w = int(width * scale)  # Largura de exibição
+    disp_h = int(height * scale)  # Altura de exibição
+
+    ret, frame = cap.read()  # Lê o primeiro quadro do vídeo para inicializar os trackers
+    if not ret or frame is None:  # Verifica se a leitura falhou
+        cap.release()  # Libera o recurso de vídeo
+        raise RuntimeError("Não foi possível ler o primeiro frame do vídeo.")  # Lança erro
 
-    # Cálculos finais de estatísticas
-    mean_speed_px = float(np.mean(speeds_px)) if speeds_px else 0.0  # Calcula velocidade média em pixels
-    max_speed_px = float(np.max(speeds_px)) if speeds_px else 0.0  # Calcula velocidade máxima em pixels
+    if initial_boxes:  # ROIs fornecidas programaticamente (API, CLI ou sidecar JSON)
+        boxes = [tuple(int(v) for v in b) for b in initial_boxes]  # Normaliza as caixas para inteiros
+        for b in boxes:  # Valida se cada caixa cabe no frame
+            x, y, w, h = b
+            if w <= 0 or h <= 0 or x < 0 or y < 0 or x + w > width or y + h > height:
+                cap.release()  # Libera o vídeo
+                raise ValueError(f"ROI inicial fora do frame ({width}x{height}): {b}")  # Lança erro
+    else:  # Seleção manual de várias ROIs em uma única janela
+        frame_disp = cv2.resize(frame, (disp_w, disp_h), interpolation=cv2.INTER_AREA) if scale < 1.0 else frame.copy()
+        title = "Selecione os objetos (ENTER confirma cada um, ESC finaliza)"  # Título da janela de seleção
+        rois_scaled = cv2.selectROIs(title, frame_disp, fromCenter=False, showCrosshair=True)  # Seleção de várias ROIs
+        cv2.destroyWindow(title)  # Fecha a janela de seleção
+        boxes = [tuple(int(v / scale) for v in r) for r in rois_scaled if r[2] > 0 and r[3] > 0]  # Converte para a escala original
+        if not boxes:  # Nenhuma ROI válida selecionada
+            cap.release()  # Libera o vídeo
+            raise RuntimeError("Nenhuma ROI selecionada (talvez o usuário cancelou).")  # Lança erro
+
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)  # Total de frames do vídeo (pré-alocação das trajetórias)
+    trackers = []  # Um tracker por objeto
+    for b in boxes:  # Cria e inicializa cada tracker no primeiro frame
+        t = _create_tracker(tracker_type)
+        t.init(frame, b)
+        trackers.append(t)
+
+    # Estado de cada objeto (trajetória em colunas e último centro, como no tracking de um objeto)
+    objects = [
+        {"initial_box": b, "color": OBJECT_COLORS[i % len(OBJECT_COLORS)],
+         "trajectory": TrajectoryStore(total_frames or 1024), "prev_center": None}
+        for i, b in enumerate(boxes)
+    ]
+
+    base_name = os.path.splitext(os.path.basename(video_path))[0]  # Extrai o nome do arquivo de vídeo sem extensão
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")  # Gera um timestamp atual para nomear arquivos únicos
+    logger.info(f"Iniciando tracking de {len(boxes)} objetos: vídeo={video_path}, tracker={tracker_type}")
+
+    video_out_path: Optional[str] = None  # Caminho do vídeo de saída
+    writer = None  # Objeto de escrita de vídeo
+    if save_video:  # Se a opção de salvar vídeo estiver ativa
+        video_out_path = os.path.join(output_dir, f"{base_name}_multi_tracking_{timestamp}.mp4")  # Caminho do vídeo anotado
+        writer = cv2.VideoWriter(video_out_path, cv2.VideoWriter_fourcc(*"mp4v"), fps if fps > 0 else 30.0, (width, height))
+
+    if not headless:  # A janela de exibição só existe no modo interativo
+        cv2.namedWindow("Tracking", cv2.WINDOW_NORMAL)  # Cria a janela de exibição do tracking
+        cv2.resizeWindow("Tracking", disp_w, disp_h)  # Redimensiona a janela para o tamanho calculado
+
+    frame_idx = 0  # Contador de frames processados
+    reader = FrameReader(cap, queue_size).start()  # Decodificação antecipada (um único decode para todos os objetos)
+    output = OutputStage(queue_size).start()  # Gravação do vídeo em outra thread
+    pool = ThreadPoolExecutor(max_workers=max_workers or len(trackers))  # Threads dos trackers (o OpenCV libera o GIL no update)
+    loop_failed = False  # Indica se o loop terminou com uma exceção
+
+    try:
+        while True:  # Loop principal de processamento frame a frame
+            frame = reader.read()  # Obtém o próximo frame já decodificado
+            if frame is None:  # Fim do vídeo
+                break
+
+            results = list(pool.map(lambda t: t.update(frame), trackers))  # Atualiza todos os trackers em paralelo
+
+            hud_lines = [f"Frame: {frame_idx}"]  # Linhas do HUD (uma por objeto)
+            for i, (obj, (success, box)) in enumerate(zip(objects, results)):  # Processa o resultado de cada objeto
+                color = obj["color"]  # Cor do objeto
+                if success:  # Objeto encontrado neste frame
+                    x, y, w, h = [int(v) for v in box]  # Coordenadas da caixa
+                    cx = x + w / 2.0  # Centro X
+                    cy = y + h / 2.0  # Centro Y
+                    obj["trajectory"].append(frame_idx, cx, cy, w, h, True)  # Grava a linha do frame
+
+                    speed_px = 0.0  # Velocidade instantânea (apenas para o HUD)
+                    if obj["prev_center"] is not None:  # Se houver um centro anterior
+                        speed_px = math.hypot(cx - obj["prev_center"][0], cy - obj["prev_center"][1])
+                    obj["prev_center"] = (cx, cy)  # Atualiza o centro anterior
+
+                    cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)  # Caixa na cor do objeto
+                    cv2.circle(frame, (int(cx), int(cy)), 4, color, -1)  # Centro na cor do objeto
+                    cv2.putText(frame, f"#{i}", (x, max(15, y - 6)), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)  # Rótulo do objeto
+                    hud_lines.append(f"#{i} Vel: {speed_px:.2f} px/frame")  # Velocidade no HUD
+                else:  # Tracking perdido para este objeto
+                    obj["trajectory"].append_lost(frame_idx)  # Registra o frame sem posição
+                    hud_lines.append(f"#{i} Tracking perdido")
+
+            for k, text in enumerate(hud_lines):  # Desenha o HUD (a linha de cada objeto na sua cor)
+                color = (255, 255, 255) if k == 0 else objects[k - 1]["color"]
+                cv2.putText(frame, text, (10, 25 + k * 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+
+            if writer is not None:  # Se estiver gravando vídeo
+                output.submit(writer.write, frame)  # Grava o frame anotado no estágio de saída
+
+            if not headless:  # Exibição e teclado só no modo interativo
+                frame_disp = cv2.resize(frame, (disp_w, disp_h), interpolation=cv2.INTER_AREA) if scale < 1.0 else frame
+                cv2.imshow("Tracking", frame_disp)  # Mostra o frame na janela
+                if (cv2.waitKey(1) & 0xFF) == 27:  # ESC interrompe
+                    break
+                if cv2.getWindowProperty("Tracking", cv2.WND_PROP_VISIBLE) < 1:  # Janela fechada pelo 'X'
+                    break
+
+            frame_idx += 1  # Incrementa o contador de frames
+
+    except BaseException:  # Erro no loop: tem prioridade sobre erros da gravação
+        loop_failed = True
+        raise
+    finally:
+        pool.shutdown(wait=True)  # Finaliza as threads dos trackers
+        reader.stop()  # Interrompe a decodificação
+        try:
+            output.close(raise_errors=not loop_failed)  # Espera as gravações pendentes
+        finally:
+            cap.release()  # Libera o vídeo de entrada
+            if writer is not None:
+                writer.release()  # Finaliza o vídeo de saída
+
+    if not headless:  # Só há janelas para fechar no modo interativo
+        cv2.destroyAllWindows()
+
+    duracao_segundos = frame_idx / fps if fps > 0 else 0.0  # Duração processada
+    per_object = []  # Estatísticas de cada objeto
+    for i, obj in enumerate(objects):
+        motion = compute_motion_stats(obj["trajectory"], frame_idx, fps, pixels_per_meter)  # Mesmas métricas do tracking de um objeto
+        per_object.append({"object_id": i, "initial_box": obj["initial_box"], "color": obj["color"],
+                           **motion, "trajectory": obj["trajectory"]})
 
-    if fps > 0:  # Se FPS for válido
-        mean_speed_px_per_s = mean_speed_px * fps  # Converte média para px/s
-        max_speed_px_per_s = max_speed_px * fps  # Converte máxima para px/s
-        duracao_segundos = frame_idx / fps  # Calcula duração total
-    else:
-        mean_speed_px_per_s = 0.0
-        max_speed_px_per_s = 0.0
-        duracao_segundos = 0.0
-
-    straight_distance_px = 0.0  # Inicializa distância em linha reta
-    path_efficiency = 0.0  # Inicializa eficiência da trajetória
-    if len(trajectory) >= 2:  # Se houver pelo menos 2 pontos
-        x0, y0 = trajectory[0]["x"], trajectory[0]["y"]  # Ponto inicial
-        x1, y1 = trajectory[-1]["x"], trajectory[-1]["y"]  # Ponto final
-        straight_distance_px = float(math.hypot(x1 - x0, y1 - y0))  # Distância euclidiana entre início e fim
-        if total_distance_px > 0:
-            path_efficiency = straight_distance_px / total_distance_px  # Razão entre deslocamento útil e total percorrido
-
-    success_rate = (success_frames / frame_idx) if frame_idx > 0 else 0.0  # Taxa de sucesso do tracking
-
-    # Conversão para unidades físicas (se fornecido pixels_per_meter)
-    mean_speed_m_s = None
-    max_speed_m_s = None
-    mean_speed_km_h = None
-    max_speed_km_h = None
-
-    if pixels_per_meter and pixels_per_meter > 0 and fps > 0:  # Se houver calibração
-        mean_speed_m_s = mean_speed_px_per_s / pixels_per_meter  # Converte para m/s
-        max_speed_m_s = max_speed_px_per_s / pixels_per_meter
-        mean_speed_km_h = mean_speed_m_s * 3.6  # Converte para km/h
-        max_speed_km_h = max_speed_m_s * 3.6
-
-    # Monta o dicionário de estatísticas finais
     stats = {
         "video_input": video_path,  # Caminho do vídeo original analisado
-        "tracker_type": tracker_type,  # Tipo de algoritmo de rastreamento utilizado (CSRT/KCF)
+        "tracker_type": tracker_type,  # Tipo de algoritmo de rastreamento utilizado
+        "num_objects": len(objects),  # Número de objetos rastreados
         "num_frames": frame_idx,  # Número total de frames processados
         "fps": fps,  # Taxa de quadros por segundo do vídeo
-        "duracao_segundos": duracao_segundos,  # Duração total do vídeo em segundos
+        "duracao_segundos": duracao_segundos,  # Duração processada em segundos
         "frame_width": width,  # Largura do frame do vídeo
         "frame_height": height,  # Altura do frame do vídeo
-        "initial_box": initial_box,  # Coordenadas iniciais da caixa delimitadora (ROI)
-        "mean_speed_px": mean_speed_px,  # Velocidade média em pixels por frame
-        "max_speed_px": max_speed_px,  # Velocidade máxima em pixels por frame
-        "mean_speed_px_per_s": mean_speed_px_per_s,  # Velocidade média em pixels por segundo
-        "max_speed_px_per_s": max_speed_px_per_s,  # Velocidade máxima em pixels por segundo
-        "total_distance_px": total_distance_px,  # Distância total percorrida em pixels
-        "straight_distance_px": straight_distance_px,  # Distância em linha reta (início ao fim) em pixels
-        "path_efficiency": path_efficiency,  # Eficiência da trajetória (reta / total)
-        "success_frames": success_frames,  # Número de frames onde o objeto foi rastreado com sucesso
-        "success_rate": success_rate,  # Taxa de sucesso do rastreamento (0.0 a 1.0)
-        "mean_speed_m_s": mean_speed_m_s,  # Velocidade média em metros por segundo (se calibrado)
-        "max_speed_m_s": max_speed_m_s,  # Velocidade máxima em metros por segundo (se calibrado)
-        "mean_speed_km_h": mean_speed_km_h,  # Velocidade média em km/h (se calibrado)
-        "max_speed_km_h": max_speed_km_h,  # Velocidade máxima em km/h (se calibrado)
-        "trajectory": trajectory,  # Lista contendo os dados de posição frame a frame
+        "objects": per_object,  # Estatísticas e trajetória de cada objeto
         "video_output": video_out_path,  # Caminho do vídeo gerado com as anotações
-        "debug_dir": debug_dir,  # Diretório onde as imagens de debug foram salvas
     }
 
-    csv_path = None  # Inicializa caminho do CSV (será preenchido se salvarmos a trajetória)
-    if save_csv:  # Se opção de salvar CSV ativa
-        csv_filename = f"{base_name}_trajectory_{timestamp}.csv"  # Nome do arquivo de trajetória com timestamp
-        csv_path = os.path.join(output_dir, csv_filename)  # Monta o caminho completo para o CSV no diretório de saída
-        with open(csv_path, mode="w", newline="", encoding="utf-8") as f:  # Abre o arquivo CSV em modo escrita com UTF-8
-            writer_csv = csv.writer(f, delimiter=";")  # Cria escritor CSV usando ponto e vírgula como separador
-            writer_csv.writerow(["frame", "x", "y", "speed_px_per_frame"])  # Escreve cabeçalho com nomes das colunas
-            for p in trajectory:  # Itera sobre cada ponto registrado da trajetória
-                writer_csv.writerow(  # Escreve uma linha no CSV contendo dados do frame atual
-                    [
-                        p["frame"],  # Coluna com o índice do frame
-                        f"{p['x']:.3f}",  # Coluna com a coordenada X formatada com 3 casas decimais
-                        f"{p['y']:.3f}",  # Coluna com a coordenada Y formatada com 3 casas decimais
-                        f"{p['speed_px_per_frame']:.3f}",  # Coluna com a velocidade instantânea em px/frame formatada
-                    ]
-                )
-        stats["csv_output"] = csv_path  # Registra o caminho do CSV gerado dentro do dicionário de estatísticas
-    
-    report_filename = f"{base_name}_relatorio_{timestamp}.txt"  # Nome do arquivo de relatório textual com timestamp
-    report_path = os.path.join(output_dir, report_filename)  # Constroi o caminho completo do relatório no diretório de saída
+    csv_path = None  # Caminho do CSV (formato largo: colunas x/y/velocidade de cada objeto)
+    if save_csv:
+        csv_path = os.path.join(output_dir, f"{base_name}_multi_trajectory_{timestamp}.csv")
+        columns = []  # Colunas (x, y, velocidade) de cada objeto, alinhadas por frame (todas as trajetórias têm uma linha por frame)
+        for o in per_object:
+            t = o["trajectory"]
+            speeds = np.full(len(t), np.nan)  # Velocidade apenas nos frames rastreados
+            speeds[t.success] = t.speeds()
+            columns.append((t.success, t.xs, t.ys, speeds))
+        with open(csv_path, mode="w", newline="", encoding="utf-8") as f:
+            writer_csv = csv.writer(f, delimiter=";")  # Mesmo separador do CSV de um objeto
+            header = ["frame"]  # Cabeçalho: frame + 3 colunas por objeto
+            for i in range(len(per_object)):
+                header += [f"obj{i}_x", f"obj{i}_y", f"obj{i}_speed_px_per_frame"]
+            writer_csv.writerow(header)
+            for fi in range(frame_idx):  # Uma linha por frame processado (vazio quando o objeto foi perdido)
+                row = [fi]
+                for ok, xs, ys, speeds in columns:
+                    row += [f"{xs[fi]:.3f}", f"{ys[fi]:.3f}", f"{speeds[fi]:.3f}"] if ok[fi] else ["", "", ""]
+                writer_csv.writerow(row)
+        stats["csv_output"] = csv_path
+
+    report_path = os.path.join(output_dir, f"{base_name}_relatorio_multi_{timestamp}.txt")  # Caminho do relatório
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("=== Relatório de Tracking de Vários Objetos ===\n\n")
+        f.write(f"Data/Hora da análise : {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
+        f.write(f"Vídeo de entrada     : {video_path}\n")
+        f.write(f"Tracker utilizado    : {tracker_type}\n")
+        f.write(f"Objetos rastreados   : {len(per_object)}\n\n")
+
+        f.write("--- Informações do vídeo ---\n")
+        f.write(f"Resolução            : {width} x {height}\n")
+        f.write(f"FPS (arquivo)        : {fps:.2f}\n")
+        f.write(f"Frames processados   : {frame_idx}\n")
+        f.write(f"Duração aprox. (s)   : {duracao_segundos:.2f}\n\n")
+
+        for o in per_object:  # Uma seção completa por objeto
+            bx, by, bw, bh = o["initial_box"]
+            f.write(f"===== Objeto #{o['object_id']} =====\n")
+            f.write(f"Bounding box inicial : ({bx}, {by}) {bw} x {bh} px\n\n")
+            write_motion_sections(f, o, fps, pixels_per_meter)
+
+        f.write("--- Arquivos gerados ---\n")
+        f.write(f"Vídeo com tracking   : {video_out_path or '(não gerado)'}\n")
+        f.write(f"Trajetórias (CSV)    : {csv_path or '(não gerado)'}\n")
+        f.write(f"Relatório (TXT)      : {report_path}\n")
+
+    stats["report_path"] = report_path
+    logger.info(f"Tracking de {len(per_object)} objetos concluído: frames={frame_idx}, FPS={fps:.2f}")
+    logger.info(f"Relatório salvo em: {report_path}")
+    return stats
+
+def parse_tracker_config(spec: str) -> Dict:  # 'TRACKER[:escala[:janela]]' -> configuração (ex.: 'KCF:0.5', 'CSRT:1:3')
+    parts = spec.split(":")
+    if not parts[0] or len(parts) > 3:
+        raise ValueError(f"Configuração de tracker inválida: {spec} (use TRACKER[:escala[:janela]])")
+    try:
+        track_scale = float(parts[1]) if len(parts) > 1 and parts[1] else 1.0
+        search_window = float(parts[2]) if len(parts) > 2 and parts[2] else None
+    except ValueError:
+        raise ValueError(f"Configuração de tracker inválida: {spec} (escala e janela são números)") from None
+    return {"name": spec, "tracker_type": parts[0].upper(), "track_scale": track_scale, "search_window": search_window}
+
+def _drift(a: TrajectoryStore, b: TrajectoryStore) -> Dict:  # Distância entre os centros de dois trackers nos frames em que ambos acharam o objeto
+    n = min(len(a), len(b))
+    both = a.success[:n] & b.success[:n]
+    dist = np.hypot(a.xs[:n][both] - b.xs[:n][both], a.ys[:n][both] - b.ys[:n][both])
+    if not len(dist):  # Nenhum frame em comum para comparar
+        return {"common_frames": 0, "mean_px": float("nan"), "p95_px": float("nan"), "max_px": float("nan")}
+    return {"common_frames": int(both.sum()), "mean_px": float(dist.mean()),
+            "p95_px": float(np.percentile(dist, 95)), "max_px": float(dist.max())}
+
+def compare_trackers(  # Compara várias configurações de tracker decodificando o vídeo uma única vez
+    video_path: str,  # Caminho do arquivo de vídeo de entrada
+    output_dir: str,  # Diretório onde o relatório é salvo
+    initial_box: Tuple[int, int, int, int],  # ROI inicial (x, y, w, h) em pixels do vídeo original (a mesma para todos)
+    configs: Optional[List[Dict]] = None,  # Configurações (tracker_type, track_scale, search_window; ver parse_tracker_config)
+    pixels_per_meter: Optional[float] = None,  # Valor de calibração para converter pixels em metros (opcional)
+    save_csv: bool = False,  # Salva as trajetórias lado a lado em um CSV
+    queue_size: int = DEFAULT_QUEUE_SIZE,  # Tamanho da fila de decodificação
+    max_workers: Optional[int] = None,  # Threads que atualizam os trackers em paralelo (padrão: uma por configuração)
+) -> Dict:  # Estatísticas de cada configuração ("configs"), deriva entre pares ("drift") e o relatório
 
-    with open(report_path, "w", encoding="utf-8") as f:  # Abre o relatório TXT em modo escrita com codificação UTF-8
-        f.write("=== Relatório de Tracking de Objeto ===\n\n")  # Registra o título principal do relatório
-        f.write(f"Data/Hora da análise : {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")  # Registra data e hora da geração
-        f.write(f"Vídeo de entrada     : {video_path}\n")  # Registra o caminho do vídeo analisado
-        f.write(f"Tracker utilizado    : {tracker_type}\n\n")  # Registra o tipo de tracker usado
-
-        f.write("--- Informações do vídeo ---\n")  # Seção com metadados do vídeo
-        f.write(f"Resolução            : {width} x {height}\n")  # Registra largura e altura do vídeo
-        f.write(f"FPS (arquivo)        : {fps:.2f}\n")  # Registra FPS reportado pelo arquivo
-        f.write(f"Frames processados   : {frame_idx}\n")  # Registra total de frames processados
-        f.write(f"Duração aprox. (s)   : {duracao_segundos:.2f}\n\n")  # Registra duração estimada em segundos
-
-        f.write("--- Bounding box inicial ---\n")  # Seção com informações da ROI inicial
-        bx, by, bw, bh = initial_box  # Descompacta os valores da caixa inicial (posição e tamanho)
-        f.write(f"Posição (x, y)       : ({bx}, {by})\n")  # Registra a posição inicial da ROI
-        f.write(f"Tamanho (w, h)       : {bw} x {bh} px\n\n")  # Registra o tamanho da ROI em pixels
-
-        f.write("--- Qualidade do tracking ---\n")  # Seção sobre desempenho do rastreamento
-        f.write(f"Frames com sucesso   : {success_frames}\n")  # Registra quantos frames obtiveram tracking válido
-        f.write(f"Taxa de sucesso      : {success_rate*100:.2f} %\n\n")  # Registra a taxa de sucesso em porcentagem
-
-        f.write("--- Métricas de movimento (em pixels) ---\n")  # Seção com métricas em unidades de pixels
-        f.write(f"Vel. média (px/frame): {mean_speed_px:.4f}\n")  # Registra velocidade média em px/frame
-        f.write(f"Vel. máx.  (px/frame): {max_speed_px:.4f}\n")  # Registra velocidade máxima em px/frame
-        f.write(f"Vel. média (px/s)    : {mean_speed_px_per_s:.4f}\n")  # Registra velocidade média convertida para px/s
-        f.write(f"Vel. máx.  (px/s)    : {max_speed_px_per_s:.4f}\n")  # Registra velocidade máxima convertida para px/s
-        f.write(f"Dist. total (px)     : {total_distance_px:.4f}\n")  # Registra distância total percorrida em pixels
-        f.write(f"Dist. reta (px)      : {straight_distance_px:.4f}\n")  # Registra distância em linha reta em pixels
-        f.write(f"Eficiência trajetória: {path_efficiency*100:.2f} %\n\n")  # Registra eficiência do caminho em porcentagem
-
-        f.write("--- Métricas físicas (se escala for fornecida) ---\n")  # Seção com métricas físicas (depende de calibração)
-        if pixels_per_meter and pixels_per_meter > 0 and fps > 0:  # Verifica se há escala válida para converter pixels em metros
-            f.write(f"Escala utilizada     : {pixels_per_meter} px ≈ 1 m\n")  # Registra a escala fornecida
-            f.write(f"Vel. média (m/s)     : {mean_speed_m_s:.4f}\n")  # Registra velocidade média em metros por segundo
-            f.write(f"Vel. máx.  (m/s)     : {max_speed_m_s:.4f}\n")  # Registra velocidade máxima em metros por segundo
-            f.write(f"Vel. média (km/h)    : {mean_speed_km_h:.4f}\n")  # Registra velocidade média convertida para km/h
-            f.write(f"Vel. máx.  (km/h)    : {max_speed_km_h:.4f}\n")  # Registra velocidade máxima convertida para km/h
-        else:  # Caso não haja escala disponível
-            f.write("Escala física        : não fornecida (velocidades em px/s)\n")  # Registra ausência de calibração física
-            f.write("km/h                 : N/A (é preciso saber quantos px = 1 m)\n")  # Explica a limitação para km/h
-        f.write("\n")  # Adiciona linha em branco para separar seções
-
-        f.write("--- Arquivos gerados ---\n")  # Seção listando os arquivos produzidos
-        if video_out_path:  # Verifica se um vídeo de saída foi gerado
-            f.write(f"Vídeo com tracking   : {video_out_path}\n")  # Registra o caminho do vídeo de saída
-        else:  # Caso não tenha sido solicitado salvar vídeo
-            f.write("Vídeo com tracking   : (não gerado)\n")  # Registra ausência de vídeo
-
-        if csv_path:  # Verifica se o CSV foi gerado
-            f.write(f"Trajetória (CSV)     : {csv_path}\n")  # Registra o caminho do CSV
-        else:  # Caso CSV tenha sido desativado
-            f.write("Trajetória (CSV)     : (não gerado)\n")  # Registra ausência de CSV
-        if debug_dir:  # Verifica se houve imagens de debug
-            f.write(f"Imagens de debug     : {debug_dir}\n")  # Registra a pasta com imagens de debug
-        else:  # Caso debug não tenha sido solicitado
-            f.write("Imagens de debug     : (não geradas)\n")  # Registra ausência de imagens debug
-
-        f.write(f"Relatório (TXT)      : {report_path}\n")  # Registra o caminho do próprio relatório
+    if not os.path.isfile(video_path):  # Verifica se o arquivo de vídeo existe no caminho especificado
+        raise FileNotFoundError(f"Vídeo não encontrado: {video_path}")
+    configs = [dict(c) for c in (configs or [parse_tracker_config("CSRT"), parse_tracker_config("KCF")])]
+    names = set()
+    for c in configs:  # Nome de cada configuração (rótulo no relatório e no CSV)
+        c.setdefault("track_scale", 1.0)
+        c.setdefault("search_window", None)
+        c.setdefault("name", c["tracker_type"])
+        if c["name"] in names:
+            raise ValueError(f"Configuração repetida: {c['name']}")
+        names.add(c["name"])
+
+    os.makedirs(output_dir, exist_ok=True)  # Cria o diretório de saída se ele não existir
+    cap = cv2.VideoCapture(video_path)  # Abre o arquivo de vídeo para leitura usando OpenCV
+    if not cap.isOpened():
+        raise RuntimeError(f"Não foi possível abrir o vídeo: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0  # FPS do vídeo
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))  # Largura dos quadros
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))  # Altura dos quadros
+    ret, frame = cap.read()  # Primeiro frame: inicializa todos os trackers
+    if not ret or frame is None:
+        cap.release()
+        raise RuntimeError("Não foi possível ler o primeiro frame do vídeo.")
+    x, y, w, h = [int(v) for v in initial_box]
+    if w <= 0 or h <= 0 or x < 0 or y < 0 or x + w > width or y + h > height:  # Valida se a caixa cabe no frame
+        cap.release()
+        raise ValueError(f"ROI inicial fora do frame ({width}x{height}): {initial_box}")
+    roi = (x, y, w, h)
+
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)  # Pré-alocação das trajetórias
+    profiler = RunProfiler()  # Tempo de cada configuração e da passada inteira
+    runs = []  # Estado de cada configuração
+    for c in configs:  # Cada tracker é criado como no tracking de um objeto (escala e janela de busca opcionais)
+        usage = Counter()
+        make = lambda c=c, usage=usage: _create_tracker(c["tracker_type"], usage) if c["tracker_type"] in CASCADE_NAMES \
+            else _create_tracker(c["tracker_type"])
+        tracker = build_tracker(make, track_scale=c["track_scale"], search_window=c["search_window"])
+        tracker.init(frame, roi)
+        runs.append({**c, "tracker": tracker, "timer": profiler.stage(f"tracker:{c['name']}"),
+                     "trajectory": TrajectoryStore(total_frames or 1024)})
+
+    def update(run, frame):  # Atualiza um tracker e mede o tempo dele (cada configuração em uma thread do pool)
+        start = perf_counter()
+        success, box = run["tracker"].update(frame)
+        run["timer"].add(perf_counter() - start, start)
+        if success:
+            bx, by, bw, bh = [int(v) for v in box]
+            run["trajectory"].append(frame_idx, bx + bw / 2.0, by + bh / 2.0, bw, bh, True)
+        else:
+            run["trajectory"].append_lost(frame_idx)
 
-    stats["report_path"] = report_path  # Adiciona caminho do relatório às estatísticas retornadas
+    logger.info(f"Comparando {len(runs)} configurações de tracker: vídeo={video_path}, "
+                f"configs={', '.join(r['name'] for r in runs)}")
+    frame_idx = 0  # Contador de frames processados
+    buffers = BufferPool()  # Frames reaproveitados (devolvidos depois que todos os trackers terminam)
+    reader = FrameReader(cap, queue_size, profiler=profiler, pool=buffers).start()  # Uma única decodificação
+    pool = ThreadPoolExecutor(max_workers=max_workers or len(runs))  # O OpenCV libera o GIL no update
+    read_timer = profiler.stage("read_wait")
+    try:
+        while True:
+            with read_timer:
+                frame = reader.read()  # Obtém o próximo frame já decodificado
+            if frame is None:  # Fim do vídeo
+                break
+            list(pool.map(lambda run: update(run, frame), runs))  # Todos os trackers recebem o mesmo frame
+            buffers.release(frame)
+            frame_idx += 1
+    finally:
+        pool.shutdown(wait=True)  # Finaliza as threads dos trackers
+        reader.stop()  # Interrompe a decodificação
+        cap.release()  # Libera o vídeo de entrada
+    profiler.finish(frame_idx)
+    profile = profiler.summary()
+
+    per_config = []  # Estatísticas de cada configuração
+    for r in runs:
+        timer = r["timer"]
+        row = {k: r[k] for k in ("name", "tracker_type", "track_scale", "search_window")}
+        row.update(compute_motion_stats(r["trajectory"], frame_idx, fps, pixels_per_meter))  # Mesmas métricas do tracking de um objeto
+        row["tracker_seconds"] = timer.total  # Tempo gasto só nos updates deste tracker
+        row["tracker_fps"] = timer.count / timer.total if timer.total > 0 else 0.0  # Throughput isolado do tracker
+        row["p95_ms"] = timer.percentile(95) * 1000.0  # Latência do update (p95)
+        row["trajectory"] = r["trajectory"]
+        per_config.append(row)
+    drift = []  # Deriva entre cada par de configurações
+    for i in range(len(runs)):
+        for j in range(i + 1, len(runs)):
+            drift.append({"a": runs[i]["name"], "b": runs[j]["name"], **_drift(runs[i]["trajectory"], runs[j]["trajectory"])})
+    for row in per_config:  # Deriva em relação à primeira configuração (referência)
+        ref = _drift(per_config[0]["trajectory"], row["trajectory"])
+        row["drift_mean_px"], row["drift_max_px"] = ref["mean_px"], ref["max_px"]
 
-    # Registra no log o sucesso da operação
-    logger.info(  # Escreve no log uma mensagem resumindo o tracking feito
-        f"Tracking concluído: frames={frame_idx}, "
-        f"FPS={fps:.2f}, dist_total_px={total_distance_px:.2f}"
-    )
-    logger.info(f"Relatório salvo em: {report_path}")  # Informa no log onde o relatório foi armazenado
+    stats = {
+        "video_input": video_path,  # Caminho do vídeo original analisado
+        "initial_box": roi,  # ROI inicial (a mesma para todas as configurações)
+        "num_frames": frame_idx,  # Frames processados (uma decodificação)
+        "fps": fps,  # FPS do vídeo
+        "frame_width": width,
+        "frame_height": height,
+        "wall_seconds": profile["wall_seconds"],  # Duração da passada (todas as configurações)
+        "effective_fps": profile["effective_fps"],  # Frames por segundo da passada
+        "decode_seconds": profile["stages"].get("decode", {}).get("total_s", 0.0),  # Tempo de decodificação (uma vez)
+        "configs": per_config,  # Estatísticas e trajetória de cada configuração
+        "drift": drift,  # Deriva entre pares
+        "profile": profile,  # Tempos por estágio e contadores
+    }
 
-    return stats  # Retorna o dicionário com todas as estatísticas coletadas
+    base_name = os.path.splitext(os.path.basename(video_path))[0]  # Nome do vídeo sem extensão
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")  # Timestamp para nome único
+    csv_path = None  # Trajetórias lado a lado (colunas x/y de cada configuração)
+    if save_csv:
+        csv_path = os.path.join(output_dir, f"{base_name}_comparacao_trajectory_{timestamp}.csv")
+        with open(csv_path, mode="w", newline="", encoding="utf-8") as f:
+            writer_csv = csv.writer(f, delimiter=";")  # Mesmo separador do CSV de um objeto
+            writer_csv.writerow(["frame"] + [f"{r['name']}_{k}" for r in per_config for k in ("x", "y")])
+            for fi in range(frame_idx):  # Uma linha por frame (vazio quando a configuração perdeu o objeto)
+                row = [fi]
+                for r in per_config:
+                    t = r["trajectory"]
+                    row += [f"{t.xs[fi]:.3f}", f"{t.ys[fi]:.3f}"] if t.success[fi] else ["", ""]
+                writer_csv.writerow(row)
+    stats["csv_output"] = csv_path
+
+    report_path = os.path.join(output_dir, f"{base_name}_comparacao_{timestamp}.txt")  # Caminho do relatório
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("=== Comparação de Trackers (uma decodificação) ===\n\n")
+        f.write(f"Data/Hora da análise : {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
+        f.write(f"Vídeo de entrada     : {video_path}\n")
+        f.write(f"Bounding box inicial : ({x}, {y}) {w} x {h} px\n")
+        f.write(f"Resolução            : {width} x {height}\n")
+        f.write(f"FPS (arquivo)        : {fps:.2f}\n")
+        f.write(f"Frames processados   : {frame_idx}\n")
+        f.write(f"Tempo da passada     : {stats['wall_seconds']:.2f} s ({stats['effective_fps']:.2f} frames/s, "
+                f"decodificação {stats['decode_seconds']:.2f} s)\n\n")
+
+        # Velocidades físicas quando há calibração; sem o FPS do arquivo, em px/frame (como no relatório do tracking)
+        if fps > 0:
+            speed_unit, mean_key, max_key = ("m/s", "mean_speed_m_s", "max_speed_m_s") if pixels_per_meter and pixels_per_meter > 0 \
+                else ("px/s", "mean_speed_px_per_s", "max_speed_px_per_s")
+        else:
+            speed_unit, mean_key, max_key = "px/frame", "mean_speed_px", "max_speed_px"
+        f.write("--- Lado a lado ---\n")
+        f.write(f"{'Configuração':<16}{'FPS tracker':>12}{'p95 (ms)':>10}{'Sucesso':>9}"
+                f"{f'Vel. méd. ({speed_unit})':>18}{f'Vel. máx. ({speed_unit})':>18}{'Dist. (px)':>11}"
+                f"{'Deriva méd. (px)':>18}{'Deriva máx. (px)':>18}\n")
+        for r in per_config:  # Uma linha por configuração
+            f.write(f"{r['name']:<16}{r['tracker_fps']:>12.1f}{r['p95_ms']:>10.2f}{r['success_rate'] * 100:>8.1f}%"
+                    f"{r[mean_key]:>18.2f}{r[max_key]:>18.2f}{r['total_distance_px']:>11.1f}"
+                    f"{r['drift_mean_px']:>18.2f}{r['drift_max_px']:>18.2f}\n")
+        f.write(f"\nA deriva é a distância entre os centros e os da referência ({per_config[0]['name']}), "
+                "nos frames em que as duas acharam o objeto.\n")
+        f.write("O FPS do tracker considera só o tempo dos seus updates (as configurações rodam em paralelo).\n\n")
+
+        if len(drift) > 1:  # Com três ou mais configurações, a deriva de cada par
+            f.write("--- Deriva entre pares ---\n")
+            f.write(f"{'Par':<34}{'Frames':>8}{'Média (px)':>12}{'p95 (px)':>10}{'Máx. (px)':>11}\n")
+            for d in drift:
+                f.write(f"{d['a'] + ' x ' + d['b']:<34}{d['common_frames']:>8}{d['mean_px']:>12.2f}"
+                        f"{d['p95_px']:>10.2f}{d['max_px']:>11.2f}\n")
+            f.write("\n")
+
+        f.write("--- Arquivos gerados ---\n")
+        f.write(f"Trajetórias (CSV)    : {csv_path or '(não gerado)'}\n")
+        f.write(f"Relatório (TXT)      : {report_path}\n")
+
+    stats["report_path"] = report_path
+    logger.info(f"Comparação concluída: frames={frame_idx}, configurações={len(runs)}, "
+                f"tempo={stats['wall_seconds']:.2f} s")
+    logger.info(f"Relatório salvo em: {report_path}")
+    return stats
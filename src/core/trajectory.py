@@ -0,0 +1,350 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo guarda a trajetória do objeto rastreado em formato colunar (um array NumPy por coluna).
+Em vez de um dicionário por frame, cada frame ocupa uma linha nas colunas (frame, x, y, w, h, success, interpolated),
+pré-alocadas e ampliadas em blocos quando necessário. Durante o loop de tracking só há a gravação dos
+valores; velocidades, distâncias, eficiência e conversões físicas são calculadas depois, de uma só vez,
+com operações vetorizadas do NumPy.
+Para vídeos muito longos há também o modo streaming (StreamingTrajectory): as linhas vão para o CSV em
+blocos durante o processamento e só as estatísticas acumuladas ficam na memória, que permanece constante.
+As duas formas também gravam a trajetória no formato binário '.traj' (ver src/io/trajectory_file.py).
+'''
+#################
+
+import math  # Importa math para a distância entre pontos no modo streaming
+import warnings  # Importa warnings para silenciar o aviso do NumPy ao ler um CSV sem linhas
+from typing import Dict, Optional, Tuple  # Importa tipos para anotação de tipagem
+import numpy as np  # Importa NumPy para as colunas e os cálculos vetorizados
+from src.io.trajectory_file import (  # Importa o formato binário
+    INTERPOLATED_FLAG, RECORD_DTYPE, SUCCESS_FLAG, TrajectoryFileWriter, is_trajectory_file, open_trajectory,
+    write_trajectory_file,
+)
+
+DEFAULT_CAPACITY = 1024  # Capacidade inicial (em frames) quando o total do vídeo é desconhecido
+DEFAULT_CHUNK_SIZE = 4096  # Linhas acumuladas antes de cada gravação no modo streaming
+
+CSV_HEADER = "frame;x;y;speed_px_per_frame"  # Cabeçalho do CSV de trajetória (separador ';')
+CSV_FORMAT = ["%d", "%.3f", "%.3f", "%.3f"]  # Formato de cada coluna do CSV
+CSV_INTERPOLATED_COLUMN = "interpolated"  # Coluna extra do passo adaptativo (1 = posição interpolada)
+
+def csv_header(interpolated_column: bool = False, extra_names=()) -> str:  # Cabeçalho do CSV (com as colunas opcionais pedidas)
+    return CSV_HEADER + (f";{CSV_INTERPOLATED_COLUMN}" if interpolated_column else "") + "".join(f";{n}" for n in extra_names)
+
+def write_csv_rows(f, frames: np.ndarray, xs: np.ndarray, ys: np.ndarray, speeds: np.ndarray,
+                   interpolated: Optional[np.ndarray] = None,
+                   extra: Optional[Dict[str, np.ndarray]] = None):  # Grava um bloco de linhas do CSV de uma vez
+    columns, fmt = [frames, xs, ys, speeds], list(CSV_FORMAT)
+    if interpolated is not None:  # Coluna do passo adaptativo
+        columns.append(interpolated)
+        fmt.append("%d")
+    for values in (extra or {}).values():  # Colunas extras (ex.: cinemática), inteiras ou com 3 casas
+        columns.append(values)
+        fmt.append("%d" if np.issubdtype(np.asarray(values).dtype, np.integer) else "%.3f")
+    np.savetxt(f, np.column_stack(columns), fmt=fmt, delimiter=";")
+
+class TrajectoryStore:  # Trajetória em colunas: uma linha por frame processado (com ou sem sucesso)
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        capacity = max(1, int(capacity))  # Pelo menos uma linha
+        self._size = 0  # Quantidade de linhas preenchidas
+        self._frame = np.empty(capacity, dtype=np.int32)  # Índice do frame
+        self._x = np.empty(capacity, dtype=np.float64)  # Centro X da caixa (pixels do vídeo original)
+        self._y = np.empty(capacity, dtype=np.float64)  # Centro Y da caixa
+        self._w = np.empty(capacity, dtype=np.float32)  # Largura da caixa
+        self._h = np.empty(capacity, dtype=np.float32)  # Altura da caixa
+        self._success = np.empty(capacity, dtype=bool)  # Indica se o objeto tem posição no frame
+        self._interpolated = np.empty(capacity, dtype=bool)  # Indica se a posição foi interpolada (passo adaptativo)
+
+    @classmethod
+    def from_columns(cls, frames, xs, ys, ws, hs, success, interpolated=None) -> "TrajectoryStore":  # Cria a trajetória a partir de colunas prontas
+        store = cls(len(frames))  # Capacidade exata
+        n = len(frames)
+        store._frame[:n] = frames
+        store._x[:n] = xs
+        store._y[:n] = ys
+        store._w[:n] = ws
+        store._h[:n] = hs
+        store._success[:n] = success
+        store._interpolated[:n] = False if interpolated is None else interpolated
+        store._size = n
+        return store
+
+    def __len__(self) -> int:  # Número de frames registrados
+        return self._size
+
+    def _grow(self):  # Dobra a capacidade das colunas (custo amortizado constante por frame)
+        capacity = len(self._frame) * 2  # Nova capacidade
+        for name in ("_frame", "_x", "_y", "_w", "_h", "_success", "_interpolated"):  # Realoca cada coluna preservando os dados
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+    def append(self, frame: int, x: float, y: float, w: float, h: float, success: bool,
+               interpolated: bool = False):  # Registra um frame
+        if self._size == len(self._frame):  # Colunas cheias: amplia antes de gravar
+            self._grow()
+        i = self._size  # Linha a preencher
+        self._frame[i] = frame
+        self._x[i] = x
+        self._y[i] = y
+        self._w[i] = w
+        self._h[i] = h
+        self._success[i] = success
+        self._interpolated[i] = interpolated
+        self._size += 1
+
+    def append_lost(self, frame: int, skipped: bool = False):  # Registra um frame sem posição (skipped = pulado e não avaliado)
+        self.append(frame, np.nan, np.nan, np.nan, np.nan, False, skipped)
+
+    # Colunas preenchidas (visões sem cópia dos arrays internos)
+    @property
+    def frames(self) -> np.ndarray:
+        return self._frame[: self._size]
+
+    @property
+    def xs(self) -> np.ndarray:
+        return self._x[: self._size]
+
+    @property
+    def ys(self) -> np.ndarray:
+        return self._y[: self._size]
+
+    @property
+    def ws(self) -> np.ndarray:
+        return self._w[: self._size]
+
+    @property
+    def hs(self) -> np.ndarray:
+        return self._h[: self._size]
+
+    @property
+    def success(self) -> np.ndarray:
+        return self._success[: self._size]
+
+    @property
+    def interpolated(self) -> np.ndarray:
+        return self._interpolated[: self._size]
+
+    @property
+    def interpolated_frames(self) -> int:  # Frames com posição interpolada (não medida pelo tracker)
+        return int(np.count_nonzero(self.interpolated & self.success))
+
+    @property
+    def skipped_frames(self) -> int:  # Frames pulados pelo passo adaptativo que ficaram sem avaliação
+        return int(np.count_nonzero(self.interpolated & ~self.success))
+
+    def tracked(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:  # Frames, X e Y apenas dos frames com sucesso
+        ok = self.success  # Máscara dos frames rastreados
+        return self.frames[ok], self.xs[ok], self.ys[ok]
+
+    def speeds(self) -> np.ndarray:  # Velocidade em px/frame de cada ponto rastreado (o primeiro ponto vale 0)
+        _, xs, ys = self.tracked()  # Pontos rastreados em ordem
+        speeds = np.zeros(len(xs), dtype=np.float64)  # Primeiro ponto não tem anterior
+        if len(xs) >= 2:  # Distância entre pontos rastreados consecutivos
+            speeds[1:] = np.hypot(np.diff(xs), np.diff(ys))
+        return speeds
+
+    def summary(self) -> Tuple[int, int, float, float, float]:  # (pontos, passos, distância total, vel. máxima, dist. reta)
+        _, xs, ys = self.tracked()  # Pontos rastreados
+        steps = self.speeds()[1:]  # Deslocamentos entre pontos consecutivos (o primeiro ponto não tem velocidade)
+        straight = float(np.hypot(xs[-1] - xs[0], ys[-1] - ys[0])) if len(xs) >= 2 else 0.0  # Distância entre início e fim
+        return len(xs), len(steps), float(steps.sum()), float(steps.max()) if len(steps) else 0.0, straight
+
+    def write_csv(self, csv_path: str, interpolated_column: bool = False,
+                  extra_columns: Optional[Dict[str, np.ndarray]] = None):  # Grava o CSV da trajetória (apenas frames rastreados)
+        frames, xs, ys = self.tracked()  # Colunas dos frames rastreados
+        flags = self.interpolated[self.success] if interpolated_column else None  # Coluna de interpolação (passo adaptativo)
+        with open(csv_path, mode="w", newline="", encoding="utf-8") as f:
+            f.write(csv_header(interpolated_column, list(extra_columns or {})) + "\n")  # Cabeçalho com nomes das colunas
+            write_csv_rows(f, frames, xs, ys, self.speeds(), flags, extra_columns)  # Formata e grava todas as linhas
+
+    def write_binary(self, path: str, fps: float, width: int, height: int):  # Grava a trajetória no formato binário '.traj'
+        write_trajectory_file(path, self.frames, self.xs, self.ys, self.ws, self.hs, self.success, fps, width, height,
+                              self.interpolated)
+
+def load_binary_trajectory(path: str) -> TrajectoryStore:  # Carrega um arquivo '.traj' como trajetória em colunas
+    traj = open_trajectory(path)  # Abre com memória mapeada
+    return TrajectoryStore.from_columns(traj.frames, traj.xs, traj.ys, traj.ws, traj.hs, traj.success, traj.interpolated)
+
+def load_csv_trajectory(csv_path: str) -> TrajectoryStore:  # Carrega o CSV de trajetória (apenas frames rastreados; w e h desconhecidos)
+    with open(csv_path, encoding="utf-8") as f:  # As colunas opcionais são localizadas pelo nome
+        names = f.readline().strip().split(";")
+    with warnings.catch_warnings():  # Um CSV só com o cabeçalho é válido (nenhum frame rastreado)
+        warnings.simplefilter("ignore", UserWarning)
+        table = np.loadtxt(csv_path, delimiter=";", skiprows=1, ndmin=2)  # Colunas frame;x;y;speed_px_per_frame[;interpolated][;...]
+    if table.shape[0] == 0:  # CSV apenas com o cabeçalho
+        return TrajectoryStore()
+    n = len(table)
+    interpolated = None  # Coluna do passo adaptativo (se existir)
+    if CSV_INTERPOLATED_COLUMN in names:
+        interpolated = table[:, names.index(CSV_INTERPOLATED_COLUMN)] != 0
+    return TrajectoryStore.from_columns(
+        table[:, 0].astype(np.int32), table[:, 1], table[:, 2], np.full(n, np.nan), np.full(n, np.nan), np.ones(n, dtype=bool),
+        interpolated,
+    )
+
+def load_trajectory(path: str) -> TrajectoryStore:  # Carrega uma trajetória salva (binária '.traj' ou CSV)
+    return load_binary_trajectory(path) if is_trajectory_file(path) else load_csv_trajectory(path)
+
+def convert_binary_to_csv(traj_path: str, csv_path: str):  # Exporta um arquivo '.traj' para o CSV de trajetória
+    store = load_binary_trajectory(traj_path)
+    store.write_csv(csv_path, interpolated_column=store.interpolated_frames > 0)  # A coluna de interpolação só aparece se for usada
+
+class StreamingTrajectory:  # Trajetória em modo streaming: grava CSV e/ou '.traj' em blocos e guarda só estatísticas acumuladas
+
+    def __init__(
+        self,
+        csv_path: Optional[str] = None,  # CSV de saída (None = sem CSV)
+        chunk_size: int = DEFAULT_CHUNK_SIZE,  # Frames acumulados antes de cada gravação
+        binary: Optional[TrajectoryFileWriter] = None,  # Gravador do arquivo binário '.traj' (None = sem binário)
+        interpolated_column: bool = False,  # Acrescenta ao CSV a coluna de interpolação (passo adaptativo)
+    ):
+        self._size = 0  # Frames registrados
+        self._points = 0  # Frames rastreados com sucesso
+        self._interpolated = 0  # Frames com posição interpolada
+        self._skipped = 0  # Frames pulados e não avaliados
+        self._interpolated_column = interpolated_column  # Coluna extra no CSV
+        self._steps = 0  # Deslocamentos entre pontos rastreados consecutivos
+        self._total = 0.0  # Distância total percorrida
+        self._max = 0.0  # Maior deslocamento em um passo
+        self._first: Optional[Tuple[float, float]] = None  # Primeiro ponto rastreado
+        self._last: Optional[Tuple[float, float]] = None  # Último ponto rastreado
+        self._file = None  # Arquivo CSV (None = apenas estatísticas)
+        if csv_path is not None:  # Abre o CSV e escreve o cabeçalho
+            self._file = open(csv_path, mode="w", newline="", encoding="utf-8")
+            self._file.write(csv_header(interpolated_column) + "\n")
+        self._binary = binary  # Gravador binário
+        self._chunk = np.empty(max(1, int(chunk_size)), dtype=RECORD_DTYPE)  # Bloco de frames ainda não gravados
+        self._speeds = np.empty(len(self._chunk), dtype=np.float64)  # Velocidade de cada frame do bloco (CSV)
+        self._pending = 0  # Frames ocupados no bloco
+
+    def __len__(self) -> int:  # Número de frames registrados
+        return self._size
+
+    def append(self, frame: int, x: float, y: float, w: float, h: float, success: bool,
+               interpolated: bool = False):  # Registra um frame
+        self._size += 1
+        if interpolated:  # Com posição: interpolado; sem posição: pulado e não avaliado
+            if success:
+                self._interpolated += 1
+            else:
+                self._skipped += 1
+        speed = 0.0  # Velocidade do ponto (o primeiro ponto vale 0)
+        if success:  # Frames perdidos não entram nas métricas
+            if self._last is not None:  # Distância até o ponto rastreado anterior
+                speed = math.hypot(x - self._last[0], y - self._last[1])
+                self._steps += 1
+                self._total += speed
+                self._max = max(self._max, speed)
+            else:
+                self._first = (x, y)
+            self._last = (x, y)
+            self._points += 1
+
+        if self._file is not None or self._binary is not None:  # Acumula o frame no bloco e grava quando ele enche
+            self._chunk[self._pending] = (frame, x, y, w, h, SUCCESS_FLAG * bool(success) | INTERPOLATED_FLAG * bool(interpolated))
+            self._speeds[self._pending] = speed
+            self._pending += 1
+            if self._pending == len(self._chunk):
+                self._flush()
+
+    def append_lost(self, frame: int, skipped: bool = False):  # Registra um frame sem posição (skipped = pulado e não avaliado)
+        self.append(frame, math.nan, math.nan, math.nan, math.nan, False, skipped)
+
+    def _flush(self):  # Grava os frames pendentes do bloco
+        if self._pending:
+            rows = self._chunk[: self._pending]
+            if self._file is not None:  # CSV: apenas os frames rastreados (x e y em precisão dupla, como no modo em memória)
+                ok = (rows["success"] & SUCCESS_FLAG) != 0
+                cx = rows["x"][ok].astype(np.float64)
+                cy = rows["y"][ok].astype(np.float64)
+                flags = ((rows["success"][ok] & INTERPOLATED_FLAG) != 0) if self._interpolated_column else None
+                write_csv_rows(self._file, rows["frame"][ok], cx, cy, self._speeds[: self._pending][ok], flags)
+            if self._binary is not None:  # Binário: todos os frames
+                self._binary.write(rows)
+            self._pending = 0
+
+    def close(self):  # Grava o último bloco e fecha os arquivos
+        self._flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._binary is not None:
+            self._binary.close()
+            self._binary = None
+
+    @property
+    def interpolated_frames(self) -> int:  # Frames com posição interpolada (não medida pelo tracker)
+        return self._interpolated
+
+    @property
+    def skipped_frames(self) -> int:  # Frames pulados pelo passo adaptativo que ficaram sem avaliação
+        return self._skipped
+
+    def summary(self) -> Tuple[int, int, float, float, float]:  # (pontos, passos, distância total, vel. máxima, dist. reta)
+        straight = 0.0  # Distância entre o primeiro e o último ponto
+        if self._points >= 2:
+            straight = math.hypot(self._last[0] - self._first[0], self._last[1] - self._first[1])
+        return self._points, self._steps, self._total, self._max, straight
+
+def compute_motion_stats(  # Calcula as métricas de movimento de uma trajetória em uma única passada vetorizada
+    store,  # Trajetória em colunas (TrajectoryStore) ou acumulada (StreamingTrajectory)
+    num_frames: int,  # Frames processados
+    fps: float,  # Taxa de quadros do vídeo
+    pixels_per_meter: Optional[float],  # Calibração física (opcional)
+) -> Dict:
+    success_frames, num_steps, total_distance_px, max_speed_px, straight_distance_px = store.summary()  # Agregados da trajetória
+
+    mean_speed_px = total_distance_px / num_steps if num_steps else 0.0  # Velocidade média em pixels
+
+    mean_speed_px_per_s = mean_speed_px * fps if fps > 0 else 0.0  # Converte média para px/s
+    max_speed_px_per_s = max_speed_px * fps if fps > 0 else 0.0  # Converte máxima para px/s
+
+    path_efficiency = 0.0  # Eficiência da trajetória
+    if total_distance_px > 0:
+        path_efficiency = straight_distance_px / total_distance_px  # Razão entre deslocamento útil e total percorrido
+
+    # Posições interpoladas entram nas velocidades (preenchem os frames entre medições), mas não contam como sucesso:
+    # a taxa de sucesso considera apenas os frames em que o tracker foi de fato consultado. Os frames pulados antes de
+    # uma medição que falhou não foram avaliados: ficam fora do denominador em vez de contarem como falhas
+    interpolated_frames = getattr(store, "interpolated_frames", 0)
+    skipped_frames = getattr(store, "skipped_frames", 0)
+    success_frames -= interpolated_frames
+    measured_frames = num_frames - interpolated_frames - skipped_frames
+    success_rate = (success_frames / measured_frames) if measured_frames > 0 else 0.0  # Taxa de sucesso do tracking
+
+    # Conversão para unidades físicas (se fornecido pixels_per_meter)
+    mean_speed_m_s = max_speed_m_s = mean_speed_km_h = max_speed_km_h = None
+    if pixels_per_meter and pixels_per_meter > 0 and fps > 0:  # Se houver calibração
+        mean_speed_m_s = mean_speed_px_per_s / pixels_per_meter  # Converte para m/s
+        max_speed_m_s = max_speed_px_per_s / pixels_per_meter
+        mean_speed_km_h = mean_speed_m_s * 3.6  # Converte para km/h
+        max_speed_km_h = max_speed_m_s * 3.6
+
+    return {
+        "mean_speed_px": mean_speed_px,  # Velocidade média em pixels por frame
+        "max_speed_px": max_speed_px,  # Velocidade máxima em pixels por frame
+        "mean_speed_px_per_s": mean_speed_px_per_s,  # Velocidade média em pixels por segundo
+        "max_speed_px_per_s": max_speed_px_per_s,  # Velocidade máxima em pixels por segundo
+        "total_distance_px": total_distance_px,  # Distância total percorrida em pixels
+        "straight_distance_px": straight_distance_px,  # Distância em linha reta (início ao fim) em pixels
+        "path_efficiency": path_efficiency,  # Eficiência da trajetória (reta / total)
+        "success_frames": success_frames,  # Número de frames onde o objeto foi rastreado com sucesso
+        "success_rate": success_rate,  # Taxa de sucesso do rastreamento (0.0 a 1.0)
+        "interpolated_frames": interpolated_frames,  # Frames com posição interpolada (passo adaptativo)
+        "skipped_frames": skipped_frames,  # Frames pulados e não avaliados (a medição seguinte falhou)
+        "mean_speed_m_s": mean_speed_m_s,  # Velocidade média em metros por segundo (se calibrado)
+        "max_speed_m_s": max_speed_m_s,  # Velocidade máxima em metros por segundo (se calibrado)
+        "mean_speed_km_h": mean_speed_km_h,  # Velocidade média em km/h (se calibrado)
+        "max_speed_km_h": max_speed_km_h,  # Velocidade máxima em km/h (se calibrado)
+    }
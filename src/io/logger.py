@@ -14,38 +14,186 @@ Ele é responsável por registrar eventos importantes, erros e informações de
 tanto no console quanto em arquivos de texto persistentes na pasta 'data/results/logs'.
 Isso facilita o monitoramento da execução do software e a identificação de problemas
 durante o uso ou desenvolvimento.
+Os loggers não escrevem diretamente no disco: cada registro é colocado em uma fila (QueueHandler) e uma única
+thread (QueueListener) grava no console, no arquivo 'app_metric.log' (com rotação por tamanho) e, para os eventos
+estruturados de cada execução, no arquivo 'app_metric.events.jsonl' (um objeto JSON por linha). Assim o loop de
+tracking nunca espera pelo disco; se a fila encher, o registro é descartado em vez de travar o loop. Os processos
+do lote e do tracking em blocos mandam seus registros para a fila do processo principal, que é o único a gravar.
 '''
 #################
 
+import os  # Importa o módulo os para montar o caminho dos arquivos de log
+import json  # Importa json para os eventos estruturados
+import queue  # Importa queue para a fila entre os loggers e a thread de gravação
+import atexit  # Importa atexit para gravar os registros pendentes ao encerrar o programa
 import logging  # Importa o módulo padrão de logging do Python
+from time import perf_counter  # Importa o relógio usado no limite de frequência do debug por frame
+from datetime import datetime  # Importa datetime para o horário dos eventos
+from contextlib import contextmanager  # Importa contextmanager para a fila entre processos
 from logging import Logger  # Importa a classe Logger para tipagem
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler  # Importa a fila de logs e a rotação
+from typing import Optional  # Importa tipos para anotação de tipagem
 from .paths import get_data_dir  # Importa a função para obter o diretório de dados (onde os logs serão salvos)
 
+LOG_FILE = "app_metric.log"  # Log de texto
+EVENTS_FILE = "app_metric.events.jsonl"  # Eventos estruturados (JSON por linha)
+LOG_MAX_BYTES = 5 * 1024 ** 2  # Tamanho máximo de cada arquivo de log antes da rotação (5 MB)
+LOG_BACKUPS = 3  # Arquivos antigos mantidos na rotação (app_metric.log.1, .2, .3)
+LOG_QUEUE_SIZE = 10000  # Registros em espera na fila (acima disso são descartados)
+FRAME_LOG_INTERVAL = 1.0  # Intervalo mínimo (s) entre duas mensagens de debug por frame
+
 _LOGGER_CACHE = {}  # Dicionário global para armazenar loggers já criados e evitar duplicação (padrão Singleton)
+_level = logging.INFO  # Nível mínimo dos loggers da aplicação
+_sinks = []  # Destinos dos registros (console e arquivos), usados apenas pela thread de gravação
+_listeners = []  # Threads de gravação (a da fila local e as das filas entre processos)
+_configured = False  # Os destinos já foram definidos neste processo?
+
+class _DropQueueHandler(QueueHandler):  # Coloca o registro na fila sem nunca bloquear (fila cheia = registro descartado)
+
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = 0  # Registros descartados por falta de espaço na fila
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class _Listener(QueueListener):  # Thread de gravação; o sinal de parada espera por espaço (a fila pode estar cheia)
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+class _JsonLinesFormatter(logging.Formatter):  # Formata um evento estruturado como um objeto JSON em uma linha
+
+    def format(self, record):
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),  # Horário do evento
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.event,  # Nome do evento (ex.: run_start)
+            **record.fields,  # Campos do evento
+        }
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+_queue_handler = _DropQueueHandler(queue.Queue(LOG_QUEUE_SIZE))  # Manipulador compartilhado por todos os loggers
+
+def _stop_listeners():  # Grava os registros pendentes e encerra as threads de gravação
+    while _listeners:
+        _listeners.pop().stop()
+
+def _close_sinks():  # Fecha os arquivos de log
+    while _sinks:
+        _sinks.pop().close()
+
+def configure_logging(  # (Re)configura os destinos dos logs (chamada automaticamente no primeiro get_app_logger)
+    log_dir: Optional[str] = None,  # Pasta dos arquivos de log (padrão: data/results/logs)
+    max_bytes: int = LOG_MAX_BYTES,  # Tamanho máximo de cada arquivo antes da rotação
+    backups: int = LOG_BACKUPS,  # Arquivos antigos mantidos
+    console: bool = True,  # Também escreve no console?
+):
+    global _configured
+    _stop_listeners()
+    _close_sinks()
+    _configured = True
+    log_dir = str(log_dir) if log_dir else str(get_data_dir("logs", create=True))
+    os.makedirs(log_dir, exist_ok=True)
+
+    text = RotatingFileHandler(os.path.join(log_dir, LOG_FILE), maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+    text.setFormatter(logging.Formatter("[%(levelname)s][%(name)s] %(message)s"))  # Formato: [NÍVEL][NOME] Mensagem
+    events = RotatingFileHandler(os.path.join(log_dir, EVENTS_FILE), maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+    events.setFormatter(_JsonLinesFormatter())
+    events.addFilter(lambda record: hasattr(record, "event"))  # Apenas os eventos estruturados
+    _sinks.extend([text, events])
+    if console:
+        ch = logging.StreamHandler()  # Cria um manipulador para escrever logs no console (StreamHandler)
+        ch.setFormatter(text.formatter)
+        _sinks.append(ch)
+
+    _queue_handler.queue = queue.Queue(LOG_QUEUE_SIZE)  # Fila nova (a anterior já foi esvaziada pela thread encerrada)
+    listener = _Listener(_queue_handler.queue, *_sinks)  # Única thread que escreve no disco e no console
+    listener.start()
+    _listeners.append(listener)
+
+def shutdown_logging():  # Grava os registros pendentes e fecha os arquivos (registrada para o fim do programa)
+    _stop_listeners()
+    _close_sinks()
+
+atexit.register(shutdown_logging)
+
+def set_log_level(level) -> None:  # Muda o nível mínimo de todos os loggers da aplicação (ex.: 'DEBUG')
+    global _level
+    _level = logging.getLevelName(level.upper()) if isinstance(level, str) else int(level)
+    for logger in _LOGGER_CACHE.values():
+        logger.setLevel(_level)
+
+def get_log_level() -> int:  # Nível mínimo atual dos loggers da aplicação
+    return _level
+
+def dropped_records() -> int:  # Registros descartados porque a fila estava cheia
+    return _queue_handler.dropped
 
 def get_app_logger(name: str = "app_metric") -> Logger:  # Define a função que retorna uma instância de Logger configurada
 
     if name in _LOGGER_CACHE:  # Verifica se um logger com esse nome já existe no cache
         return _LOGGER_CACHE[name]  # Se existir, retorna a instância cacheada para economizar recursos
 
+    if not _configured:  # Primeiro logger do processo: inicia a thread de gravação
+        configure_logging()
+
     logger = logging.getLogger(name)  # Cria (ou recupera) um objeto logger com o nome fornecido
-    logger.setLevel(logging.INFO)  # Define o nível mínimo de log como INFO (ignora DEBUG)
+    logger.setLevel(_level)  # Define o nível mínimo de log (padrão INFO, ignora DEBUG)
     logger.propagate = False  # Impede que os logs subam para o logger raiz (evita logs duplicados no console)
+    logger.addHandler(_queue_handler)  # Todos os loggers compartilham a mesma fila (e os mesmos arquivos)
 
-    logs_dir = get_data_dir("logs", create=True)  # Obtém o caminho da pasta de logs, criando-a se não existir
-    log_file = logs_dir / "app_metric.log"  # Define o caminho completo do arquivo de log (app_metric.log)
+    _LOGGER_CACHE[name] = logger  # Salva o logger configurado no cache global
+    return logger  # Retorna o objeto logger pronto para uso
 
-    fmt = logging.Formatter("[%(levelname)s][%(name)s] %(message)s")  # Define o formato da mensagem: [NÍVEL][NOME] Mensagem
+@contextmanager
+def process_log_queue(ctx):  # Fila para os processos de um pool: os registros deles são gravados por este processo
+    if not _configured:
+        configure_logging()
+    q = ctx.Queue(LOG_QUEUE_SIZE)
+    listener = _Listener(q, *_sinks)  # Mesmos destinos (os manipuladores têm trava própria)
+    listener.start()
+    _listeners.append(listener)
+    try:
+        yield q
+    finally:
+        listener.stop()  # Grava os registros que ainda estavam na fila
+        if listener in _listeners:
+            _listeners.remove(listener)
 
-    fh = logging.FileHandler(log_file, encoding="utf-8")  # Cria um manipulador para escrever logs em arquivo (FileHandler)
-    fh.setLevel(logging.INFO)  # Define que o arquivo registrará logs de nível INFO ou superior
-    fh.setFormatter(fmt)  # Aplica o formato definido anteriormente ao arquivo
-    logger.addHandler(fh)  # Adiciona o manipulador de arquivo ao logger
+def init_worker_logging(q, level: int = logging.INFO):  # Inicializador de um processo do pool: envia os logs para a fila do pai
+    global _configured
+    _stop_listeners()  # O processo não grava nada por conta própria
+    _close_sinks()
+    _configured = True
+    _queue_handler.queue = q
+    set_log_level(level)
 
-    ch = logging.StreamHandler()  # Cria um manipulador para escrever logs no console (StreamHandler)
-    ch.setLevel(logging.INFO)  # Define que o console mostrará logs de nível INFO ou superior
-    ch.setFormatter(fmt)  # Aplica o formato definido anteriormente ao console
-    logger.addHandler(ch)  # Adiciona o manipulador de console ao logger
+def log_event(logger: Logger, event: str, message: Optional[str] = None, level: int = logging.INFO, **fields):  # Evento estruturado
+    if logger.isEnabledFor(level):  # Vai para o log de texto (mensagem) e para o arquivo JSON por linha (campos)
+        text = message or f"{event}: " + ", ".join(f"{k}={v}" for k, v in fields.items())
+        logger.log(level, text, extra={"event": event, "fields": fields}, stacklevel=2)  # Linha de quem chamou
 
-    _LOGGER_CACHE[name] = logger  # Salva o logger configurado no cache global
-    return logger  # Retorna o objeto logger pronto para uso
+class FrameDebugLog:  # Debug por frame com limite de frequência (no máximo uma mensagem por intervalo)
+
+    def __init__(self, logger: Logger, interval: float = FRAME_LOG_INTERVAL):
+        self.logger = logger
+        self.interval = interval  # Intervalo mínimo entre duas mensagens (s)
+        self.suppressed = 0  # Mensagens omitidas desde a última emitida
+        self._last = None  # Momento da última mensagem
+
+    def debug(self, frame: int, msg: str, *args):  # Registra a mensagem do frame se o intervalo já passou
+        if not self.logger.isEnabledFor(logging.DEBUG):  # Sem DEBUG ligado o custo é só esta verificação
+            return
+        now = perf_counter()
+        if self._last is not None and now - self._last < self.interval:
+            self.suppressed += 1
+            return
+        self._last = now
+        suffix = f" (+{self.suppressed} omitidas)" if self.suppressed else ""
+        self.suppressed = 0
+        self.logger.debug(f"[frame {frame}] {msg}{suffix}", *args)
@@ -18,7 +18,7 @@ em qualquer sistema operacional ou computador.
 #################
 
 from pathlib import Path  # Importa a classe Path para manipulação de caminhos de forma orientada a objetos
-from typing import Literal  # Importa Literal para definir valores específicos permitidos em argumentos
+from typing import Literal, Optional  # Importa Literal e Optional para anotação dos argumentos
 
 def get_project_root() -> Path:  # Define função que retorna o caminho raiz do projeto
     # Retorna o diretório pai do pai do pai deste arquivo (sobe 3 níveis: io -> src -> Project)
@@ -40,11 +40,14 @@ def get_data_dir(subdir: Literal["raw", "processed", "results", "logs"] = "resul
 
     return path  # Retorna o objeto Path do diretório
 
-def get_timestamped_results_dir(prefix: str = "exec") -> Path:  # Função para criar pasta de resultados com data/hora
+def get_timestamped_results_dir(prefix: str = "exec",  # Função para criar pasta de resultados com data/hora
+                                base_dir: Optional[Path] = None) -> Path:  # Pasta base opcional (padrão: data/results)
 
     from datetime import datetime  # Importa datetime localmente
 
-    base_dir = get_data_dir("results", create=True)  # Obtém a pasta base de resultados
+    if base_dir is None:  # Se nenhuma pasta base foi informada
+        base_dir = get_data_dir("results", create=True)  # Obtém a pasta base de resultados
+    base_dir = Path(base_dir)  # Garante que a pasta base seja um objeto Path
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")  # Gera timestamp atual
     result_dir = base_dir / f"{prefix}_{ts}"  # Cria nome da nova pasta com prefixo e timestamp
     result_dir.mkdir(parents=True, exist_ok=True)  # Cria a pasta no disco
@@ -0,0 +1,99 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo é responsável por carregar as Regiões de Interesse (ROI) iniciais a partir de arquivos JSON.
+Ele permite executar o tracking sem interface gráfica (modo headless), informando a caixa inicial
+de cada vídeo em um arquivo "sidecar" em vez de selecioná-la com o mouse.
+Formatos aceitos:
+  - Um arquivo com várias caixas: {"cachorro.mp4": [x, y, w, h], "gato.mp4": [x, y, w, h]}
+  - Um arquivo ao lado do vídeo (ex.: 'cachorro.roi.json') contendo apenas [x, y, w, h]
+  - Para vários objetos no mesmo vídeo, uma lista de caixas: {"tenis-de-mesa.mp4": [[x, y, w, h], [x, y, w, h]]}
+'''
+#################
+
+import os  # Importa o módulo os para manipular caminhos de arquivos
+import json  # Importa o módulo json para ler os arquivos sidecar
+from typing import Dict, List, Optional, Tuple, Union  # Importa tipos para anotação de tipagem
+
+Box = Tuple[int, int, int, int]  # Alias de tipo para uma caixa delimitadora (x, y, w, h)
+
+ROI_SIDECAR_SUFFIX = ".roi.json"  # Sufixo do arquivo sidecar individual salvo ao lado do vídeo
+
+def parse_box(value) -> Box:  # Converte um valor lido do JSON em uma caixa (x, y, w, h) validada
+
+    if isinstance(value, dict):  # Aceita também o formato {"x": .., "y": .., "w": .., "h": ..}
+        value = [value.get("x"), value.get("y"), value.get("w"), value.get("h")]  # Reorganiza como lista
+
+    if not isinstance(value, (list, tuple)) or len(value) != 4:  # A caixa precisa ter exatamente 4 valores
+        raise ValueError(f"ROI inválida: {value!r} (esperado [x, y, w, h])")  # Lança erro explicativo
+
+    try:
+        x, y, w, h = [int(round(float(v))) for v in value]  # Converte cada valor para inteiro
+    except (TypeError, ValueError):  # Algum valor não é numérico
+        raise ValueError(f"ROI inválida: {value!r} (valores devem ser numéricos)")  # Lança erro explicativo
+
+    if w <= 0 or h <= 0 or x < 0 or y < 0:  # Largura/altura precisam ser positivas e a posição não negativa
+        raise ValueError(f"ROI inválida: {value!r} (largura e altura devem ser positivas)")  # Lança erro
+
+    return (x, y, w, h)  # Retorna a caixa validada
+
+def _is_box_list(value) -> bool:  # Indica se o valor é uma lista de caixas (vários objetos) em vez de uma caixa
+    return isinstance(value, list) and len(value) > 0 and all(isinstance(v, (list, tuple, dict)) for v in value)
+
+def parse_boxes(value) -> List[Box]:  # Converte um valor do JSON em uma lista de caixas (aceita uma caixa única)
+    if _is_box_list(value):  # Lista de caixas
+        return [parse_box(v) for v in value]
+    return [parse_box(value)]  # Caixa única vira uma lista com um elemento
+
+def load_roi_sidecar(json_path: str) -> Dict[str, Union[Box, List[Box]]]:  # Lê um arquivo JSON com as caixas iniciais de vários vídeos
+
+    with open(json_path, "r", encoding="utf-8") as f:  # Abre o arquivo JSON em modo leitura
+        data = json.load(f)  # Carrega o conteúdo do arquivo
+
+    if not isinstance(data, dict):  # O arquivo com várias caixas precisa ser um objeto {nome: caixa}
+        raise ValueError(f"Arquivo de ROIs inválido: {json_path} (esperado um objeto {{vídeo: [x, y, w, h]}})")
+
+    return {  # Valida e retorna todas as caixas (uma caixa ou uma lista de caixas por vídeo)
+        str(name): parse_boxes(box) if _is_box_list(box) else parse_box(box) for name, box in data.items()
+    }
+
+def match_roi_key(video_path: str, rois: Optional[Dict[str, Box]]) -> Optional[str]:  # Descobre qual chave do dicionário de ROIs corresponde ao vídeo
+
+    if not rois:  # Sem dicionário de ROIs não há chave possível
+        return None
+
+    file_name = os.path.basename(video_path)  # Nome do arquivo com extensão (ex.: gato.mp4)
+    stem = os.path.splitext(file_name)[0]  # Nome do arquivo sem extensão (ex.: gato)
+    for key in (video_path, os.path.abspath(video_path), file_name, stem):  # Tenta as chaves em ordem de especificidade
+        if key in rois:  # Se encontrou a chave no dicionário
+            return key  # Retorna a chave encontrada
+    return None  # Nenhuma chave corresponde ao vídeo
+
+def find_initial_box(video_path: str, rois: Optional[Dict[str, Box]] = None) -> Optional[Box]:  # Procura a ROI inicial de um vídeo
+
+    boxes = find_initial_boxes(video_path, rois)  # Procura as caixas do vídeo
+    if boxes is None:  # Nenhuma ROI encontrada
+        return None
+    return boxes[0]  # Tracking de um objeto usa a primeira caixa
+
+def find_initial_boxes(video_path: str, rois: Optional[Dict[str, Union[Box, List[Box]]]] = None) -> Optional[List[Box]]:  # Procura as ROIs iniciais (vários objetos) de um vídeo
+
+    key = match_roi_key(video_path, rois)  # Procura a chave correspondente no dicionário de ROIs
+    if key is not None:  # Se encontrou
+        value = rois[key]  # Caixa única ou lista de caixas
+        return list(value) if isinstance(value, list) else [value]  # Sempre devolve uma lista
+
+    sidecar = os.path.splitext(video_path)[0] + ROI_SIDECAR_SUFFIX  # Caminho do sidecar individual ao lado do vídeo
+    if os.path.isfile(sidecar):  # Se o sidecar individual existir
+        with open(sidecar, "r", encoding="utf-8") as f:  # Abre o arquivo
+            return parse_boxes(json.load(f))  # Lê e valida as caixas
+
+    return None  # Nenhuma ROI encontrada para este vídeo
@@ -0,0 +1,178 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo cria e consulta o índice de busca (seek index) de um vídeo.
+Uma prova curta (alguns frames lidos em sequência e dois saltos) indica se o backend do OpenCV posiciona o vídeo
+com exatidão em um frame pedido. Nesse caso o índice não percorre o vídeo: o número de frames vem do arquivo
+(conferido no último frame) e tempo vira frame pelo FPS. Caso contrário o índice guarda o instante (ms) de cada
+frame, obtido com grab() (sem converter as imagens), e é montado aos poucos: só até o frame ou instante pedido,
+e até o fim apenas quando o total de frames é necessário.
+Ele é salvo ao lado do vídeo ('<vídeo>.seek.json') e reaproveitado enquanto o vídeo não mudar (tamanho e data).
+Com ele, o tracking de um trecho converte tempo em frame e pula direto para o início do trecho.
+'''
+#################
+
+import os  # Importa o módulo os para montar o caminho do sidecar
+import json  # Importa json para salvar e ler o índice
+import math  # Importa math para converter tempo em frame pelo FPS
+import bisect  # Importa bisect para converter tempo em frame
+from typing import Dict, Optional  # Importa tipos para anotação de tipagem
+import cv2  # Importa a biblioteca OpenCV para ler o vídeo
+import numpy as np  # Importa NumPy para comparar o frame da busca direta com o da leitura em sequência
+
+SEEK_INDEX_SUFFIX = ".seek.json"  # Sufixo do índice salvo ao lado do vídeo
+SEEK_INDEX_VERSION = 2  # Versão do formato do índice
+SEEK_PROBE_FRAMES = 30  # Frames lidos em sequência para conferir a busca direta
+
+def seek_index_path(video_path: str) -> str:  # Caminho do índice de um vídeo
+    return video_path + SEEK_INDEX_SUFFIX
+
+def _video_signature(video_path: str) -> Dict:  # Tamanho e data do vídeo (invalidam o índice se mudarem)
+    st = os.stat(video_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def _save_seek_index(video_path: str, index: Dict):  # Salva ao lado do vídeo (se a pasta não permitir escrita, o índice vale só para esta execução)
+    try:
+        with open(seek_index_path(video_path), "w", encoding="utf-8") as f:
+            json.dump(index, f)
+    except OSError:
+        pass
+
+def build_seek_index(video_path: str) -> Dict:  # Cria o índice: prova da busca direta, sem percorrer o vídeo
+    cap = cv2.VideoCapture(video_path)  # Abre o vídeo
+    if not cap.isOpened():
+        raise RuntimeError(f"Não foi possível abrir o vídeo: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0  # FPS informado pelo arquivo
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))  # Estimativa do arquivo (conferida pela prova)
+    try:
+        seekable = _probe_seek(cap, fps, frame_count)  # O backend posiciona o vídeo com exatidão?
+    finally:
+        cap.release()
+
+    index = {
+        "version": SEEK_INDEX_VERSION,  # Versão do formato
+        **_video_signature(video_path),  # Assinatura do vídeo
+        "fps": fps,  # FPS do arquivo
+        "seekable": seekable,  # Busca direta exata (tempo vira frame pelo FPS)
+        "num_frames": frame_count if seekable else None,  # Número real de frames (None = ainda não conhecido)
+        "timestamps_ms": [],  # Instante de cada frame já percorrido (apenas sem busca direta)
+    }
+    _save_seek_index(video_path, index)
+    return index
+
+def _probe_seek(cap, fps: float, frame_count: int) -> bool:  # Testa se o posicionamento por frame é exato (prova curta)
+    if fps <= 0 or frame_count < 3:  # Sem FPS não há como conferir o instante; vídeo curto: ler do início é barato
+        return False
+    probe = min(SEEK_PROBE_FRAMES, frame_count - 1)  # Frame conferido contra a leitura em sequência
+    for _ in range(probe):
+        if not cap.grab():
+            return False
+    ret, expected = cap.read()  # Frame 'probe' lido em sequência
+    cap.set(cv2.CAP_PROP_POS_FRAMES, probe)
+    ret_seek, frame = cap.read()  # O mesmo frame pela busca direta
+    if not (ret and ret_seek) or not np.array_equal(frame, expected):
+        return False
+    tolerance = 500.0 / fps  # Meio intervalo entre frames, em ms
+    for target in (frame_count // 2, frame_count - 1):  # Meio e último frame: o instante deve ser frame / FPS
+        cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+        if not cap.grab() or abs(cap.get(cv2.CAP_PROP_POS_MSEC) - target * 1000.0 / fps) > tolerance:
+            return False
+    return not cap.grab()  # Depois do último frame não há outro: o número de frames do arquivo é exato
+
+def _covers(index: Dict, frame: Optional[int], seconds: Optional[float]) -> bool:  # O índice já alcança o frame/instante pedido?
+    if index["num_frames"] is not None:  # Busca direta ou índice completo
+        return True
+    timestamps = index["timestamps_ms"]
+    if frame is None and seconds is None:  # Sem alvo: é preciso o total de frames
+        return False
+    return ((frame is None or len(timestamps) > frame)
+            and (seconds is None or bool(timestamps) and timestamps[-1] >= seconds * 1000.0 - 1e-6))
+
+def _extend_seek_index(video_path: str, index: Dict, frame: Optional[int], seconds: Optional[float]):  # Percorre o vídeo até o alvo
+    timestamps = index["timestamps_ms"]
+    cap = cv2.VideoCapture(video_path)
+    try:
+        for _ in range(len(timestamps)):  # Frames já indexados: apenas avança (sem busca exata não há atalho)
+            cap.grab()
+        while not _covers(index, frame, seconds):
+            if not cap.grab():  # Fim do vídeo: o índice fica completo
+                index["num_frames"] = len(timestamps)
+                break
+            timestamps.append(round(cap.get(cv2.CAP_PROP_POS_MSEC), 3))  # grab() avança sem converter a imagem
+    finally:
+        cap.release()
+
+def get_seek_index(  # Carrega o índice salvo (ou cria um novo) e garante que ele alcance o frame/instante pedido
+    video_path: str,
+    frame: Optional[int] = None,  # Frame que precisa estar no índice
+    seconds: Optional[float] = None,  # Instante (s) que precisa estar no índice
+) -> Dict:  # Sem frame nem instante, o índice precisa do total de frames
+    path = seek_index_path(video_path)
+    index = None
+    if os.path.isfile(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != SEEK_INDEX_VERSION or any(
+                index.get(k) != v for k, v in _video_signature(video_path).items()
+            ):
+                index = None  # Índice de outra versão ou de outro vídeo: é recriado
+        except (OSError, ValueError):  # Índice corrompido: é recriado
+            index = None
+    if index is None:
+        index = build_seek_index(video_path)
+    if not _covers(index, frame, seconds):  # Completa o índice só até onde foi pedido
+        _extend_seek_index(video_path, index, frame, seconds)
+        _save_seek_index(video_path, index)
+    return index
+
+def seek_index_for_range(  # Índice que alcança o trecho pedido (até o fim do vídeo apenas se o trecho for até o fim)
+    video_path: str,
+    start_frame: Optional[int] = None, end_frame: Optional[int] = None,
+    start_time: Optional[float] = None, end_time: Optional[float] = None,
+) -> Dict:
+    if end_frame is None and end_time is None:  # Trecho até o fim: precisa do total de frames
+        return get_seek_index(video_path)
+    frames = [f for f in (start_frame, end_frame - 1 if end_frame is not None else None) if f is not None]
+    times = [t for t in (start_time, end_time) if t is not None]
+    return get_seek_index(video_path, max(frames, default=None), max(times, default=None))
+
+def time_to_frame(index: Dict, seconds: float) -> int:  # Primeiro frame cujo instante é >= ao tempo pedido
+    if index.get("seekable"):  # Busca direta exata: o instante de cada frame é frame / FPS
+        return min(max(0, math.ceil(seconds * index["fps"] - 1e-6)), index["num_frames"])
+    timestamps = index["timestamps_ms"]  # Instantes já indexados (o índice precisa alcançar o tempo pedido)
+    frame = bisect.bisect_left(timestamps, seconds * 1000.0 - 1e-6)
+    return frame if index["num_frames"] is None else min(frame, index["num_frames"])
+
+def seek_to_frame(cap, index: Dict, frame: int):  # Posiciona o vídeo de forma que o próximo read() devolva 'frame'
+    if frame <= 0:  # Já está no início
+        return
+    if index.get("seekable"):  # Busca direta (o backend decodifica a partir do keyframe anterior)
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame)
+        return
+    for _ in range(frame):  # Backend sem busca exata: avança com grab(), sem converter as imagens
+        if not cap.grab():
+            break
+
+def resolve_frame_range(  # Converte frames/tempos pedidos em um intervalo [início, fim) de frames válido
+    index: Dict,
+    start_frame: Optional[int] = None, end_frame: Optional[int] = None,
+    start_time: Optional[float] = None, end_time: Optional[float] = None,
+):
+    n = index["num_frames"]  # Total real de frames (None = índice parcial, que já alcança o trecho)
+    known = len(index["timestamps_ms"]) if n is None else n  # Frames que com certeza existem
+    start = start_frame if start_frame is not None else (time_to_frame(index, start_time) if start_time is not None else 0)
+    end = end_frame if end_frame is not None else (time_to_frame(index, end_time) if end_time is not None else known)
+    end = min(end, known)  # O fim não passa do último frame
+    if start < 0 or start >= end:
+        total = f"{n} frames" if n is not None else f"pelo menos {known} frames"
+        raise ValueError(f"Intervalo de frames inválido: início={start}, fim={end} (o vídeo tem {total})")
+    return start, end
@@ -0,0 +1,156 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo define o formato binário compacto da trajetória (arquivos '.traj') e sua leitura.
+O arquivo tem um cabeçalho fixo de 64 bytes (identificador, versão, FPS, resolução e número de registros)
+seguido de registros de tamanho fixo (frame int32, x/y/w/h float32, flags uint8), um por frame processado.
+O byte de flags guarda no bit 0 se o objeto foi encontrado e no bit 1 se a posição foi interpolada (passo adaptativo).
+A leitura usa memória mapeada (np.memmap): nada é copiado nem convertido de texto, e fatias como
+"x dos frames 1000 a 2000" são lidas direto do disco sob demanda, o que torna rápido carregar milhares
+de execuções em notebooks de análise.
+'''
+#################
+
+import os  # Importa o módulo os para verificar o tamanho dos arquivos
+import struct  # Importa struct para gravar e ler o cabeçalho binário
+import numpy as np  # Importa NumPy para os registros e a memória mapeada
+
+TRAJECTORY_SUFFIX = ".traj"  # Extensão dos arquivos de trajetória binária
+TRAJECTORY_MAGIC = b"AMTRAJ\x00\x00"  # Identificador do formato (8 bytes)
+TRAJECTORY_VERSION = 1  # Versão do formato
+HEADER_SIZE = 64  # Tamanho fixo do cabeçalho em bytes (os registros começam depois dele)
+
+_HEADER_STRUCT = struct.Struct("<8sIdiiq")  # magic, versão, fps, largura, altura, número de registros
+_COUNT_OFFSET = _HEADER_STRUCT.size - 8  # Posição do número de registros (atualizado ao fechar o arquivo)
+
+SUCCESS_FLAG = 1  # Bit 0: objeto encontrado (posição válida)
+INTERPOLATED_FLAG = 2  # Bit 1: posição interpolada entre duas medições do tracker
+# Bit 1 sem o bit 0: frame pulado pelo passo adaptativo e não avaliado (a medição seguinte falhou, não há como interpolar)
+
+# Registro de um frame (little-endian, sem alinhamento: 21 bytes por frame)
+RECORD_DTYPE = np.dtype([
+    ("frame", "<i4"),  # Índice do frame
+    ("x", "<f4"),  # Centro X da caixa (pixels do vídeo original)
+    ("y", "<f4"),  # Centro Y da caixa
+    ("w", "<f4"),  # Largura da caixa
+    ("h", "<f4"),  # Altura da caixa
+    ("success", "u1"),  # Flags: SUCCESS_FLAG se o objeto foi encontrado, INTERPOLATED_FLAG se a posição foi interpolada
+])
+
+class TrajectoryFileWriter:  # Grava um arquivo '.traj' em blocos (o número de registros é fixado ao fechar)
+
+    def __init__(self, path: str, fps: float, width: int, height: int):
+        self.path = path  # Caminho do arquivo
+        self.count = 0  # Registros gravados
+        self._header = (float(fps), int(width), int(height))  # Metadados do vídeo
+        self._file = open(path, "wb")  # Abre o arquivo em modo binário
+        self._write_header()  # Cabeçalho provisório (contagem zero)
+
+    def _write_header(self):  # Grava o cabeçalho no início do arquivo
+        fps, width, height = self._header
+        header = _HEADER_STRUCT.pack(TRAJECTORY_MAGIC, TRAJECTORY_VERSION, fps, width, height, self.count)
+        self._file.write(header.ljust(HEADER_SIZE, b"\x00"))  # Completa com zeros até o tamanho fixo
+
+    def write(self, records: np.ndarray):  # Acrescenta um bloco de registros (array com RECORD_DTYPE)
+        records = np.asarray(records, dtype=RECORD_DTYPE)
+        self._file.write(records.tobytes())  # Grava os bytes diretamente, sem formatação
+        self.count += len(records)
+
+    def close(self):  # Atualiza a contagem no cabeçalho e fecha o arquivo
+        if self._file is None:
+            return
+        self._file.seek(_COUNT_OFFSET)
+        self._file.write(struct.pack("<q", self.count))
+        self._file.close()
+        self._file = None
+
+def write_trajectory_file(  # Grava um arquivo '.traj' completo a partir das colunas da trajetória
+    path: str,  # Caminho do arquivo
+    frames: np.ndarray, xs: np.ndarray, ys: np.ndarray, ws: np.ndarray, hs: np.ndarray, success: np.ndarray,  # Colunas
+    fps: float, width: int, height: int,  # Metadados do vídeo
+    interpolated: np.ndarray = None,  # Frames com posição interpolada (opcional)
+):
+    records = np.empty(len(frames), dtype=RECORD_DTYPE)  # Monta os registros de uma vez
+    records["frame"] = frames
+    records["x"] = xs
+    records["y"] = ys
+    records["w"] = ws
+    records["h"] = hs
+    records["success"] = np.asarray(success, dtype=np.uint8) * SUCCESS_FLAG
+    if interpolated is not None:
+        records["success"] |= np.asarray(interpolated, dtype=np.uint8) * INTERPOLATED_FLAG
+    writer = TrajectoryFileWriter(path, fps, width, height)
+    try:
+        writer.write(records)
+    finally:
+        writer.close()
+
+class TrajectoryFile:  # Trajetória binária aberta com memória mapeada (leitura sem cópia)
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:  # Lê e valida o cabeçalho
+            raw = f.read(HEADER_SIZE)
+        if len(raw) < HEADER_SIZE:
+            raise ValueError(f"Arquivo de trajetória inválido: {path} (cabeçalho incompleto)")
+        magic, version, fps, width, height, count = _HEADER_STRUCT.unpack_from(raw)
+        if magic != TRAJECTORY_MAGIC:
+            raise ValueError(f"Arquivo de trajetória inválido: {path} (identificador desconhecido)")
+        if version != TRAJECTORY_VERSION:
+            raise ValueError(f"Versão de trajetória não suportada: {version} ({path})")
+        if HEADER_SIZE + count * RECORD_DTYPE.itemsize > os.path.getsize(path):
+            raise ValueError(f"Arquivo de trajetória truncado: {path}")
+
+        self.path = path  # Caminho do arquivo
+        self.fps = fps  # FPS do vídeo de origem
+        self.width = width  # Largura do vídeo de origem
+        self.height = height  # Altura do vídeo de origem
+        self.records: np.ndarray = (  # Registros mapeados do disco (somente leitura)
+            np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+            if count > 0 else np.empty(0, dtype=RECORD_DTYPE)  # O mmap não aceita regiões vazias
+        )
+
+    def __len__(self) -> int:  # Número de frames registrados
+        return len(self.records)
+
+    # Colunas (visões sobre a memória mapeada)
+    @property
+    def frames(self) -> np.ndarray:
+        return self.records["frame"]
+
+    @property
+    def xs(self) -> np.ndarray:
+        return self.records["x"]
+
+    @property
+    def ys(self) -> np.ndarray:
+        return self.records["y"]
+
+    @property
+    def ws(self) -> np.ndarray:
+        return self.records["w"]
+
+    @property
+    def hs(self) -> np.ndarray:
+        return self.records["h"]
+
+    @property
+    def success(self) -> np.ndarray:
+        return (self.records["success"] & SUCCESS_FLAG) != 0  # Máscara booleana do bit de sucesso
+
+    @property
+    def interpolated(self) -> np.ndarray:
+        return (self.records["success"] & INTERPOLATED_FLAG) != 0  # Máscara booleana do bit de interpolação
+
+def open_trajectory(path: str) -> TrajectoryFile:  # Abre um arquivo '.traj' com memória mapeada
+    return TrajectoryFile(path)
+
+def is_trajectory_file(path: str) -> bool:  # Indica se o caminho é um arquivo de trajetória binária
+    return os.path.splitext(path)[1].lower() == TRAJECTORY_SUFFIX
@@ -0,0 +1,403 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este módulo implementa a interface de linha de comando (CLI) da aplicação.
+Ele permite executar o tracking sem interface gráfica (modo headless), informando a ROI inicial
+diretamente na linha de comando ou através de um arquivo JSON (sidecar), o que possibilita
+rodar análises automáticas em servidores, sem janelas do OpenCV e na velocidade de decodificação.
+Uso: python -m src.ui.cli track data/raw/gato.mp4 --box 100 80 60 40 --csv
+'''
+#################
+
+import sys  # Importa sys para manipulação do sistema (path e código de saída)
+import os  # Importa os para manipulação de arquivos
+import argparse  # Importa argparse para interpretar os argumentos da linha de comando
+
+# Adiciona a raiz do projeto ao path para permitir imports absolutos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.core.tracking import compare_trackers, parse_tracker_config, track_multiple_objects  # Importa o tracking de vários objetos e a comparação de trackers
+from src.core.cache import cached_track_single_object  # Importa o tracking com cache de resultados
+from src.core.chunked import track_chunked  # Importa o tracking paralelo em blocos
+from src.core.resolution import benchmark_track_scales  # Importa o comparativo de precisão x velocidade por escala
+from src.core.batch import find_videos, run_batch, format_batch_summary  # Importa o executor em lote
+from src.io.logger import get_app_logger, set_log_level  # Importa o logger
+from src.io.paths import get_data_dir, get_timestamped_results_dir  # Importa as funções de caminhos de dados
+from src.core.trajectory import convert_binary_to_csv  # Importa a conversão da trajetória binária para CSV
+from src.core.metrics import recompute_metrics  # Importa o recálculo de métricas a partir de uma trajetória salva
+from src.core.kalman import KALMAN_MODELS  # Importa os modelos de movimento aceitos
+from src.core.profiling import PROFILE_DUMPS  # Importa os tipos de perfil detalhado
+from src.core.overlay import export_overlays, play_overlay  # Importa o player e a exportação das anotações sob demanda
+from src.core.debug_panels import DEBUG_FORMATS, DEBUG_WORKERS, build_debug_panels  # Importa os painéis de debug sob demanda
+from src.io.roi import load_roi_sidecar, find_initial_box, find_initial_boxes  # Importa as funções de leitura das ROIs em JSON
+
+logger = get_app_logger("cli")  # Inicializa logger da CLI
+
+def _add_tracking_options(parser: argparse.ArgumentParser):  # Adiciona as opções comuns de tracking a um subcomando
+    parser.add_argument("--tracker", default="CSRT", help="Algoritmo de tracking (CSRT, KCF ou CASCADE)")  # Tipo de tracker
+    parser.add_argument("--rois", default=None, help="Arquivo JSON com as ROIs iniciais {vídeo: [x, y, w, h]}")  # Sidecar JSON
+    parser.add_argument("--ppm", type=float, default=None, help="Calibração em pixels por metro")  # Escala física
+    parser.add_argument("--no-video", action="store_true", help="Não salva o vídeo anotado")  # Desliga o vídeo de saída
+    parser.add_argument("--csv", action="store_true", help="Salva a trajetória em CSV")  # Liga o CSV
+    parser.add_argument("--no-debug", action="store_true", help="Não salva as imagens de debug")  # Desliga o debug
+    parser.add_argument("--binary", action="store_true", help="Salva a trajetória no formato binário '.traj'")  # Liga o binário
+    parser.add_argument("--no-cache", action="store_true", help="Ignora o cache de resultados e sempre roda o tracking")  # Desliga o cache
+    parser.add_argument("--stream", action="store_true", help="Grava o CSV durante o tracking com memória constante (vídeos longos)")  # Modo streaming
+
+def _add_debug_format_options(parser: argparse.ArgumentParser):  # Adiciona as opções de formato dos painéis de debug
+    parser.add_argument("--debug-format", choices=tuple(DEBUG_FORMATS), default="png",
+                        help="Formato dos painéis de debug (jpg/webp gravam bem mais rápido que png)")  # Formato
+    parser.add_argument("--debug-quality", type=int, default=None,
+                        help="Compressão do PNG (0-9) ou qualidade do JPEG/WebP (0-100)")  # Nível de compressão
+
+def _build_parser() -> argparse.ArgumentParser:  # Monta o interpretador de argumentos da CLI
+    parser = argparse.ArgumentParser(prog="app-metric", description="Tracking de objetos em vídeo (App Metric)")  # Parser principal
+    parser.add_argument("--log-level", choices=("DEBUG", "INFO", "WARNING", "ERROR"), default="INFO",
+                        help="Nível mínimo dos logs (DEBUG inclui uma mensagem por segundo do loop de tracking)")  # Nível dos logs
+    sub = parser.add_subparsers(dest="command", required=True)  # Cria os subcomandos
+
+    p_track = sub.add_parser("track", help="Rastreia um objeto em um vídeo")  # Subcomando de tracking de um vídeo
+    p_track.add_argument("video", help="Caminho do vídeo de entrada")  # Vídeo de entrada
+    p_track.add_argument("--box", type=int, nargs=4, metavar=("X", "Y", "W", "H"), default=None,
+                         help="ROI inicial em pixels do vídeo original")  # ROI inicial direta
+    p_track.add_argument("--out", default=None, help="Pasta de saída (padrão: data/results/<vídeo>_<data>)")  # Pasta de saída
+    p_track.add_argument("--gui", action="store_true", help="Abre as janelas do OpenCV (seleção de ROI e exibição)")  # Modo interativo
+    p_track.add_argument("--track-scale", type=float, default=1.0, help="Escala do frame entregue ao tracker (ex.: 0.5)")  # Resolução reduzida
+    p_track.add_argument("--search-window", type=float, default=None, help="Janela de busca em múltiplos da caixa (ex.: 3)")  # Janela recortada
+    p_track.add_argument("--start", type=int, default=None, help="Primeiro frame do trecho (a ROI se refere a ele)")  # Início do trecho
+    p_track.add_argument("--end", type=int, default=None, help="Frame final do trecho (exclusivo)")  # Fim do trecho
+    p_track.add_argument("--start-time", type=float, default=None, help="Início do trecho em segundos")  # Início em tempo
+    p_track.add_argument("--end-time", type=float, default=None, help="Fim do trecho em segundos")  # Fim em tempo
+    p_track.add_argument("--max-stride", type=int, default=1,
+                         help="Passo adaptativo: consulta o tracker a cada até N frames e interpola os demais")  # Passo adaptativo
+    p_track.add_argument("--motion-gate", type=float, default=None,
+                         help="Não consulta o tracker quando a diferença média ao redor da caixa fica abaixo deste valor (ex.: 3)")  # Portão de movimento
+    p_track.add_argument("--reacquire", action="store_true",
+                         help="Procura o objeto por template depois que o tracker o perde e reinicia o tracker")  # Reaquisição
+    p_track.add_argument("--kalman", choices=KALMAN_MODELS, default=None,
+                         help="Modelo de movimento: adianta a busca e acrescenta as métricas filtradas (cv ou ca)")  # Filtro de Kalman
+    p_track.add_argument("--kinematics", action="store_true",
+                         help="Cinemática no relatório e no CSV (vx, vy, aceleração, tranco, direção, percentis, paradas)")  # Cinemática
+    p_track.add_argument("--overlay", action="store_true",
+                         help="Não codifica o vídeo anotado: salva a trajetória e um arquivo lateral para 'play'/'export'")  # Anotações sob demanda
+    p_track.add_argument("--profile", choices=PROFILE_DUMPS, default=None,
+                         help="Grava o perfil da execução: cprofile ('.prof') ou trace ('.trace.json' para o Perfetto); ignora o cache")  # Perfil detalhado
+    p_track.add_argument("--debug-every", type=int, default=None,
+                         help="Painel de debug a cada N frames (padrão: início, quartos, meio e fim)")  # Amostragem do debug
+    p_track.add_argument("--debug-frames", type=int, nargs="+", default=None,
+                         help="Frames com painel de debug (somados a --debug-every)")  # Frames do debug
+    _add_debug_format_options(p_track)  # Formato dos painéis
+    p_track.add_argument("--chunks", type=int, default=None,
+                         help="Divide o vídeo em N blocos rastreados em paralelo (sem vídeo anotado nem debug)")  # Paralelo no tempo
+    _add_tracking_options(p_track)  # Adiciona as opções comuns
+
+    p_multi = sub.add_parser("multi", help="Rastreia vários objetos em um vídeo (uma única decodificação)")  # Subcomando de vários objetos
+    p_multi.add_argument("video", help="Caminho do vídeo de entrada")  # Vídeo de entrada
+    p_multi.add_argument("--box", type=int, nargs=4, metavar=("X", "Y", "W", "H"), action="append", default=None,
+                         help="ROI inicial de um objeto (repita para cada objeto)")  # ROIs iniciais diretas
+    p_multi.add_argument("--out", default=None, help="Pasta de saída (padrão: data/results/<vídeo>_<data>)")  # Pasta de saída
+    p_multi.add_argument("--gui", action="store_true", help="Abre as janelas do OpenCV (seleção de ROIs e exibição)")  # Modo interativo
+    p_multi.add_argument("--threads", type=int, default=None, help="Threads que atualizam os trackers (padrão: um por objeto)")  # Pool de threads
+    _add_tracking_options(p_multi)  # Adiciona as opções comuns
+
+    p_scales = sub.add_parser("scales", help="Compara precisão e velocidade do tracking em várias escalas")  # Subcomando de comparação
+    p_scales.add_argument("video", help="Caminho do vídeo de entrada")  # Vídeo de entrada
+    p_scales.add_argument("--box", type=int, nargs=4, metavar=("X", "Y", "W", "H"), default=None,
+                          help="ROI inicial em pixels do vídeo original")  # ROI inicial direta
+    p_scales.add_argument("--rois", default=None, help="Arquivo JSON com as ROIs iniciais {vídeo: [x, y, w, h]}")  # Sidecar JSON
+    p_scales.add_argument("--scales", type=float, nargs="+", default=[1.0, 0.75, 0.5, 0.25], help="Escalas a comparar")  # Escalas
+    p_scales.add_argument("--search-window", type=float, default=None, help="Janela de busca em múltiplos da caixa")  # Janela recortada
+    p_scales.add_argument("--tracker", default="CSRT", help="Algoritmo de tracking (CSRT ou KCF)")  # Tipo de tracker
+    p_scales.add_argument("--out", default=None, help="Pasta de saída (padrão: data/results/<vídeo>_<data>)")  # Pasta de saída
+
+    p_compare = sub.add_parser("compare", help="Compara configurações de tracker em uma única decodificação do vídeo")  # Comparação
+    p_compare.add_argument("video", help="Caminho do vídeo de entrada")  # Vídeo de entrada
+    p_compare.add_argument("--box", type=int, nargs=4, metavar=("X", "Y", "W", "H"), default=None,
+                           help="ROI inicial em pixels do vídeo original")  # ROI direta
+    p_compare.add_argument("--rois", default=None, help="Arquivo JSON com as ROIs iniciais {vídeo: [x, y, w, h]}")  # Sidecar JSON
+    p_compare.add_argument("--configs", nargs="+", default=["CSRT", "KCF"],
+                           help="Configurações no formato TRACKER[:escala[:janela]] (ex.: CSRT KCF KCF:0.5 CSRT:1:3)")  # Configurações
+    p_compare.add_argument("--ppm", type=float, default=None, help="Calibração em pixels por metro")  # Escala física
+    p_compare.add_argument("--csv", action="store_true", help="Salva as trajetórias lado a lado em CSV")  # CSV
+    p_compare.add_argument("--threads", type=int, default=None, help="Threads que atualizam os trackers (padrão: uma por configuração)")  # Pool
+    p_compare.add_argument("--out", default=None, help="Pasta de saída (padrão: data/results/<vídeo>_<data>)")  # Pasta de saída
+
+    p_batch = sub.add_parser("batch", help="Rastreia todos os vídeos de uma pasta em paralelo")  # Subcomando de lote
+    p_batch.add_argument("input_dir", nargs="?", default=None, help="Pasta com os vídeos (padrão: data/raw)")  # Pasta de entrada
+    p_batch.add_argument("--out", default=None, help="Pasta onde as pastas de cada vídeo são criadas (padrão: data/results)")  # Pasta de saída
+    p_batch.add_argument("--workers", type=int, default=None, help="Número de processos (padrão: núcleos da máquina)")  # Tamanho do pool
+    _add_tracking_options(p_batch)  # Adiciona as opções comuns
+
+    p_convert = sub.add_parser("convert", help="Exporta uma trajetória binária '.traj' para CSV")  # Subcomando de conversão
+    p_convert.add_argument("trajectory", help="Arquivo '.traj' de entrada")  # Trajetória binária
+    p_convert.add_argument("--out", default=None, help="CSV de saída (padrão: mesmo nome com extensão .csv)")  # CSV de saída
+
+    p_play = sub.add_parser("play", help="Reproduz o vídeo original com as anotações de um arquivo '_overlay_<data>.json'")  # Player
+    p_play.add_argument("overlay", help="Arquivo lateral gerado por 'track --overlay'")  # Arquivo lateral
+    p_play.add_argument("--speed", type=float, default=1.0, help="Velocidade de reprodução (ex.: 2 = o dobro)")  # Velocidade
+
+    p_export = sub.add_parser("export", help="Grava o vídeo anotado (burn-in) a partir de arquivos '_overlay_<data>.json'")  # Exportação
+    p_export.add_argument("overlays", nargs="+", help="Arquivos laterais gerados por 'track --overlay'")  # Arquivos laterais
+    p_export.add_argument("--out", default=None, help="Pasta dos vídeos (padrão: a pasta de cada arquivo lateral)")  # Pasta de saída
+    p_export.add_argument("--workers", type=int, default=1, help="Vídeos exportados em paralelo (um processo por vídeo)")  # Paralelismo
+
+    p_debug = sub.add_parser("debug", help="Gera painéis de debug de frames escolhidos depois do tracking")  # Debug sob demanda
+    p_debug.add_argument("source", help="Arquivo '_overlay_<data>.json' (frames da trajetória, anotados) ou um vídeo (frames absolutos)")  # Origem
+    p_debug.add_argument("--frames", type=int, nargs="+", default=None, help="Frames dos painéis")  # Frames pedidos
+    p_debug.add_argument("--every", type=int, default=None, help="Um painel a cada N frames")  # Intervalo
+    p_debug.add_argument("--out", default=None, help="Pasta dos painéis (padrão: ao lado da origem)")  # Pasta de saída
+    p_debug.add_argument("--workers", type=int, default=DEBUG_WORKERS, help="Threads que montam e gravam os painéis")  # Paralelismo
+    _add_debug_format_options(p_debug)  # Formato dos painéis
+
+    p_metrics = sub.add_parser("metrics", help="Recalcula estatísticas e relatório de uma trajetória salva (CSV ou '.traj')")  # Subcomando de recálculo
+    p_metrics.add_argument("trajectory", help="Arquivo de trajetória (CSV ou '.traj')")  # Trajetória salva
+    p_metrics.add_argument("--fps", type=float, default=None, help="FPS do vídeo (padrão: o do '.traj'; obrigatório para CSV)")  # FPS correto
+    p_metrics.add_argument("--ppm", type=float, default=None, help="Calibração em pixels por metro")  # Nova calibração
+    p_metrics.add_argument("--frames", type=int, default=None, help="Frames processados (para a taxa de sucesso a partir de CSV)")  # Total de frames
+    p_metrics.add_argument("--out", default=None, help="Pasta do relatório (padrão: a pasta da trajetória)")  # Pasta de saída
+    p_metrics.add_argument("--kalman", choices=KALMAN_MODELS, default=None,
+                           help="Acrescenta as métricas da trajetória suavizada (cv: velocidade constante, ca: aceleração constante)")  # Métricas filtradas
+    p_metrics.add_argument("--kinematics", action="store_true",
+                           help="Acrescenta a cinemática (aceleração, tranco, percentis de velocidade, paradas)")  # Cinemática
+
+    return parser  # Retorna o parser configurado
+
+def _cmd_track(args) -> int:  # Executa o subcomando 'track'
+    rois = load_roi_sidecar(args.rois) if args.rois else None  # Carrega o arquivo de ROIs, se informado
+    box = tuple(args.box) if args.box else find_initial_box(args.video, rois)  # Prioriza --box, senão procura no sidecar
+
+    if box is None and not args.gui:  # Sem ROI e sem interface não há como começar
+        logger.error(f"Nenhuma ROI encontrada para {args.video}. Use --box, --rois ou --gui.")  # Registra o erro
+        return 2  # Código de saída de uso incorreto
+
+    base_name = os.path.splitext(os.path.basename(args.video))[0]  # Nome do vídeo sem extensão
+    output_dir = args.out or str(get_timestamped_results_dir(prefix=base_name))  # Define a pasta de saída
+
+    if args.chunks:  # Tracking paralelo em blocos (vídeos longos)
+        if box is None:  # Os blocos rodam em processos sem interface
+            logger.error("O modo --chunks precisa de uma ROI (--box ou --rois).")
+            return 2
+        stats = track_chunked(
+            video_path=args.video,  # Vídeo de entrada
+            output_dir=output_dir,  # Pasta de saída
+            initial_box=box,  # ROI inicial
+            num_chunks=args.chunks,  # Número de blocos
+            tracker_type=args.tracker,  # Algoritmo de tracking
+            save_csv=args.csv,  # Salva o CSV?
+            save_binary=args.binary,  # Salva a trajetória binária?
+            pixels_per_meter=args.ppm,  # Calibração física
+            track_scale=args.track_scale,  # Escala do frame entregue ao tracker
+            search_window=args.search_window,  # Janela de busca
+        )
+        print(f"Blocos paralelos   : {stats['chunks']} (rastreados de novo: {stats['chunk_reacquisitions']})")
+        print(f"Frames processados : {stats['num_frames']}")  # Mostra o total de frames
+        print(f"Taxa de sucesso    : {stats['success_rate']*100:.2f} %")  # Mostra a taxa de sucesso
+        print(f"Relatório          : {stats['report_path']}")  # Mostra onde o relatório foi salvo
+        return 0
+
+    stats = cached_track_single_object(  # Executa o tracking (ou reaproveita o resultado guardado no cache)
+        video_path=args.video,  # Vídeo de entrada
+        output_dir=output_dir,  # Pasta de saída
+        tracker_type=args.tracker,  # Algoritmo de tracking
+        save_video=not args.no_video,  # Salva o vídeo anotado?
+        save_csv=args.csv,  # Salva o CSV?
+        pixels_per_meter=args.ppm,  # Calibração física
+        save_debug_images=not args.no_debug,  # Salva as imagens de debug?
+        initial_box=box,  # ROI inicial (None abre o selectROI no modo --gui)
+        headless=not args.gui,  # Sem janelas, a menos que --gui seja pedido
+        track_scale=args.track_scale,  # Escala do frame entregue ao tracker
+        search_window=args.search_window,  # Janela de busca
+        streaming=args.stream,  # Modo streaming
+        save_binary=args.binary,  # Salva a trajetória binária?
+        start_frame=args.start,  # Início do trecho (frame)
+        end_frame=args.end,  # Fim do trecho (frame)
+        start_time=args.start_time,  # Início do trecho (segundos)
+        end_time=args.end_time,  # Fim do trecho (segundos)
+        max_stride=args.max_stride,  # Passo adaptativo
+        motion_gate=args.motion_gate,  # Portão de movimento
+        reacquire=args.reacquire,  # Reaquisição por template
+        kalman=args.kalman,  # Modelo de movimento
+        kinematics=args.kinematics,  # Cinemática detalhada
+        profile_dump=args.profile,  # Perfil detalhado da execução
+        overlay=args.overlay,  # Anotações sob demanda em vez do vídeo anotado
+        debug_every=args.debug_every,  # Painel de debug a cada N frames
+        debug_frames=args.debug_frames,  # Frames com painel de debug
+        debug_format=args.debug_format,  # Formato dos painéis
+        debug_quality=args.debug_quality,  # Compressão / qualidade dos painéis
+        use_cache=not args.no_cache,  # Usa o cache de resultados?
+    )
+
+    if stats.get("cache_hit"):  # Resultado reaproveitado: os arquivos estão na pasta do cache
+        print("Resultado do cache (use --no-cache para rodar o tracking de novo)")
+    print(f"Frames processados : {stats['num_frames']}")  # Mostra o total de frames
+    print(f"Taxa de sucesso    : {stats['success_rate']*100:.2f} %")  # Mostra a taxa de sucesso
+    if stats.get("profile") and not stats.get("cache_hit"):  # Desempenho medido nesta execução
+        print(f"FPS efetivo        : {stats['profile']['effective_fps']:.2f}")
+    if stats.get("profile_output"):
+        print(f"Perfil             : {stats['profile_output']}")
+    if stats.get("overlay_output"):  # Anotações sob demanda
+        print(f"Overlay            : {stats['overlay_output']} (use 'play' ou 'export')")
+    print(f"Relatório          : {stats['report_path']}")  # Mostra onde o relatório foi salvo
+    return 0  # Código de saída de sucesso
+
+def _cmd_multi(args) -> int:  # Executa o subcomando 'multi'
+    rois = load_roi_sidecar(args.rois) if args.rois else None  # Carrega o arquivo de ROIs, se informado
+    boxes = [tuple(b) for b in args.box] if args.box else find_initial_boxes(args.video, rois)  # Prioriza --box, senão procura no sidecar
+
+    if not boxes and not args.gui:  # Sem ROIs e sem interface não há como começar
+        logger.error(f"Nenhuma ROI encontrada para {args.video}. Use --box, --rois ou --gui.")  # Registra o erro
+        return 2  # Código de saída de uso incorreto
+
+    base_name = os.path.splitext(os.path.basename(args.video))[0]  # Nome do vídeo sem extensão
+    output_dir = args.out or str(get_timestamped_results_dir(prefix=base_name))  # Define a pasta de saída
+
+    stats = track_multiple_objects(  # Executa o tracking de todos os objetos
+        video_path=args.video,  # Vídeo de entrada
+        output_dir=output_dir,  # Pasta de saída
+        tracker_type=args.tracker,  # Algoritmo de tracking
+        save_video=not args.no_video,  # Salva o vídeo anotado?
+        save_csv=args.csv,  # Salva o CSV?
+        pixels_per_meter=args.ppm,  # Calibração física
+        initial_boxes=boxes,  # ROIs iniciais (None abre o selectROIs no modo --gui)
+        headless=not args.gui,  # Sem janelas, a menos que --gui seja pedido
+        max_workers=args.threads,  # Threads dos trackers
+    )
+
+    print(f"Frames processados : {stats['num_frames']}")  # Mostra o total de frames
+    for o in stats["objects"]:  # Uma linha por objeto
+        print(f"Objeto #{o['object_id']}          : sucesso {o['success_rate']*100:.2f} %, "
+              f"vel. média {o['mean_speed_px']:.3f} px/frame")
+    print(f"Relatório          : {stats['report_path']}")  # Mostra onde o relatório foi salvo
+    return 0  # Código de saída de sucesso
+
+def _cmd_batch(args) -> int:  # Executa o subcomando 'batch'
+    input_dir = args.input_dir or str(get_data_dir("raw"))  # Pasta de entrada (padrão: data/raw)
+    rois = load_roi_sidecar(args.rois) if args.rois else None  # Carrega o arquivo de ROIs, se informado
+
+    results = run_batch(  # Executa o lote no pool de processos
+        find_videos(input_dir),  # Vídeos suportados da pasta
+        rois=rois,  # ROIs iniciais por vídeo
+        tracker_type=args.tracker,  # Algoritmo de tracking
+        workers=args.workers,  # Número de processos
+        save_video=not args.no_video,  # Salva o vídeo anotado?
+        save_csv=args.csv,  # Salva o CSV?
+        pixels_per_meter=args.ppm,  # Calibração física
+        save_debug_images=not args.no_debug,  # Salva as imagens de debug?
+        results_root=args.out,  # Pasta base dos resultados
+        streaming=args.stream,  # Modo streaming
+        save_binary=args.binary,  # Salva a trajetória binária?
+        use_cache=not args.no_cache,  # Usa o cache de resultados?
+    )
+
+    print(format_batch_summary(results))  # Mostra a tabela-resumo
+    return 0 if all(r["ok"] for r in results) else 1  # Código 1 se algum vídeo falhou
+
+def _cmd_scales(args) -> int:  # Executa o subcomando 'scales'
+    rois = load_roi_sidecar(args.rois) if args.rois else None  # Carrega o arquivo de ROIs, se informado
+    box = tuple(args.box) if args.box else find_initial_box(args.video, rois)  # Prioriza --box, senão procura no sidecar
+    if box is None:  # O comparativo sempre roda em modo headless
+        logger.error(f"Nenhuma ROI encontrada para {args.video}. Use --box ou --rois.")  # Registra o erro
+        return 2  # Código de saída de uso incorreto
+
+    base_name = os.path.splitext(os.path.basename(args.video))[0]  # Nome do vídeo sem extensão
+    output_dir = args.out or str(get_timestamped_results_dir(prefix=base_name))  # Define a pasta de saída
+    rows = benchmark_track_scales(args.video, box, output_dir, scales=args.scales,
+                                  tracker_type=args.tracker, search_window=args.search_window)  # Executa o comparativo
+    with open(rows[0]["report_path"], encoding="utf-8") as f:  # Mostra o relatório gerado
+        print(f.read())
+    return 0  # Código de saída de sucesso
+
+def _cmd_compare(args) -> int:  # Executa o subcomando 'compare'
+    rois = load_roi_sidecar(args.rois) if args.rois else None  # Carrega o arquivo de ROIs, se informado
+    box = tuple(args.box) if args.box else find_initial_box(args.video, rois)  # Prioriza --box, senão procura no sidecar
+    if box is None:  # A comparação sempre roda em modo headless
+        logger.error(f"Nenhuma ROI encontrada para {args.video}. Use --box ou --rois.")
+        return 2
+    try:
+        configs = [parse_tracker_config(spec) for spec in args.configs]
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+
+    base_name = os.path.splitext(os.path.basename(args.video))[0]  # Nome do vídeo sem extensão
+    output_dir = args.out or str(get_timestamped_results_dir(prefix=base_name))  # Define a pasta de saída
+    stats = compare_trackers(args.video, output_dir, box, configs, pixels_per_meter=args.ppm,
+                             save_csv=args.csv, max_workers=args.threads)  # Uma decodificação para todas as configurações
+    with open(stats["report_path"], encoding="utf-8") as f:  # Mostra o relatório gerado
+        print(f.read())
+    return 0
+
+def _cmd_convert(args) -> int:  # Executa o subcomando 'convert'
+    csv_path = args.out or os.path.splitext(args.trajectory)[0] + ".csv"  # CSV ao lado do arquivo binário
+    convert_binary_to_csv(args.trajectory, csv_path)  # Converte os registros para o CSV de trajetória
+    print(f"CSV gerado         : {csv_path}")  # Mostra onde o CSV foi salvo
+    return 0  # Código de saída de sucesso
+
+def _cmd_play(args) -> int:  # Executa o subcomando 'play'
+    play_overlay(args.overlay, speed=args.speed)  # Espaço pausa, ESC encerra
+    return 0
+
+def _cmd_export(args) -> int:  # Executa o subcomando 'export'
+    results = export_overlays(args.overlays, out_dir=args.out, workers=args.workers)
+    for r in results:  # Uma linha por arquivo lateral
+        print(f"{r['overlay']} -> {r['output'] if r['ok'] else 'ERRO: ' + r['error']}")
+    return 0 if all(r["ok"] for r in results) else 1
+
+def _cmd_debug(args) -> int:  # Executa o subcomando 'debug'
+    try:
+        paths = build_debug_panels(args.source, frames=args.frames, every=args.every, out_dir=args.out,
+                                   fmt=args.debug_format, quality=args.debug_quality, workers=args.workers)
+    except ValueError as e:  # Ex.: nenhum frame pedido ou frame fora do vídeo
+        logger.error(str(e))
+        return 2
+    print(f"Painéis de debug   : {len(paths)} em {os.path.dirname(paths[0]) if paths else '-'}")
+    return 0
+
+def _cmd_metrics(args) -> int:  # Executa o subcomando 'metrics'
+    try:
+        stats = recompute_metrics(args.trajectory, fps=args.fps, pixels_per_meter=args.ppm,
+                                  num_frames=args.frames, output_dir=args.out, kalman=args.kalman,
+                                  kinematics=args.kinematics)  # Recalcula sem rodar o tracker
+    except ValueError as e:  # Ex.: CSV sem --fps
+        logger.error(str(e))  # Registra o erro
+        return 2  # Código de saída de uso incorreto
+    with open(stats["report_path"], encoding="utf-8") as f:  # Mostra o relatório gerado
+        print(f.read())
+    return 0  # Código de saída de sucesso
+
+def main(argv=None) -> int:  # Ponto de entrada da CLI
+    args = _build_parser().parse_args(argv)  # Interpreta os argumentos
+    set_log_level(args.log_level)  # Aplica o nível dos logs (também repassado aos processos do lote)
+
+    if args.command == "track":  # Subcomando de tracking de um vídeo
+        return _cmd_track(args)  # Executa e retorna o código de saída
+    if args.command == "multi":  # Subcomando de vários objetos
+        return _cmd_multi(args)  # Executa e retorna o código de saída
+    if args.command == "batch":  # Subcomando de lote
+        return _cmd_batch(args)  # Executa e retorna o código de saída
+    if args.command == "metrics":  # Subcomando de recálculo de métricas
+        return _cmd_metrics(args)  # Executa e retorna o código de saída
+    if args.command == "convert":  # Subcomando de conversão
+        return _cmd_convert(args)  # Executa e retorna o código de saída
+    if args.command == "play":  # Subcomando do player de anotações
+        return _cmd_play(args)
+    if args.command == "export":  # Subcomando de exportação do vídeo anotado
+        return _cmd_export(args)
+    if args.command == "debug":  # Subcomando dos painéis de debug sob demanda
+        return _cmd_debug(args)
+    if args.command == "compare":  # Subcomando de comparação de trackers
+        return _cmd_compare(args)
+    if args.command == "scales":  # Subcomando de comparação de escalas
+        return _cmd_scales(args)  # Executa e retorna o código de saída
+
+    return 2  # Subcomando desconhecido (não deve ocorrer com required=True)
+
+if __name__ == "__main__":  # Verifica se este arquivo está sendo executado diretamente (não importado)
+    sys.exit(main())  # Executa a CLI e devolve o código de saída ao sistema
@@ -207,12 +207,29 @@ def tab_object_measurement(app):  # Função que desenha a aba de medição
             )
             return  # Interrompe para aguardar a seleção da pasta
 
-        app.progress_bar.set(0.2)  # Inicia progresso visual
+        if getattr(app, "cancel_event", None) is not None:  # Já existe uma análise em andamento
+            return
+
+        app.progress_bar.set(0)  # Inicia progresso visual
         label_result_process.configure(
             text="Iniciando análise...",  # Atualiza feedback textual
             text_color="white"  # Usa branco para indicar estado neutro em execução
         )
         app.new_window.update_idletasks()  # Força atualização da tela
+        app.cancel_event = threading.Event()  # Sinal de cancelamento lido pelo loop de tracking a cada frame
+
+        def show_progress(p):  # Atualiza a barra e o texto de andamento (thread principal)
+            app.progress_bar.set(p["fraction"])  # Fração de frames processados
+            if p["finished"] or app.cancel_event is None or app.cancel_event.is_set():  # Texto final vem do update_success
+                return
+            eta = f", faltam ~{p['eta_s']:.0f} s" if p["eta_s"] is not None else ""  # Tempo restante estimado
+            label_result_process.configure(
+                text=f"Processando: {p['done']}/{p['total']} frames ({p['fps']:.1f} FPS{eta})",
+                text_color="white"
+            )
+
+        def on_progress(p):  # Chamado pela thread do tracking (no máximo a cada 0,25 s)
+            app.new_window.after(0, show_progress, p)  # O Tkinter só pode ser alterado pela thread principal
 
         def worker():  # Função worker para rodar em thread separada
             try:
@@ -222,9 +239,18 @@ def tab_object_measurement(app):  # Função que desenha a aba de medição
                     tracker_type="CSRT",  # Algoritmo de rastreamento escolhido
                     save_video=True,  # Habilita salvamento do vídeo anotado
                     save_csv=True,  # Gera arquivo CSV com medições
+                    progress=on_progress,  # Andamento para a barra de progresso
+                    cancel_event=app.cancel_event,  # Botão "Cancelar"
                 )
 
                 def update_success():  # Função para atualizar UI após sucesso
+                    app.cancel_event = None  # Libera uma nova análise
+                    if stats.get("cancelled"):  # Interrompido pelo botão "Cancelar"
+                        label_result_process.configure(
+                            text="Análise cancelada. Relatório parcial salvo na pasta selecionada.",
+                            text_color="orange"
+                        )
+                        return
                     app.progress_bar.set(1.0)  # Completa barra
 
                     msg = "Tracking concluído. Consulte o relatório na pasta selecionada."  # Mensagem pública final
@@ -237,6 +263,7 @@ def tab_object_measurement(app):  # Função que desenha a aba de medição
 
             except Exception as e:  # Captura erros
                 def update_error():  # Função para atualizar UI após erro
+                    app.cancel_event = None  # Libera uma nova análise
                     app.progress_bar.set(0.0)  # Reseta a barra para indicar falha
                     label_result_process.configure(
                         text=f"Erro na análise: {e}",  # Mostra a exceção ao usuário
@@ -247,6 +274,14 @@ def tab_object_measurement(app):  # Função que desenha a aba de medição
 
         threading.Thread(target=worker, daemon=True).start()  # Inicia a thread
 
+    def cancel_video_analysis():  # Pede a interrupção da análise em andamento
+        if getattr(app, "cancel_event", None) is None:  # Nenhuma análise em andamento
+            return
+        app.cancel_event.set()  # O loop de tracking para no próximo frame
+        label_result_process.configure(
+            text="Cancelando...",  # O relatório parcial ainda será gravado
+            text_color="orange"
+        )
 
     button_select_video = ctk.CTkButton(  # Botão selecionar vídeo
         app.new_window,  # Define a janela que receberá o botão
@@ -284,6 +319,18 @@ def tab_object_measurement(app):  # Função que desenha a aba de medição
     )
     button_run_analysis.place(x=455, y=440)  # Posiciona o botão próximo aos feedbacks
 
+    button_cancel_analysis = ctk.CTkButton(  # Botão cancelar
+        app.new_window,  # Janela que receberá o botão
+        hover_color="#D93D5F",  # Cor ao passar o mouse
+        fg_color="#5A5A5A",  # Cor neutra (ação secundária)
+        text="Cancelar",  # Texto do botão
+        width=100,  # Largura do botão
+        height=30,  # Altura menor que a do botão principal
+        font=("Arial", 14),  # Fonte do botão
+        command=cancel_video_analysis  # Interrompe a análise em andamento
+    )
+    button_cancel_analysis.place(x=690, y=512)  # Posiciona ao lado da barra de progresso
+
 def clean_window(app):  # Função para limpar widgets da janela
     for widget in app.new_window.winfo_children():  # Itera sobre filhos da janela
         if widget not in [app.my_seg_button]:  # Mantém o botão de abas
@@ -0,0 +1,71 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes unitários do executor em lote (batch).
+Ele verifica se vários vídeos são processados no pool de processos, se a falha
+de um vídeo fica isolada dos demais e se a tabela-resumo é gerada.
+'''
+#################
+
+import unittest  # Importa o framework de testes unitários do Python
+import sys  # Importa o módulo sys para manipulação de variáveis do sistema
+import os  # Importa o módulo os para interação com o sistema operacional
+import tempfile  # Importa tempfile para criar pastas temporárias
+
+# Adiciona o diretório pai (raiz do projeto) ao sys.path para permitir importar módulos internos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.core.batch import find_videos, run_batch, format_batch_summary
+from test_tracking import make_synthetic_video
+
+class TestBatch(unittest.TestCase):  # Define a classe de testes herdando de unittest.TestCase
+
+    def test_batch_with_failure_isolation(self):  # Um vídeo sem ROI não deve impedir os outros
+        with tempfile.TemporaryDirectory() as tmp:
+            box = make_synthetic_video(os.path.join(tmp, "a.avi"))  # Vídeo com ROI
+            make_synthetic_video(os.path.join(tmp, "b.avi"))  # Outro vídeo com ROI
+            make_synthetic_video(os.path.join(tmp, "c.avi"))  # Vídeo sem ROI (deve falhar)
+            with open(os.path.join(tmp, "ignorar.txt"), "w") as f:  # Arquivo que não é vídeo
+                f.write("x")
+
+            videos = find_videos(tmp)
+            self.assertEqual([os.path.basename(v) for v in videos], ["a.avi", "b.avi", "c.avi"])
+
+            results = run_batch(videos, rois={"a": box, "b": box}, tracker_type="KCF", workers=2,
+                                save_video=False, save_csv=False, results_root=tmp)
+            self.assertEqual([r["ok"] for r in results], [True, True, False])  # Mesma ordem dos vídeos
+            self.assertEqual(results[0]["stats"]["num_frames"], 39)
+            self.assertIn("ROI", results[2]["error"])
+            self.assertTrue(results[0]["output_dir"].startswith(tmp))  # Resultados ficam na pasta informada
+
+            table = format_batch_summary(results)
+            self.assertIn("Sucesso: 2", table)
+            self.assertIn("Falhas: 1", table)
+
+    def test_same_stem_videos(self):  # Vídeos com o mesmo nome base não devem colidir nem herdar a ROI do nome base
+        with tempfile.TemporaryDirectory() as tmp:
+            box = make_synthetic_video(os.path.join(tmp, "gato.avi"))
+            make_synthetic_video(os.path.join(tmp, "gato.mkv"))
+            videos = find_videos(tmp)
+
+            results = run_batch(videos, rois={"gato": box}, tracker_type="KCF", workers=1,
+                                save_video=False, save_csv=False, results_root=tmp)
+            self.assertFalse(any(r["ok"] for r in results))  # A chave "gato" é ambígua
+            self.assertIn("ambígua", results[0]["error"])
+
+            results = run_batch(videos, rois={"gato.avi": box, "gato.mkv": box}, tracker_type="KCF", workers=2,
+                                save_video=False, save_csv=False, results_root=tmp)
+            self.assertTrue(all(r["ok"] for r in results))
+            self.assertNotEqual(results[0]["output_dir"], results[1]["output_dir"])  # Uma pasta por vídeo
+
+if __name__ == '__main__':  # Verifica se o arquivo está sendo executado diretamente
+    unittest.main()  # Executa todos os testes definidos na classe
@@ -0,0 +1,104 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes do cache de resultados do tracking.
+Ele verifica o acerto com os mesmos parâmetros, a falha quando algum parâmetro muda,
+o modo que ignora o cache e a remoção das entradas menos usadas.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import tempfile  # Importa tempfile para criar pastas temporárias
+from pathlib import Path  # Importa Path para listar as entradas do cache
+
+# Adiciona o diretório pai (raiz do projeto) ao sys.path para permitir a importação dos módulos do projeto
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import src.core.cache as cache  # Importa o módulo testado
+from test_tracking import make_synthetic_video  # Reaproveita o vídeo sintético dos testes de tracking
+
+class TestResultCache(unittest.TestCase):  # Testes do cache de resultados
+
+    def setUp(self):  # Vídeo sintético e pasta de cache temporária
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "quadrado.avi")
+        self.box = make_synthetic_video(self.video)
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.kwargs = dict(tracker_type="KCF", save_video=False, save_csv=True, save_debug_images=False,
+                           initial_box=self.box, headless=True, cache_dir=self.cache_dir)
+
+    def tearDown(self):  # Remove a pasta temporária
+        self.tmp.cleanup()
+
+    def run_tracking(self, name, **overrides):  # Executa o tracking com cache em uma pasta de saída própria
+        return cache.cached_track_single_object(self.video, os.path.join(self.tmp.name, name), **{**self.kwargs, **overrides})
+
+    def test_hit_returns_stored_stats_and_artifacts(self):  # A segunda execução vem do cache
+        first = self.run_tracking("a")
+        second = self.run_tracking("b")
+        self.assertFalse(first["cache_hit"])
+        self.assertTrue(second["cache_hit"])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "b")))  # O tracking não rodou de novo
+        self.assertEqual(second["num_frames"], first["num_frames"])
+        self.assertAlmostEqual(second["mean_speed_px"], first["mean_speed_px"])
+        self.assertEqual(second["initial_box"], first["initial_box"])
+        self.assertTrue(os.path.isfile(second["csv_output"]))  # Artefatos guardados na entrada do cache
+        self.assertEqual(len(second["trajectory"]), len(first["trajectory"]))  # Trajetória recarregada
+
+    def test_changed_parameters_miss(self):  # Outra ROI ou outro tracker geram outra chave
+        self.run_tracking("a")
+        self.assertFalse(self.run_tracking("b", initial_box=(12, 50, 20, 20))["cache_hit"])
+        self.assertFalse(self.run_tracking("c", pixels_per_meter=10.0)["cache_hit"])
+
+    def test_streaming_has_its_own_entry(self):  # Streaming usa o filtro só para frente (sem RTS): outra chave
+        memory = self.run_tracking("a", kalman="cv")
+        streaming = self.run_tracking("b", kalman="cv", streaming=True)
+        self.assertFalse(streaming["cache_hit"])
+        self.assertEqual(memory["kalman_smoother"], "RTS")
+        self.assertIsNone(streaming["kalman_smoother"])
+        self.assertTrue(self.run_tracking("c", kalman="cv", streaming=True)["cache_hit"])
+
+    def test_streaming_kinematics_has_its_own_entry(self):  # Streaming pula a cinemática: não pode servir a do modo em memória
+        memory = self.run_tracking("a", kinematics=True)
+        streaming = self.run_tracking("b", kinematics=True, streaming=True)
+        self.assertFalse(streaming["cache_hit"])
+        self.assertIsNotNone(memory["kinematics"])
+        self.assertIsNone(streaming["kinematics"])
+        self.assertIsNotNone(self.run_tracking("c", kinematics=True)["kinematics"])
+
+    def test_code_version_covers_io_modules(self):  # O trecho (seek index) e o '.traj' também mudam o resultado
+        self.assertIn("io/seek_index.py", cache._CODE_MODULES)
+        self.assertIn("io/trajectory_file.py", cache._CODE_MODULES)
+        src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+        for name in cache._CODE_MODULES:  # Todos os caminhos existem (um arquivo renomeado quebraria o hash)
+            self.assertTrue(os.path.isfile(os.path.join(src_dir, name)), name)
+
+    def test_bypass(self):  # use_cache=False sempre roda o tracking
+        self.run_tracking("a")
+        stats = self.run_tracking("b", use_cache=False)
+        self.assertNotIn("cache_hit", stats)
+        self.assertTrue(os.path.isdir(os.path.join(self.tmp.name, "b")))
+
+    def test_eviction_removes_least_recently_used(self):  # O limite de tamanho apaga as entradas mais antigas
+        self.run_tracking("a")
+        os.utime(next(Path(self.cache_dir).glob("*/stats.json")), (0, 0))  # Marca a primeira entrada como a mais antiga
+        self.run_tracking("b", initial_box=(12, 50, 20, 20))
+        entries = [p for p in Path(self.cache_dir).iterdir() if p.is_dir()]
+        self.assertEqual(len(entries), 2)
+        newest = max(entries, key=lambda p: (p / "stats.json").stat().st_mtime)
+        cache.evict(Path(self.cache_dir), max_bytes=cache._entry_size(newest))  # Só cabe uma entrada
+        self.assertEqual([p for p in Path(self.cache_dir).iterdir() if p.is_dir()], [newest])
+
+if __name__ == '__main__':  # Verifica se o arquivo está sendo executado diretamente
+    unittest.main()  # Executa os testes
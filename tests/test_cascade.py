@@ -0,0 +1,102 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes do tracker em cascata KCF -> CSRT.
+Ele verifica o escalonamento para o CSRT quando o KCF falha ou salta, a volta ao KCF depois de um trecho estável
+e a contagem de frames por tracker nas estatísticas do tracking.
+'''
+#################
+
+import unittest  # Importa o framework de testes unitários do Python
+import sys  # Importa o módulo sys para manipulação de variáveis do sistema
+import os  # Importa o módulo os para interação com o sistema operacional
+import tempfile  # Importa tempfile para criar pastas temporárias
+import numpy as np  # Importa NumPy para criar frames falsos
+
+# Adiciona o diretório pai (raiz do projeto) ao sys.path para permitir importar módulos internos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.core.cascade import CascadeTracker
+from src.core.tracking import track_single_object
+from test_tracking import make_synthetic_video
+
+class ScriptedTracker:  # Tracker falso que devolve as respostas de uma lista, uma por update
+    def __init__(self, answers):
+        self.answers = list(answers)  # Respostas (sucesso, caixa) em ordem
+        self.init_box = None
+
+    def init(self, frame, box):
+        self.init_box = box
+
+    def update(self, frame):
+        return self.answers.pop(0)
+
+class TestCascadeTracker(unittest.TestCase):  # Testes da lógica de escalonamento
+
+    def setUp(self):
+        self.frame = np.zeros((100, 100, 3), dtype=np.uint8)  # Frame liso (sem correlação de aparência definida)
+        self.fast, self.robust = [], []  # Trackers criados pela cascata
+
+    def _cascade(self, fast_answers, robust_answers, stable_frames=3):
+        def fast():
+            self.fast.append(ScriptedTracker(fast_answers))
+            return self.fast[-1]
+        def robust():
+            self.robust.append(ScriptedTracker(robust_answers))
+            return self.robust[-1]
+        cascade = CascadeTracker(fast, robust, stable_frames=stable_frames)
+        cascade.init(self.frame, (10, 10, 20, 20))
+        return cascade
+
+    def test_failure_escalates_and_stable_stretch_drops_back(self):
+        ok_box = (True, (11, 10, 20, 20))
+        cascade = self._cascade([ok_box, (False, (0, 0, 0, 0))] + [ok_box] * 5, [(True, (12, 10, 20, 20))] * 3)
+        self.assertEqual(cascade.update(self.frame), ok_box)  # KCF responde
+        self.assertEqual(cascade.update(self.frame), (True, (12, 10, 20, 20)))  # KCF falha: o CSRT responde no mesmo frame
+        self.assertEqual(self.robust[0].init_box, (11, 10, 20, 20))  # CSRT iniciado na última caixa confiável
+        cascade.update(self.frame)
+        cascade.update(self.frame)  # Terceiro frame estável do CSRT: volta ao KCF
+        self.assertIsNone(cascade.robust)
+        self.assertEqual(len(self.fast), 2)
+        self.assertEqual(self.fast[1].init_box, (12, 10, 20, 20))
+        self.assertEqual(dict(cascade.usage), {"KCF": 1, "CSRT": 3, "escalations": 1})
+
+    def test_jump_escalates(self):  # Salto maior que meia caixa em uma consulta não é aceito do KCF
+        cascade = self._cascade([(True, (60, 60, 20, 20))], [(True, (11, 11, 20, 20))])
+        self.assertEqual(cascade.update(self.frame), (True, (11, 11, 20, 20)))
+        self.assertEqual(cascade.usage["escalations"], 1)
+
+class TestCascadeTracking(unittest.TestCase):  # Tracking completo com a cascata
+
+    def test_cascade_tracks_and_counts_frames(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "quadrado.avi")
+            box = make_synthetic_video(video)
+            stats = track_single_object(video, tmp, tracker_type="CASCADE", save_video=False, save_debug_images=False,
+                                        initial_box=box, headless=True)
+            self.assertGreater(stats["success_rate"], 0.9)
+            self.assertEqual(sum(stats["tracker_frames"].values()), stats["tracker_updates"])
+            self.assertIn("KCF", stats["tracker_frames"])
+            _, xs, _ = stats["trajectory"].tracked()
+            self.assertAlmostEqual(xs[-1], 10 + 39 * 2 + 10, delta=3)
+
+    def test_plain_tracker_counts(self):  # Sem cascata, todas as consultas são do tracker escolhido
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "quadrado.avi")
+            box = make_synthetic_video(video)
+            stats = track_single_object(video, tmp, tracker_type="KCF", save_video=False, save_debug_images=False,
+                                        initial_box=box, headless=True)
+            self.assertEqual(stats["tracker_frames"], {"KCF": 39})
+            self.assertEqual(stats["cascade_escalations"], 0)
+
+if __name__ == '__main__':  # Verifica se o arquivo está sendo executado diretamente
+    unittest.main()  # Executa os testes
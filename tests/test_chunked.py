@@ -0,0 +1,93 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes do tracking paralelo em blocos.
+Ele verifica a divisão em blocos, a reaquisição por template e a costura das trajetórias,
+inclusive quando a reaquisição paralela se engana e o bloco precisa ser rastreado de novo.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import tempfile  # Importa tempfile para criar pastas temporárias durante os testes
+import cv2  # Importa a biblioteca OpenCV para gerar o vídeo com distrator
+import numpy as np  # Importa NumPy para comparar as trajetórias
+
+# Adiciona a raiz do projeto e a pasta de testes ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.chunked import split_chunks, track_chunked  # Importa o tracking em blocos
+from src.core.reacquire import cut_template, match_template  # Importa a reaquisição por template
+from src.core.tracking import track_single_object  # Importa o tracking sequencial (referência)
+from test_tracking import make_synthetic_video  # Importa o gerador de vídeo sintético
+
+class TestChunkedTracking(unittest.TestCase):  # Testes do tracking paralelo em blocos
+
+    def setUp(self):  # Pasta temporária para os vídeos e resultados
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):  # Remove a pasta temporária
+        self.tmp.cleanup()
+
+    def test_split_chunks(self):  # Blocos cobrem o vídeo e começam na sobreposição do anterior
+        self.assertEqual(split_chunks(300, 3, overlap=10), [(0, 100), (90, 200), (190, 300)])
+        self.assertEqual(split_chunks(100, 8), [(0, 100)])  # Vídeo curto: um único bloco
+
+    def test_match_template(self):  # O quadrado é reencontrado no frame inteiro e em uma janela de busca
+        frame = np.full((120, 200, 3), 40, dtype=np.uint8)
+        cv2.rectangle(frame, (10, 50), (29, 69), (0, 200, 255), -1)
+        template = cut_template(frame, (10, 50, 20, 20))
+        moved = np.full((120, 200, 3), 40, dtype=np.uint8)
+        cv2.rectangle(moved, (60, 40), (79, 59), (0, 200, 255), -1)
+        box, score = match_template(moved, template)
+        self.assertEqual(box, (60, 40, 20, 20))
+        self.assertGreater(score, 0.9)
+        box, _ = match_template(moved, template, around=(55, 45, 20, 20))
+        self.assertEqual(box, (60, 40, 20, 20))
+
+    def test_chunked_matches_sequential(self):  # Com a reaquisição correta, o resultado é o mesmo da execução sequencial
+        video = os.path.join(self.tmp.name, "quadrado.avi")
+        box = make_synthetic_video(video, num_frames=200, size=(260, 120), step=1)
+        seq = track_single_object(video, self.tmp.name, tracker_type="KCF", save_video=False,
+                                  save_debug_images=False, initial_box=box, headless=True)
+        par = track_chunked(video, self.tmp.name, box, num_chunks=3, overlap=5, tracker_type="KCF",
+                            save_csv=True, max_workers=1)
+        self.assertEqual(par["chunks"], 3)
+        self.assertEqual(par["chunk_reacquisitions"], 0)
+        self.assertEqual(par["num_frames"], seq["num_frames"])
+        self.assertTrue(np.array_equal(par["trajectory"].frames, seq["trajectory"].frames))
+        self.assertTrue(np.array_equal(par["trajectory"].xs, seq["trajectory"].xs, equal_nan=True))
+        self.assertAlmostEqual(par["mean_speed_px"], seq["mean_speed_px"])
+        self.assertTrue(os.path.isfile(par["csv_output"]))
+
+    def test_wrong_reacquisition_is_retracked(self):  # Um distrator igual ao objeto engana a reaquisição; a costura corrige
+        video = os.path.join(self.tmp.name, "distrator.avi")
+        writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"MJPG"), 20.0, (260, 120))
+        for i in range(200):
+            frame = np.full((120, 260, 3), 40, dtype=np.uint8)
+            fade = i / 199.0  # O objeto escurece aos poucos; o distrator mantém a cor do primeiro frame
+            cv2.rectangle(frame, (10 + i, 50), (30 + i, 70), (0, int(200 - 100 * fade), int(255 - 100 * fade)), -1)
+            cv2.rectangle(frame, (230, 5), (250, 25), (0, 200, 255), -1)
+            writer.write(frame)
+        writer.release()
+        par = track_chunked(video, self.tmp.name, (10, 50, 20, 20), num_chunks=3, overlap=5,
+                            tracker_type="KCF", max_workers=1)
+        self.assertEqual(par["chunk_reacquisitions"], 2)  # Os dois blocos paralelos começaram no distrator
+        t = par["trajectory"]
+        ok = t.success
+        self.assertGreater(par["success_rate"], 0.8)
+        # O registro N corresponde ao frame N+1, onde o centro do objeto está em x = 21 + N
+        self.assertLessEqual(np.abs(t.xs[ok] - (21 + t.frames[ok])).max(), 4.0)
+
+if __name__ == "__main__":  # Verifica se o script está sendo executado diretamente
+    unittest.main()  # Executa todos os testes
@@ -0,0 +1,112 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes dos painéis de debug (pool de gravação, formatos, amostragem e geração sob demanda).
+Ele verifica a escolha dos frames, os painéis gravados pelo tracking em outro formato e os painéis gerados depois
+do tracking a partir do vídeo original, que devem ser iguais aos gravados durante o tracking.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import tempfile  # Importa tempfile para criar pastas temporárias durante os testes
+import cv2  # Importa OpenCV para ler os painéis gravados
+import numpy as np  # Importa NumPy para comparar os painéis
+
+# Adiciona a raiz do projeto e a pasta de testes ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import src.core.debug_panels as debug_panels  # Módulo testado (o painel é substituído em um dos testes)
+from src.core.debug_panels import DebugPanelWriter, build_debug_panels, debug_encode_params, debug_frame_selector
+from src.core.tracking import track_single_object  # Importa a função principal de tracking
+from test_tracking import make_synthetic_video  # Importa o gerador de vídeo sintético
+
+class TestDebugSelection(unittest.TestCase):  # Escolha dos frames e do formato
+
+    def test_default_quartiles(self):  # Sem opções: início, quartos, meio e fim
+        selected = debug_frame_selector(40)
+        self.assertEqual([i for i in range(40) if selected(i)], [0, 10, 20, 30, 39])
+        self.assertFalse(debug_frame_selector(0)(0))  # Vídeo sem contagem de frames: nenhum painel
+
+    def test_every_and_frames(self):  # Um a cada N frames, somado aos frames pedidos
+        selected = debug_frame_selector(40, every=15, frames=[7])
+        self.assertEqual([i for i in range(40) if selected(i)], [0, 7, 15, 30])
+        with self.assertRaises(ValueError):
+            debug_frame_selector(40, every=0)
+
+    def test_encode_params(self):  # Formato e nível validados antes do tracking
+        self.assertEqual(debug_encode_params("png"), (".png", []))
+        self.assertEqual(debug_encode_params("jpg", 80), (".jpg", [cv2.IMWRITE_JPEG_QUALITY, 80]))
+        with self.assertRaises(ValueError):
+            debug_encode_params("bmp")
+        with self.assertRaises(ValueError):
+            debug_encode_params("png", 10)  # O PNG aceita de 0 a 9
+
+class TestDebugPanels(unittest.TestCase):  # Painéis gravados durante e depois do tracking
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "quadrado.avi")
+        self.box = make_synthetic_video(self.video)  # 40 frames
+        self.kwargs = dict(tracker_type="KCF", initial_box=self.box, headless=True)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_tracking_sampling_and_format(self):  # Um painel a cada 10 frames, em JPEG
+        stats = track_single_object(self.video, self.tmp.name, save_video=False, debug_every=10,
+                                    debug_format="jpg", debug_quality=90, **self.kwargs)
+        self.assertEqual(sorted(os.listdir(stats["debug_dir"])),
+                         [f"debug_frame_{i:05d}.jpg" for i in (0, 10, 20, 30)])
+        panel = cv2.imread(os.path.join(stats["debug_dir"], "debug_frame_00010.jpg"))
+        self.assertEqual(panel.shape, (120, 3 * 160, 3))  # Original | Bordas | Movimento
+        self.assertEqual(stats["profile"]["stages"]["debug_panel"]["count"], 4)  # Medidos nas threads do pool
+
+    def test_after_the_fact_matches_tracking(self):  # Painéis gerados depois, do vídeo original, iguais aos do tracking
+        stats = track_single_object(self.video, os.path.join(self.tmp.name, "run"), overlay=True,
+                                    debug_frames=[0, 5, 6, 20], **self.kwargs)
+        out = os.path.join(self.tmp.name, "depois")
+        paths = build_debug_panels(stats["overlay_output"], frames=[20, 6, 5, 0], out_dir=out)
+        self.assertEqual([os.path.basename(p) for p in paths],
+                         [f"debug_frame_{i:05d}.png" for i in (0, 5, 6, 20)])
+        for path in paths:
+            live = cv2.imread(os.path.join(stats["debug_dir"], os.path.basename(path)))
+            np.testing.assert_array_equal(cv2.imread(path), live)
+
+    def test_after_the_fact_from_video(self):  # Sem arquivo lateral: frames absolutos do vídeo, sem anotações
+        paths = build_debug_panels(self.video, every=10, out_dir=os.path.join(self.tmp.name, "video"), fmt="webp")
+        self.assertEqual([os.path.basename(p) for p in paths],
+                         [f"debug_frame_{i:05d}.webp" for i in (0, 10, 20, 30)])
+        first = cv2.imread(paths[0])
+        self.assertEqual(int(first[40:, 2 * 160:].max()), 0)  # Primeiro frame: sem anterior, movimento preto
+        self.assertGreater(int(cv2.imread(paths[1])[40:, 2 * 160:].max()), 0)  # Demais: o quadrado se moveu
+        with self.assertRaises(ValueError):
+            build_debug_panels(self.video, frames=[40], out_dir=os.path.join(self.tmp.name, "video"))
+
+    def test_writer_error_is_raised(self):  # Um erro em uma thread do pool chega a quem chamou
+        def failing_panel(*args):
+            raise IOError("falha na gravação")
+
+        original = debug_panels.save_debug_panel
+        debug_panels.save_debug_panel = failing_panel
+        try:
+            writer = DebugPanelWriter(self.tmp.name).start()
+            gray = np.zeros((8, 8), dtype=np.uint8)
+            writer.submit(0, np.zeros((8, 8, 3), dtype=np.uint8), gray, None, 0.0)
+            with self.assertRaises(IOError):
+                writer.close()
+        finally:
+            debug_panels.save_debug_panel = original
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes do modelo de movimento (filtro de Kalman).
+Ele verifica a previsão, a suavização RTS de uma trajetória com ruído e lacunas, o modo streaming
+e as métricas filtradas do tracking e do recálculo a partir de uma trajetória salva.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import tempfile  # Importa tempfile para criar pastas temporárias durante os testes
+import numpy as np  # Importa NumPy para gerar as trajetórias com ruído
+
+# Adiciona a raiz do projeto e a pasta de testes ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.kalman import KalmanFilter, rts_smooth  # Importa o filtro e a suavização
+from src.core.metrics import recompute_metrics  # Importa o recálculo de métricas
+from src.core.tracking import track_single_object  # Importa a função principal de tracking
+from test_tracking import make_synthetic_video  # Importa o gerador de vídeo sintético
+
+class TestKalman(unittest.TestCase):  # Testes do filtro de Kalman
+
+    def test_predicts_constant_velocity(self):  # Depois de algumas medições, a previsão segue a velocidade
+        kf = KalmanFilter("cv")
+        kf.reset(0.0, 0.0)
+        for i in range(1, 20):
+            kf.predict()
+            kf.update(3.0 * i, -1.0 * i)
+        vx, vy = kf.velocity
+        self.assertAlmostEqual(vx, 3.0, delta=0.1)
+        self.assertAlmostEqual(vy, -1.0, delta=0.1)
+        px, py = kf.peek(5)
+        self.assertAlmostEqual(px, 3.0 * 24, delta=1.0)
+        self.assertAlmostEqual(py, -1.0 * 24, delta=1.0)
+
+    def test_invalid_model(self):  # Só 'cv' e 'ca' são aceitos
+        with self.assertRaises(ValueError):
+            KalmanFilter("xyz")
+
+    def test_rts_removes_jitter(self):  # A suavização aproxima a trajetória real mesmo com lacunas entre as medições
+        rng = np.random.default_rng(1)
+        frames = np.delete(np.arange(300), np.arange(100, 120))  # 20 frames sem medição
+        true_x, true_y = 2.0 * frames, 0.5 * frames
+        xs = true_x + rng.normal(0, 2, len(frames))
+        ys = true_y + rng.normal(0, 2, len(frames))
+        true_distance = np.hypot(np.diff(true_x), np.diff(true_y)).sum()
+        for model in ("cv", "ca"):
+            sx, sy = rts_smooth(frames, xs, ys, model)
+            self.assertLess(np.hypot(sx - true_x, sy - true_y).mean(), 0.5 * np.hypot(xs - true_x, ys - true_y).mean())
+            self.assertAlmostEqual(np.hypot(np.diff(sx), np.diff(sy)).sum(), true_distance, delta=0.02 * true_distance)
+
+    def test_tracking_reports_filtered_metrics(self):  # Tracking e recálculo trazem as métricas brutas e as filtradas
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "quadrado.avi")
+            box = make_synthetic_video(video)
+            stats = track_single_object(video, tmp, tracker_type="KCF", save_video=False, save_debug_images=False,
+                                        save_binary=True, initial_box=box, headless=True, kalman="cv")
+            streamed = track_single_object(video, os.path.join(tmp, "stream"), tracker_type="KCF", save_video=False,
+                                           save_debug_images=False, initial_box=box, headless=True, kalman="cv",
+                                           streaming=True)
+            recomputed = recompute_metrics(stats["binary_output"], kalman="cv", save_report=False)
+            for s in (stats, streamed):  # O quadrado anda 2 px por frame
+                self.assertAlmostEqual(s["filtered_mean_speed_px"], 2.0, delta=0.3)
+                self.assertAlmostEqual(s["filtered_max_speed_px"], 2.0, delta=0.3)
+            self.assertAlmostEqual(recomputed["filtered_total_distance_px"], stats["filtered_total_distance_px"], places=3)
+            self.assertEqual(stats["mean_speed_px"], recomputed["mean_speed_px"])  # As métricas brutas não mudam
+            with open(stats["report_path"], encoding="utf-8") as f:
+                self.assertIn("--- Métricas filtradas (Kalman CV, suavização RTS) ---", f.read())
+
+if __name__ == "__main__":  # Permite executar o arquivo diretamente
+    unittest.main()
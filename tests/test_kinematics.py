@@ -0,0 +1,96 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes da cinemática vetorizada.
+Ele compara os percentis móveis com o np.percentile, verifica aceleração, tranco, direção e paradas em
+trajetórias conhecidas, o tempo com um milhão de pontos e as colunas extras do CSV do tracking.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import time  # Importa time para medir o tempo com um milhão de pontos
+import tempfile  # Importa tempfile para criar pastas temporárias durante os testes
+import numpy as np  # Importa NumPy para gerar as trajetórias
+
+# Adiciona a raiz do projeto e a pasta de testes ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.kinematics import KINEMATICS_COLUMNS, compute_kinematics, rolling_percentiles, summarize_kinematics
+from src.core.trajectory import load_csv_trajectory  # Importa a leitura do CSV
+from src.core.tracking import track_single_object  # Importa a função principal de tracking
+from test_tracking import make_synthetic_video  # Importa o gerador de vídeo sintético
+
+class TestKinematics(unittest.TestCase):  # Testes da cinemática
+
+    def test_rolling_percentiles_match_numpy(self):  # Mesmo resultado do np.percentile em cada janela (bordas repetidas)
+        values = np.random.default_rng(0).random(200)
+        result = rolling_percentiles(values, 7, (50, 90))
+        padded = np.concatenate([np.repeat(values[:1], 3), values, np.repeat(values[-1:], 3)])
+        expected = np.array([np.percentile(padded[i:i + 7], (50, 90)) for i in range(200)])
+        np.testing.assert_allclose(result, expected)
+
+    def test_constant_acceleration(self):  # x = t²: aceleração 2 px/frame², tranco zero, direção para a direita
+        frames = np.arange(50)
+        k = compute_kinematics(frames, frames.astype(float) ** 2, np.zeros(50))
+        np.testing.assert_allclose(k["accel"][2:], 2.0)
+        np.testing.assert_allclose(k["jerk"][3:], 0.0, atol=1e-9)
+        np.testing.assert_allclose(k["vy"], 0.0)
+        np.testing.assert_allclose(k["heading_deg"][1:], 0.0)
+
+    def test_gap_uses_real_interval(self):  # Frames perdidos no meio não inflam a velocidade
+        frames = np.array([0, 1, 2, 6, 7, 8])
+        k = compute_kinematics(frames, 3.0 * frames, np.zeros(6))
+        np.testing.assert_allclose(k["vx"], 3.0)
+        np.testing.assert_allclose(k["accel"], 0.0)
+
+    def test_heading_change_on_circle(self):  # Em um círculo de 90 pontos a direção muda 4 graus por ponto
+        t = np.arange(90) * 2 * np.pi / 90
+        k = compute_kinematics(np.arange(90), 100 * np.cos(t), 100 * np.sin(t))
+        np.testing.assert_allclose(k["heading_change_deg"][2:], 4.0, atol=1e-6)
+
+    def test_stop_segments(self):  # Anda, para 30 frames, anda de novo; um tremor isolado não quebra a parada
+        x = np.concatenate([np.arange(40) * 2.0, np.full(30, 78.0), 78.0 + np.arange(1, 41) * 2.0])
+        x[55] += 3.0  # Tremor no meio da parada
+        frames = np.arange(len(x))
+        k = compute_kinematics(frames, x, np.zeros(len(x)))
+        summary = summarize_kinematics(k, frames)
+        self.assertEqual(summary["stops"], 1)
+        self.assertAlmostEqual(summary["stop_frames"], 30, delta=3)
+        self.assertFalse(k["moving"][50:60].any())
+
+    def test_million_points_under_a_second(self):  # Trajetórias longas precisam ser processadas em menos de 1 s
+        rng = np.random.default_rng(0)
+        n = 10 ** 6
+        frames = np.arange(n)
+        xs, ys = np.cumsum(rng.normal(0, 1, n)), np.cumsum(rng.normal(0, 1, n))
+        start = time.perf_counter()
+        summarize_kinematics(compute_kinematics(frames, xs, ys), frames)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_tracking_csv_columns(self):  # O CSV do tracking ganha as colunas e continua legível
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "quadrado.avi")
+            box = make_synthetic_video(video)
+            stats = track_single_object(video, tmp, tracker_type="KCF", save_video=False, save_csv=True,
+                                        save_debug_images=False, initial_box=box, headless=True, kinematics=True)
+            with open(stats["csv_output"], encoding="utf-8") as f:
+                header = f.readline().strip().split(";")
+            self.assertEqual(header[4:], list(KINEMATICS_COLUMNS))
+            self.assertEqual(len(load_csv_trajectory(stats["csv_output"])), stats["success_frames"])
+            self.assertAlmostEqual(stats["kinematics"]["speed_p50"], 2.0, delta=0.3)  # O quadrado anda 2 px por frame
+            with open(stats["report_path"], encoding="utf-8") as f:
+                self.assertIn("--- Cinemática (por frame) ---", f.read())
+
+if __name__ == "__main__":  # Permite executar o arquivo diretamente
+    unittest.main()
@@ -0,0 +1,124 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes do sistema de logs em fila.
+Ele verifica o arquivo único compartilhado pelos loggers, a rotação por tamanho, os eventos em JSON por linha,
+o descarte (sem bloqueio) quando a fila enche, o limite de frequência do debug por frame e os logs vindos de
+outros processos.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import json  # Importa json para ler os eventos
+import time  # Importa time para medir o tempo das chamadas de log
+import tempfile  # Importa tempfile para criar pastas temporárias durante os testes
+import multiprocessing  # Importa multiprocessing para o teste entre processos
+
+# Adiciona a raiz do projeto ao sys.path para permitir importar 'src'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.io.logger import (EVENTS_FILE, LOG_FILE, LOG_QUEUE_SIZE, FrameDebugLog, configure_logging, dropped_records,
+                           get_app_logger, get_log_level, init_worker_logging, log_event, process_log_queue,
+                           set_log_level, shutdown_logging)
+
+def _worker_logs(q):  # Corpo de um processo filho: registra uma mensagem pela fila do processo principal
+    init_worker_logging(q)
+    get_app_logger("teste_filho").info("mensagem do processo filho")
+
+class TestLogger(unittest.TestCase):  # Testes do sistema de logs
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()  # Os logs dos testes não vão para data/results/logs
+        configure_logging(self.tmp.name, console=False)
+
+    def tearDown(self):
+        set_log_level("INFO")
+        configure_logging()  # Volta aos destinos padrão
+        self.tmp.cleanup()
+
+    def _read(self, name):  # Grava os registros pendentes e lê um arquivo de log
+        shutdown_logging()
+        with open(os.path.join(self.tmp.name, name), encoding="utf-8") as f:
+            return f.read()
+
+    def test_loggers_share_one_file(self):  # Loggers diferentes escrevem no mesmo arquivo, sem duplicar linhas
+        get_app_logger("teste_a").info("primeira")
+        get_app_logger("teste_b").info("segunda")
+        get_app_logger("teste_a").info("terceira")
+        self.assertIs(get_app_logger("teste_a").handlers[0], get_app_logger("teste_b").handlers[0])
+        lines = self._read(LOG_FILE).splitlines()
+        self.assertEqual(lines, ["[INFO][teste_a] primeira", "[INFO][teste_b] segunda", "[INFO][teste_a] terceira"])
+
+    def test_rotation(self):  # O arquivo é rotacionado ao passar do tamanho máximo
+        configure_logging(self.tmp.name, max_bytes=2000, backups=2, console=False)
+        logger = get_app_logger("teste_rotacao")
+        for i in range(200):
+            logger.info(f"linha {i:04d} " + "x" * 40)
+        shutdown_logging()
+        files = sorted(os.listdir(self.tmp.name))
+        self.assertIn(LOG_FILE + ".1", files)
+        self.assertIn(LOG_FILE + ".2", files)
+        self.assertNotIn(LOG_FILE + ".3", files)  # Apenas 'backups' arquivos antigos
+        self.assertLessEqual(os.path.getsize(os.path.join(self.tmp.name, LOG_FILE)), 2000)
+
+    def test_structured_events(self):  # Eventos vão para o JSON por linha (e como texto para o log); mensagens comuns não
+        logger = get_app_logger("teste_eventos")
+        log_event(logger, "run_start", run_id="abc", video="gato.mp4", box=(1, 2, 3, 4))
+        logger.info("mensagem comum")
+        log_event(logger, "run_end", "Tracking concluído", run_id="abc", frames=10)
+        events = [json.loads(line) for line in self._read(EVENTS_FILE).splitlines()]
+        self.assertEqual([e["event"] for e in events], ["run_start", "run_end"])
+        self.assertEqual(events[0]["box"], [1, 2, 3, 4])
+        self.assertEqual(events[1]["frames"], 10)
+        self.assertEqual(events[1]["logger"], "teste_eventos")
+        with open(os.path.join(self.tmp.name, LOG_FILE), encoding="utf-8") as f:
+            text = f.read()
+        self.assertIn("run_start: run_id=abc", text)
+        self.assertIn("[INFO][teste_eventos] Tracking concluído", text)
+
+    def test_full_queue_drops_without_blocking(self):  # Sem a thread de gravação, a fila enche e os registros são descartados
+        logger = get_app_logger("teste_fila")
+        shutdown_logging()  # Ninguém esvazia a fila
+        before = dropped_records()
+        start = time.perf_counter()
+        for i in range(LOG_QUEUE_SIZE + 50):
+            logger.info("registro %d", i)
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertGreaterEqual(dropped_records() - before, 50)
+
+    def test_frame_debug_is_rate_limited(self):  # No máximo uma mensagem por intervalo, com a contagem das omitidas
+        logger = get_app_logger("teste_frames")
+        frame_log = FrameDebugLog(logger, interval=60.0)
+        frame_log.debug(0, "ignorada (nível INFO)")
+        set_log_level("DEBUG")
+        self.assertEqual(get_log_level(), 10)
+        with self.assertLogs(logger, "DEBUG") as cm:
+            for i in range(100):
+                frame_log.debug(i, "caixa=%s", (i, i))
+        self.assertEqual(cm.output, ["DEBUG:teste_frames:[frame 0] caixa=(0, 0)"])
+        frame_log.interval = 0.0
+        with self.assertLogs(logger, "DEBUG") as cm:
+            frame_log.debug(100, "caixa=%s", None)
+        self.assertEqual(cm.output, ["DEBUG:teste_frames:[frame 100] caixa=None (+99 omitidas)"])
+
+    def test_worker_process_logs_to_parent_file(self):  # Os registros de outro processo são gravados pelo processo principal
+        ctx = multiprocessing.get_context("spawn")
+        with process_log_queue(ctx) as q:
+            child = ctx.Process(target=_worker_logs, args=(q,))
+            child.start()
+            child.join(60)
+        self.assertEqual(child.exitcode, 0)
+        self.assertIn("[INFO][teste_filho] mensagem do processo filho", self._read(LOG_FILE))
+
+if __name__ == "__main__":  # Se o arquivo for executado diretamente
+    unittest.main()  # Executa todos os testes definidos
@@ -0,0 +1,67 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes do motor de métricas (recálculo a partir de trajetórias salvas).
+Ele verifica se as estatísticas recalculadas de um CSV ou de um '.traj' conferem com as do tracking
+e se mudar o FPS ou a calibração altera apenas as métricas dependentes.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import tempfile  # Importa tempfile para gravar os arquivos em uma pasta temporária
+
+# Adiciona o diretório pai (raiz do projeto) ao sys.path para permitir a importação dos módulos do projeto
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.core.metrics import recompute_metrics  # Importa o recálculo de métricas
+from src.core.tracking import track_single_object  # Importa o tracking
+from test_tracking import make_synthetic_video  # Reaproveita o vídeo sintético dos testes de tracking
+
+METRIC_KEYS = ("num_frames", "success_frames", "success_rate", "mean_speed_px", "max_speed_px",
+               "mean_speed_px_per_s", "total_distance_px", "straight_distance_px", "path_efficiency")
+
+class TestRecomputeMetrics(unittest.TestCase):  # Testes do recálculo offline
+
+    @classmethod
+    def setUpClass(cls):  # Roda o tracking uma vez e guarda CSV e '.traj'
+        cls.tmp = tempfile.TemporaryDirectory()
+        video = os.path.join(cls.tmp.name, "quadrado.avi")
+        box = make_synthetic_video(video)
+        cls.stats = track_single_object(video, cls.tmp.name, tracker_type="KCF", save_video=False, save_csv=True,
+                                        save_binary=True, save_debug_images=False, initial_box=box, headless=True)
+
+    @classmethod
+    def tearDownClass(cls):  # Remove a pasta temporária
+        cls.tmp.cleanup()
+
+    def test_binary_matches_tracking(self):  # O '.traj' guarda FPS e resolução: nada precisa ser informado
+        stats = recompute_metrics(self.stats["binary_output"])
+        for key in METRIC_KEYS:
+            self.assertAlmostEqual(stats[key], self.stats[key], places=4, msg=key)
+        self.assertEqual((stats["frame_width"], stats["frame_height"]), (160, 120))
+        self.assertTrue(os.path.isfile(stats["report_path"]))
+
+    def test_csv_with_new_fps_and_calibration(self):  # Mudar FPS e calibração só altera as métricas dependentes
+        stats = recompute_metrics(self.stats["csv_output"], fps=40.0, pixels_per_meter=20.0, save_report=False)
+        self.assertAlmostEqual(stats["mean_speed_px"], self.stats["mean_speed_px"])
+        self.assertAlmostEqual(stats["mean_speed_px_per_s"], self.stats["mean_speed_px"] * 40.0)
+        self.assertAlmostEqual(stats["mean_speed_m_s"], self.stats["mean_speed_px"] * 40.0 / 20.0)
+        self.assertEqual(stats["num_frames"], self.stats["num_frames"])  # Inferido do último frame do CSV
+
+    def test_csv_requires_fps(self):  # O CSV não guarda o FPS do vídeo
+        with self.assertRaises(ValueError):
+            recompute_metrics(self.stats["csv_output"], save_report=False)
+
+if __name__ == '__main__':  # Verifica se o arquivo está sendo executado diretamente
+    unittest.main()  # Executa os testes
@@ -0,0 +1,105 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes das anotações sob demanda (overlay).
+Ele verifica o arquivo lateral gerado pelo tracking (sem vídeo anotado), o desenho dos frames a partir da trajetória
+e a exportação (burn-in), que deve reproduzir o vídeo anotado gravado pelo próprio tracking.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import json  # Importa json para ler o arquivo lateral
+import tempfile  # Importa tempfile para criar pastas temporárias durante os testes
+import cv2  # Importa OpenCV para ler os vídeos gerados
+import numpy as np  # Importa NumPy para comparar os frames
+
+# Adiciona a raiz do projeto e a pasta de testes ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.overlay import OverlayRenderer, export_overlay, export_overlays, load_overlay  # Importa as anotações sob demanda
+from src.core.tracking import track_single_object  # Importa a função principal de tracking
+from test_tracking import make_synthetic_video  # Importa o gerador de vídeo sintético
+
+def _read_frames(path):  # Lê todos os frames de um vídeo
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame.astype(np.int16))
+    cap.release()
+    return frames
+
+class TestOverlay(unittest.TestCase):  # Testes das anotações sob demanda
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "quadrado.avi")
+        self.box = make_synthetic_video(self.video)  # 40 frames
+        self.kwargs = dict(tracker_type="KCF", save_debug_images=False, initial_box=self.box, headless=True)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sidecar_instead_of_video(self):  # O tracking não codifica o vídeo e grava o arquivo lateral e o '.traj'
+        out = os.path.join(self.tmp.name, "overlay")
+        stats = track_single_object(self.video, out, save_video=True, overlay=True, **self.kwargs)
+        self.assertIsNone(stats["video_output"])
+        self.assertFalse(any(name.endswith(".mp4") for name in os.listdir(out)))
+        overlay = load_overlay(stats["overlay_output"])
+        self.assertEqual(overlay["trajectory"], os.path.abspath(stats["binary_output"]))
+        self.assertEqual(overlay["num_frames"], stats["num_frames"])
+        self.assertEqual(overlay["start_frame"], 0)
+        with open(stats["overlay_output"], encoding="utf-8") as f:
+            self.assertFalse(os.path.isabs(json.load(f)["trajectory"]))  # Relativo: a pasta pode ser movida (ou ir para o cache)
+
+    def test_renderer_matches_tracking_hud(self):  # Caixa e HUD redesenhados a partir da trajetória
+        stats = track_single_object(self.video, self.tmp.name, save_video=False, overlay=True, **self.kwargs)
+        overlay = load_overlay(stats["overlay_output"])
+        renderer = OverlayRenderer(overlay["trajectory"], overlay["fps"])
+        self.assertEqual(renderer.speeds[0], 0.0)  # Primeiro frame com posição: sem velocidade
+        self.assertAlmostEqual(float(np.median(renderer.speeds[1:])), 2.0, delta=0.5)  # O quadrado anda 2 px por frame
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        self.assertTrue(renderer.render(frame, 5))
+        self.assertGreater(int(frame[:, :, 1].max()), 0)  # Caixa verde desenhada
+        self.assertFalse(renderer.render(np.zeros_like(frame), 1000))  # Frame fora da trajetória
+
+    def test_export_matches_annotated_video(self):  # O burn-in reproduz o vídeo anotado gravado pelo tracking
+        annotated = track_single_object(self.video, os.path.join(self.tmp.name, "video"), save_video=True, **self.kwargs)
+        stats = track_single_object(self.video, os.path.join(self.tmp.name, "overlay"), overlay=True, **self.kwargs)
+        exported = export_overlay(stats["overlay_output"])
+        self.assertTrue(exported.endswith(".mp4"))
+        self.assertIn("_tracking_", os.path.basename(exported))
+        expected, frames = _read_frames(annotated["video_output"]), _read_frames(exported)
+        self.assertEqual(len(frames), len(expected))
+        for a, b in zip(expected, frames):  # Mesmo desenho (a codificação é determinística para a mesma entrada)
+            self.assertLess(float(np.abs(a - b).mean()), 0.5)
+
+    def test_export_segment_and_parallel(self):  # Trecho do vídeo (busca pelo índice) e exportação em dois processos
+        sidecars = []
+        for name, start in (("a", 10), ("b", 0)):
+            stats = track_single_object(self.video, os.path.join(self.tmp.name, name), overlay=True, start_frame=start,
+                                        end_frame=30, **self.kwargs)
+            sidecars.append(stats["overlay_output"])
+        self.assertEqual(load_overlay(sidecars[0])["start_frame"], 10)
+        out = os.path.join(self.tmp.name, "export")
+        results = export_overlays(sidecars + [os.path.join(self.tmp.name, "faltando_overlay_x.json")], out_dir=out, workers=2)
+        self.assertEqual([r["ok"] for r in results], [True, True, False])
+        self.assertEqual(len(_read_frames(results[0]["output"])), 19)  # Frames 11 a 29
+        self.assertEqual(len(_read_frames(results[1]["output"])), 29)  # Frames 1 a 29
+        self.assertEqual(os.path.dirname(results[0]["output"]), out)
+
+if __name__ == "__main__":  # Se o arquivo for executado diretamente
+    unittest.main()  # Executa todos os testes definidos
@@ -0,0 +1,106 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes unitários dos estágios do pipeline (decodificação e gravação).
+Ele verifica se os frames chegam completos e em ordem, se a leitura pode ser interrompida
+antes do fim do vídeo e se erros das threads são repassados para a thread principal.
+'''
+#################
+
+import unittest  # Importa o framework de testes unitários do Python
+import sys  # Importa o módulo sys para manipulação de variáveis do sistema
+import os  # Importa o módulo os para interação com o sistema operacional
+import numpy as np  # Importa NumPy para criar frames falsos
+
+# Adiciona o diretório pai (raiz do projeto) ao sys.path para permitir importar módulos internos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.pipeline import BufferPool, FrameReader, OutputStage
+
+class FakeCapture:  # Imita um cv2.VideoCapture com uma quantidade fixa de frames
+    def __init__(self, num_frames):
+        self.num_frames = num_frames  # Total de frames do "vídeo"
+        self.pos = 0  # Próximo frame a ser lido
+
+    def read(self, image=None):  # Devolve um frame cujo valor é o próprio índice (no array recebido, como o OpenCV)
+        if self.pos >= self.num_frames:
+            return False, None
+        frame = image if image is not None and image.shape == (2, 2, 3) else np.empty((2, 2, 3), dtype=np.uint8)
+        frame[:] = self.pos
+        self.pos += 1
+        return True, frame
+
+class TestPipeline(unittest.TestCase):  # Define a classe de testes herdando de unittest.TestCase
+
+    def test_reader_delivers_all_frames_in_order(self):  # Todos os frames devem chegar em ordem
+        reader = FrameReader(FakeCapture(50), queue_size=2).start()
+        values = []
+        while True:
+            frame = reader.read()
+            if frame is None:
+                break
+            values.append(int(frame[0, 0, 0]))
+        reader.stop()
+        self.assertEqual(values, list(range(50)))
+        self.assertIsNone(reader.read())  # Depois do fim continua devolvendo None
+
+    def test_reader_stop_before_end(self):  # A leitura pode ser interrompida com a fila cheia
+        cap = FakeCapture(1000)
+        reader = FrameReader(cap, queue_size=2).start()
+        reader.read()
+        reader.stop()
+        self.assertLess(cap.pos, 1000)  # A thread parou sem decodificar o vídeo inteiro
+
+    def test_buffer_pool_reuses_released_buffers(self):  # Um buffer só volta a ser entregue sem nenhum dono
+        pool = BufferPool()
+        a = pool.acquire((4, 4))
+        pool.retain(a)  # Dois donos
+        pool.release(a)
+        self.assertIsNot(pool.acquire((4, 4)), a)  # Ainda em uso: cria outro
+        pool.release(a)
+        self.assertIs(pool.acquire((4, 4)), a)  # Devolvido: reaproveitado
+        self.assertIsNot(pool.acquire((4, 4, 3)), a)  # Outro formato
+        pool.release(np.zeros((4, 4), dtype=np.uint8))  # Arrays de fora do pool são ignorados
+        self.assertEqual((pool.allocations, pool.reuses), (3, 1))
+
+    def test_reader_decodes_into_pool_buffers(self):  # Com o pool, poucos buffers atendem o vídeo inteiro
+        pool = BufferPool()
+        reader = FrameReader(FakeCapture(50), queue_size=2, pool=pool).start()
+        values = []
+        while True:
+            frame = reader.read()
+            if frame is None:
+                break
+            values.append(int(frame[0, 0, 0]))
+            pool.release(frame)  # O consumidor devolve cada frame
+        reader.stop()
+        self.assertEqual(values, list(range(50)))
+        self.assertLessEqual(pool.allocations, 5)  # Fila (2) + frame em uso + o que está sendo decodificado
+        self.assertEqual(pool.allocations + pool.reuses, 51)  # A última leitura (fim do vídeo) também pede um buffer
+
+    def test_output_stage_runs_tasks_in_order(self):  # As tarefas de gravação devem rodar em ordem
+        done = []
+        output = OutputStage(queue_size=1).start()
+        for i in range(20):
+            output.submit(done.append, i)
+        output.close()
+        self.assertEqual(done, list(range(20)))
+
+    def test_output_stage_propagates_errors(self):  # Um erro na thread de gravação chega na thread principal
+        def fail():
+            raise IOError("disco cheio")
+        output = OutputStage().start()
+        output.submit(fail)
+        with self.assertRaises(IOError):
+            output.close()
+
+if __name__ == '__main__':  # Verifica se o arquivo está sendo executado diretamente
+    unittest.main()  # Executa todos os testes definidos na classe
@@ -0,0 +1,100 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes dos cronômetros por estágio do tracking.
+Ele verifica os percentis do histograma, o resumo com FPS efetivo e pico de memória, a seção de desempenho do
+relatório e os perfis detalhados opcionais (cProfile e trace de eventos).
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import json  # Importa json para ler o trace de eventos
+import pstats  # Importa pstats para ler o perfil do cProfile
+import tempfile  # Importa tempfile para criar pastas temporárias durante os testes
+
+# Adiciona a raiz do projeto e a pasta de testes ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.profiling import RunProfiler, peak_rss_mb  # Importa os cronômetros por estágio
+from src.core.tracking import track_single_object  # Importa a função principal de tracking
+from test_tracking import make_synthetic_video  # Importa o gerador de vídeo sintético
+
+class TestProfiling(unittest.TestCase):  # Testes dos cronômetros por estágio
+
+    def test_percentiles_from_histogram(self):  # Percentis com erro de no máximo um intervalo do histograma (~12%)
+        profiler = RunProfiler()
+        timer = profiler.stage("tracker")
+        for i in range(1, 101):  # Durações de 1 ms a 100 ms
+            timer.add(i / 1000.0)
+        s = timer.summary()
+        self.assertEqual(s["count"], 100)
+        self.assertAlmostEqual(s["total_s"], 5.05)
+        self.assertAlmostEqual(s["p50_ms"], 50.0, delta=50.0 * 0.13)
+        self.assertAlmostEqual(s["p95_ms"], 95.0, delta=95.0 * 0.13)
+        self.assertAlmostEqual(s["p99_ms"], 99.0, delta=99.0 * 0.13)
+        self.assertAlmostEqual(s["max_ms"], 100.0)
+        self.assertLessEqual(s["p99_ms"], s["max_ms"])
+
+    def test_summary(self):  # FPS efetivo, pico de memória e apenas os estágios medidos
+        profiler = RunProfiler()
+        profiler.stage("vazio")
+        with profiler.stage("gray"):
+            pass
+        profiler.timed("write", lambda a, b: a + b)(1, 2)
+        profiler.finish(10)
+        summary = profiler.summary()
+        self.assertEqual(list(summary["stages"]), ["gray", "write"])
+        self.assertGreater(summary["effective_fps"], 0.0)
+        self.assertAlmostEqual(summary["effective_fps"], 10 / summary["wall_seconds"])
+        if peak_rss_mb() is not None:
+            self.assertGreater(summary["peak_rss_mb"], 1.0)
+
+    def test_tracking_report_and_dumps(self):  # Estatísticas, relatório e perfis detalhados de uma execução real
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "sintetico.avi")
+            box = make_synthetic_video(video)
+            stats = track_single_object(video, tmp, tracker_type="KCF", save_video=True, save_debug_images=False,
+                                        initial_box=box, headless=True)
+            profile = stats["profile"]
+            self.assertIsNone(stats["profile_output"])
+            self.assertEqual(profile["stages"]["tracker"]["count"], stats["num_frames"])
+            self.assertEqual(profile["stages"]["write"]["count"], stats["num_frames"])
+            self.assertEqual(profile["stages"]["decode"]["count"], stats["num_frames"] + 1)  # O último read() devolve o fim do vídeo
+            with open(stats["report_path"], encoding="utf-8") as f:
+                report = f.read()
+            self.assertIn("--- Desempenho (por estágio) ---", report)
+            self.assertIn("FPS efetivo", report)
+            counters = profile["counters"]  # Frames e cinzas vêm do pool: poucas alocações para o vídeo inteiro
+            self.assertLess(counters["buffer_allocations"], 30)
+            self.assertEqual(counters["buffer_allocations"] + counters["buffer_reuses"], 2 * stats["num_frames"] + 1)
+            self.assertIn("Buffers de imagem", report)
+
+            stats = track_single_object(video, tmp, tracker_type="KCF", save_video=False, save_debug_images=False,
+                                        initial_box=box, headless=True, profile_dump="cprofile")
+            self.assertTrue(stats["profile_output"].endswith(".prof"))
+            self.assertGreater(pstats.Stats(stats["profile_output"]).total_calls, 0)
+
+            stats = track_single_object(video, tmp, tracker_type="KCF", save_video=False, save_debug_images=False,
+                                        initial_box=box, headless=True, profile_dump="trace")
+            with open(stats["profile_output"], encoding="utf-8") as f:
+                events = json.load(f)["traceEvents"]
+            spans = [e for e in events if e["ph"] == "X"]
+            self.assertEqual(sum(e["name"] == "tracker" for e in spans), stats["num_frames"])
+            self.assertTrue(all(e["dur"] >= 0 for e in spans))
+
+            with self.assertRaises(ValueError):
+                track_single_object(video, tmp, initial_box=box, headless=True, profile_dump="gprof")
+
+if __name__ == "__main__":  # Se o arquivo for executado diretamente
+    unittest.main()  # Executa todos os testes definidos
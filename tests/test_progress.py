@@ -0,0 +1,106 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes dos avisos de andamento e do cancelamento do tracking.
+Ele verifica o espaçamento dos avisos, o aviso final, a interrupção pelo cancel_event (com relatório parcial)
+e que resultados cancelados não entram no cache.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import time  # Importa time para simular o passar do tempo
+import threading  # Importa threading para o sinal de cancelamento
+import tempfile  # Importa tempfile para criar pastas temporárias durante os testes
+from unittest import mock  # Importa mock para reduzir o intervalo entre avisos
+
+# Adiciona a raiz do projeto e a pasta de testes ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.progress import ProgressReporter  # Importa os avisos de andamento
+from src.core.tracking import track_single_object  # Importa a função principal de tracking
+from src.core.cache import cached_track_single_object  # Importa o tracking com cache
+from test_tracking import make_synthetic_video  # Importa o gerador de vídeo sintético
+
+class TestProgressReporter(unittest.TestCase):  # Testes do espaçamento dos avisos
+
+    def test_throttled_updates_and_final_event(self):
+        events = []
+        reporter = ProgressReporter(events.append, total=100, interval=0.05)
+        for i in range(100):
+            reporter.update(i)  # Chamadas seguidas: no máximo um aviso por intervalo
+        self.assertLessEqual(len(events), 1)
+        time.sleep(0.06)
+        reporter.update(50)
+        self.assertEqual(events[-1]["done"], 50)
+        self.assertAlmostEqual(events[-1]["fraction"], 0.5)
+        self.assertGreater(events[-1]["fps"], 0.0)
+        self.assertGreater(events[-1]["eta_s"], 0.0)
+        reporter.finish(100)
+        self.assertTrue(events[-1]["finished"])
+        self.assertIsNone(events[-1]["eta_s"])
+        self.assertEqual(events[-1]["fraction"], 1.0)
+
+    def test_without_callback(self):  # Sem callback nada é calculado nem chamado
+        reporter = ProgressReporter(None, total=10)
+        reporter.update(5)
+        reporter.finish(10)
+
+class TestTrackingProgress(unittest.TestCase):  # Andamento e cancelamento no tracking
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "quadrado.avi")
+        self.box = make_synthetic_video(self.video)  # 40 frames
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_progress_events(self):  # Avisos em ordem, terminando com o total de frames
+        events = []
+        stats = track_single_object(self.video, self.tmp.name, tracker_type="KCF", save_video=False,
+                                    save_debug_images=False, initial_box=self.box, headless=True, progress=events.append)
+        self.assertFalse(stats["cancelled"])
+        self.assertTrue(events[-1]["finished"])
+        self.assertEqual(events[-1]["done"], stats["num_frames"])
+        self.assertEqual(events[-1]["total"], 39)
+        self.assertEqual([e["done"] for e in events], sorted(e["done"] for e in events))
+
+    def test_cancel_stops_loop_with_partial_report(self):  # set() durante o tracking interrompe no frame seguinte
+        cancel = threading.Event()
+        def on_progress(p):
+            if p["done"] >= 10:
+                cancel.set()
+        with mock.patch("src.core.progress.PROGRESS_INTERVAL", 0.0):
+            stats = track_single_object(self.video, self.tmp.name, tracker_type="KCF", save_video=False,
+                                        save_debug_images=False, initial_box=self.box, headless=True,
+                                        progress=on_progress, cancel_event=cancel)
+        self.assertTrue(stats["cancelled"])
+        self.assertEqual(stats["num_frames"], 10)
+        with open(stats["report_path"], encoding="utf-8") as f:
+            self.assertIn("Execução cancelada", f.read())
+
+    def test_cancelled_run_is_not_cached(self):  # Um resultado parcial não pode ser devolvido por acertos futuros
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        cancel = threading.Event()
+        cancel.set()  # Cancelado antes do primeiro frame
+        kwargs = dict(tracker_type="KCF", save_video=False, save_debug_images=False, initial_box=self.box, headless=True)
+        stats = cached_track_single_object(self.video, self.tmp.name, cache_dir=cache_dir, cancel_event=cancel, **kwargs)
+        self.assertTrue(stats["cancelled"])
+        self.assertEqual(stats["num_frames"], 0)
+        stats = cached_track_single_object(self.video, self.tmp.name, cache_dir=cache_dir, **kwargs)
+        self.assertFalse(stats["cache_hit"])
+        self.assertFalse(stats["cancelled"])
+
+if __name__ == "__main__":  # Se o arquivo for executado diretamente
+    unittest.main()  # Executa todos os testes definidos
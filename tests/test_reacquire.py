@@ -0,0 +1,106 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes da reaquisição do objeto depois da perda do tracking.
+Ele verifica a busca em várias escalas, a janela crescente seguida da pirâmide no frame inteiro
+e o tracking completo de um objeto que some por alguns frames e reaparece em outro lugar.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import tempfile  # Importa tempfile para criar pastas temporárias durante os testes
+import cv2  # Importa a biblioteca OpenCV para gerar os frames e o vídeo
+import numpy as np  # Importa NumPy para montar as imagens
+
+# Adiciona a raiz do projeto ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.reacquire import Reacquirer, cut_template, match_multiscale  # Importa a reaquisição
+from src.core.tracking import track_single_object  # Importa a função principal de tracking
+
+def make_texture(size: int = 24) -> np.ndarray:  # Objeto com textura (listras e um círculo)
+    tex = np.zeros((size, size, 3), dtype=np.uint8)
+    tex[::2, :] = 255
+    tex[:, ::6] = (0, 0, 255)
+    cv2.circle(tex, (size // 2, size // 2), size // 4, (0, 255, 0), -1)
+    return tex
+
+def make_background(w: int, h: int) -> np.ndarray:  # Fundo com ruído fixo
+    return np.random.default_rng(0).integers(30, 60, (h, w, 3), dtype=np.uint8)
+
+def make_hiding_video(path: str, num_frames: int = 60, hide=(20, 30), jump: int = 60):  # O objeto some e reaparece adiante
+    w, h = 240, 120
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 20.0, (w, h))
+    background, tex = make_background(w, h), make_texture()
+    for i in range(num_frames):
+        frame = background.copy()
+        x = 10 + 2 * i + (jump if i >= hide[1] else 0)  # Anda 2 px por frame e salta 'jump' px enquanto está escondido
+        if not hide[0] <= i < hide[1]:
+            frame[50:74, x:x + 24] = tex
+        writer.write(frame)
+    writer.release()
+    return (10, 50, 24, 24)
+
+class TestReacquire(unittest.TestCase):  # Testes da reaquisição por template
+
+    def setUp(self):  # Pasta temporária para o vídeo e os resultados
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):  # Remove a pasta temporária
+        self.tmp.cleanup()
+
+    def test_multiscale_finds_larger_object(self):  # O objeto 25% maior é encontrado com a escala certa
+        frame = make_background(240, 120)
+        frame[40:64, 20:44] = make_texture()
+        template = cut_template(frame, (20, 40, 24, 24))
+        bigger = make_background(240, 120)
+        bigger[30:60, 150:180] = cv2.resize(make_texture(), (30, 30), interpolation=cv2.INTER_LINEAR)
+        box, score = match_multiscale(bigger, template)
+        self.assertEqual(box[2:], (30, 30))
+        self.assertLess(abs(box[0] - 150) + abs(box[1] - 30), 3)
+        self.assertGreater(score, 0.8)
+
+    def test_window_then_pyramid(self):  # Perto da última caixa basta a janela; longe dela, a pirâmide no frame inteiro
+        background = make_background(480, 240)
+        first = background.copy()
+        first[100:124, 40:64] = make_texture()
+        gray = cv2.cvtColor(first, cv2.COLOR_BGR2GRAY)
+        for x, stage in ((56, "janela"), (400, "pirâmide")):
+            reacquirer = Reacquirer()
+            reacquirer.remember(gray, (40, 100, 24, 24))
+            self.assertIsNone(reacquirer.search(cv2.cvtColor(background, cv2.COLOR_BGR2GRAY)))  # Objeto ausente
+            frame = background.copy()
+            frame[100:124, x:x + 24] = make_texture()
+            box, score, found_stage = reacquirer.search(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+            self.assertEqual(found_stage, stage)
+            self.assertLess(abs(box[0] - x) + abs(box[1] - 100), 3)
+
+    def test_tracking_recovers_after_loss(self):  # Sem reaquisição o resto do vídeo é perdido; com ela o tracking continua
+        video = os.path.join(self.tmp.name, "esconde.avi")
+        box = make_hiding_video(video)
+        plain = track_single_object(video, self.tmp.name, tracker_type="KCF", save_video=False,
+                                    save_debug_images=False, initial_box=box, headless=True)
+        stats = track_single_object(video, self.tmp.name, tracker_type="KCF", save_video=False,
+                                    save_debug_images=False, initial_box=box, headless=True, reacquire=True)
+        self.assertLess(plain["success_rate"], 0.5)
+        self.assertGreater(stats["success_rate"], 0.8)
+        events = stats["reacquisition_events"]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["frame"], 29)  # Frame em que o objeto reaparece (o frame 0 inicializa o tracker)
+        frames, xs, _ = stats["trajectory"].tracked()
+        self.assertAlmostEqual(xs[-1], 10 + 2 * 59 + 60 + 12, delta=4)  # Centro do objeto no último frame
+        with open(stats["report_path"], encoding="utf-8") as f:
+            self.assertIn("Reaquisições         : 1 (frames 29)", f.read())
+
+if __name__ == "__main__":  # Permite executar o arquivo diretamente
+    unittest.main()
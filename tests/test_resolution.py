@@ -0,0 +1,98 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes unitários dos modos de tracking com resolução reduzida
+(frame reduzido e janela de busca). Ele verifica se as caixas voltam para as coordenadas
+do vídeo original e se o relatório de precisão x velocidade é gerado.
+'''
+#################
+
+import unittest  # Importa o framework de testes unitários do Python
+import sys  # Importa o módulo sys para manipulação de variáveis do sistema
+import os  # Importa o módulo os para interação com o sistema operacional
+import tempfile  # Importa tempfile para criar pastas temporárias
+import numpy as np  # Importa NumPy para criar frames falsos
+
+# Adiciona o diretório pai (raiz do projeto) ao sys.path para permitir importar módulos internos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.core.resolution import ScaledTracker, SearchWindowTracker, benchmark_track_scales
+from src.core.tracking import track_single_object
+from test_tracking import make_synthetic_video
+
+class RecordingTracker:  # Tracker falso que guarda o que recebeu e devolve sempre a mesma caixa
+    def __init__(self, box=(10, 10, 20, 20)):
+        self.box = box  # Caixa devolvida no update (coordenadas do frame recebido)
+
+    def init(self, frame, box):
+        self.init_shape, self.init_box = frame.shape, box
+
+    def update(self, frame):
+        self.update_shape = frame.shape
+        return True, self.box
+
+class TestResolution(unittest.TestCase):  # Define a classe de testes herdando de unittest.TestCase
+
+    def test_scaled_tracker_maps_boxes(self):  # A caixa reduzida deve voltar para a escala original
+        inner = RecordingTracker((10, 20, 5, 5))
+        tracker = ScaledTracker(inner, 0.5)
+        frame = np.zeros((100, 200, 3), dtype=np.uint8)
+        tracker.init(frame, (40, 60, 20, 10))
+        self.assertEqual(inner.init_shape, (50, 100, 3))  # O tracker interno recebe metade da resolução
+        self.assertEqual(inner.init_box, (20, 30, 10, 5))
+        ok, box = tracker.update(frame)
+        self.assertEqual(box, (20.0, 40.0, 10.0, 10.0))
+
+    def test_search_window_maps_and_recenters(self):  # A caixa da janela deve voltar ao frame e a janela acompanhar o objeto
+        created = []
+        def factory():
+            created.append(RecordingTracker((0, 0, 10, 10)))  # Caixa encostada na borda da janela
+            return created[-1]
+        tracker = SearchWindowTracker(factory, window_factor=3.0)
+        frame = np.zeros((300, 300, 3), dtype=np.uint8)
+        tracker.init(frame, (100, 100, 10, 10))
+        self.assertEqual(tracker.window, (90, 90, 30, 30))
+        self.assertEqual(created[0].init_box, (10, 10, 10, 10))
+        ok, box = tracker.update(frame)
+        self.assertEqual(box, (90, 90, 10, 10))  # Coordenadas do vídeo original
+        self.assertEqual(tracker.recenters, 1)  # A caixa chegou na borda: a janela foi reposicionada
+        self.assertEqual(tracker.window, (80, 80, 30, 30))
+
+    def test_search_window_leads_predicted_motion(self):  # Com velocidade prevista, a janela é adiantada no sentido do movimento
+        tracker = SearchWindowTracker(lambda: RecordingTracker(), window_factor=4.0)
+        frame = np.zeros((300, 300, 3), dtype=np.uint8)
+        tracker.velocity = (2.0, 0.0)  # 2 px/frame para a direita
+        tracker.init(frame, (100, 100, 10, 10))
+        self.assertEqual(tracker.window, (93, 85, 40, 40))  # Deslocada 8 px (limite que mantém a caixa fora da margem de trás)
+
+    def test_reduced_resolution_tracking_end_to_end(self):  # O tracking reduzido segue o quadrado nas coordenadas originais
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "quadrado.avi")
+            box = make_synthetic_video(video)
+            for kwargs in ({"track_scale": 0.5}, {"search_window": 3.0}):
+                stats = track_single_object(video, tmp, tracker_type="KCF", save_video=False, save_debug_images=False,
+                                            initial_box=box, headless=True, **kwargs)
+                self.assertGreater(stats["success_rate"], 0.9)
+                _, xs, _ = stats["trajectory"].tracked()  # O quadrado termina em x = 10 + 39*2 (centro + 10)
+                self.assertAlmostEqual(xs[-1], 10 + 39 * 2 + 10, delta=12)  # Cada reposicionamento da janela reinicia o modelo
+
+    def test_benchmark_report(self):  # O comparativo deve gerar uma linha por escala, com erro zero na referência
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "quadrado.avi")
+            box = make_synthetic_video(video)
+            rows = benchmark_track_scales(video, box, tmp, scales=(0.5,), tracker_type="KCF")
+            self.assertEqual([r["scale"] for r in rows], [1.0, 0.5])
+            self.assertEqual(rows[0]["mean_center_error_px"], 0.0)
+            self.assertTrue(os.path.isfile(rows[0]["report_path"]))
+
+if __name__ == '__main__':  # Verifica se o arquivo está sendo executado diretamente
+    unittest.main()  # Executa todos os testes definidos na classe
@@ -0,0 +1,56 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes unitários responsáveis por validar a leitura das ROIs iniciais
+a partir de arquivos JSON (sidecar), usadas no modo headless e na linha de comando.
+'''
+#################
+
+import unittest  # Importa o framework de testes unitários do Python
+import sys  # Importa o módulo sys para manipulação de variáveis do sistema
+import os  # Importa o módulo os para interação com o sistema operacional
+import json  # Importa json para escrever os arquivos de teste
+import tempfile  # Importa tempfile para criar pastas temporárias
+
+# Adiciona o diretório pai (raiz do projeto) ao sys.path para permitir importar módulos internos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.io.roi import parse_box, load_roi_sidecar, find_initial_box
+
+class TestRoi(unittest.TestCase):  # Define a classe de testes herdando de unittest.TestCase
+
+    def test_parse_box_formats(self):  # Lista e dicionário devem gerar a mesma caixa
+        self.assertEqual(parse_box([1, 2, 3, 4]), (1, 2, 3, 4))
+        self.assertEqual(parse_box({"x": 1, "y": 2, "w": 3, "h": 4}), (1, 2, 3, 4))
+
+    def test_parse_box_invalid(self):  # Caixas sem área ou incompletas devem ser rejeitadas
+        for value in ([1, 2, 3], [0, 0, 0, 10], "abc", [1, 2, "a", 4]):
+            with self.assertRaises(ValueError):
+                parse_box(value)
+
+    def test_find_initial_box(self):  # A ROI deve ser encontrada pelo nome do arquivo ou pelo sidecar individual
+        with tempfile.TemporaryDirectory() as tmp:
+            rois_path = os.path.join(tmp, "rois.json")  # Arquivo com várias ROIs
+            with open(rois_path, "w", encoding="utf-8") as f:
+                json.dump({"gato.mp4": [5, 6, 7, 8], "cachorro": [1, 1, 2, 2]}, f)
+            rois = load_roi_sidecar(rois_path)
+
+            self.assertEqual(find_initial_box("/videos/gato.mp4", rois), (5, 6, 7, 8))  # Pelo nome com extensão
+            self.assertEqual(find_initial_box("/videos/cachorro.mp4", rois), (1, 1, 2, 2))  # Pelo nome sem extensão
+
+            video = os.path.join(tmp, "tenis.mp4")  # Vídeo com sidecar individual ao lado
+            with open(os.path.join(tmp, "tenis.roi.json"), "w", encoding="utf-8") as f:
+                json.dump([10, 20, 30, 40], f)
+            self.assertEqual(find_initial_box(video, rois), (10, 20, 30, 40))
+            self.assertIsNone(find_initial_box(os.path.join(tmp, "outro.mp4"), rois))  # Sem ROI disponível
+
+if __name__ == '__main__':  # Verifica se o arquivo está sendo executado diretamente
+    unittest.main()  # Executa todos os testes definidos na classe
@@ -0,0 +1,112 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes do índice de busca (seek index) e do tracking de um trecho do vídeo.
+Ele verifica a criação e o reaproveitamento do índice salvo ao lado do vídeo, a conversão de tempo em frame,
+o posicionamento no início do trecho e as estatísticas calculadas sobre o trecho.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import tempfile  # Importa tempfile para criar pastas temporárias durante os testes
+import cv2  # Importa a biblioteca OpenCV para ler o vídeo
+
+# Adiciona a raiz do projeto e a pasta de testes ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import src.io.seek_index as seek_index  # Módulo testado (para simular um backend sem busca exata)
+from src.io.seek_index import (get_seek_index, seek_index_path, time_to_frame,  # Importa o índice de busca
+                               seek_to_frame, resolve_frame_range, seek_index_for_range)
+from src.core.tracking import track_single_object  # Importa a função principal de tracking
+from test_tracking import make_synthetic_video  # Importa o gerador de vídeo sintético
+
+class TestSeekIndex(unittest.TestCase):  # Testes do índice de busca
+
+    def setUp(self):  # Prepara um vídeo sintético em uma pasta temporária
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "quadrado.avi")
+        self.box = make_synthetic_video(self.video)
+
+    def tearDown(self):  # Remove a pasta temporária
+        self.tmp.cleanup()
+
+    def test_index_is_built_once_and_reused(self):  # O índice é salvo ao lado do vídeo e reaproveitado
+        index = get_seek_index(self.video)
+        self.assertTrue(index["seekable"])  # MJPG em .avi: a prova curta confirma a busca direta
+        self.assertEqual(index["num_frames"], 40)
+        self.assertEqual(index["timestamps_ms"], [])  # Com busca direta o vídeo não é percorrido
+        self.assertTrue(os.path.isfile(seek_index_path(self.video)))
+        mtime = os.stat(seek_index_path(self.video)).st_mtime_ns
+        self.assertEqual(get_seek_index(self.video), index)  # Segunda chamada: lido do arquivo
+        self.assertEqual(os.stat(seek_index_path(self.video)).st_mtime_ns, mtime)  # Não foi recriado
+
+    def test_time_to_frame_and_range(self):  # Conversão de tempo (20 fps) em frames
+        index = get_seek_index(self.video)
+        self.assertEqual(time_to_frame(index, 0.0), 0)
+        self.assertEqual(time_to_frame(index, 0.5), 10)
+        self.assertEqual(resolve_frame_range(index, start_time=0.5, end_time=1.0), (10, 20))
+        self.assertEqual(resolve_frame_range(index, start_frame=5), (5, 40))
+        self.assertEqual(resolve_frame_range(index, end_frame=1000), (0, 40))  # O fim é limitado ao vídeo
+        with self.assertRaises(ValueError):
+            resolve_frame_range(index, start_frame=30, end_frame=10)
+
+    def test_partial_index_without_exact_seek(self):  # Sem busca exata o índice só vai até onde foi pedido
+        original_probe = seek_index._probe_seek
+        seek_index._probe_seek = lambda cap, fps, frame_count: False
+        try:
+            index = get_seek_index(self.video, 10)
+            self.assertFalse(index["seekable"])
+            self.assertIsNone(index["num_frames"])  # Total ainda desconhecido
+            self.assertEqual(len(index["timestamps_ms"]), 11)  # Frames 0 a 10
+            index = seek_index_for_range(self.video, start_time=0.25, end_time=0.75)
+            self.assertEqual(resolve_frame_range(index, start_time=0.25, end_time=0.75), (5, 15))
+            self.assertIsNone(index["num_frames"])
+            self.assertEqual(len(get_seek_index(self.video, 3)["timestamps_ms"]), 16)  # Reaproveita o que já foi percorrido
+            index = seek_index_for_range(self.video, start_frame=30, end_frame=1000)  # Fim além do vídeo: índice completo
+            self.assertEqual(index["num_frames"], 40)
+            self.assertEqual(len(index["timestamps_ms"]), 40)
+            self.assertEqual(resolve_frame_range(index, start_frame=30, end_frame=1000), (30, 40))
+        finally:
+            seek_index._probe_seek = original_probe
+
+    def test_seek_matches_linear_read(self):  # Após o posicionamento, read() devolve o frame pedido
+        index = get_seek_index(self.video)
+        cap = cv2.VideoCapture(self.video)
+        frames = [cap.read()[1] for _ in range(16)]  # Leitura linear até o frame 15
+        cap.release()
+        for seekable in (True, False):  # Busca direta e avanço com grab()
+            cap = cv2.VideoCapture(self.video)
+            seek_to_frame(cap, {**index, "seekable": seekable}, 15)
+            ret, frame = cap.read()
+            cap.release()
+            self.assertTrue(ret)
+            self.assertTrue((frame == frames[15]).all())
+
+    def test_segment_tracking(self):  # As estatísticas são relativas ao trecho
+        box = (10 + 2 * 10, 50, 20, 20)  # Posição do quadrado no frame 10 (início do trecho)
+        stats = track_single_object(self.video, self.tmp.name, tracker_type="KCF", save_video=False, save_csv=True,
+                                    save_debug_images=True, initial_box=box, headless=True,
+                                    start_frame=10, end_frame=30)
+        self.assertEqual(stats["num_frames"], 19)  # 20 frames no trecho; o primeiro inicializa o tracker
+        self.assertEqual((stats["start_frame"], stats["end_frame"]), (10, 30))
+        self.assertAlmostEqual(stats["duracao_segundos"], 19 / 20.0)
+        self.assertGreater(stats["success_rate"], 0.9)
+        self.assertAlmostEqual(stats["mean_speed_px"], 2.0, delta=0.5)
+        for idx in (0, 5, 10, 15):  # Índices de debug: 0, 1/4, 1/2 e 3/4 do trecho
+            self.assertTrue(os.path.isfile(os.path.join(stats["debug_dir"], f"debug_frame_{idx:05d}.png")))
+        with open(stats["report_path"], encoding="utf-8") as f:
+            self.assertIn("Trecho analisado     : frames 10 a 29", f.read())
+
+if __name__ == "__main__":  # Verifica se o script está sendo executado diretamente
+    unittest.main()  # Executa todos os testes
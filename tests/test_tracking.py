@@ -20,13 +20,38 @@ estão disponíveis e funcionais no ambiente de execução.
 import unittest  # Importa o módulo unittest para criar e executar testes unitários
 import sys  # Importa o módulo sys para manipular variáveis do sistema, como o path
 import os  # Importa o módulo os para interagir com o sistema operacional (caminhos de arquivos)
+import tempfile  # Importa tempfile para criar pastas temporárias durante os testes
+import time  # Importa time para sincronizar as threads no teste de erros
 import cv2  # Importa a biblioteca OpenCV para visão computacional
+import numpy as np  # Importa NumPy para gerar os frames do vídeo sintético
 
 # Adiciona o diretório pai (raiz do projeto) ao sys.path para permitir a importação dos módulos do projeto
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Importa a função privada _create_tracker do módulo src.core.tracking para ser testada
-from src.core.tracking import _create_tracker
+from src.core.tracking import _create_tracker, compare_trackers, parse_tracker_config, track_single_object, track_multiple_objects
+
+def make_synthetic_video(path, num_frames=40, size=(160, 120), box_size=20, step=2):  # Gera um vídeo com um quadrado se movendo
+    w, h = size  # Largura e altura do vídeo
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 20.0, (w, h))  # Cria o gravador (MJPG em .avi)
+    for i in range(num_frames):  # Gera cada frame
+        frame = np.full((h, w, 3), 40, dtype=np.uint8)  # Fundo cinza escuro
+        x = 10 + i * step  # O quadrado anda 'step' pixels por frame na horizontal
+        cv2.rectangle(frame, (x, 50), (x + box_size, 50 + box_size), (0, 200, 255), -1)  # Desenha o quadrado
+        writer.write(frame)  # Grava o frame
+    writer.release()  # Finaliza o arquivo
+    return (10, 50, box_size, box_size)  # Retorna a ROI inicial do quadrado
+
+def make_two_objects_video(path, num_frames=40, size=(160, 120)):  # Gera um vídeo com dois quadrados em velocidades diferentes
+    w, h = size  # Largura e altura do vídeo
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 20.0, (w, h))  # Cria o gravador (MJPG em .avi)
+    for i in range(num_frames):  # Gera cada frame
+        frame = np.full((h, w, 3), 40, dtype=np.uint8)  # Fundo cinza escuro
+        cv2.rectangle(frame, (10 + 2 * i, 10), (30 + 2 * i, 30), (0, 200, 255), -1)  # Quadrado 1: 2 px por frame
+        cv2.rectangle(frame, (10 + i, 80), (30 + i, 100), (255, 120, 0), -1)  # Quadrado 2: 1 px por frame
+        writer.write(frame)  # Grava o frame
+    writer.release()  # Finaliza o arquivo
+    return [(10, 10, 20, 20), (10, 80, 20, 20)]  # Retorna as ROIs iniciais dos dois quadrados
 
 class TestTrackingLogic(unittest.TestCase):  # Define a classe de teste que herda de unittest.TestCase
 
@@ -56,5 +81,269 @@ class TestTrackingLogic(unittest.TestCase):  # Define a classe de teste que herd
             # Tenta criar um tracker com um nome que não existe, esperando que falhe
             _create_tracker("TRACKER_QUE_NAO_EXISTE")
 
+class TestHeadlessTracking(unittest.TestCase):  # Testes do modo headless (sem janelas do OpenCV)
+
+    def setUp(self):  # Prepara um vídeo sintético em uma pasta temporária
+        self.tmp = tempfile.TemporaryDirectory()  # Cria a pasta temporária
+        self.video = os.path.join(self.tmp.name, "quadrado.avi")  # Caminho do vídeo sintético
+        self.box = make_synthetic_video(self.video)  # Gera o vídeo e guarda a ROI inicial
+
+    def tearDown(self):  # Remove a pasta temporária
+        self.tmp.cleanup()
+
+    def test_headless_tracking_with_initial_box(self):  # O tracking deve rodar do início ao fim sem interface
+        stats = track_single_object(self.video, self.tmp.name, tracker_type="KCF", save_video=False,
+                                    save_csv=True, save_debug_images=False, initial_box=self.box, headless=True)
+        self.assertEqual(stats["num_frames"], 39)  # O primeiro frame é usado na inicialização
+        self.assertGreater(stats["success_rate"], 0.9)  # O quadrado deve ser seguido na maior parte do vídeo
+        self.assertAlmostEqual(stats["mean_speed_px"], 2.0, delta=0.5)  # O quadrado anda 2 px por frame
+        self.assertTrue(os.path.isfile(stats["csv_output"]))  # O CSV deve ter sido gerado
+        self.assertTrue(os.path.isfile(stats["report_path"]))  # O relatório deve ter sido gerado
+
+    def test_headless_video_and_debug_outputs(self):  # O vídeo anotado e o debug são gravados pelo estágio de saída
+        stats = track_single_object(self.video, self.tmp.name, tracker_type="KCF", save_video=True,
+                                    save_debug_images=True, initial_box=self.box, headless=True)
+        cap = cv2.VideoCapture(stats["video_output"])  # Abre o vídeo anotado gerado
+        encoded = 0  # Conta os frames gravados
+        while cap.read()[0]:
+            encoded += 1
+        cap.release()
+        self.assertEqual(encoded, stats["num_frames"])  # Um frame gravado por frame processado
+        # Índices de debug: 0, 1/4, 1/2 e 3/4 do vídeo (o último índice, 39, não é alcançado)
+        for idx in (0, 10, 20, 30):
+            self.assertTrue(os.path.isfile(os.path.join(stats["debug_dir"], f"debug_frame_{idx:05d}.png")))
+
+    def test_streaming_matches_in_memory(self):  # O modo streaming gera o mesmo CSV e o mesmo relatório
+        outputs = {}
+        for streaming in (False, True):
+            out = os.path.join(self.tmp.name, f"stream_{streaming}")
+            stats = track_single_object(self.video, out, tracker_type="KCF", save_video=False, save_csv=True,
+                                        save_debug_images=False, initial_box=self.box, headless=True, streaming=streaming)
+            with open(stats["csv_output"], encoding="utf-8") as f:
+                csv_text = f.read()
+            with open(stats["report_path"], encoding="utf-8") as f:  # Ignora data/hora e caminhos dos arquivos
+                text = f.read()
+            start = text.index("--- Desempenho")  # Ignora também os tempos medidos (variam de uma execução para outra)
+            text = text[:start] + text[text.index("\n\n", start) + 2:]
+            report = [l for l in text.splitlines(True) if not l.startswith(("Data/Hora", "Trajetória", "Relatório (TXT)"))]
+            outputs[streaming] = (csv_text, report, stats)
+        self.assertEqual(outputs[False][0], outputs[True][0])
+        self.assertEqual(outputs[False][1], outputs[True][1])
+        self.assertIsNone(outputs[True][2]["trajectory"])  # A trajetória não fica na memória
+
+    def test_adaptive_stride_interpolates_skipped_frames(self):  # Objeto lento: menos consultas ao tracker, frames interpolados marcados
+        video = os.path.join(self.tmp.name, "lento.avi")
+        box = make_synthetic_video(video, num_frames=120, size=(200, 120), box_size=40, step=1)
+        outputs = {}
+        for streaming in (False, True):
+            out = os.path.join(self.tmp.name, f"passo_{streaming}")
+            stats = track_single_object(video, out, tracker_type="KCF", save_video=False, save_csv=True,
+                                        save_debug_images=False, initial_box=box, headless=True,
+                                        streaming=streaming, max_stride=8)
+            with open(stats["csv_output"], encoding="utf-8") as f:
+                outputs[streaming] = f.read()
+        self.assertEqual(outputs[False], outputs[True])  # O modo streaming grava as mesmas linhas
+        self.assertEqual(stats["num_frames"], 119)
+        self.assertLess(stats["tracker_updates"], 119 / 2)  # O tracker é consultado em menos da metade dos frames
+        self.assertEqual(stats["interpolated_frames"] + stats["tracker_updates"], 119)
+        self.assertGreater(stats["success_rate"], 0.9)
+        self.assertAlmostEqual(stats["mean_speed_px"], 1.0, delta=0.3)  # O quadrado anda 1 px por frame
+        self.assertTrue(outputs[True].splitlines()[0].endswith(";interpolated"))
+        flags = [line.rsplit(";", 1)[1] for line in outputs[True].splitlines()[1:]]
+        self.assertEqual(flags.count("1"), stats["interpolated_frames"])
+
+    def test_failure_after_stride_does_not_count_skipped_frames(self):  # Frames pulados antes de uma falha não são falhas do tracker
+        import src.core.tracking as tracking  # Módulo testado (para substituir o tracker temporariamente)
+        from src.core.trajectory import load_trajectory  # Recarrega a trajetória gravada
+
+        class StillTracker:  # Caixa parada (o passo dobra até 8) e uma única falha na quarta consulta (frame 15)
+            def init(self, frame, box):
+                self.calls = 0
+
+            def update(self, frame):
+                self.calls += 1
+                return self.calls != 4, (10, 50, 20, 20)
+
+        original_create = tracking._create_tracker
+        tracking._create_tracker = lambda tracker_type="CSRT": StillTracker()
+        try:
+            results = {}
+            for streaming in (False, True):
+                out = os.path.join(self.tmp.name, f"falha_{streaming}")
+                results[streaming] = track_single_object(self.video, out, save_video=False, save_csv=False, save_binary=True,
+                                                         save_debug_images=False, initial_box=self.box, headless=True,
+                                                         streaming=streaming, max_stride=8)
+        finally:
+            tracking._create_tracker = original_create
+        for stats in results.values():
+            self.assertEqual(stats["skipped_frames"], 7)  # Frames 8 a 14: pulados e sem medição
+            measured = stats["num_frames"] - stats["interpolated_frames"] - stats["skipped_frames"]
+            self.assertEqual(measured, stats["tracker_updates"])  # Só os frames consultados entram na taxa
+            self.assertAlmostEqual(stats["success_rate"], (measured - 1) / measured)  # A única falha é a do frame 15
+        store = load_trajectory(results[True]["binary_output"])  # O '.traj' guarda os frames não avaliados
+        self.assertEqual(store.skipped_frames, 7)
+        self.assertEqual(store.interpolated_frames, results[True]["interpolated_frames"])
+
+    def test_motion_gate_skips_static_frames(self):  # Quadrado parado na metade do vídeo: o tracker não é consultado
+        video = os.path.join(self.tmp.name, "parado.avi")
+        writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"MJPG"), 20.0, (160, 120))
+        for i in range(60):  # Anda 2 px por frame nos 30 primeiros frames e depois para
+            frame = np.full((120, 160, 3), 40, dtype=np.uint8)
+            x = 10 + 2 * min(i, 30)
+            cv2.rectangle(frame, (x, 50), (x + 20, 70), (0, 200, 255), -1)
+            writer.write(frame)
+        writer.release()
+        stats = track_single_object(video, self.tmp.name, tracker_type="KCF", save_video=False, save_csv=False,
+                                    save_debug_images=False, initial_box=self.box, headless=True, motion_gate=3.0)
+        self.assertGreaterEqual(stats["gated_frames"], 25)  # Os frames com o quadrado parado dispensam o tracker
+        self.assertEqual(stats["gated_frames"] + stats["tracker_updates"], stats["num_frames"])
+        self.assertGreater(stats["success_rate"], 0.9)
+        _, xs, _ = stats["trajectory"].tracked()
+        self.assertAlmostEqual(xs[-1], 10 + 60 + 10, delta=2)  # Parou em x = 70 (centro em 80)
+        with open(stats["report_path"], encoding="utf-8") as f:
+            self.assertIn("Portão de movimento", f.read())
+
+    def test_tracking_error_is_not_masked(self):  # Um erro no loop não deve ser escondido por erros da gravação
+        import src.core.tracking as tracking  # Módulo testado (para substituir funções temporariamente)
+        import src.core.debug_panels as debug_panels  # Pool dos painéis de debug (o painel também é substituído)
+
+        class FailingTracker:  # Tracker que falha no terceiro update (depois do painel de debug do frame 0)
+            def init(self, frame, box):
+                self.calls = 0
+
+            def update(self, frame):
+                self.calls += 1
+                if self.calls == 3:
+                    time.sleep(0.2)  # Dá tempo para a thread de saída registrar o erro do painel
+                    raise KeyError("falha no tracker")
+                return True, (10, 50, 20, 20)
+
+        def failing_panel(*args):  # Painel de debug que também falha (erro no pool de debug)
+            raise IOError("falha na gravação")
+
+        original_create, original_panel = tracking._create_tracker, debug_panels.save_debug_panel
+        tracking._create_tracker = lambda tracker_type="CSRT": FailingTracker()
+        debug_panels.save_debug_panel = failing_panel
+        try:
+            with self.assertRaises(KeyError):  # A exceção original do loop é a que chega ao chamador
+                track_single_object(self.video, self.tmp.name, save_video=False, save_debug_images=True,
+                                    initial_box=self.box, headless=True)
+        finally:
+            tracking._create_tracker, debug_panels.save_debug_panel = original_create, original_panel
+
+    def test_headless_requires_initial_box(self):  # Sem ROI o modo headless não consegue começar
+        with self.assertRaises(ValueError):
+            track_single_object(self.video, self.tmp.name, headless=True)
+
+    def test_initial_box_outside_frame(self):  # Uma ROI fora do frame deve ser rejeitada
+        with self.assertRaises(ValueError):
+            track_single_object(self.video, self.tmp.name, initial_box=(150, 100, 50, 50), headless=True)
+
+class TestMultiObjectTracking(unittest.TestCase):  # Testes do tracking de vários objetos em uma única decodificação
+
+    def setUp(self):  # Prepara um vídeo sintético com dois objetos
+        self.tmp = tempfile.TemporaryDirectory()  # Cria a pasta temporária
+        self.video = os.path.join(self.tmp.name, "dois_quadrados.avi")  # Caminho do vídeo sintético
+        self.boxes = make_two_objects_video(self.video)  # Gera o vídeo e guarda as ROIs iniciais
+
+    def tearDown(self):  # Remove a pasta temporária
+        self.tmp.cleanup()
+
+    def test_objects_are_tracked_independently(self):  # Cada objeto tem sua própria trajetória e estatísticas
+        stats = track_multiple_objects(self.video, self.tmp.name, tracker_type="KCF", save_video=True,
+                                       save_csv=True, initial_boxes=self.boxes, headless=True)
+        self.assertEqual(stats["num_frames"], 39)  # O primeiro frame é usado na inicialização
+        self.assertEqual(stats["num_objects"], 2)  # Dois objetos rastreados
+        fast, slow = stats["objects"]  # Estatísticas de cada quadrado
+        self.assertGreater(fast["success_rate"], 0.9)
+        self.assertGreater(slow["success_rate"], 0.9)
+        self.assertAlmostEqual(fast["mean_speed_px"], 2.0, delta=0.5)  # O primeiro anda 2 px por frame
+        self.assertAlmostEqual(slow["mean_speed_px"], 1.0, delta=0.5)  # O segundo anda 1 px por frame
+
+        with open(stats["csv_output"], encoding="utf-8") as f:  # CSV com colunas por objeto
+            header = f.readline().strip().split(";")
+            rows = f.read().strip().splitlines()
+        self.assertEqual(header[:4], ["frame", "obj0_x", "obj0_y", "obj0_speed_px_per_frame"])
+        self.assertEqual(len(header), 7)  # frame + 3 colunas por objeto
+        self.assertEqual(len(rows), 39)  # Uma linha por frame processado
+        self.assertTrue(os.path.isfile(stats["video_output"]))  # Vídeo anotado gravado
+        self.assertTrue(os.path.isfile(stats["report_path"]))  # Relatório gerado
+
+    def test_headless_requires_initial_boxes(self):  # Sem ROIs o modo headless não consegue começar
+        with self.assertRaises(ValueError):
+            track_multiple_objects(self.video, self.tmp.name, headless=True)
+
+class TestCompareTrackers(unittest.TestCase):  # Testes da comparação de configurações em uma única decodificação
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "quadrado.avi")
+        self.box = make_synthetic_video(self.video)  # 40 frames, 2 px por frame
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_tracker_config(self):  # 'TRACKER[:escala[:janela]]'
+        self.assertEqual(parse_tracker_config("kcf:0.5"),
+                         {"name": "kcf:0.5", "tracker_type": "KCF", "track_scale": 0.5, "search_window": None})
+        self.assertEqual(parse_tracker_config("CSRT:1:3")["search_window"], 3.0)
+        for spec in ("", "KCF:x", "KCF:1:2:3"):
+            with self.assertRaises(ValueError):
+                parse_tracker_config(spec)
+
+    def test_single_decode_matches_separate_runs(self):  # Cada configuração dá a mesma trajetória de uma execução isolada
+        configs = [parse_tracker_config(s) for s in ("KCF", "KCF:0.5", "KCF:1:3")]
+        stats = compare_trackers(self.video, self.tmp.name, self.box, configs, save_csv=True)
+        self.assertEqual(stats["num_frames"], 39)
+        self.assertEqual([c["name"] for c in stats["configs"]], ["KCF", "KCF:0.5", "KCF:1:3"])
+        single = track_single_object(self.video, self.tmp.name, tracker_type="KCF", track_scale=0.5, save_video=False,
+                                     save_debug_images=False, initial_box=self.box, headless=True)
+        np.testing.assert_array_equal(stats["configs"][1]["trajectory"].xs, single["trajectory"].xs)
+        for c in stats["configs"]:
+            self.assertGreater(c["success_rate"], 0.9)
+            self.assertAlmostEqual(c["mean_speed_px"], 2.0, delta=0.5)
+            self.assertGreater(c["tracker_fps"], 0)
+        self.assertEqual(stats["configs"][0]["drift_mean_px"], 0.0)  # A referência não deriva de si mesma
+        self.assertEqual([(d["a"], d["b"]) for d in stats["drift"]], [("KCF", "KCF:0.5"), ("KCF", "KCF:1:3"), ("KCF:0.5", "KCF:1:3")])
+        self.assertLess(stats["drift"][0]["max_px"], 5.0)  # O quadrado é fácil: as configurações concordam
+        self.assertEqual(stats["profile"]["stages"]["decode"]["count"], 40)  # Uma decodificação (39 frames + o fim)
+
+        with open(stats["csv_output"], encoding="utf-8") as f:
+            self.assertEqual(f.readline().strip().split(";"), ["frame", "KCF_x", "KCF_y", "KCF:0.5_x", "KCF:0.5_y", "KCF:1:3_x", "KCF:1:3_y"])
+        with open(stats["report_path"], encoding="utf-8") as f:
+            report = f.read()
+        self.assertIn("--- Lado a lado ---", report)
+        self.assertIn("KCF:0.5 x KCF:1:3", report)
+
+    def test_report_without_file_fps(self):  # Sem FPS no arquivo as velocidades do relatório ficam em px/frame
+        import src.core.tracking as tracking  # Módulo testado (para simular um vídeo sem FPS)
+        original_capture = tracking.cv2.VideoCapture
+
+        class NoFpsCapture:  # Vídeo cujo arquivo não informa o FPS (o resto vai para o VideoCapture original)
+            def __init__(self, *args):
+                self._cap = original_capture(*args)
+
+            def get(self, prop):
+                return 0.0 if prop == cv2.CAP_PROP_FPS else self._cap.get(prop)
+
+            def __getattr__(self, name):
+                return getattr(self._cap, name)
+
+        tracking.cv2.VideoCapture = NoFpsCapture
+        try:
+            stats = compare_trackers(self.video, self.tmp.name, self.box, [parse_tracker_config("KCF")], pixels_per_meter=50.0)
+        finally:
+            tracking.cv2.VideoCapture = original_capture
+        self.assertIsNone(stats["configs"][0]["mean_speed_m_s"])  # Sem FPS não há conversão física
+        with open(stats["report_path"], encoding="utf-8") as f:
+            report = f.read()
+        self.assertIn("Vel. méd. (px/frame)", report)
+        row = next(line for line in report.splitlines() if line.startswith("KCF "))
+        self.assertAlmostEqual(float(row.split()[4]), 2.0, delta=0.5)  # O quadrado anda 2 px por frame
+
+    def test_repeated_config_is_rejected(self):  # Nomes repetidos tornariam o relatório ambíguo
+        with self.assertRaises(ValueError):
+            compare_trackers(self.video, self.tmp.name, self.box, [parse_tracker_config("KCF")] * 2)
+
 if __name__ == '__main__':  # Verifica se o script está sendo executado diretamente
     unittest.main()  # Executa todos os testes definidos na classe
\ No newline at end of file
@@ -0,0 +1,103 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes da trajetória em colunas (TrajectoryStore) e das métricas vetorizadas.
+Ele verifica o crescimento das colunas, o cálculo das velocidades entre pontos rastreados
+e se as métricas conferem com o cálculo ponto a ponto.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import math  # Importa math para o cálculo de referência
+import tempfile  # Importa tempfile para gravar os CSVs em uma pasta temporária
+
+# Adiciona o diretório pai (raiz do projeto) ao sys.path para permitir a importação dos módulos do projeto
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.trajectory import TrajectoryStore, StreamingTrajectory, compute_motion_stats  # Importa o que será testado
+
+class TestTrajectoryStore(unittest.TestCase):  # Testes da trajetória em colunas
+
+    def test_grows_beyond_initial_capacity(self):  # As colunas crescem sem perder dados
+        store = TrajectoryStore(capacity=2)
+        for i in range(10):
+            store.append(i, i * 3.0, i * 4.0, 10, 10, True)
+        self.assertEqual(len(store), 10)
+        self.assertEqual(list(store.frames), list(range(10)))
+        self.assertEqual(store.xs[-1], 27.0)
+
+    def test_speeds_skip_lost_frames(self):  # A velocidade liga pontos rastreados consecutivos
+        store = TrajectoryStore()
+        store.append(0, 0.0, 0.0, 10, 10, True)
+        store.append_lost(1)
+        store.append(2, 3.0, 4.0, 10, 10, True)
+        frames, _, _ = store.tracked()
+        self.assertEqual(list(frames), [0, 2])
+        self.assertEqual(list(store.speeds()), [0.0, 5.0])
+
+    def test_stats_match_pointwise_computation(self):  # Métricas vetorizadas = cálculo ponto a ponto
+        points = [(0.0, 0.0), (3.0, 4.0), (6.0, 8.0), (6.0, 0.0)]
+        store = TrajectoryStore()
+        for i, (x, y) in enumerate(points):
+            store.append(i, x, y, 10, 10, True)
+        store.append_lost(len(points))
+        steps = [math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(points, points[1:])]
+
+        m = compute_motion_stats(store, num_frames=5, fps=10.0, pixels_per_meter=5.0)
+        self.assertAlmostEqual(m["total_distance_px"], sum(steps))
+        self.assertAlmostEqual(m["mean_speed_px"], sum(steps) / len(steps))
+        self.assertAlmostEqual(m["max_speed_px"], max(steps))
+        self.assertAlmostEqual(m["straight_distance_px"], 6.0)
+        self.assertAlmostEqual(m["path_efficiency"], 6.0 / sum(steps))
+        self.assertEqual(m["success_frames"], 4)
+        self.assertAlmostEqual(m["success_rate"], 0.8)
+        self.assertAlmostEqual(m["mean_speed_m_s"], sum(steps) / len(steps) * 10.0 / 5.0)
+
+    def test_interpolated_frames_do_not_count_as_success(self):  # Posições interpoladas entram nas velocidades, não no sucesso
+        store = TrajectoryStore()
+        for i in range(5):
+            store.append(i, 2.0 * i, 0.0, 4, 4, True, interpolated=i in (1, 2, 3))
+        m = compute_motion_stats(store, num_frames=5, fps=10.0, pixels_per_meter=None)
+        self.assertEqual(m["interpolated_frames"], 3)
+        self.assertEqual(m["success_frames"], 2)
+        self.assertAlmostEqual(m["success_rate"], 1.0)  # 2 sucessos em 2 consultas ao tracker
+        self.assertAlmostEqual(m["mean_speed_px"], 2.0)  # Velocidade por frame, com os frames interpolados
+
+    def test_empty_store(self):  # Sem pontos rastreados as métricas ficam zeradas
+        m = compute_motion_stats(TrajectoryStore(), num_frames=0, fps=30.0, pixels_per_meter=None)
+        self.assertEqual(m["mean_speed_px"], 0.0)
+        self.assertEqual(m["success_rate"], 0.0)
+        self.assertIsNone(m["mean_speed_km_h"])
+
+class TestStreamingTrajectory(unittest.TestCase):  # Testes do modo streaming
+
+    def test_same_csv_and_stats_as_store(self):  # Blocos pequenos geram o mesmo CSV e as mesmas métricas
+        points = [(i, 2.0 * i, 50.0 + (i % 3), i % 4 != 2) for i in range(11)]  # Alguns frames perdidos
+        store = TrajectoryStore(capacity=4)
+        with tempfile.TemporaryDirectory() as tmp:
+            stream = StreamingTrajectory(os.path.join(tmp, "stream.csv"), chunk_size=3)
+            for frame, x, y, ok in points:
+                for t in (store, stream):
+                    if ok:
+                        t.append(frame, x, y, 10, 10, True)
+                    else:
+                        t.append_lost(frame)
+            stream.close()
+            store.write_csv(os.path.join(tmp, "store.csv"))
+            with open(os.path.join(tmp, "stream.csv")) as a, open(os.path.join(tmp, "store.csv")) as b:
+                self.assertEqual(a.read(), b.read())
+        for key, value in compute_motion_stats(store, 11, 30.0, 10.0).items():
+            self.assertAlmostEqual(compute_motion_stats(stream, 11, 30.0, 10.0)[key], value)
+
+if __name__ == '__main__':  # Verifica se o arquivo está sendo executado diretamente
+    unittest.main()  # Executa os testes
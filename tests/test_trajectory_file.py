@@ -0,0 +1,94 @@
+# ===================================================================
+# Cabeçalho do Programa
+# Nome e RAs: Lucas Soares - 324155365, Robert Zica - 323112024, Leonardo Vieira - 323119033, Asafe Orneles - 324172578, Bruno Eduardo - 322123429
+# Data: 27/11/2025
+# Curso: Ciência da Computação
+# Professor: EUZÉBIO D. DE SOUZA
+# Trabalho: Detecção de Movimento usando Filtros Espaciais
+# ===================================================================
+# ANOTAÇÕES
+# ===================================================================
+'''
+Este arquivo contém os testes do formato binário de trajetória ('.traj').
+Ele verifica a gravação e a leitura com memória mapeada, a rejeição de arquivos inválidos
+e a exportação para CSV, inclusive a partir do tracking em modo streaming.
+'''
+#################
+
+import unittest  # Importa o módulo unittest para criar e executar testes unitários
+import sys  # Importa o módulo sys para manipular o path
+import os  # Importa o módulo os para montar caminhos
+import tempfile  # Importa tempfile para gravar os arquivos em uma pasta temporária
+import numpy as np  # Importa NumPy para comparar as colunas
+
+# Adiciona o diretório pai (raiz do projeto) ao sys.path para permitir a importação dos módulos do projeto
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.core.trajectory import TrajectoryStore, convert_binary_to_csv, load_trajectory  # Importa a trajetória em colunas, a conversão e a leitura
+from src.core.tracking import track_single_object  # Importa o tracking
+from src.io.trajectory_file import open_trajectory  # Importa a leitura do formato binário
+from test_tracking import make_synthetic_video  # Reaproveita o vídeo sintético dos testes de tracking
+
+class TestTrajectoryFile(unittest.TestCase):  # Testes do formato binário
+
+    def setUp(self):  # Pasta temporária para os arquivos
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):  # Remove a pasta temporária
+        self.tmp.cleanup()
+
+    def test_roundtrip_with_memory_map(self):  # Gravação e leitura preservam colunas e metadados
+        store = TrajectoryStore()
+        store.append(0, 10.5, 20.0, 4, 6, True)
+        store.append_lost(1)
+        store.append(2, 12.5, 21.0, 4, 6, True)
+        path = os.path.join(self.tmp.name, "t.traj")
+        store.write_binary(path, fps=29.97, width=640, height=480)
+
+        traj = open_trajectory(path)
+        self.assertIsInstance(traj.records, np.memmap)  # Leitura sem cópia
+        self.assertEqual((traj.fps, traj.width, traj.height, len(traj)), (29.97, 640, 480, 3))
+        self.assertEqual(list(traj.frames), [0, 1, 2])
+        self.assertEqual(list(traj.success), [True, False, True])
+        self.assertEqual(list(traj.xs[traj.success]), [10.5, 12.5])
+        del traj  # Libera o mapeamento antes de apagar a pasta
+
+    def test_interpolated_flag_roundtrip(self):  # O bit de interpolação volta do '.traj' e do CSV
+        store = TrajectoryStore()
+        store.append(0, 10.0, 20.0, 4, 6, True)
+        store.append(1, 11.0, 20.0, 4, 6, True, interpolated=True)
+        store.append(2, 12.0, 20.0, 4, 6, True)
+        path = os.path.join(self.tmp.name, "t.traj")
+        store.write_binary(path, fps=30.0, width=640, height=480)
+        traj = open_trajectory(path)
+        self.assertEqual(list(traj.success), [True, True, True])
+        self.assertEqual(list(traj.interpolated), [False, True, False])
+        del traj
+        csv_path = os.path.join(self.tmp.name, "t.csv")
+        convert_binary_to_csv(path, csv_path)
+        with open(csv_path) as f:
+            self.assertTrue(f.readline().strip().endswith(";interpolated"))
+        self.assertEqual(list(load_trajectory(csv_path).interpolated), [False, True, False])
+
+    def test_invalid_file_is_rejected(self):  # Arquivos que não são '.traj' geram ValueError
+        path = os.path.join(self.tmp.name, "ruim.traj")
+        with open(path, "wb") as f:
+            f.write(b"isto nao e uma trajetoria" * 4)
+        with self.assertRaises(ValueError):
+            open_trajectory(path)
+
+    def test_streaming_binary_converts_to_same_csv(self):  # O '.traj' do modo streaming exporta o mesmo CSV do tracking
+        video = os.path.join(self.tmp.name, "quadrado.avi")
+        box = make_synthetic_video(video)
+        stats = track_single_object(video, self.tmp.name, tracker_type="KCF", save_video=False, save_csv=True,
+                                    save_debug_images=False, initial_box=box, headless=True,
+                                    streaming=True, save_binary=True)
+        converted = os.path.join(self.tmp.name, "convertido.csv")
+        convert_binary_to_csv(stats["binary_output"], converted)
+        with open(stats["csv_output"]) as a, open(converted) as b:
+            self.assertEqual(a.read(), b.read())
+        self.assertEqual(len(open_trajectory(stats["binary_output"])), stats["num_frames"])  # Um registro por frame
+
+if __name__ == '__main__':  # Verifica se o arquivo está sendo executado diretamente
+    unittest.main()  # Executa os testes